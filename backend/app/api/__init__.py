@@ -8,7 +8,7 @@ from fastapi import APIRouter
 api_router = APIRouter()
 
 # Import and include all routers here
-from .routers import menu, auth, user, categories, tables, orders, cash_register, restaurants, restaurant_users, reports, printers
+from .routers import menu, auth, user, categories, tables, orders, cash_register, restaurants, restaurant_users, reports, printers, exports, events, media
 from . import admin
 from .subscription import router as subscription_router
 from .sysadmin_payments import router as sysadmin_payments_router
@@ -29,5 +29,8 @@ api_router.include_router(cash_register.router)  # New cash register router
 api_router.include_router(subscription_router)  # Subscription management
 api_router.include_router(sysadmin_payments_router)  # SysAdmin payment management
 api_router.include_router(reports.router)  # Reports and analytics
+api_router.include_router(exports.router)  # Streaming CSV/NDJSON exports
+api_router.include_router(events.router)  # Server-Sent Events stream
+api_router.include_router(media.router)  # Uploaded menu images
 api_router.include_router(admin.router)  # SysAdmin management
 api_router.include_router(health.router)  # Health check endpoints
@@ -7,11 +7,14 @@ from sqlalchemy import func
 from typing import List, Optional
 from datetime import datetime
 
-from app.db.base import get_db
+from app.db.base import get_db, get_read_db
 from app.models import Restaurant, User, RestaurantSubscription, SubscriptionPlan
 from app.models.user import UserRole
 from app.models.restaurant_subscription import SubscriptionStatus
+from app.core.config import settings
 from app.core.exceptions import UnauthorizedError, ResourceNotFoundError
+from app.services.platform_metrics import get_platform_metrics
+from app.services.subscription import refresh_due_statuses
 from app.services.subscription_service import SubscriptionService
 from app.schemas.subscription import (
     RestaurantSubscriptionResponse,
@@ -66,6 +69,8 @@ class AdminStats(BaseModel):
     total_annual_revenue: float
     
     plans_distribution: dict  # {plan_name: count}
+    
+    computed_at: Optional[datetime] = None  # When the snapshot was taken
 
 
 # ==================== DEPENDENCIES ====================
@@ -88,70 +93,34 @@ def get_current_sysadmin(
 
 @router.get("/stats", response_model=AdminStats)
 def get_system_stats(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     # current_user: User = Depends(get_current_sysadmin)  # Uncomment when auth is ready
 ):
-    """Get system-wide statistics (SysAdmin only)"""
-    
-    # Count restaurants
-    total_restaurants = db.query(func.count(Restaurant.id)).scalar()
-    
-    # Count subscriptions
-    total_subscriptions = db.query(func.count(RestaurantSubscription.id)).scalar()
-    restaurants_with_sub = db.query(
-        func.count(func.distinct(RestaurantSubscription.restaurant_id))
-    ).scalar()
-    
-    # Count by status (count unique restaurants, not subscriptions)
-    active_subs = db.query(func.count(func.distinct(RestaurantSubscription.restaurant_id))).filter(
-        RestaurantSubscription.status == SubscriptionStatus.ACTIVE
-    ).scalar()
-    
-    trial_subs = db.query(func.count(func.distinct(RestaurantSubscription.restaurant_id))).filter(
-        RestaurantSubscription.status == SubscriptionStatus.TRIAL
-    ).scalar()
-    
-    cancelled_subs = db.query(func.count(func.distinct(RestaurantSubscription.restaurant_id))).filter(
-        RestaurantSubscription.status == SubscriptionStatus.CANCELLED
-    ).scalar()
-    
-    expired_subs = db.query(func.count(func.distinct(RestaurantSubscription.restaurant_id))).filter(
-        RestaurantSubscription.status == SubscriptionStatus.EXPIRED
-    ).scalar()
-    
-    # Calculate revenue
-    total_monthly = db.query(func.sum(RestaurantSubscription.total_price)).filter(
-        RestaurantSubscription.status.in_([SubscriptionStatus.ACTIVE, SubscriptionStatus.TRIAL])
-    ).scalar() or 0.0
-    
-    # Plans distribution (count unique restaurants per plan)
+    """
+    Get system-wide statistics (SysAdmin only).
+
+    Served from the platform metrics snapshot refreshed in the background.
+    """
+    metrics = get_platform_metrics(db, max_age_seconds=2 * settings.PLATFORM_METRICS_REFRESH_SECONDS)
+    by_status = metrics.restaurants_by_status
+
     plans_dist = {}
-    plan_counts = db.query(
-        SubscriptionPlan.display_name,
-        func.count(func.distinct(RestaurantSubscription.restaurant_id))
-    ).join(
-        RestaurantSubscription
-    ).filter(
-        RestaurantSubscription.status.in_([SubscriptionStatus.ACTIVE, SubscriptionStatus.TRIAL])
-    ).group_by(
-        SubscriptionPlan.display_name
-    ).all()
-    
-    for plan_name, count in plan_counts:
-        plans_dist[plan_name] = count
-    
+    for plan in metrics.plans:
+        plans_dist[plan.display_name] = plans_dist.get(plan.display_name, 0) + plan.restaurants
+
     return AdminStats(
-        total_restaurants=total_restaurants,
-        restaurants_with_subscription=restaurants_with_sub,
-        restaurants_without_subscription=total_restaurants - restaurants_with_sub,
-        total_subscriptions=total_subscriptions,
-        active_subscriptions=active_subs,
-        trial_subscriptions=trial_subs,
-        cancelled_subscriptions=cancelled_subs,
-        expired_subscriptions=expired_subs,
-        total_monthly_revenue=total_monthly,
-        total_annual_revenue=total_monthly * 12,
-        plans_distribution=plans_dist
+        total_restaurants=metrics.total_restaurants,
+        restaurants_with_subscription=metrics.restaurants_with_subscription,
+        restaurants_without_subscription=metrics.total_restaurants - metrics.restaurants_with_subscription,
+        total_subscriptions=metrics.total_subscriptions,
+        active_subscriptions=by_status[SubscriptionStatus.ACTIVE.value],
+        trial_subscriptions=by_status[SubscriptionStatus.TRIAL.value],
+        cancelled_subscriptions=by_status[SubscriptionStatus.CANCELLED.value],
+        expired_subscriptions=by_status[SubscriptionStatus.EXPIRED.value],
+        total_monthly_revenue=metrics.live_subscription_total,
+        total_annual_revenue=metrics.live_subscription_total * 12,
+        plans_distribution=plans_dist,
+        computed_at=metrics.computed_at
     )
 
 
@@ -215,18 +184,9 @@ def list_all_restaurants(
         else:
             query = query.filter(RestaurantSubscription.id.is_(None))
     
-    results = query.offset(skip).limit(limit).all()
-    
-    # Update subscription status for all subscriptions before returning
-    subscription_ids = [row.subscription_id for row in results if row.subscription_id]
-    if subscription_ids:
-        subscriptions = db.query(RestaurantSubscription).filter(
-            RestaurantSubscription.id.in_(subscription_ids)
-        ).all()
-        for sub in subscriptions:
-            sub.update_status(db)
+    # Bring date-driven statuses up to date in bulk before reading them
+    refresh_due_statuses(db)
     
-    # Re-fetch results after status updates
     results = query.offset(skip).limit(limit).all()
     
     # Convert to response model
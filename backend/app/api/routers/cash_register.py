@@ -4,7 +4,7 @@ from typing import List, Optional
 from enum import Enum
 from datetime import datetime, timedelta
 
-from ...db.base import get_db
+from ...db.base import get_db, get_read_db
 from ...models.cash_register import (
     CashRegisterSession as CashRegisterSessionModel,
     CashTransaction as CashTransactionModel,
@@ -261,7 +261,7 @@ async def get_reports(
     report_type: Optional[str] = None,
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_active_user)
 ) -> List[CashRegisterReport]:
     try:
@@ -269,62 +269,26 @@ async def get_reports(
         restaurant = await get_current_restaurant(request)
         
         # If user is a cashier, filter reports to only their sessions
+        cashier_id = None
         if current_user.role == "staff" and current_user.staff_type == "cashier":
-            # Get all session IDs for this cashier in this restaurant
-            cashier_sessions = cash_register_service.get_sessions(
-                db, restaurant_id=restaurant.id, cashier_id=current_user.id, skip=0, limit=1000
-            )
-            cashier_session_ids = [s.id for s in cashier_sessions]
-            
-            # If a specific session_id is requested, verify it belongs to this cashier
-            if session_id:
-                if session_id not in cashier_session_ids:
-                    raise HTTPException(
-                        status_code=403, 
-                        detail="No tienes permiso para ver reportes de esta sesión"
-                    )
-                # Session belongs to cashier, return reports for that session
-                return cash_register_service.get_reports(
-                    db, session_id=session_id, report_type=report_type, skip=skip, limit=limit
-                )
-            
-            # No session_id specified, get reports from all cashier's sessions
-            # If cashier has no sessions, return empty list
-            if not cashier_session_ids:
-                return []
-            
-            # Get reports for all cashier sessions
-            all_reports = []
-            for sid in cashier_session_ids:
-                reports = cash_register_service.get_reports(
-                    db, session_id=sid, report_type=report_type, skip=0, limit=limit
-                )
-                all_reports.extend(reports)
-            return all_reports[:limit]  # Apply limit to combined results
-        
-        # Admin/SysAdmin - return all reports for this restaurant
-        # First get all sessions for this restaurant
-        restaurant_sessions = cash_register_service.get_sessions(
-            db, restaurant_id=restaurant.id, skip=0, limit=1000
-        )
-        restaurant_session_ids = [s.id for s in restaurant_sessions]
+            cashier_id = current_user.id
         
         if session_id:
+            session = cash_register_service.get_session(db, session_id)
             # Verify session belongs to this restaurant
-            if session_id not in restaurant_session_ids:
+            if not session or session.restaurant_id != restaurant.id:
                 raise HTTPException(status_code=403, detail="Access denied: Session belongs to another restaurant")
-            return cash_register_service.get_reports(
-                db, session_id=session_id, report_type=report_type, skip=skip, limit=limit
-            )
+            if cashier_id and session.cashier_id != cashier_id:
+                raise HTTPException(
+                    status_code=403, 
+                    detail="No tienes permiso para ver reportes de esta sesión"
+                )
         
-        # Get reports for all restaurant sessions
-        all_reports = []
-        for sid in restaurant_session_ids:
-            reports = cash_register_service.get_reports(
-                db, session_id=sid, report_type=report_type, skip=0, limit=limit
-            )
-            all_reports.extend(reports)
-        return all_reports[:limit]
+        # One indexed query over the restaurant's reports
+        return cash_register_service.get_reports(
+            db, session_id=session_id, report_type=report_type, skip=skip, limit=limit,
+            restaurant_id=restaurant.id, cashier_id=cashier_id
+        )
     except HTTPException:
         raise
     except Exception as e:
@@ -334,7 +298,7 @@ async def get_reports(
 async def get_session_reports(
     session_id: int,
     request: Request,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_active_user)
 ) -> List[CashRegisterReport]:
     """Get all reports for a specific session."""
@@ -447,7 +411,7 @@ async def get_daily_summaries(
     end_date: Optional[str] = Query(None, description="End date for filtering reports (YYYY-MM-DD)"),
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_active_user)
 ) -> List[DailySummaryReport]:
     """Get daily summary reports within a date range."""
@@ -483,7 +447,7 @@ async def get_weekly_summary(
     request: Request,
     start_date: Optional[str] = Query(None, description="Start of the week (YYYY-MM-DD)"),
     end_date: Optional[str] = Query(None, description="End of the week (YYYY-MM-DD)"),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_active_user)
 ) -> WeeklySummaryReport:
     """Generate a weekly summary report."""
@@ -11,6 +11,7 @@ from ...services.menu import get_categories, get_category, create_category, upda
 from ...schemas.menu import CategoryCreate, CategoryUpdate, CategoryInDB
 from ...core.exceptions import ResourceNotFoundError, ValidationError, ConflictError
 from ...core.error_handlers import handle_duplicate_error
+from ...core.response_cache import cached_response
 from ...middleware.subscription_limits import SubscriptionLimitsMiddleware
 
 router = APIRouter(
@@ -19,6 +20,7 @@ router = APIRouter(
 )
 
 @router.get("/", response_model=List[CategoryInDB])
+@cached_response(tags=("menu",))
 async def get_menu_categories(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user),
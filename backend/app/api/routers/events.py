@@ -0,0 +1,47 @@
+from fastapi import APIRouter, Depends
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+
+from ...db.base import get_db
+from ...models.restaurant import Restaurant
+from ...models.user import User
+from ...core.dependencies import get_current_restaurant
+from ...services.alert_service import ADMIN_ROLES, ALERTS_UNREAD, AlertService
+from ...services.realtime import hub
+from ...services.user import get_current_active_user
+
+router = APIRouter(
+    prefix="/events",
+    tags=["events"],
+)
+
+
+@router.get("/stream")
+def stream_events(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+    restaurant: Restaurant = Depends(get_current_restaurant)
+) -> StreamingResponse:
+    """
+    Server-Sent Events stream of the current restaurant's real-time events.
+    
+    Admins get the unread alerts count first, then ``alert.created`` and
+    ``alerts.unread`` as alerts change. ``resync`` means events were
+    dropped and the client should reload what it shows.
+    """
+    role = current_user.role.value
+    initial = []
+    if role in ADMIN_ROLES:
+        initial.append((ALERTS_UNREAD, {"unread_count": AlertService(db).get_unread_count(restaurant.id)}))
+    restaurant_id = restaurant.id
+    # The stream stays open for hours; give the connection back to the pool now
+    db.close()
+    return StreamingResponse(
+        hub.stream(restaurant_id, role, initial),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-store",
+            # Proxies must pass events through as they are written
+            "X-Accel-Buffering": "no",
+        },
+    )
@@ -0,0 +1,101 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+from typing import Callable, Iterator, Optional, Sequence, Tuple
+from datetime import datetime
+from enum import Enum
+
+from ...db.base import get_read_db
+from ...models.restaurant import Restaurant
+from ...models.user import User
+from ...core.dependencies import get_current_restaurant, require_admin_or_sysadmin
+from ...services import export_service
+
+router = APIRouter(
+    prefix="/exports",
+    tags=["exports"],
+    responses={404: {"description": "Not found"}},
+)
+
+
+class ExportFormat(str, Enum):
+    CSV = "csv"
+    NDJSON = "ndjson"
+
+
+_MEDIA_TYPES = {
+    ExportFormat.CSV: "text/csv; charset=utf-8",
+    ExportFormat.NDJSON: "application/x-ndjson",
+}
+
+
+def _parse_range(start_date: Optional[str], end_date: Optional[str]) -> Tuple[Optional[datetime], Optional[datetime]]:
+    """Parse YYYY-MM-DD bounds the same way the reports endpoints do (end day inclusive)."""
+    try:
+        start = datetime.strptime(start_date, "%Y-%m-%d") if start_date else None
+        end = datetime.strptime(end_date, "%Y-%m-%d").replace(hour=23, minute=59, second=59) if end_date else None
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid date format. Use YYYY-MM-DD: {str(e)}")
+    if start and end and start > end:
+        raise HTTPException(status_code=400, detail="start_date must be before end_date")
+    return start, end
+
+
+def _export_response(
+    name: str,
+    fmt: ExportFormat,
+    columns: Sequence[str],
+    rows: Iterator[Tuple],
+    start_date: Optional[str],
+    end_date: Optional[str]
+) -> StreamingResponse:
+    encode: Callable = export_service.stream_csv if fmt == ExportFormat.CSV else export_service.stream_ndjson
+    filename = "_".join(part for part in (name, start_date, end_date) if part) + f".{fmt.value}"
+    return StreamingResponse(
+        encode(columns, rows),
+        media_type=_MEDIA_TYPES[fmt],
+        headers={
+            "Content-Disposition": f'attachment; filename="{filename}"',
+            "Cache-Control": "no-store",
+        },
+    )
+
+
+@router.get("/orders")
+def export_orders(
+    format: ExportFormat = Query(ExportFormat.CSV, description="csv or ndjson"),
+    start_date: Optional[str] = Query(None, description="Start date (YYYY-MM-DD)"),
+    end_date: Optional[str] = Query(None, description="End date (YYYY-MM-DD), inclusive"),
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(require_admin_or_sysadmin),
+    restaurant: Restaurant = Depends(get_current_restaurant)
+) -> StreamingResponse:
+    """
+    Stream all orders of the current restaurant in a date range.
+    
+    Rows are read through a server-side cursor and written as they arrive,
+    so there is no pagination and no upper bound on the range.
+    """
+    start, end = _parse_range(start_date, end_date)
+    rows = export_service.iter_order_rows(db, restaurant.id, start, end)
+    return _export_response("orders", format, export_service.ORDER_COLUMNS, rows, start_date, end_date)
+
+
+@router.get("/cash-transactions")
+def export_cash_transactions(
+    format: ExportFormat = Query(ExportFormat.CSV, description="csv or ndjson"),
+    start_date: Optional[str] = Query(None, description="Start date (YYYY-MM-DD)"),
+    end_date: Optional[str] = Query(None, description="End date (YYYY-MM-DD), inclusive"),
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(require_admin_or_sysadmin),
+    restaurant: Restaurant = Depends(get_current_restaurant)
+) -> StreamingResponse:
+    """
+    Stream all cash register transactions of the current restaurant in a date range.
+    
+    Rows are read through a server-side cursor and written as they arrive,
+    so there is no pagination and no upper bound on the range.
+    """
+    start, end = _parse_range(start_date, end_date)
+    rows = export_service.iter_transaction_rows(db, restaurant.id, start, end)
+    return _export_response("cash_transactions", format, export_service.TRANSACTION_COLUMNS, rows, start_date, end_date)
@@ -0,0 +1,29 @@
+"""
+Media Router
+
+Serves uploaded media (see core/media.py). File names are content
+hashes, so responses are cacheable forever. Public: images are loaded by
+<img> tags, which send no Authorization header.
+"""
+
+from fastapi import APIRouter
+from fastapi.responses import FileResponse
+
+from app.core.exceptions import ResourceNotFoundError
+from app.core.media import IMMUTABLE_CACHE_CONTROL, MEDIA_FILENAME, menu_image_dir
+
+router = APIRouter(
+    prefix="/media",
+    tags=["media"]
+)
+
+
+@router.get("/menu/{restaurant_id}/{filename}")
+def get_menu_image(restaurant_id: int, filename: str) -> FileResponse:
+    """
+    A menu image or one of its variants, with immutable cache headers.
+    """
+    path = menu_image_dir(restaurant_id) / filename
+    if not MEDIA_FILENAME.match(filename) or not path.is_file():
+        raise ResourceNotFoundError("Image", filename)
+    return FileResponse(path, headers={"Cache-Control": IMMUTABLE_CACHE_CONTROL})
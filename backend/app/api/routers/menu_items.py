@@ -6,11 +6,12 @@ Separated from menu.py for better organization and maintainability.
 """
 
 import logging
-from fastapi import APIRouter, Depends, status, Query, Request
+from fastapi import APIRouter, Depends, File, status, Query, Request, UploadFile
 from pydantic import BaseModel
 from sqlalchemy.orm import Session
 from typing import List, Optional
 
+from app.core.config import settings
 from app.core.exceptions import ResourceNotFoundError, ValidationError, DatabaseError
 
 from app.db.base import get_db
@@ -24,6 +25,7 @@ from app.services.menu import (
     update_menu_item as update_menu_item_service,
     delete_menu_item as delete_menu_item_service
 )
+from app.services.menu_images import remove_menu_image, store_menu_image
 from app.models.user import User
 from app.models.restaurant import Restaurant
 from app.services.user import get_current_active_user
@@ -151,6 +153,45 @@ async def update_menu_item_availability(
         raise DatabaseError(f"Failed to update menu item availability: {str(e)}", operation="update")
 
 
+@router.put("/{item_id}/image", response_model=MenuItem)
+async def upload_menu_item_image(
+    item_id: int,
+    image: UploadFile = File(..., description="JPEG, PNG, GIF or WebP image"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_admin_or_sysadmin),
+    restaurant: Restaurant = Depends(get_current_restaurant)
+) -> MenuItem:
+    """
+    Upload the image of a menu item.
+    Thumbnails are generated in the background; until then ``image_urls``
+    point every size at the original. Requires admin or sysadmin privileges.
+    """
+    db_item = get_menu_item(db, item_id=item_id, restaurant_id=restaurant.id)
+    if db_item is None:
+        raise ResourceNotFoundError("Menu item", item_id)
+    
+    # One byte over the limit is enough to reject it
+    content = await image.read(settings.MENU_IMAGE_MAX_BYTES + 1)
+    return store_menu_image(db, db_item, content)
+
+
+@router.delete("/{item_id}/image", response_model=MenuItem)
+async def delete_menu_item_image(
+    item_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_admin_or_sysadmin),
+    restaurant: Restaurant = Depends(get_current_restaurant)
+) -> MenuItem:
+    """
+    Remove the uploaded image of a menu item (its image_url, if any, is kept).
+    Requires admin or sysadmin privileges.
+    """
+    db_item = get_menu_item(db, item_id=item_id, restaurant_id=restaurant.id)
+    if db_item is None:
+        raise ResourceNotFoundError("Menu item", item_id)
+    return remove_menu_image(db, db_item)
+
+
 @router.put("/{item_id}", response_model=MenuItem)
 async def update_menu_item(
     item_id: int,
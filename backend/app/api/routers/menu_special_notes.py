@@ -6,15 +6,15 @@ Separated from menu.py for better organization and maintainability.
 """
 
 import logging
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Query, status
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 
 from app.core.exceptions import ForbiddenError
 
 from app.db.base import get_db
 from app.services.special_notes import SpecialNotesService
-from app.schemas.special_notes import TopSpecialNote, TrackNoteRequest, TrackNoteResponse
+from app.schemas.special_notes import SuggestedSpecialNote, TopSpecialNote, TrackNoteRequest, TrackNoteResponse
 from app.models.user import User, UserRole
 from app.models.restaurant import Restaurant
 from app.services.user import get_current_active_user
@@ -64,19 +64,40 @@ async def get_top_special_notes(
         return []
 
 
+@router.get("/suggest", response_model=List[SuggestedSpecialNote])
+async def suggest_special_notes(
+    q: str = Query("", max_length=200, description="Text typed so far"),
+    menu_item_id: Optional[int] = Query(None, description="Rank notes used with this menu item first"),
+    category_id: Optional[int] = Query(None, description="Rank notes used with this category first"),
+    limit: int = Query(8, ge=1, le=50),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+    restaurant: Restaurant = Depends(get_current_restaurant)
+):
+    """
+    Suggest special notes with a word starting with what has been typed,
+    ranked by usage with recency decay. Served from an in-memory index,
+    so it can be called on every keystroke.
+    """
+    return SpecialNotesService.suggest_notes(
+        restaurant.id, db, q, limit, menu_item_id=menu_item_id, category_id=category_id
+    )
+
+
 @router.post("/track", response_model=TrackNoteResponse)
 async def track_special_note(
     request: TrackNoteRequest,
+    db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user),
     restaurant: Restaurant = Depends(get_current_restaurant)
 ):
     """
     Track usage of a special note for statistics.
-    Updates are batched for performance (actual DB write happens in background).
+    The count is updated in the background by the outbox worker.
     """
     try:
-        # Async tracking - accumulates in memory
-        SpecialNotesService.track_note_async(restaurant.id, request.note_text)
+        # Counted by the outbox worker after commit
+        SpecialNotesService.track_note(db, restaurant.id, request.note_text, request.menu_item_id)
         return TrackNoteResponse(success=True)
     except Exception as e:
         logger.error(f"Error tracking special note: {str(e)}")
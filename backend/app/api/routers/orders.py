@@ -1,15 +1,17 @@
-from fastapi import APIRouter, Depends, status, BackgroundTasks, Request
+from fastapi import APIRouter, Depends, Query, status, BackgroundTasks, Request
 from sqlalchemy.orm import Session, selectinload
 from typing import List, Optional
+from datetime import datetime
 
 from ...db.base import get_db
 from ...models.order import Order as OrderModel, OrderStatus
 from ...models.order_item import OrderItem as OrderItemModel
 from ...models.table import Table as TableModel
 from ...models.menu import MenuItem as MenuItemModel
+from ...models.printer import PrinterType
 from ...models.restaurant import Restaurant
 from ...models.user import User
-from ...schemas.order import Order, OrderCreate, OrderUpdate, OrderItemCreate, OrderItemUpdate, OrderItem, OrderItemExtraCreate, OrderItemExtraUpdate, OrderItemExtra
+from ...schemas.order import PaymentMethod, Order, OrderCreate, OrderUpdate, OrderItemCreate, OrderItemUpdate, OrderItem, OrderItemExtraCreate, OrderItemExtraUpdate, OrderItemExtra, KitchenBumpRequest, KitchenBumpResult, KitchenQueue
 
 # Order services - New modular imports
 from ...services.orders import (
@@ -23,12 +25,21 @@ from ...services.orders import (
     update_order_item,
     delete_order_item,
     serialize_order_item,
+    add_extra_to_item,
+    get_item_extras,
+    get_extra_by_id,
+    update_item_extra,
+    delete_item_extra,
+    bump_item_statuses,
+    get_kitchen_queue,
+    settle_order,
+    process_order_payment,
 )
 from ...services.orders.table_manager import mark_table_available_if_no_orders
-from ...services.cash_register import create_transaction_from_order
 from ...services.user import get_current_active_user
 from ...core.dependencies import get_current_restaurant, get_current_user_with_active_subscription
-from ...core.exceptions import ResourceNotFoundError, ValidationError, ConflictError, DatabaseError
+from ...core.exceptions import ResourceNotFoundError, ValidationError, ConflictError, DatabaseError, ForbiddenError
+from ...core.responses import FastJSONResponse
 
 router = APIRouter(
     prefix="/orders",
@@ -39,7 +50,7 @@ router = APIRouter(
 )
 
 
-@router.get("/", response_model=List[Order])
+@router.get("/", response_model=List[Order], response_class=FastJSONResponse)
 async def read_orders(
     request: Request,
     skip: int = 0,
@@ -48,6 +59,9 @@ async def read_orders(
     table_id: Optional[int] = None,
     sort_by: str = 'orders',
     hours: Optional[int] = None,
+    search: Optional[str] = Query(None, max_length=100),
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
     db: Session = Depends(get_db),
     restaurant: Restaurant = Depends(get_current_restaurant),
     current_user: User = Depends(get_current_active_user)
@@ -55,8 +69,12 @@ async def read_orders(
     """
     Retrieve orders with optional filtering (filtered by restaurant).
     Waiters only see their own orders.
-    sort_by: 'orders' (newest first by ID) or 'kitchen' (FIFO by status/created_at)
+    sort_by: 'orders' (newest first by ID), 'kitchen' (FIFO by status/created_at)
+        or 'relevance' (best search matches first)
     hours: Filter orders from the last X hours (e.g., 24 for last 24 hours)
+    search: Words matched as prefixes against order/ticket number, customer
+        name, item names and notes; every word must match
+    start_date / end_date: Filter by creation time
     """
     try:
         # If user is a waiter, filter to only their orders
@@ -64,7 +82,7 @@ async def read_orders(
         if current_user.role == "staff" and current_user.staff_type == "waiter":
             waiter_id = current_user.id
         
-        return get_orders(
+        orders = get_orders(
             db,
             restaurant_id=restaurant.id,
             skip=skip,
@@ -73,14 +91,20 @@ async def read_orders(
             status=status,
             table_id=table_id,
             waiter_id=waiter_id,
-            hours=hours
+            hours=hours,
+            search=search,
+            start_date=start_date,
+            end_date=end_date
         )
     except Exception as e:
         raise DatabaseError(f"Error retrieving orders: {str(e)}", operation="select")
+    
+    # Serializers already emit the response shape; skip response_model re-validation
+    return FastJSONResponse(orders)
 
 
 
-@router.post("/", response_model=Order, status_code=status.HTTP_201_CREATED)
+@router.post("/", response_model=Order, status_code=status.HTTP_201_CREATED, response_class=FastJSONResponse)
 async def create_order(
     request: Request,
     order: OrderCreate, 
@@ -123,10 +147,12 @@ async def create_order(
                 if not db_item:
                     raise ResourceNotFoundError("MenuItem", item.menu_item_id)
     
-    return create_order_with_items(db=db, order=order, restaurant_id=restaurant.id, user_id=current_user.id)
+    # Tickets are printed by the outbox worker once the order is committed
+    created = create_order_with_items(db=db, order=order, restaurant_id=restaurant.id, user_id=current_user.id)
+    return FastJSONResponse(created, status_code=status.HTTP_201_CREATED)
 
 
-@router.get("/{order_id}", response_model=Order)
+@router.get("/{order_id}", response_model=Order, response_class=FastJSONResponse)
 async def read_order(order_id: int, db: Session = Depends(get_db), restaurant: Restaurant = Depends(get_current_restaurant)) -> Order:
     """
     Get a specific order by ID.
@@ -134,16 +160,19 @@ async def read_order(order_id: int, db: Session = Depends(get_db), restaurant: R
     db_order = get_order(db, order_id=order_id, restaurant_id=restaurant.id)
     if db_order is None:
         raise ResourceNotFoundError("Order", order_id)
-    return db_order
+    return FastJSONResponse(db_order)
 
 
-@router.put("/{order_id}", response_model=Order)
+@router.put("/{order_id}", response_model=Order, response_class=FastJSONResponse)
 async def update_order_endpoint(order_id: int, order: OrderUpdate, db: Session = Depends(get_db), current_user = Depends(get_current_user_with_active_subscription)) -> Order:
     """
     Update an order.
     """
-    # First get the database order object
-    db_order = db.query(OrderModel).filter(OrderModel.id == order_id).first()
+    # First get the database order object, locked if it is being paid
+    query = db.query(OrderModel).filter(OrderModel.id == order_id)
+    if order.is_paid:
+        query = query.with_for_update()
+    db_order = query.first()
     if db_order is None:
         raise ResourceNotFoundError("Order", order_id)
     
@@ -194,48 +223,18 @@ async def update_order_endpoint(order_id: int, order: OrderUpdate, db: Session =
 
     # Check if order is being marked as paid
     if order.is_paid and not db_order.is_paid:
-        # Validate payment method if provided
-        if order.payment_method is not None:
-            from ...schemas.order import PaymentMethod
-            try:
-                payment_method_enum = PaymentMethod(order.payment_method.value)
-            except (ValueError, AttributeError):
-                raise ValidationError("Invalid payment method", field="payment_method")
-            db_order.payment_method = payment_method_enum
-        # If no payment method provided, default to CASH
-        else:
-            from ...schemas.order import PaymentMethod
-            db_order.payment_method = PaymentMethod.CASH
-
-        # Mark order as paid and completed
-        db_order.is_paid = True
-        db_order.status = OrderStatus.COMPLETED
-
-        # Mark table as available if this is a dine-in order
-        if db_order.table_id:
-            mark_table_available_if_no_orders(db, db_order.table_id, order_id)
-
-        # Create cash register transaction
-        try:
-            create_transaction_from_order(
-                db=db,
-                order_id=order_id,
-                created_by_user_id=current_user.id
-            )
-        except ValueError as e:
-            raise ValidationError(str(e))
+        settle_order(db, db_order, order.payment_method or PaymentMethod.CASH, current_user.id)
 
         # Commit the payment changes first
         db.commit()
-        db.refresh(db_order)
 
     # Update any other fields from the request
     if order.dict(exclude_unset=True):
         updated_order = update_order(db=db, db_order=db_order, order=order)
-        return updated_order
+        return FastJSONResponse(updated_order)
     else:
         # If no other updates, just return the current order
-        return get_order(db, order_id, db_order.restaurant_id)
+        return FastJSONResponse(get_order(db, order_id, db_order.restaurant_id))
 
 
 
@@ -252,7 +251,7 @@ async def delete_order_endpoint(order_id: int, db: Session = Depends(get_db), cu
     delete_order(db, db_order=db_order)
 
 
-@router.post("/{order_id}/items", response_model=OrderItem, status_code=status.HTTP_201_CREATED)
+@router.post("/{order_id}/items", response_model=OrderItem, status_code=status.HTTP_201_CREATED, response_class=FastJSONResponse)
 async def add_order_item_endpoint(order_id: int, item: OrderItemCreate, db: Session = Depends(get_db), current_user: User = Depends(get_current_user_with_active_subscription)) -> OrderItem:
     """
     Add an item to an existing order.
@@ -281,10 +280,10 @@ async def add_order_item_endpoint(order_id: int, item: OrderItemCreate, db: Sess
     result = add_order_item(db=db, db_order=db_order, item=item, unit_price=db_menu_item.price)
     
     # No need to refresh - items relationship is eager loaded with lazy='selectin'
-    return result
+    return FastJSONResponse(result, status_code=status.HTTP_201_CREATED)
 
 
-@router.post("/{order_id}/items/bulk", response_model=Order, status_code=status.HTTP_201_CREATED)
+@router.post("/{order_id}/items/bulk", response_model=Order, status_code=status.HTTP_201_CREATED, response_class=FastJSONResponse)
 async def add_multiple_items_to_order(
     order_id: int, 
     items: List[OrderItemCreate], 
@@ -336,10 +335,13 @@ async def add_multiple_items_to_order(
     db.commit()
     
     # Return updated order with all items
-    return get_order(db, order_id=order_id, restaurant_id=restaurant.id)
+    return FastJSONResponse(
+        get_order(db, order_id=order_id, restaurant_id=restaurant.id),
+        status_code=status.HTTP_201_CREATED
+    )
 
 
-@router.put("/{order_id}/items/{item_id}", response_model=OrderItem)
+@router.put("/{order_id}/items/{item_id}", response_model=OrderItem, response_class=FastJSONResponse)
 async def update_order_item_endpoint(order_id: int, item_id: int, item: OrderItemUpdate, db: Session = Depends(get_db), current_user: User = Depends(get_current_user_with_active_subscription)) -> OrderItem:
     """
     Update an order item.
@@ -348,10 +350,10 @@ async def update_order_item_endpoint(order_id: int, item_id: int, item: OrderIte
     if not db_order_item or db_order_item.order_id != order_id:
         raise ResourceNotFoundError("OrderItem", item_id)
     
-    return update_order_item(db=db, db_item=db_order_item, item=item)
+    return FastJSONResponse(update_order_item(db=db, db_item=db_order_item, item=item))
 
 
-@router.patch("/{order_id}/items/{item_id}/status", response_model=OrderItem)
+@router.patch("/{order_id}/items/{item_id}/status", response_model=OrderItem, response_class=FastJSONResponse)
 async def update_order_item_status(
     order_id: int, 
     item_id: int, 
@@ -381,7 +383,46 @@ async def update_order_item_status(
     db.commit()
     db.refresh(db_order_item)  # Refresh to get updated_at timestamp
     
-    return serialize_order_item(db_order_item)
+    return FastJSONResponse(serialize_order_item(db_order_item))
+
+
+@router.post("/kitchen/bump", response_model=KitchenBumpResult, response_class=FastJSONResponse)
+def bump_kitchen_items(
+    bump: KitchenBumpRequest,
+    db: Session = Depends(get_db),
+    restaurant: Restaurant = Depends(get_current_restaurant),
+    current_user: User = Depends(get_current_user_with_active_subscription)
+) -> KitchenBumpResult:
+    """
+    Move many items through their statuses in one request.
+
+    Accepts explicit (order_id, item_id, status) transitions and
+    (order_id, category_id, status) bumps for every item of a category in
+    an order. All transitions are validated before any is applied; the
+    response only lists what changed.
+    """
+    return FastJSONResponse(bump_item_statuses(db, restaurant.id, bump))
+
+
+@router.get("/kitchen/queue", response_model=KitchenQueue, response_class=FastJSONResponse)
+def read_kitchen_queue(
+    printer_id: Optional[int] = Query(None, description="Station of one printer"),
+    station: Optional[PrinterType] = Query(None, description="Station of every printer of a type (kitchen, bar)"),
+    order_type: Optional[str] = Query(None, max_length=50, description="dine_in, takeaway or delivery"),
+    limit: int = Query(500, ge=1, le=2000),
+    db: Session = Depends(get_db),
+    restaurant: Restaurant = Depends(get_current_restaurant)
+) -> KitchenQueue:
+    """
+    Items a kitchen or bar display has to prepare, oldest order first.
+
+    Only pending and preparing items of open orders in categories visible
+    in the kitchen, filtered to the categories routed to the station's
+    printers. One flat row per item with its order context and age.
+    """
+    return FastJSONResponse(get_kitchen_queue(
+        db, restaurant.id, printer_id=printer_id, station=station, order_type=order_type, limit=limit
+    ))
 
 
 @router.delete("/{order_id}/items/{item_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -396,91 +437,66 @@ async def delete_order_item_endpoint(order_id: int, item_id: int, db: Session =
     delete_order_item(db=db, db_item=db_order_item)
 
 
-@router.patch("/{order_id}/pay", response_model=Order)
+@router.patch("/{order_id}/pay", response_model=Order, response_class=FastJSONResponse)
 async def mark_order_as_paid(
     order_id: int,
     payment_method: str,
     status: str = None,
     db: Session = Depends(get_db),
+    restaurant: Restaurant = Depends(get_current_restaurant),
     current_user = Depends(get_current_active_user)
 ) -> Order:
     """
     Mark an order as paid and create a cash register transaction.
-    Optionally update the order status (e.g., from 'ready' to 'completed').
+    Optionally update the order status (e.g., from 'ready' to 'completed');
+    without a status, or with an unknown one, the order keeps its status.
     """
-    # Get the order
-    db_order = db.query(OrderModel).filter(OrderModel.id == order_id).first()
-    if not db_order:
-        raise ResourceNotFoundError("Order", order_id)
-
-    if db_order.is_paid:
-        raise ConflictError("Order is already paid", resource="Order")
-
-    # Validate payment method
-    from ...schemas.order import PaymentMethod
-    try:
-        payment_method_enum = PaymentMethod(payment_method.lower())
-    except ValueError:
-        raise ValidationError(
-            f"Invalid payment method. Must be one of: {', '.join([pm.value for pm in PaymentMethod])}",
-            field="payment_method"
-        )
+    # Orders paid up front stay in the kitchen flow: clients only send a
+    # status to complete them, and an unknown status has always been ignored
+    if status and status.lower() not in {order_status.value for order_status in OrderStatus}:
+        status = None
+    process_order_payment(
+        db,
+        order_id=order_id,
+        payment_method=payment_method.lower(),
+        user_id=current_user.id,
+        restaurant_id=restaurant.id,
+        status=status,
+        default_status=None
+    )
+    return FastJSONResponse(get_order(db, order_id, restaurant.id))
 
-    try:
-        # Create cash register transaction with payment method
-        create_transaction_from_order(
-            db=db,
-            order_id=order_id,
-            created_by_user_id=current_user.id,
-            payment_method=payment_method
-        )
 
-        # Mark order as paid
-        db_order.is_paid = True
-        db_order.payment_method = payment_method_enum
-        
-        # Update status if provided (e.g., from 'ready' to 'completed')
-        if status:
-            try:
-                new_status = OrderStatus(status.lower())
-                db_order.status = new_status
-                
-                # If changing to completed, free the table if it's a dine-in order
-                if new_status == OrderStatus.COMPLETED and db_order.table_id:
-                    from ...models.table import Table as TableModel
-                    table = db.query(TableModel).filter(TableModel.id == db_order.table_id).first()
-                    if table:
-                        # Check if there are other active orders for this table
-                        other_active_orders = db.query(OrderModel).filter(
-                            OrderModel.table_id == db_order.table_id,
-                            OrderModel.id != order_id,
-                            OrderModel.status.in_([OrderStatus.PENDING, OrderStatus.PREPARING, OrderStatus.READY]),
-                            OrderModel.is_paid == False
-                        ).count()
-                        
-                        # Only mark as available if no other active orders
-                        if other_active_orders == 0:
-                            table.status = "available"
-                            table.current_order_id = None
-            except ValueError:
-                # Invalid status, just ignore and keep current status
-                pass
+# -----------------------------
+# Order Item Extras Endpoints
+# -----------------------------
 
-        db.commit()
-        db.refresh(db_order)  # Refresh to get updated timestamps
+def _get_order_item_for_extras(db: Session, restaurant: Restaurant, order_id: int, item_id: int) -> OrderItemModel:
+    """Load a live item of one of the restaurant's live orders, or raise 404."""
+    db_order_id = db.query(OrderModel.id).filter(
+        OrderModel.id == order_id,
+        OrderModel.restaurant_id == restaurant.id,
+        OrderModel.deleted_at.is_(None)
+    ).scalar()
+    if db_order_id is None:
+        raise ResourceNotFoundError("Order", order_id)
 
-        return get_order(db, order_id, db_order.restaurant_id)
+    db_item = db.query(OrderItemModel).filter(
+        OrderItemModel.id == item_id,
+        OrderItemModel.order_id == order_id,
+        OrderItemModel.deleted_at.is_(None)
+    ).first()
+    if not db_item:
+        raise ResourceNotFoundError("OrderItem", item_id)
+    return db_item
 
-    except ValueError as e:
-        raise ValidationError(str(e))
-    except Exception as e:
-        db.rollback()
-        raise DatabaseError(f"Error processing payment: {str(e)}", operation="update")
 
+def _get_item_extra(db: Session, item_id: int, extra_id: int):
+    db_extra = get_extra_by_id(db, extra_id)
+    if not db_extra or db_extra.order_item_id != item_id:
+        raise ResourceNotFoundError("OrderItemExtra", extra_id)
+    return db_extra
 
-# -----------------------------
-# Order Item Extras Endpoints
-# -----------------------------
 
 @router.post("/{order_id}/items/{item_id}/extras", response_model=OrderItemExtra, status_code=status.HTTP_201_CREATED)
 async def add_extra_to_order_item(
@@ -493,47 +509,8 @@ async def add_extra_to_order_item(
     """
     Add an extra (e.g., extra tortillas, extra guacamole) to an order item.
     """
-    from ...models.order_item_extra import OrderItemExtra as OrderItemExtraModel
-    from datetime import datetime, timezone
-    
-    # Verify order exists and belongs to restaurant
-    db_order = db.query(OrderModel).filter(
-        OrderModel.id == order_id,
-        OrderModel.restaurant_id == restaurant.id,
-        OrderModel.deleted_at.is_(None)
-    ).first()
-    if not db_order:
-        raise ResourceNotFoundError("Order", order_id)
-    
-    # Verify order item exists and belongs to the order
-    db_item = db.query(OrderItemModel).filter(
-        OrderItemModel.id == item_id,
-        OrderItemModel.order_id == order_id,
-        OrderItemModel.deleted_at.is_(None)
-    ).first()
-    if not db_item:
-        raise ResourceNotFoundError("OrderItem", item_id)
-    
-    # Create the extra
-    db_extra = OrderItemExtraModel(
-        order_item_id=item_id,
-        name=extra.name,
-        price=extra.price,
-        quantity=extra.quantity,
-        created_at=datetime.now(timezone.utc),
-        updated_at=datetime.now(timezone.utc)
-    )
-    db.add(db_extra)
-    
-    # Update order total
-    extra_total = extra.price * extra.quantity
-    db_order.total_amount = (db_order.total_amount or 0) + extra_total
-    db_order.updated_at = datetime.now(timezone.utc)
-    
-    db.commit()
-    db.refresh(db_extra)
-    
-    return db_extra
+    _get_order_item_for_extras(db, restaurant, order_id, item_id)
+    return add_extra_to_item(db, order_item_id=item_id, extra=extra)
 
 
 @router.get("/{order_id}/items/{item_id}/extras", response_model=List[OrderItemExtra])
@@ -546,32 +523,8 @@ async def get_order_item_extras(
     """
     Get all extras for a specific order item.
     """
-    from ...models.order_item_extra import OrderItemExtra as OrderItemExtraModel
-    
-    # Verify order exists and belongs to restaurant
-    db_order = db.query(OrderModel).filter(
-        OrderModel.id == order_id,
-        OrderModel.restaurant_id == restaurant.id,
-        OrderModel.deleted_at.is_(None)
-    ).first()
-    if not db_order:
-        raise ResourceNotFoundError("Order", order_id)
-    
-    # Verify order item exists
-    db_item = db.query(OrderItemModel).filter(
-        OrderItemModel.id == item_id,
-        OrderItemModel.order_id == order_id,
-        OrderItemModel.deleted_at.is_(None)
-    ).first()
-    if not db_item:
-        raise ResourceNotFoundError("OrderItem", item_id)
-    
-    # Get all extras for this item
-    extras = db.query(OrderItemExtraModel).filter(
-        OrderItemExtraModel.order_item_id == item_id
-    ).all()
-    
-    return extras
+    _get_order_item_for_extras(db, restaurant, order_id, item_id)
+    return get_item_extras(db, order_item_id=item_id)
 
 
 @router.put("/{order_id}/items/{item_id}/extras/{extra_id}", response_model=OrderItemExtra)
@@ -586,45 +539,9 @@ async def update_order_item_extra(
     """
     Update an extra on an order item.
     """
-    from ...models.order_item_extra import OrderItemExtra as OrderItemExtraModel
-    from datetime import datetime, timezone
-    
-    # Verify order exists and belongs to restaurant
-    db_order = db.query(OrderModel).filter(
-        OrderModel.id == order_id,
-        OrderModel.restaurant_id == restaurant.id,
-        OrderModel.deleted_at.is_(None)
-    ).first()
-    if not db_order:
-        raise ResourceNotFoundError("Order", order_id)
-    
-    # Verify extra exists
-    db_extra = db.query(OrderItemExtraModel).filter(
-        OrderItemExtraModel.id == extra_id,
-        OrderItemExtraModel.order_item_id == item_id
-    ).first()
-    if not db_extra:
-        raise ResourceNotFoundError("OrderItemExtra", extra_id)
-    
-    # Calculate old total for this extra
-    old_total = db_extra.price * db_extra.quantity
-    
-    # Update fields
-    update_data = extra_update.dict(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(db_extra, field, value)
-    
-    db_extra.updated_at = datetime.now(timezone.utc)
-    
-    # Calculate new total and update order
-    new_total = db_extra.price * db_extra.quantity
-    db_order.total_amount = (db_order.total_amount or 0) - old_total + new_total
-    db_order.updated_at = datetime.now(timezone.utc)
-    
-    db.commit()
-    db.refresh(db_extra)
-    
-    return db_extra
+    _get_order_item_for_extras(db, restaurant, order_id, item_id)
+    db_extra = _get_item_extra(db, item_id, extra_id)
+    return update_item_extra(db, db_extra=db_extra, extra=extra_update)
 
 
 @router.delete("/{order_id}/items/{item_id}/extras/{extra_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -638,33 +555,8 @@ async def delete_order_item_extra(
     """
     Delete an extra from an order item.
     """
-    from ...models.order_item_extra import OrderItemExtra as OrderItemExtraModel
-    from datetime import datetime, timezone
-    
-    # Verify order exists and belongs to restaurant
-    db_order = db.query(OrderModel).filter(
-        OrderModel.id == order_id,
-        OrderModel.restaurant_id == restaurant.id,
-        OrderModel.deleted_at.is_(None)
-    ).first()
-    if not db_order:
-        raise ResourceNotFoundError("Order", order_id)
-    
-    # Verify extra exists
-    db_extra = db.query(OrderItemExtraModel).filter(
-        OrderItemExtraModel.id == extra_id,
-        OrderItemExtraModel.order_item_id == item_id
-    ).first()
-    if not db_extra:
-        raise ResourceNotFoundError("OrderItemExtra", extra_id)
-    
-    # Update order total
-    extra_total = db_extra.price * db_extra.quantity
-    db_order.total_amount = (db_order.total_amount or 0) - extra_total
-    db_order.updated_at = datetime.now(timezone.utc)
-    
-    # Delete the extra
-    db.delete(db_extra)
-    db.commit()
+    _get_order_item_for_extras(db, restaurant, order_id, item_id)
+    db_extra = _get_item_extra(db, item_id, extra_id)
+    delete_item_extra(db, db_extra=db_extra)
     
     return None
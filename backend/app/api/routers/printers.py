@@ -16,13 +16,24 @@ from app.schemas.printer import (
     PrinterListResponse,
     PrinterCategoryAssignment
 )
+from app.models.restaurant import Restaurant
 from app.services import printer as printer_service
-from app.core.exceptions import ResourceNotFoundError
+from app.services.orders import get_order
+from app.services.printing import (
+    PrintJob,
+    get_routing_table,
+    order_print_jobs,
+    print_spooler,
+    render_test_page,
+)
+from app.core.exceptions import ResourceNotFoundError, ValidationError
+from app.core.response_cache import cached_response
 
 router = APIRouter(prefix="/printers", tags=["printers"])
 
 
 @router.get("/", response_model=PrinterListResponse)
+@cached_response(tags=("printers", "menu"))
 def get_printers(
     printer_type: Optional[PrinterType] = None,
     is_active: Optional[bool] = None,
@@ -172,3 +183,63 @@ def assign_categories(
     )
     
     return PrinterResponse.from_printer(printer)
+
+
+@router.get("/spooler/status")
+def get_spooler_status(
+    current_user: User = Depends(get_current_user_with_restaurant),
+    db: Session = Depends(get_db)
+):
+    """Queue depth and delivery counters of this restaurant's network printers"""
+    table = get_routing_table(db, current_user.restaurant_id)
+    stats = print_spooler.stats()
+    return {
+        "printers": [
+            {
+                "id": target.id,
+                "name": target.name,
+                "address": f"{target.host}:{target.port}",
+                **stats.get(f"{target.host}:{target.port}", {"queued": 0}),
+            }
+            for target in table.printers.values()
+        ]
+    }
+
+
+@router.post("/{printer_id}/test", status_code=status.HTTP_202_ACCEPTED)
+async def print_test_page(
+    printer_id: int,
+    current_user: User = Depends(get_current_user_with_restaurant),
+    db: Session = Depends(get_db)
+):
+    """Queue a test page on a network printer"""
+    target = get_routing_table(db, current_user.restaurant_id).printers.get(printer_id)
+    if not target:
+        printer = printer_service.get_printer_by_id(db, printer_id, current_user.restaurant_id)
+        if not printer:
+            raise ResourceNotFoundError("Printer", printer_id)
+        raise ValidationError("Only active network printers with an IP address can print from the server")
+    
+    print_spooler.submit_nowait(
+        PrintJob(target, render_test_page(target.name, target.paper_width), "test page")
+    )
+    return {"queued": 1}
+
+
+@router.post("/orders/{order_id}/print", status_code=status.HTTP_202_ACCEPTED)
+async def print_order_tickets(
+    order_id: int,
+    current_user: User = Depends(get_current_user_with_restaurant),
+    db: Session = Depends(get_db)
+):
+    """Queue an order's kitchen tickets on the printers its categories route to"""
+    order = get_order(db, order_id=order_id, restaurant_id=current_user.restaurant_id)
+    if not order:
+        raise ResourceNotFoundError("Order", order_id)
+    
+    restaurant = db.get(Restaurant, current_user.restaurant_id)
+    jobs = order_print_jobs(db, restaurant, order)
+    for job in jobs:
+        print_spooler.submit_nowait(job)
+    
+    return {"queued": len(jobs), "printers": [job.printer.name for job in jobs]}
@@ -1,18 +1,20 @@
 from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from sqlalchemy.orm import Session
 from sqlalchemy import func, desc
-from typing import List, Optional
-from datetime import datetime, timedelta, timezone
+from typing import List, Optional, Tuple
+from datetime import date, datetime, timedelta, timezone
 from enum import Enum
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
-from ...db.base import get_db
+from ...db.base import get_read_db
 from ...models.order import Order, OrderStatus, PaymentMethod
 from ...models.order_item import OrderItem
 from ...models.menu import MenuItem, Category
 from ...models.cash_register import CashRegisterSession, SessionStatus
 from ...models.restaurant import Restaurant
 from ...services.user import get_current_active_user
-from ...models.user import User
+from ...services import analytics
+from ...models.user import User, UserRole
 from ...core.dependencies import get_current_restaurant, require_admin_or_sysadmin
 
 router = APIRouter(
@@ -39,7 +41,7 @@ async def get_top_products(
     end_date: Optional[str] = Query(None, description="End date (YYYY-MM-DD)"),
     category_id: Optional[int] = Query(None, description="Filter by category"),
     limit: int = Query(10, ge=1, le=50, description="Number of top products to return"),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(require_admin_or_sysadmin),
     restaurant: Restaurant = Depends(get_current_restaurant)
 ):
@@ -132,7 +134,7 @@ async def get_dashboard_summary(
     period: PeriodType = Query(PeriodType.TODAY, description="Period type"),
     start_date: Optional[str] = Query(None, description="Custom start date (YYYY-MM-DD)"),
     end_date: Optional[str] = Query(None, description="Custom end date (YYYY-MM-DD)"),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(require_admin_or_sysadmin),
     restaurant: Restaurant = Depends(get_current_restaurant)
 ):
@@ -303,7 +305,7 @@ async def get_dashboard_summary(
 @router.get("/sales-trend")
 async def get_sales_trend(
     days: int = Query(7, ge=1, le=90, description="Number of days to analyze"),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(require_admin_or_sysadmin),
     restaurant: Restaurant = Depends(get_current_restaurant)
 ):
@@ -353,3 +355,272 @@ async def get_sales_trend(
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error generating sales trend: {str(e)}")
+
+
+# -----------------------------
+# Demand Analytics
+# -----------------------------
+
+# Longest range the demand views accept, in days
+MAX_DEMAND_DAYS = 366
+
+
+def _demand_columns(
+    db: Session,
+    restaurant: Restaurant,
+    start_date: Optional[str],
+    end_date: Optional[str],
+    default_days: int
+) -> analytics.DemandColumns:
+    """Parse a local date range (defaulting to the last days up to today) and load its columns."""
+    try:
+        tz = ZoneInfo(restaurant.timezone)
+    except (ZoneInfoNotFoundError, ValueError, TypeError):
+        tz = timezone.utc
+    today = datetime.now(tz).date()
+    try:
+        end = date.fromisoformat(end_date) if end_date else today
+        start = date.fromisoformat(start_date) if start_date else end - timedelta(days=default_days - 1)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid date format. Use YYYY-MM-DD: {str(e)}")
+    if start > end:
+        raise HTTPException(status_code=400, detail="start_date must be on or before end_date")
+    if (end - start).days >= MAX_DEMAND_DAYS:
+        raise HTTPException(status_code=400, detail=f"Date range cannot exceed {MAX_DEMAND_DAYS} days")
+
+    return analytics.load_demand_columns(db, restaurant.id, start, end, restaurant.timezone, today=today)
+
+
+def _demand_period(columns: analytics.DemandColumns, restaurant: Restaurant) -> dict:
+    return {
+        "start_date": columns.start.isoformat(),
+        "end_date": columns.end.isoformat(),
+        "days": columns.days,
+        "timezone": restaurant.timezone,
+    }
+
+
+@router.get("/demand/heatmap")
+def get_demand_heatmap(
+    start_date: Optional[str] = Query(None, description="First local day (YYYY-MM-DD)"),
+    end_date: Optional[str] = Query(None, description="Last local day (YYYY-MM-DD), defaults to today"),
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(require_admin_or_sysadmin),
+    restaurant: Restaurant = Depends(get_current_restaurant)
+):
+    """
+    Get paid orders and revenue by weekday and hour, in the restaurant's time zone.
+
+    Defaults to the last 4 weeks. Useful for staffing.
+    """
+    columns = _demand_columns(db, restaurant, start_date, end_date, default_days=28)
+    return {
+        "period": _demand_period(columns, restaurant),
+        **analytics.hourly_heatmap(columns),
+    }
+
+
+@router.get("/demand/trend")
+def get_demand_trend(
+    start_date: Optional[str] = Query(None, description="First local day (YYYY-MM-DD)"),
+    end_date: Optional[str] = Query(None, description="Last local day (YYYY-MM-DD), defaults to today"),
+    window: int = Query(7, ge=1, le=90, description="Rolling average window in days"),
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(require_admin_or_sysadmin),
+    restaurant: Restaurant = Depends(get_current_restaurant)
+):
+    """
+    Get daily sales per local day with rolling averages.
+
+    Defaults to the last 90 days. Days without sales are included.
+    """
+    columns = _demand_columns(db, restaurant, start_date, end_date, default_days=90)
+    return {
+        "period": _demand_period(columns, restaurant),
+        "window": window,
+        "trend": analytics.daily_trend(columns, window=window),
+    }
+
+
+@router.get("/demand/items")
+def get_item_velocity(
+    start_date: Optional[str] = Query(None, description="First local day (YYYY-MM-DD)"),
+    end_date: Optional[str] = Query(None, description="Last local day (YYYY-MM-DD), defaults to today"),
+    limit: int = Query(50, ge=1, le=500, description="Number of items to return"),
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(require_admin_or_sysadmin),
+    restaurant: Restaurant = Depends(get_current_restaurant)
+):
+    """
+    Get how fast each menu item sells: units per day, selling days and peak hour.
+
+    Defaults to the last 4 weeks. Useful for prep planning.
+    """
+    columns = _demand_columns(db, restaurant, start_date, end_date, default_days=28)
+    items = analytics.item_velocity(columns, limit=limit)
+
+    names = dict(
+        db.query(MenuItem.id, MenuItem.name)
+        .filter(MenuItem.id.in_([item["menu_item_id"] for item in items]))
+        .all()
+    ) if items else {}
+    for item in items:
+        item["name"] = names.get(item["menu_item_id"])
+
+    return {
+        "period": _demand_period(columns, restaurant),
+        "items": items,
+    }
+
+
+# -----------------------------
+# Consolidated Branch Reports
+# -----------------------------
+
+# Longest custom range the consolidated views accept, in days
+MAX_CONSOLIDATED_DAYS = 366
+
+
+def get_report_branch_ids(
+    restaurant_ids: Optional[List[int]] = Query(None, description="Branches to include (defaults to the whole chain)"),
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(require_admin_or_sysadmin),
+    restaurant: Restaurant = Depends(get_current_restaurant)
+) -> List[int]:
+    """
+    Resolve the restaurants a consolidated report covers.
+
+    Admins get their chain (headquarters and branches) or a subset of it,
+    and need a plan with multi-branch reporting. Sysadmins may pass any IDs.
+    """
+    if current_user.role == UserRole.SYSADMIN and restaurant_ids:
+        return list(dict.fromkeys(restaurant_ids))
+    if current_user.role != UserRole.SYSADMIN and not analytics.has_multi_branch(db, restaurant):
+        raise HTTPException(
+            status_code=403,
+            detail="Feature not available: 'multi_branch' is not included in your current plan. Please upgrade your plan to access this feature."
+        )
+
+    chain = analytics.get_branch_ids(db, restaurant)
+    if not restaurant_ids:
+        return chain
+    outside = set(restaurant_ids) - set(chain)
+    if outside:
+        raise HTTPException(status_code=403, detail=f"Restaurants {sorted(outside)} are not branches of this chain")
+    return [branch_id for branch_id in chain if branch_id in set(restaurant_ids)]
+
+
+def _consolidated_range(period: PeriodType, start_date: Optional[str], end_date: Optional[str]) -> Tuple[datetime, datetime]:
+    """Whole UTC days covered by a period, as [start, end), so repeated calls share a cache entry."""
+    today = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+    tomorrow = today + timedelta(days=1)
+    if period == PeriodType.TODAY:
+        return today, tomorrow
+    if period == PeriodType.WEEK:
+        return today - timedelta(days=6), tomorrow
+    if period == PeriodType.MONTH:
+        return today - timedelta(days=29), tomorrow
+
+    if not start_date or not end_date:
+        raise HTTPException(status_code=400, detail="Custom period requires start_date and end_date")
+    try:
+        start = date.fromisoformat(start_date)
+        end = date.fromisoformat(end_date)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid date format. Use YYYY-MM-DD: {str(e)}")
+    if start > end:
+        raise HTTPException(status_code=400, detail="start_date must be on or before end_date")
+    if (end - start).days >= MAX_CONSOLIDATED_DAYS:
+        raise HTTPException(status_code=400, detail=f"Date range cannot exceed {MAX_CONSOLIDATED_DAYS} days")
+    start_datetime = datetime.combine(start, datetime.min.time(), tzinfo=timezone.utc)
+    return start_datetime, datetime.combine(end, datetime.min.time(), tzinfo=timezone.utc) + timedelta(days=1)
+
+
+def _consolidated_period(period: PeriodType, start: datetime, end: datetime) -> dict:
+    return {
+        "type": period.value,
+        "start_date": start.date().isoformat(),
+        "end_date": (end - timedelta(days=1)).date().isoformat(),
+        "start_datetime": start.isoformat(),
+        "end_datetime": end.isoformat(),
+    }
+
+
+@router.get("/branches/sales")
+def get_consolidated_sales(
+    period: PeriodType = Query(PeriodType.TODAY, description="Period type"),
+    start_date: Optional[str] = Query(None, description="Custom start date (YYYY-MM-DD)"),
+    end_date: Optional[str] = Query(None, description="Custom end date (YYYY-MM-DD)"),
+    branch_ids: List[int] = Depends(get_report_branch_ids),
+    db: Session = Depends(get_read_db)
+):
+    """
+    Get total sales, tickets and average ticket for each branch of the chain and in total.
+    """
+    start, end = _consolidated_range(period, start_date, end_date)
+    return {
+        "period": _consolidated_period(period, start, end),
+        "restaurant_ids": branch_ids,
+        **analytics.consolidated_sales(db, branch_ids, start, end),
+    }
+
+
+@router.get("/branches/top-products")
+def get_consolidated_top_products(
+    period: PeriodType = Query(PeriodType.TODAY, description="Period type"),
+    start_date: Optional[str] = Query(None, description="Custom start date (YYYY-MM-DD)"),
+    end_date: Optional[str] = Query(None, description="Custom end date (YYYY-MM-DD)"),
+    limit: int = Query(10, ge=1, le=50, description="Number of top products per branch and in total"),
+    branch_ids: List[int] = Depends(get_report_branch_ids),
+    db: Session = Depends(get_read_db)
+):
+    """
+    Get the best-selling products of each branch and of the whole chain.
+
+    Products are matched across branches by name.
+    """
+    start, end = _consolidated_range(period, start_date, end_date)
+    return {
+        "period": _consolidated_period(period, start, end),
+        "restaurant_ids": branch_ids,
+        **analytics.consolidated_top_products(db, branch_ids, start, end, limit=limit),
+    }
+
+
+@router.get("/branches/payment-mix")
+def get_consolidated_payment_mix(
+    period: PeriodType = Query(PeriodType.TODAY, description="Period type"),
+    start_date: Optional[str] = Query(None, description="Custom start date (YYYY-MM-DD)"),
+    end_date: Optional[str] = Query(None, description="Custom end date (YYYY-MM-DD)"),
+    branch_ids: List[int] = Depends(get_report_branch_ids),
+    db: Session = Depends(get_read_db)
+):
+    """
+    Get sales by payment method for each branch and in total.
+    """
+    start, end = _consolidated_range(period, start_date, end_date)
+    return {
+        "period": _consolidated_period(period, start, end),
+        "restaurant_ids": branch_ids,
+        **analytics.consolidated_payment_mix(db, branch_ids, start, end),
+    }
+
+
+@router.get("/branches/cash-sessions")
+def get_consolidated_cash_sessions(
+    period: PeriodType = Query(PeriodType.TODAY, description="Period type"),
+    start_date: Optional[str] = Query(None, description="Custom start date (YYYY-MM-DD)"),
+    end_date: Optional[str] = Query(None, description="Custom end date (YYYY-MM-DD)"),
+    branch_ids: List[int] = Depends(get_report_branch_ids),
+    db: Session = Depends(get_read_db)
+):
+    """
+    Get cash register sessions opened in the period: open and closed counts,
+    cash collected and cash differences, for each branch and in total.
+    """
+    start, end = _consolidated_range(period, start_date, end_date)
+    return {
+        "period": _consolidated_period(period, start, end),
+        "restaurant_ids": branch_ids,
+        **analytics.consolidated_cash_sessions(db, branch_ids, start, end),
+    }
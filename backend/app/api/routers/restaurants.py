@@ -1,22 +1,30 @@
+import asyncio
+
 from fastapi import APIRouter, Depends, status, Request
 from sqlalchemy.orm import Session
 from sqlalchemy import func, case
 from typing import List, Dict, Any
 from datetime import datetime, timedelta
 
-from ...db.base import get_db
+from ...db.base import get_db, get_read_db
 from ...models.restaurant import Restaurant as RestaurantModel
 from ...models.user import User, UserRole, User as UserModel
 from ...models.restaurant_subscription import RestaurantSubscription, SubscriptionStatus
 from ...models.order import Order, OrderStatus
 from ...models.subscription_plan import SubscriptionPlan
-from ...schemas.restaurant import Restaurant, RestaurantCreate, RestaurantUpdate, RestaurantPublic, RestaurantCreationResponse
+from ...schemas.restaurant import (
+    Restaurant, RestaurantCreate, RestaurantUpdate, RestaurantPublic, RestaurantCreationResponse,
+    RestaurantBulkCreate, RestaurantBulkCreationResponse,
+)
 from ...schemas.user import UserCreate
 from ...services.user import get_current_active_user, create_user
+from ...services.platform_metrics import get_platform_metrics
+from ...services.provisioning import provision_restaurants
 from ...middleware.restaurant import get_restaurant_from_request
 from ...core.config import settings
 from ...core.exceptions import ConflictError, ForbiddenError, ResourceNotFoundError, DatabaseError
 from ...core.dependencies import get_current_user_with_restaurant
+from ...core.response_cache import cached_response
 
 router = APIRouter(
     prefix="/restaurants",
@@ -32,12 +40,14 @@ def require_sysadmin(current_user: User = Depends(get_current_active_user)) -> U
 
 
 @router.get("/current", response_model=RestaurantPublic)
+@cached_response(tags=("restaurant",))
 async def get_current_restaurant(request: Request):
     """
     Get the current restaurant based on subdomain.
     This endpoint is public and doesn't require authentication.
     """
-    restaurant = await get_restaurant_from_request(request)
+    # Usually already resolved by RestaurantMiddleware
+    restaurant = getattr(request.state, "restaurant", None) or await get_restaurant_from_request(request)
     
     if not restaurant:
         raise ResourceNotFoundError("Restaurant", "subdomain")
@@ -406,6 +416,24 @@ Tu {business_name} "{db_restaurant.name}" ha sido creado exitosamente.
     )
 
 
+@router.post("/bulk", response_model=RestaurantBulkCreationResponse)
+async def bulk_create_restaurants(
+    payload: RestaurantBulkCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_sysadmin)
+):
+    """
+    Provision many branches at once (sysadmin only).
+    Each branch gets the same setup as POST /restaurants: a trial or paid
+    subscription and an admin user. Optionally clones the menu of
+    menu_template_restaurant_id into every branch.
+    Returns one result per branch, in request order; failed branches carry
+    the reason and do not affect the others.
+    """
+    # Password hashing and the chunked commits block: keep them off the event loop
+    return await asyncio.to_thread(provision_restaurants, db, payload)
+
+
 @router.put("/{restaurant_id}", response_model=Restaurant)
 async def update_restaurant(
     restaurant_id: int,
@@ -527,117 +555,42 @@ async def delete_restaurant(
 
 @router.get("/stats/global", response_model=Dict[str, Any])
 async def get_global_stats(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(require_sysadmin)
 ):
     """
     Get global system statistics (sysadmin only).
-    Returns overview of all restaurants, subscriptions, users, and revenue.
+    Returns overview of all restaurants, subscriptions, users, and revenue,
+    served from the platform metrics snapshot refreshed in the background.
     """
-    # Total restaurants
-    total_restaurants = db.query(func.count(RestaurantModel.id)).scalar()
-    
-    # Active restaurants (with active subscription)
-    active_restaurants = db.query(func.count(func.distinct(RestaurantModel.id))).join(
-        RestaurantSubscription,
-        RestaurantModel.id == RestaurantSubscription.restaurant_id
-    ).filter(
-        RestaurantSubscription.status == SubscriptionStatus.ACTIVE
-    ).scalar()
-    
-    # Trial restaurants
-    trial_restaurants = db.query(func.count(func.distinct(RestaurantModel.id))).join(
-        RestaurantSubscription,
-        RestaurantModel.id == RestaurantSubscription.restaurant_id
-    ).filter(
-        RestaurantSubscription.status == SubscriptionStatus.TRIAL
-    ).scalar()
-    
-    # Expired/Cancelled restaurants (suspended)
-    suspended_restaurants = db.query(func.count(func.distinct(RestaurantModel.id))).join(
-        RestaurantSubscription,
-        RestaurantModel.id == RestaurantSubscription.restaurant_id
-    ).filter(
-        RestaurantSubscription.status.in_([SubscriptionStatus.EXPIRED, SubscriptionStatus.CANCELLED])
-    ).scalar()
-    
-    # Total users by role
-    total_users = db.query(func.count(UserModel.id)).scalar()
-    admin_users = db.query(func.count(UserModel.id)).filter(UserModel.role == UserRole.ADMIN).scalar()
-    staff_users = db.query(func.count(UserModel.id)).filter(UserModel.role == UserRole.STAFF).scalar()
-    
-    # Monthly Recurring Revenue (MRR)
-    # Sum total_price for monthly subscriptions, or total_price/12 for annual
-    mrr_monthly = db.query(func.sum(RestaurantSubscription.total_price)).filter(
-        RestaurantSubscription.status.in_([SubscriptionStatus.ACTIVE, SubscriptionStatus.TRIAL]),
-        RestaurantSubscription.billing_cycle == 'monthly'
-    ).scalar() or 0
-    
-    mrr_annual = db.query(func.sum(RestaurantSubscription.total_price)).filter(
-        RestaurantSubscription.status.in_([SubscriptionStatus.ACTIVE, SubscriptionStatus.TRIAL]),
-        RestaurantSubscription.billing_cycle == 'annual'
-    ).scalar() or 0
-    
-    # Convert annual to monthly (divide by 12)
-    mrr = mrr_monthly + (mrr_annual / 12)
-    
-    # Pending payments (subscriptions expiring in next 7 days)
-    next_week = datetime.utcnow() + timedelta(days=7)
-    pending_payments = db.query(func.count(RestaurantSubscription.id)).filter(
-        RestaurantSubscription.current_period_end <= next_week,
-        RestaurantSubscription.status.in_([SubscriptionStatus.ACTIVE, SubscriptionStatus.TRIAL])
-    ).scalar()
-    
-    # Recent activity (restaurants created in last 30 days)
-    thirty_days_ago = datetime.utcnow() - timedelta(days=30)
-    new_restaurants_30d = db.query(func.count(RestaurantModel.id)).filter(
-        RestaurantModel.created_at >= thirty_days_ago
-    ).scalar()
-    
-    # Total orders across all restaurants (last 30 days)
-    total_orders_30d = db.query(func.count(Order.id)).filter(
-        Order.created_at >= thirty_days_ago
-    ).scalar()
-    
-    # Revenue from completed orders (last 30 days)
-    revenue_30d = db.query(func.sum(Order.total_amount)).filter(
-        Order.created_at >= thirty_days_ago,
-        Order.status == OrderStatus.COMPLETED
-    ).scalar() or 0
-    
-    # Subscription distribution by plan
-    subscription_distribution = db.query(
-        SubscriptionPlan.name,
-        func.count(RestaurantSubscription.id).label('count')
-    ).join(
-        RestaurantSubscription,
-        SubscriptionPlan.id == RestaurantSubscription.plan_id
-    ).filter(
-        RestaurantSubscription.status.in_([SubscriptionStatus.ACTIVE, SubscriptionStatus.TRIAL])
-    ).group_by(SubscriptionPlan.name).all()
-    
-    plan_distribution = {plan: count for plan, count in subscription_distribution}
+    metrics = get_platform_metrics(db, max_age_seconds=2 * settings.PLATFORM_METRICS_REFRESH_SECONDS)
+    by_status = metrics.restaurants_by_status
+    
+    plan_distribution = {}
+    for plan in metrics.plans:
+        plan_distribution[plan.name] = plan_distribution.get(plan.name, 0) + plan.subscriptions
     
     return {
         "restaurants": {
-            "total": total_restaurants,
-            "active": active_restaurants,
-            "trial": trial_restaurants,
-            "suspended": suspended_restaurants,
-            "new_last_30_days": new_restaurants_30d
+            "total": metrics.total_restaurants,
+            "active": by_status[SubscriptionStatus.ACTIVE.value],
+            "trial": by_status[SubscriptionStatus.TRIAL.value],
+            "suspended": metrics.suspended_restaurants,
+            "new_last_30_days": metrics.new_restaurants_30d
         },
         "users": {
-            "total": total_users,
-            "admins": admin_users,
-            "staff": staff_users
+            "total": metrics.total_users,
+            "admins": metrics.admin_users,
+            "staff": metrics.staff_users
         },
         "revenue": {
-            "mrr": float(mrr),
-            "revenue_30d": float(revenue_30d),
-            "pending_payments": pending_payments
+            "mrr": metrics.mrr,
+            "revenue_30d": metrics.revenue_30d,
+            "pending_payments": metrics.pending_payments
         },
         "activity": {
-            "orders_30d": total_orders_30d
+            "orders_30d": metrics.orders_30d
         },
-        "subscription_distribution": plan_distribution
+        "subscription_distribution": plan_distribution,
+        "computed_at": metrics.computed_at.isoformat()
     }
@@ -68,12 +68,13 @@ async def get_top_special_notes(
 @router.post("/record", response_model=TrackNoteResponse)
 async def record_special_note(
     request: TrackNoteRequest,
+    db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user),
     restaurant: Restaurant = Depends(get_current_restaurant)
 ):
     """
     Record usage of a special note for statistics.
-    Updates are batched for performance (actual DB write happens in background).
+    The count is updated in the background by the outbox worker.
     
     Args:
         request: Request containing the note text to track
@@ -84,8 +85,8 @@ async def record_special_note(
         Response indicating success or failure
     """
     try:
-        # Async tracking - accumulates in memory
-        SpecialNotesService.track_note_async(restaurant.id, request.note_text)
+        # Counted by the outbox worker after commit
+        SpecialNotesService.track_note(db, restaurant.id, request.note_text)
         return TrackNoteResponse(success=True)
     except Exception as e:
         logger.error(f"Error recording special note: {str(e)}")
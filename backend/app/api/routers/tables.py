@@ -12,6 +12,7 @@ from ...models.restaurant import Restaurant
 from ...core.dependencies import get_current_restaurant, require_admin_or_sysadmin, require_staff_or_admin, get_current_user_with_active_subscription
 from ...services.user import get_current_active_user, UserRole
 from ...core.exceptions import ResourceNotFoundError, ConflictError, ValidationError
+from ...core.response_cache import cached_response
 from ...middleware.subscription_limits import SubscriptionLimitsMiddleware
 
 router = APIRouter(
@@ -22,6 +23,7 @@ router = APIRouter(
 )
 
 @router.get("/", response_model=List[Table])
+@cached_response(tags=("tables",))
 async def read_tables(
     skip: int = 0, 
     limit: int = 100,
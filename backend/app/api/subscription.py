@@ -2,7 +2,7 @@
 Subscription API endpoints for restaurant users.
 Allows restaurants to view their subscription, usage, and upgrade options.
 """
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
 from typing import Dict, Any
 
@@ -23,8 +23,9 @@ from app.services.alert_service import AlertService
 from app.api.deps import get_current_user, get_current_restaurant, require_admin_or_sysadmin
 from app.services.user import get_current_active_user
 from app.schemas.payment import RenewalRequest, RenewalResponse, PaymentSubmit, PaymentResponse
-from app.schemas.alert import AlertResponse, AlertMarkRead
+from app.schemas.alert import AlertResponse, AlertMarkRead, AlertUnreadCount
 from app.core.operation_modes import OperationMode, get_mode_config
+from app.core.response_cache import cached_response
 
 router = APIRouter(prefix="/subscriptions", tags=["subscriptions"])
 
@@ -52,14 +53,7 @@ def get_my_subscription(
     # Check and auto-update expiration status
     subscription.update_status(db)
     
-    # Check for expiring subscriptions and create alerts if needed
-    try:
-        from app.services.alert_service import AlertService
-        alert_service = AlertService(db)
-        alert_service.check_expiring_subscriptions()
-    except Exception as e:
-        # Log error but don't fail the request
-        print(f"Warning: Could not check expiring subscriptions: {e}")
+    # Expiring-soon alerts are created by the scheduled job in services/jobs.py
     
     return {
         "has_subscription": True,
@@ -173,6 +167,7 @@ def get_subscription_usage(
 
 
 @router.get("/plans")
+@cached_response(global_tags=("plans",), per_restaurant=False, public=True)
 def get_available_plans(
     db: Session = Depends(get_db)
 ):
@@ -213,6 +208,7 @@ def get_available_plans(
 
 
 @router.get("/addons")
+@cached_response(tags=("subscription",), global_tags=("addons", "plans", "subscriptions"))
 def get_available_addons(
     current_user: User = Depends(require_admin_or_sysadmin),
     restaurant: Restaurant = Depends(get_current_restaurant),
@@ -640,13 +636,14 @@ def get_payment_status(
 @router.get("/alerts", response_model=list[AlertResponse])
 def get_alerts(
     unread_only: bool = False,
+    limit: int = Query(100, ge=1, le=500, description="Newest alerts to return"),
     current_user: User = Depends(require_admin_or_sysadmin),
     restaurant: Restaurant = Depends(get_current_restaurant),
     db: Session = Depends(get_db)
 ):
     """Get subscription alerts for restaurant"""
     alert_service = AlertService(db)
-    alerts = alert_service.get_restaurant_alerts(restaurant.id, unread_only)
+    alerts = alert_service.get_restaurant_alerts(restaurant.id, unread_only, limit=limit)
     
     return [
         AlertResponse(
@@ -664,6 +661,19 @@ def get_alerts(
     ]
 
 
+@router.get("/alerts/unread-count", response_model=AlertUnreadCount)
+def get_unread_alert_count(
+    current_user: User = Depends(require_admin_or_sysadmin),
+    restaurant: Restaurant = Depends(get_current_restaurant),
+    db: Session = Depends(get_db)
+):
+    """
+    Get the number of unread alerts, from the cached counter.
+    Open event streams receive changes as ``alerts.unread`` events.
+    """
+    return AlertUnreadCount(unread_count=AlertService(db).get_unread_count(restaurant.id))
+
+
 @router.post("/alerts/mark-read")
 def mark_alerts_read(
     data: AlertMarkRead,
@@ -679,6 +689,7 @@ def mark_alerts_read(
 
 
 @router.get("/mode-config")
+@cached_response(tags=("subscription",), global_tags=("plans", "subscriptions"))
 def get_operation_mode_config(
     current_user: User = Depends(get_current_active_user),
     restaurant: Restaurant = Depends(get_current_restaurant),
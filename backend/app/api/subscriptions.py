@@ -34,6 +34,7 @@ from app.schemas.subscription import (
     SubscriptionLimitsResponse
 )
 from app.core.exceptions import ResourceNotFoundError, ValidationError, ConflictError
+from app.core.response_cache import cached_response
 from app.models import BillingCycle
 
 router = APIRouter(prefix="/subscriptions", tags=["subscriptions"])
@@ -42,6 +43,7 @@ router = APIRouter(prefix="/subscriptions", tags=["subscriptions"])
 # ==================== PLANS ====================
 
 @router.get("/plans", response_model=List[SubscriptionPlanResponse])
+@cached_response(global_tags=("plans",), per_restaurant=False, public=True)
 def get_all_plans(
     include_trial: bool = True,
     db: Session = Depends(get_db)
@@ -67,6 +69,7 @@ def get_plan(
 # ==================== ADDONS ====================
 
 @router.get("/addons", response_model=List[SubscriptionAddonResponse])
+@cached_response(global_tags=("addons",), per_restaurant=False, public=True)
 def get_all_addons(
     plan_tier: str = None,
     db: Session = Depends(get_db)
@@ -2,12 +2,20 @@
 Health check endpoints for monitoring and Kubernetes probes.
 """
 from fastapi import APIRouter, Depends, status
+from sqlalchemy import text
 from sqlalchemy.orm import Session
+from typing import Optional
 from datetime import datetime
+import os
 import sys
 import logging
 
-from app.db.base import get_db
+from app.core.cache import caches
+from app.core.config import settings
+from app.db.base import get_db, engine, read_router, replica_engine
+from app.db.pool_metrics import pool_stats, read_worker_stats, recommend_pool_size
+from app.services.realtime import hub
+from app.services.scheduler import recent_runs, scheduler
 
 logger = logging.getLogger(__name__)
 
@@ -24,7 +32,7 @@ def get_db_health() -> dict:
     try:
         from app.db.base import SessionLocal
         db = SessionLocal()
-        db.execute("SELECT 1")
+        db.execute(text("SELECT 1"))
         db.close()
         return {
             "status": "healthy",
@@ -39,6 +47,18 @@ def get_db_health() -> dict:
         }
 
 
+def get_max_connections() -> Optional[int]:
+    """MySQL's max_connections, or None when it can't be read."""
+    if engine.dialect.name != "mysql":
+        return None
+    try:
+        with engine.connect() as conn:
+            return int(conn.execute(text("SELECT @@max_connections")).scalar())
+    except Exception as e:
+        logger.warning(f"Could not read max_connections: {str(e)}")
+        return None
+
+
 @router.get("/", status_code=status.HTTP_200_OK)
 async def health_check():
     """
@@ -80,6 +100,8 @@ async def detailed_health_check(db: Session = Depends(get_db)):
         "service": "Coffee Shop API",
         "version": "0.1.0",
         "database": db_health,
+        "pool": pool_stats(engine),
+        "read_replica": read_router.status(),
         "system": {
             "python_version": sys.version,
             "platform": sys.platform
@@ -87,6 +109,94 @@ async def detailed_health_check(db: Session = Depends(get_db)):
     }
 
 
+@router.get("/pool", status_code=status.HTTP_200_OK)
+def pool_health():
+    """
+    Connection pool telemetry of the worker that answers, plus sizing advice.
+
+    Returns for the primary (and the read replica, if configured):
+    - checked-out connections, overflow and pool settings
+    - checkout wait histogram in milliseconds, checkout and timeout counters
+    - in-use gauge, its peak and time-weighted concurrency percentiles
+
+    With DB_POOL_ADVISOR_ENABLED, "advice" combines the stats every worker
+    published to DB_POOL_STATS_DIR into recommended pool_size/max_overflow.
+    The advice is informational; pool settings are not changed.
+    """
+    response = {
+        "timestamp": datetime.utcnow().isoformat(),
+        "worker_pid": os.getpid(),
+        "primary": pool_stats(engine),
+        "replica": pool_stats(replica_engine) if replica_engine is not None else None,
+    }
+    if settings.DB_POOL_ADVISOR_ENABLED:
+        workers = read_worker_stats(settings.DB_POOL_STATS_DIR, max_age_seconds=3 * settings.DB_POOL_STATS_INTERVAL)
+        response["advice"] = recommend_pool_size(workers, get_max_connections())
+    return response
+
+
+@router.get("/cache", status_code=status.HTTP_200_OK)
+def cache_health():
+    """
+    Cache namespaces of the worker that answers (see core/cache.py).
+
+    Per namespace: local hits, shared tier hits, misses, evictions,
+    expirations, invalidations, shared tier errors, size and hit ratio.
+    """
+    return {
+        "timestamp": datetime.utcnow().isoformat(),
+        "worker_pid": os.getpid(),
+        "shared_tier": type(caches.tier).__name__ if caches.tier is not None else None,
+        "namespaces": caches.stats(),
+    }
+
+
+@router.get("/realtime", status_code=status.HTTP_200_OK)
+def realtime_health():
+    """
+    Event streams held by the worker that answers (see services/realtime.py).
+
+    Open streams and the restaurants they belong to, events published
+    here, events queued to streams (from any worker) and events dropped
+    from streams that fell behind.
+    """
+    return {
+        "timestamp": datetime.utcnow().isoformat(),
+        "worker_pid": os.getpid(),
+        **hub.stats(),
+    }
+
+
+@router.get("/jobs", status_code=status.HTTP_200_OK)
+def jobs_health(job_name: Optional[str] = None, limit: int = 50, db: Session = Depends(get_db)):
+    """
+    Scheduled jobs as seen by the worker that answers, plus cluster run history.
+
+    "jobs" lists each job's trigger, next run and this worker's run counts
+    and durations; "leader" says whether this worker holds the scheduler
+    lock. "recent_runs" comes from the database and covers cluster jobs
+    run by any worker, newest first.
+    """
+    return {
+        "timestamp": datetime.utcnow().isoformat(),
+        "worker": scheduler.worker_id,
+        "leader": scheduler.is_leader,
+        "jobs": scheduler.stats(),
+        "recent_runs": [
+            {
+                "job_name": run.job_name,
+                "status": run.status.value,
+                "worker": run.worker,
+                "started_at": run.started_at,
+                "finished_at": run.finished_at,
+                "duration_ms": run.duration_ms,
+                "error": run.error,
+            }
+            for run in recent_runs(db, job_name=job_name, limit=min(max(limit, 1), 500))
+        ],
+    }
+
+
 @router.get("/ready", status_code=status.HTTP_200_OK)
 async def readiness_check(db: Session = Depends(get_db)):
     """
@@ -14,6 +14,8 @@ from .rate_limit import limiter
 from ..middleware.cors import configure_cors
 from ..middleware.security import SecurityHeadersMiddleware
 from ..middleware.restaurant import RestaurantMiddleware
+from ..middleware.request_id import RequestIdMiddleware
+from ..db.routing import ReadPinMiddleware
 from .openapi import configure_openapi
 from .exception_handlers import register_exception_handlers
 from .lifespan import lifespan
@@ -29,9 +31,11 @@ def create_app() -> FastAPI:
     """
     # Setup logging
     setup_logging(
-        log_level=getattr(settings, 'LOG_LEVEL', 'INFO'),
-        log_file_max_bytes=getattr(settings, 'LOG_FILE_MAX_BYTES', 10 * 1024 * 1024),
-        log_file_backup_count=getattr(settings, 'LOG_FILE_BACKUP_COUNT', 5)
+        log_level=settings.LOG_LEVEL,
+        log_file_max_bytes=settings.LOG_FILE_MAX_BYTES,
+        log_file_backup_count=settings.LOG_FILE_BACKUP_COUNT,
+        json_logs=settings.LOG_JSON,
+        sample_rates=settings.LOG_SAMPLE_RATES
     )
     
     # Import models to ensure they are registered with SQLAlchemy
@@ -65,6 +69,12 @@ def create_app() -> FastAPI:
     # Add tenant context middleware (subdomain -> restaurant)
     app.add_middleware(RestaurantMiddleware)
     
+    # Per-request read-your-writes pin for replica reads
+    app.add_middleware(ReadPinMiddleware)
+    
+    # Correlate log records with a request ID (outermost, so every log line has it)
+    app.add_middleware(RequestIdMiddleware)
+    
     # Register exception handlers
     register_exception_handlers(app)
     
@@ -0,0 +1,507 @@
+"""
+Two-Tier Cache
+
+Tenant-scoped caches for services that would otherwise keep their own
+dicts. Each cache is a named namespace with two tiers:
+
+1. An in-process LRU bounded by entry count, with a TTL per entry.
+2. Optionally, a shared tier reached through a small Redis-protocol
+   interface (GET with PTTL, SET EX, DEL, tag sets, PUBLISH and
+   SUBSCRIBE): ``RedisTier`` when CACHE_REDIS_URL is set, or
+   ``MemoryTier``, an in-process stand-in for tests and development.
+
+Entries are keyed by (tenant, key) and carry tags. ``invalidate_tags``
+drops every entry with one of the tags in every namespace: locally, in
+the shared tier, and in the other workers, which hear about it on the
+invalidation channel. In the shared tier each tag is a sorted set of
+entry keys scored by their expiry: adding to it drops the expired ones,
+so long-lived tags stay bounded, and its own expiry is only ever
+extended, so it outlives every entry it lists, whatever their namespaces
+and TTLs. Every entry is tagged ``tenant:<id>``, so ``invalidate_tenant``
+drops everything cached for a restaurant.
+
+Only namespaces created with ``shared=True`` use the shared tier, and
+their values must be JSON-serializable. Local namespaces can hold any
+object. Shared tier errors are counted and otherwise ignored: the cache
+degrades to the local tier, never fails a request.
+"""
+import json
+import logging
+import os
+import socket
+import threading
+import time as _time
+import uuid
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Set, Tuple
+
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+
+# ---------------------------------------------------------------------------
+# Shared tiers
+# ---------------------------------------------------------------------------
+
+class MemoryTier:
+    """
+    In-process stand-in for Redis with the subset of commands the cache uses.
+    Subscribers are called synchronously on publish.
+    """
+
+    def __init__(self):
+        self._values: Dict[str, Tuple[Optional[float], str]] = {}
+        # Tag sets: member -> expiry
+        self._tags: Dict[str, Dict[str, float]] = {}
+        self._subscribers: Dict[str, List[Callable[[str], None]]] = {}
+        self._lock = threading.Lock()
+
+    def get_with_ttl(self, key: str) -> Tuple[Optional[str], Optional[float]]:
+        """Value and seconds left (None without expiry)."""
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                return None, None
+            expires_at, value = entry
+            if expires_at is None:
+                return value, None
+            left = expires_at - _time.monotonic()
+            if left <= 0:
+                del self._values[key]
+                return None, None
+            return value, left
+
+    def set(self, key: str, value: str, ex: Optional[float] = None) -> None:
+        with self._lock:
+            self._values[key] = (_time.monotonic() + ex if ex else None, value)
+
+    def _live_tag(self, key: str) -> Optional[Dict[str, float]]:
+        members = self._tags.get(key)
+        if members is not None:
+            now = _time.monotonic()
+            for member in [member for member, expires_at in members.items() if expires_at <= now]:
+                del members[member]
+            if not members:
+                del self._tags[key]
+                return None
+        return members
+
+    def delete(self, *keys: str) -> int:
+        with self._lock:
+            deleted = 0
+            for key in keys:
+                deleted += (self._values.pop(key, None) is not None) + (self._live_tag(key) is not None)
+                self._tags.pop(key, None)
+            return deleted
+
+    def tag_add(self, key: str, member: str, ttl: float) -> None:
+        """
+        Add a member to a tag set for ``ttl`` seconds, dropping expired
+        members. The set lives as long as its longest-lived member.
+        """
+        with self._lock:
+            members = self._live_tag(key)
+            if members is None:
+                members = self._tags[key] = {}
+            members[member] = _time.monotonic() + ttl
+
+    def tag_members(self, key: str) -> Set[str]:
+        with self._lock:
+            return set(self._live_tag(key) or ())
+
+    def publish(self, channel: str, message: str) -> None:
+        with self._lock:
+            subscribers = list(self._subscribers.get(channel, ()))
+        for callback in subscribers:
+            callback(message)
+
+    def subscribe(self, channel: str, callback: Callable[[str], None]) -> None:
+        with self._lock:
+            self._subscribers.setdefault(channel, []).append(callback)
+
+    def close(self) -> None:
+        with self._lock:
+            self._subscribers.clear()
+
+
+class RedisTier:
+    """
+    Shared tier on a Redis server. Needs the ``redis`` package, which is
+    only required when CACHE_REDIS_URL is set. Invalidations are received
+    on a background thread.
+    """
+
+    # Tag sets are sorted sets scored by member expiry (server clock, in
+    # ms). Adding trims the expired members and extends, never shortens,
+    # the set's own TTL (PEXPIRE ... GT needs Redis 7, and treats a key
+    # without TTL as never expiring, so it would not set one)
+    _TAG_ADD = """
+local time = redis.call('TIME')
+local now = tonumber(time[1]) * 1000 + math.floor(tonumber(time[2]) / 1000)
+local ttl = tonumber(ARGV[2])
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', now)
+redis.call('ZADD', KEYS[1], now + ttl, ARGV[1])
+local left = redis.call('PTTL', KEYS[1])
+if left == -1 or left < ttl then
+    redis.call('PEXPIRE', KEYS[1], ttl)
+end
+return 0
+"""
+
+    def __init__(self, url: str):
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError("CACHE_REDIS_URL is set but the 'redis' package is not installed") from None
+        self._client = redis.Redis.from_url(url, socket_timeout=0.5, socket_connect_timeout=0.5,
+                                            decode_responses=True)
+        self._tag_add = self._client.register_script(self._TAG_ADD)
+        self._pubsub = None
+        self._thread = None
+
+    def get_with_ttl(self, key: str) -> Tuple[Optional[str], Optional[float]]:
+        pipe = self._client.pipeline(transaction=False)
+        pipe.get(key)
+        pipe.pttl(key)
+        value, pttl = pipe.execute()
+        return value, pttl / 1000 if pttl > 0 else None
+
+    def set(self, key: str, value: str, ex: Optional[float] = None) -> None:
+        self._client.set(key, value, ex=max(1, int(ex)) if ex else None)
+
+    def delete(self, *keys: str) -> int:
+        return self._client.delete(*keys) if keys else 0
+
+    def tag_add(self, key: str, member: str, ttl: float) -> None:
+        self._tag_add(keys=[key], args=[member, max(1, int(ttl * 1000))])
+
+    def tag_members(self, key: str) -> Set[str]:
+        return set(self._client.zrange(key, 0, -1))
+
+    def publish(self, channel: str, message: str) -> None:
+        self._client.publish(channel, message)
+
+    def subscribe(self, channel: str, callback: Callable[[str], None]) -> None:
+        self._pubsub = self._client.pubsub(ignore_subscribe_messages=True)
+        self._pubsub.subscribe(**{channel: lambda message: callback(message["data"])})
+        self._thread = self._pubsub.run_in_thread(sleep_time=1.0, daemon=True)
+
+    def close(self) -> None:
+        if self._thread is not None:
+            self._thread.stop()
+            self._thread = None
+        if self._pubsub is not None:
+            self._pubsub.close()
+            self._pubsub = None
+        self._client.close()
+
+
+# ---------------------------------------------------------------------------
+# Local tier
+# ---------------------------------------------------------------------------
+
+@dataclass
+class CacheStats:
+    """Counters of one namespace in this worker."""
+    hits: int = 0
+    # Local misses served by the shared tier
+    shared_hits: int = 0
+    misses: int = 0
+    # Dropped to stay within max_entries
+    evictions: int = 0
+    expirations: int = 0
+    invalidations: int = 0
+    shared_errors: int = 0
+
+
+class _LocalTier:
+    """Thread-safe LRU with per-entry expiry and a tag index."""
+
+    def __init__(self, max_entries: int, stats: CacheStats):
+        self.max_entries = max_entries
+        self._stats = stats
+        self._entries: "OrderedDict[tuple, Tuple[float, Any, frozenset]]" = OrderedDict()
+        self._by_tag: Dict[str, Set[tuple]] = {}
+        self._lock = threading.Lock()
+
+    def _remove(self, key: tuple) -> None:
+        _, _, tags = self._entries.pop(key)
+        for tag in tags:
+            keys = self._by_tag.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._by_tag[tag]
+
+    def get(self, key: tuple) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return _MISSING
+            if _time.monotonic() >= entry[0]:
+                self._remove(key)
+                self._stats.expirations += 1
+                return _MISSING
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def put(self, key: tuple, value: Any, ttl: float, tags: frozenset) -> None:
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (_time.monotonic() + ttl, value, tags)
+            for tag in tags:
+                self._by_tag.setdefault(tag, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+                self._stats.evictions += 1
+
+    def discard(self, key: tuple) -> int:
+        with self._lock:
+            if key not in self._entries:
+                return 0
+            self._remove(key)
+            return 1
+
+    def discard_tags(self, tags: Iterable[str]) -> int:
+        with self._lock:
+            keys = set()
+            for tag in tags:
+                keys.update(self._by_tag.get(tag, ()))
+            for key in keys:
+                self._remove(key)
+            return len(keys)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._by_tag.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# ---------------------------------------------------------------------------
+# Namespaces
+# ---------------------------------------------------------------------------
+
+def _key_text(key: Hashable) -> str:
+    return key if isinstance(key, str) else repr(key)
+
+
+def tenant_tag(tenant_id: Optional[int]) -> str:
+    """Tag carried by every entry of a tenant."""
+    return f"tenant:{tenant_id}"
+
+
+class TenantCache:
+    """
+    One namespace of the cache. Create it with ``CacheManager.namespace``.
+
+    ``tenant_id`` is the restaurant the entry belongs to (None for
+    platform-wide data); ``key`` is any hashable with a stable ``repr``.
+    """
+
+    def __init__(self, manager: "CacheManager", name: str, max_entries: int, ttl: float, shared: bool):
+        self.name = name
+        self.ttl = ttl
+        self.shared = shared
+        self._manager = manager
+        self._stats = CacheStats()
+        self._local = _LocalTier(max_entries, self._stats)
+
+    def _shared_key(self, tenant_id: Optional[int], key: str) -> str:
+        return f"{settings.CACHE_KEY_PREFIX}:{self.name}:{tenant_id}:{key}"
+
+    def _tags(self, tenant_id: Optional[int], tags: Iterable[str]) -> frozenset:
+        return frozenset((tenant_tag(tenant_id), f"{self.name}:{tenant_id}", f"{self.name}:*", *tags))
+
+    def get(self, tenant_id: Optional[int], key: Hashable, default: Any = None) -> Any:
+        """Cached value, or ``default`` if missing or expired in both tiers."""
+        key = _key_text(key)
+        value = self._local.get((tenant_id, key))
+        if value is not _MISSING:
+            self._stats.hits += 1
+            return value
+        tier = self._manager.tier if self.shared else None
+        if tier is not None:
+            try:
+                raw, ttl = tier.get_with_ttl(self._shared_key(tenant_id, key))
+            except Exception as e:
+                self._shared_error("get", e)
+                raw = None
+            if raw is not None:
+                entry = json.loads(raw)
+                self._stats.shared_hits += 1
+                # Expire with the shared entry, not a full TTL from now
+                self._local.put((tenant_id, key), entry["v"], ttl or self.ttl, self._tags(tenant_id, entry["t"]))
+                return entry["v"]
+        self._stats.misses += 1
+        return default
+
+    def set(self, tenant_id: Optional[int], key: Hashable, value: Any,
+            ttl: Optional[float] = None, tags: Iterable[str] = ()) -> None:
+        """
+        Store a value in both tiers.
+
+        Args:
+            tenant_id: Restaurant the value belongs to
+            key: Key within the tenant
+            value: Anything for local namespaces; JSON-serializable for shared ones
+            ttl: Seconds to keep it (default: the namespace TTL)
+            tags: Extra tags to invalidate it by, e.g. ``menu:12``
+        """
+        key = _key_text(key)
+        ttl = ttl or self.ttl
+        tags = tuple(tags)
+        all_tags = self._tags(tenant_id, tags)
+        self._local.put((tenant_id, key), value, ttl, all_tags)
+        tier = self._manager.tier if self.shared else None
+        if tier is not None:
+            shared_key = self._shared_key(tenant_id, key)
+            try:
+                tier.set(shared_key, json.dumps({"v": value, "t": tags}), ex=ttl)
+                for tag in all_tags:
+                    tier.tag_add(self._manager.tag_key(tag), shared_key, ttl)
+            except Exception as e:
+                self._shared_error("set", e)
+
+    def get_or_set(self, tenant_id: Optional[int], key: Hashable, compute: Callable[[], Any],
+                   ttl: Optional[float] = None, tags: Iterable[str] = ()) -> Any:
+        """Cached value, computing and storing it on a miss."""
+        value = self.get(tenant_id, key, _MISSING)
+        if value is _MISSING:
+            value = compute()
+            self.set(tenant_id, key, value, ttl=ttl, tags=tags)
+        return value
+
+    def delete(self, tenant_id: Optional[int], key: Hashable) -> None:
+        """Drop one entry in every worker."""
+        key = _key_text(key)
+        self._manager.publish({"namespace": self.name, "keys": [[tenant_id, key]]}, drop_local=True)
+        if self.shared and self._manager.tier is not None:
+            try:
+                self._manager.tier.delete(self._shared_key(tenant_id, key))
+            except Exception as e:
+                self._shared_error("delete", e)
+
+    def clear(self, tenant_id: Optional[int] = None) -> None:
+        """Drop a tenant's entries of this namespace, or all of them, in every worker."""
+        self._manager.invalidate_tags(f"{self.name}:{'*' if tenant_id is None else tenant_id}")
+
+    def _drop_keys(self, keys: Iterable[Tuple[Optional[int], str]]) -> None:
+        dropped = sum(self._local.discard((tenant_id, key)) for tenant_id, key in keys)
+        self._stats.invalidations += dropped
+
+    def _drop_tags(self, tags: Iterable[str]) -> None:
+        self._stats.invalidations += self._local.discard_tags(tags)
+
+    def _shared_error(self, operation: str, error: Exception) -> None:
+        self._stats.shared_errors += 1
+        logger.warning("Shared cache %s failed for %s: %s", operation, self.name, error)
+
+    def stats(self) -> dict:
+        """Counters, size and hit ratio of this namespace in this worker."""
+        stats = asdict(self._stats)
+        lookups = stats["hits"] + stats["shared_hits"] + stats["misses"]
+        return {
+            **stats,
+            "size": len(self._local),
+            "max_entries": self._local.max_entries,
+            "ttl_seconds": self.ttl,
+            "shared": self.shared,
+            "hit_ratio": round((stats["hits"] + stats["shared_hits"]) / lookups, 4) if lookups else None,
+        }
+
+
+class CacheManager:
+    """
+    The namespaces of one process and their shared tier.
+    The application uses the module-level ``caches``.
+    """
+
+    def __init__(self):
+        self.tier = None
+        self.origin = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._namespaces: Dict[str, TenantCache] = {}
+        self._lock = threading.Lock()
+
+    def namespace(self, name: str, max_entries: int = 1000, ttl: float = 300,
+                  shared: bool = False) -> TenantCache:
+        """Create a namespace, or return the existing one of that name."""
+        with self._lock:
+            cache = self._namespaces.get(name)
+            if cache is None:
+                cache = self._namespaces[name] = TenantCache(self, name, max_entries, ttl, shared)
+            return cache
+
+    def configure(self, tier) -> None:
+        """Use a shared tier (None for local only), subscribing to invalidations."""
+        previous, self.tier = self.tier, tier
+        if previous is not None:
+            previous.close()
+        if tier is not None:
+            tier.subscribe(settings.CACHE_INVALIDATION_CHANNEL, self._receive)
+
+    def tag_key(self, tag: str) -> str:
+        return f"{settings.CACHE_KEY_PREFIX}:tag:{tag}"
+
+    def invalidate_tags(self, *tags: str) -> None:
+        """Drop every entry with any of the tags, in all namespaces and workers."""
+        if not tags:
+            return
+        if self.tier is not None:
+            try:
+                for tag in tags:
+                    tag_key = self.tag_key(tag)
+                    self.tier.delete(*self.tier.tag_members(tag_key), tag_key)
+            except Exception as e:
+                logger.warning("Shared cache invalidation failed: %s", e)
+        self.publish({"tags": list(tags)}, drop_local=True)
+
+    def invalidate_tenant(self, tenant_id: int) -> None:
+        """Drop everything cached for a restaurant."""
+        self.invalidate_tags(tenant_tag(tenant_id))
+
+    def publish(self, message: dict, drop_local: bool) -> None:
+        if drop_local:
+            self._apply(message)
+        if self.tier is not None:
+            try:
+                self.tier.publish(settings.CACHE_INVALIDATION_CHANNEL, json.dumps({**message, "origin": self.origin}))
+            except Exception as e:
+                logger.warning("Could not broadcast cache invalidation: %s", e)
+
+    def _apply(self, message: dict) -> None:
+        if "tags" in message:
+            for cache in list(self._namespaces.values()):
+                cache._drop_tags(message["tags"])
+        elif "keys" in message:
+            cache = self._namespaces.get(message["namespace"])
+            if cache is not None:
+                cache._drop_keys((tenant_id, key) for tenant_id, key in message["keys"])
+
+    def _receive(self, raw: str) -> None:
+        try:
+            message = json.loads(raw)
+        except ValueError:
+            logger.warning("Ignoring malformed cache invalidation: %r", raw)
+            return
+        if message.get("origin") != self.origin:
+            self._apply(message)
+
+    def clear_local(self) -> None:
+        """Empty the local tier of every namespace in this worker (tests, maintenance)."""
+        for cache in list(self._namespaces.values()):
+            cache._local.clear()
+
+    def stats(self) -> Dict[str, dict]:
+        """Per-namespace stats in this worker."""
+        return {name: cache.stats() for name, cache in sorted(self._namespaces.items())}
+
+
+caches = CacheManager()
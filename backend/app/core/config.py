@@ -32,7 +32,77 @@ class Settings(BaseSettings):
     DB_POOL_SIZE: int = Field(default=5, env='DB_POOL_SIZE')
     DB_MAX_OVERFLOW: int = Field(default=10, env='DB_MAX_OVERFLOW')
     DB_POOL_RECYCLE: int = Field(default=3600, env='DB_POOL_RECYCLE')
+    DB_POOL_TIMEOUT: int = Field(default=30, env='DB_POOL_TIMEOUT')
     DB_ECHO: bool = Field(default=False, env='DB_ECHO')
+    # Pool sizing advisor: workers publish pool stats to a shared directory
+    DB_POOL_ADVISOR_ENABLED: bool = Field(default=False, env='DB_POOL_ADVISOR_ENABLED')
+    DB_POOL_STATS_DIR: str = Field(default="/tmp/restaurant-db-pool", env='DB_POOL_STATS_DIR')
+    DB_POOL_STATS_INTERVAL: int = Field(default=60, env='DB_POOL_STATS_INTERVAL')
+    
+    # Read replica for reporting/analytics reads (off: everything reads the primary)
+    READ_REPLICA_ENABLED: bool = Field(default=False, env='READ_REPLICA_ENABLED')
+    MYSQL_REPLICA_SERVER: Optional[str] = Field(default=None, env='MYSQL_REPLICA_SERVER')
+    MYSQL_REPLICA_PORT: int = Field(default=3306, env='MYSQL_REPLICA_PORT')
+    # Staleness bound: above this replication lag, reads go to the primary
+    READ_REPLICA_MAX_LAG_SECONDS: float = Field(default=5.0, env='READ_REPLICA_MAX_LAG_SECONDS')
+    READ_REPLICA_LAG_CHECK_SECONDS: float = Field(default=5.0, env='READ_REPLICA_LAG_CHECK_SECONDS')
+    
+    # Logging
+    LOG_LEVEL: str = Field(default="INFO", env='LOG_LEVEL')
+    LOG_FILE_MAX_BYTES: int = Field(default=10 * 1024 * 1024, env='LOG_FILE_MAX_BYTES')
+    LOG_FILE_BACKUP_COUNT: int = Field(default=5, env='LOG_FILE_BACKUP_COUNT')
+    LOG_JSON: bool = Field(default=False, env='LOG_JSON')
+    # Per-logger keep ratio for records below WARNING, as JSON
+    # e.g. {"app.middleware.restaurant": 0.1}
+    LOG_SAMPLE_RATES: Dict[str, float] = Field(default_factory=dict, env='LOG_SAMPLE_RATES')
+    
+    # Sysadmin dashboards: how often the platform metrics snapshot is recomputed
+    PLATFORM_METRICS_REFRESH_SECONDS: int = Field(default=300, env='PLATFORM_METRICS_REFRESH_SECONDS')
+    
+    # Server-side printing to network printers
+    SERVER_AUTO_PRINT: bool = Field(default=False, env='SERVER_AUTO_PRINT')
+    PRINT_QUEUE_SIZE: int = Field(default=100, env='PRINT_QUEUE_SIZE')
+    PRINT_CONNECT_TIMEOUT: float = Field(default=3.0, env='PRINT_CONNECT_TIMEOUT')
+    PRINT_MAX_RETRIES: int = Field(default=3, env='PRINT_MAX_RETRIES')
+    
+    # Transactional outbox: side effects drained after commit by a background worker
+    OUTBOX_WORKER_ENABLED: bool = Field(default=True, env='OUTBOX_WORKER_ENABLED')
+    OUTBOX_POLL_SECONDS: float = Field(default=1.0, env='OUTBOX_POLL_SECONDS')
+    OUTBOX_BATCH_SIZE: int = Field(default=50, env='OUTBOX_BATCH_SIZE')
+    OUTBOX_MAX_ATTEMPTS: int = Field(default=8, env='OUTBOX_MAX_ATTEMPTS')
+    # How long a claimed event stays hidden from other workers
+    OUTBOX_LEASE_SECONDS: int = Field(default=60, env='OUTBOX_LEASE_SECONDS')
+    OUTBOX_RETENTION_HOURS: int = Field(default=24, env='OUTBOX_RETENTION_HOURS')
+    
+    # Periodic jobs (see services/scheduler.py); cluster jobs run on the lock holder only
+    SCHEDULER_ENABLED: bool = Field(default=True, env='SCHEDULER_ENABLED')
+    # Leader lock: MySQL advisory lock name, or a lock file on other databases
+    SCHEDULER_LOCK_NAME: str = Field(default="restaurant_scheduler", env='SCHEDULER_LOCK_NAME')
+    SCHEDULER_LOCK_FILE: str = Field(default="/tmp/restaurant-scheduler.lock", env='SCHEDULER_LOCK_FILE')
+    # How long shutdown waits for running jobs to finish
+    SCHEDULER_SHUTDOWN_SECONDS: float = Field(default=30.0, env='SCHEDULER_SHUTDOWN_SECONDS')
+    SCHEDULER_HISTORY_DAYS: int = Field(default=14, env='SCHEDULER_HISTORY_DAYS')
+    # Cron expressions (minute hour day month weekday, UTC)
+    SUBSCRIPTION_ALERTS_CRON: str = Field(default="0 * * * *", env='SUBSCRIPTION_ALERTS_CRON')
+    SPECIAL_NOTES_CLEANUP_CRON: str = Field(default="30 4 * * *", env='SPECIAL_NOTES_CLEANUP_CRON')
+    
+    # Two-tier cache (see core/cache.py): without a Redis URL caches are per worker
+    CACHE_REDIS_URL: Optional[str] = Field(default=None, env='CACHE_REDIS_URL')
+    CACHE_KEY_PREFIX: str = Field(default="restaurant-cache", env='CACHE_KEY_PREFIX')
+    CACHE_INVALIDATION_CHANNEL: str = Field(default="restaurant-cache:invalidate", env='CACHE_INVALIDATION_CHANNEL')
+
+    # Real-time events (see services/realtime.py), shared between workers through CACHE_REDIS_URL
+    REALTIME_CHANNEL: str = Field(default="restaurant-events", env='REALTIME_CHANNEL')
+    REALTIME_HEARTBEAT_SECONDS: float = Field(default=15.0, env='REALTIME_HEARTBEAT_SECONDS')
+    REALTIME_QUEUE_SIZE: int = Field(default=100, env='REALTIME_QUEUE_SIZE')
+    
+    # Uploaded menu images and their resized variants (see core/media.py)
+    MEDIA_ROOT: str = Field(default="media", env='MEDIA_ROOT')
+    # Where clients fetch media from; point it at a CDN or web server serving MEDIA_ROOT
+    MEDIA_URL_PREFIX: str = Field(default="/api/v1/media", env='MEDIA_URL_PREFIX')
+    MENU_IMAGE_MAX_BYTES: int = Field(default=5 * 1024 * 1024, env='MENU_IMAGE_MAX_BYTES')
+    # Width x height limit: a small file can decode to gigabytes of pixels
+    MENU_IMAGE_MAX_PIXELS: int = Field(default=40_000_000, env='MENU_IMAGE_MAX_PIXELS')
     
     # Frontend
     FRONTEND_URL: str = Field("http://localhost:3000", env='FRONTEND_URL')
@@ -9,6 +9,7 @@ from contextlib import asynccontextmanager
 from fastapi import FastAPI
 
 from ..db.base import get_db
+from .config import settings
 
 logger = logging.getLogger(__name__)
 
@@ -17,7 +18,10 @@ logger = logging.getLogger(__name__)
 async def lifespan(app_instance: FastAPI):
     """
     Lifespan context manager for startup and shutdown events.
-    Handles background tasks like flushing special note statistics.
+    Starts the job scheduler (special note stats, platform metrics,
+    subscription alerts, cleanups) and the outbox worker, and stops them
+    cleanly, letting running jobs finish. Open event streams are closed
+    at shutdown.
     
     Args:
         app_instance: FastAPI application instance
@@ -25,38 +29,93 @@ async def lifespan(app_instance: FastAPI):
     # Startup
     logger.info("Starting background tasks...")
     
-    # Create background task for flushing special note stats
-    task = asyncio.create_task(_flush_special_notes_task())
+    # Shared cache tier, also carrying invalidations between workers
+    from .cache import RedisTier, caches
+    from ..services.realtime import hub
+    if settings.CACHE_REDIS_URL:
+        caches.configure(RedisTier(settings.CACHE_REDIS_URL))
+        hub.configure(RedisTier(settings.CACHE_REDIS_URL))
+    
+    # Let worker threads (the outbox worker) queue print jobs on this loop
+    from ..services.printing import print_spooler
+    print_spooler.attach(asyncio.get_running_loop())
+    
+    # Periodic jobs (services/jobs.py registers them on import)
+    from ..services import jobs  # noqa: F401
+    from ..services.scheduler import scheduler
+    if settings.SCHEDULER_ENABLED:
+        scheduler.start()
+    
+    tasks = []
+    if settings.OUTBOX_WORKER_ENABLED:
+        tasks.append(asyncio.create_task(_drain_outbox_task()))
     
     yield
     
     # Shutdown
     logger.info("Shutting down background tasks...")
-    task.cancel()
+    # Open event streams would otherwise keep the server waiting for clients
+    hub.close_all()
+    await scheduler.stop(settings.SCHEDULER_SHUTDOWN_SECONDS)
+    for task in tasks:
+        task.cancel()
+    for task in tasks:
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+    
+    if settings.DB_POOL_ADVISOR_ENABLED:
+        from ..db.pool_metrics import remove_worker_stats
+        remove_worker_stats(settings.DB_POOL_STATS_DIR)
+    
+    # Give queued tickets a moment to reach their printers
+    await print_spooler.stop()
+    print_spooler.attach(None)
+    
+    caches.configure(None)
+    hub.configure(None)
+
+
+def _drain_outbox() -> int:
+    from ..services import outbox
+
+    db = next(get_db())
     try:
-        await task
-    except asyncio.CancelledError:
-        pass
+        return outbox.drain(db)
+    finally:
+        db.close()
 
 
-async def _flush_special_notes_task():
+async def _drain_outbox_task():
     """
-    Background task that flushes special note statistics every 5 minutes.
+    Background task that runs outbox events (see services/outbox.py).
+
+    Woken right after a commit that enqueued events, and polls every
+    OUTBOX_POLL_SECONDS for retries and events from other workers. Full
+    batches are followed by another batch straight away. Database work
+    runs in a worker thread.
     """
-    from ..services.special_notes import SpecialNotesService
-    
-    while True:
-        try:
-            await asyncio.sleep(300)  # 5 minutes
-            
-            # Get a database session
-            db = next(get_db())
+    from ..services import outbox
+
+    loop = asyncio.get_running_loop()
+    wakeup = asyncio.Event()
+    outbox.set_wakeup(lambda: loop.call_soon_threadsafe(wakeup.set))
+    try:
+        while True:
             try:
-                updated_count = SpecialNotesService.flush_updates(db)
-                if updated_count > 0:
-                    logger.info(f"Flushed {updated_count} special note updates to database")
-            finally:
-                db.close()
-                
-        except Exception as e:
-            logger.error(f"Error in special notes flush task: {str(e)}", exc_info=True)
+                wakeup.clear()
+                claimed = await asyncio.to_thread(_drain_outbox)
+                if claimed < settings.OUTBOX_BATCH_SIZE:
+                    try:
+                        async with asyncio.timeout(settings.OUTBOX_POLL_SECONDS):
+                            await wakeup.wait()
+                    except TimeoutError:
+                        pass
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Error draining outbox: {str(e)}", exc_info=True)
+                await asyncio.sleep(settings.OUTBOX_POLL_SECONDS)
+    finally:
+        outbox.set_wakeup(None)
@@ -6,45 +6,177 @@ This module provides a unified logging setup with:
 - Console output
 - Configurable log levels
 - Separate error log file
+- Non-blocking pipeline: request threads only enqueue records, a
+  QueueListener thread does the formatting and disk/stdout I/O
+- Optional structured JSON records
+- Request-ID correlation and per-logger sampling
 """
+import atexit
+import copy
+import json
 import logging
+import queue
+import random
 import sys
+from contextvars import ContextVar
+from datetime import datetime, timezone
 from pathlib import Path
-from logging.handlers import RotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Dict, Optional
+
+# Request ID of the request being handled, set by RequestIdMiddleware
+request_id_var: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+
+# Listener draining the log queue; replaced on every setup_logging() call
+_listener: Optional[QueueListener] = None
+
+# Attributes every LogRecord has; anything else was passed through `extra=`
+_RECORD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+
+class RequestIdFilter(logging.Filter):
+    """
+    Stamp each record with the current request ID.
+
+    Must run in the caller's context (i.e. on the QueueHandler, not on
+    the listener's handlers) so the context variable is still visible.
+    """
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id_var.get() or "-"
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Keep only a fraction of records below WARNING for selected loggers.
+
+    Rates are matched by logger name prefix, the most specific prefix wins.
+    WARNING and above are never dropped.
+
+    Args:
+        rates: Mapping of logger name (prefix) to keep ratio between 0 and 1
+    """
+
+    def __init__(self, rates: Optional[Dict[str, float]] = None):
+        super().__init__()
+        self.rates = {name: max(0.0, min(1.0, float(rate))) for name, rate in (rates or {}).items()}
+        self._resolved: Dict[str, float] = {}
+
+    def _rate_for(self, name: str) -> float:
+        rate = self._resolved.get(name)
+        if rate is None:
+            rate = 1.0
+            best = -1
+            for prefix, prefix_rate in self.rates.items():
+                if (name == prefix or name.startswith(prefix + ".")) and len(prefix) > best:
+                    rate, best = prefix_rate, len(prefix)
+            self._resolved[name] = rate
+        return rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING or not self.rates:
+            return True
+        rate = self._rate_for(record.name)
+        return rate >= 1.0 or random.random() < rate
+
+
+class _QueueHandler(QueueHandler):
+    """
+    QueueHandler that defers formatting to the listener thread.
+
+    The stock prepare() fully formats every record on the caller's thread;
+    here only the message arguments and traceback are resolved (they may
+    not be picklable or may change later), the rest is left to the handlers.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = _TRACEBACK_FORMATTER.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+_TRACEBACK_FORMATTER = logging.Formatter()
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    Format records as one JSON object per line.
+
+    Includes timestamp, level, logger, message, request_id, any fields
+    passed through ``extra=`` and the formatted exception if present.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "ts": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "request_id": getattr(record, "request_id", "-"),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS and key not in payload:
+                payload[key] = value
+        if record.exc_info:
+            payload["exc_info"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            payload["exc_info"] = record.exc_text
+        return json.dumps(payload, default=str, ensure_ascii=False)
 
 
 def setup_logging(
     log_level: str = "INFO",
     log_file_max_bytes: int = 10 * 1024 * 1024,  # 10MB
-    log_file_backup_count: int = 5
+    log_file_backup_count: int = 5,
+    json_logs: bool = False,
+    sample_rates: Optional[Dict[str, float]] = None,
+    logs_dir: Optional[Path] = None
 ) -> None:
     """
     Configure application logging with rotating file handlers and console output.
-    
+
+    The root logger gets a single QueueHandler; the file, console and error
+    handlers run on a background QueueListener thread so request handlers
+    never block on log I/O.
+
     Args:
         log_level: Logging level (DEBUG, INFO, WARNING, ERROR, CRITICAL)
         log_file_max_bytes: Maximum size of log file before rotation
         log_file_backup_count: Number of backup log files to keep
+        json_logs: Emit structured JSON records instead of plain text
+        sample_rates: Per-logger keep ratio for records below WARNING
+            (e.g. {"app.middleware.restaurant": 0.1})
+        logs_dir: Directory for log files (default: backend/logs)
     """
+    global _listener
+
     # Get the backend directory (parent of app directory)
-    backend_dir = Path(__file__).parent.parent.parent
-    logs_dir = backend_dir / 'logs'
-    
+    if logs_dir is None:
+        backend_dir = Path(__file__).parent.parent.parent
+        logs_dir = backend_dir / 'logs'
+
     # Create logs directory if it doesn't exist
     logs_dir.mkdir(exist_ok=True)
-    
+
     # Determine log level
     numeric_level = getattr(logging, log_level.upper(), logging.INFO)
-    
+
     # Create formatters
-    detailed_formatter = logging.Formatter(
-        '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-    )
-    
-    simple_formatter = logging.Formatter(
-        '%(asctime)s - %(levelname)s - %(message)s'
-    )
-    
+    if json_logs:
+        detailed_formatter = simple_formatter = JsonFormatter()
+    else:
+        detailed_formatter = logging.Formatter(
+            '%(asctime)s - %(name)s - %(levelname)s - [%(request_id)s] %(message)s'
+        )
+        simple_formatter = logging.Formatter(
+            '%(asctime)s - %(levelname)s - [%(request_id)s] %(message)s'
+        )
+
     # File handler with rotation (all logs)
     file_handler = RotatingFileHandler(
         logs_dir / 'app.log',
@@ -53,12 +185,12 @@ def setup_logging(
     )
     file_handler.setLevel(logging.DEBUG)
     file_handler.setFormatter(detailed_formatter)
-    
+
     # Console handler
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setLevel(numeric_level)
     console_handler.setFormatter(simple_formatter)
-    
+
     # Error file handler (only errors and critical)
     error_handler = RotatingFileHandler(
         logs_dir / 'error.log',
@@ -67,41 +199,76 @@ def setup_logging(
     )
     error_handler.setLevel(logging.ERROR)
     error_handler.setFormatter(detailed_formatter)
-    
-    # Configure root logger
+
+    # Restart the listener if logging is reconfigured
+    stop_logging()
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    queue_handler = _QueueHandler(log_queue)
+    queue_handler.addFilter(RequestIdFilter())
+    queue_handler.addFilter(SamplingFilter(sample_rates))
+
+    _listener = QueueListener(
+        log_queue,
+        file_handler,
+        console_handler,
+        error_handler,
+        respect_handler_level=True
+    )
+    _listener.start()
+
+    # Configure root logger. Records below the configured level are dropped
+    # before they are queued, so DEBUG calls cost nothing in production.
     root_logger = logging.getLogger()
-    root_logger.setLevel(logging.DEBUG)
-    
+    root_logger.setLevel(numeric_level)
+
     # Remove any existing handlers to avoid duplicates
     root_logger.handlers.clear()
-    
-    # Add our handlers
-    root_logger.addHandler(file_handler)
-    root_logger.addHandler(console_handler)
-    root_logger.addHandler(error_handler)
-    
+    root_logger.addHandler(queue_handler)
+
     # Reduce noise from third-party libraries
     logging.getLogger("sqlalchemy.engine").setLevel(logging.WARNING)
     logging.getLogger("uvicorn.access").setLevel(logging.WARNING)
-    
+
     # Log startup message
     logger = logging.getLogger(__name__)
     logger.info("=" * 50)
     logger.info("Logging initialized")
-    logger.info(f"Log level: {log_level}")
-    logger.info(f"Log file: {logs_dir / 'app.log'}")
-    logger.info(f"Error log: {logs_dir / 'error.log'}")
+    logger.info("Log level: %s", log_level)
+    logger.info("Log file: %s", logs_dir / 'app.log')
+    logger.info("Error log: %s", logs_dir / 'error.log')
+    if sample_rates:
+        logger.info("Log sampling: %s", sample_rates)
     logger.info("=" * 50)
 
 
+def stop_logging() -> None:
+    """
+    Flush queued records and stop the background listener.
+
+    Safe to call more than once; registered with atexit so records queued
+    right before interpreter shutdown still reach the handlers.
+    """
+    global _listener
+
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+
 def get_logger(name: str) -> logging.Logger:
     """
     Get a logger instance for a module.
-    
+
     Args:
         name: Name of the module (typically __name__)
-        
+
     Returns:
         logging.Logger: Configured logger instance
     """
     return logging.getLogger(name)
+
+
+atexit.register(stop_logging)
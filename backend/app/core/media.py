@@ -0,0 +1,78 @@
+"""
+Media Files
+
+Menu images uploaded to the API are stored under MEDIA_ROOT, one
+directory per restaurant, and named by the hash of their content::
+
+    menu/<restaurant_id>/<hash>.<ext>            the original upload
+    menu/<restaurant_id>/<hash>-<size>.webp      resized variants
+
+A name always refers to the same bytes, so clients and proxies may cache
+media forever (IMMUTABLE_CACHE_CONTROL): a new image gets a new URL.
+URLs start with MEDIA_URL_PREFIX, served by api/routers/media.py unless
+it points at a CDN or web server in front of MEDIA_ROOT.
+"""
+import re
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+from .config import settings
+
+# Longest side in pixels of each variant, smallest first
+MENU_IMAGE_SIZES = {"thumb": 160, "card": 480, "large": 1024}
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+# <hash>.<ext> or <hash>-<size>.webp
+MEDIA_FILENAME = re.compile(r"^[0-9a-f]{32}(?:\.(?:jpg|png|gif|webp)|-[a-z]+\.webp)$")
+
+
+def menu_image_dir(restaurant_id: int) -> Path:
+    """Directory of a restaurant's menu images."""
+    return Path(settings.MEDIA_ROOT) / "menu" / str(restaurant_id)
+
+
+def variant_filename(image_key: str, size: str) -> str:
+    """File name of one variant of an uploaded image."""
+    return f"{image_key.split('.', 1)[0]}-{size}.webp"
+
+
+def media_url(restaurant_id: int, filename: str) -> str:
+    return f"{settings.MEDIA_URL_PREFIX.rstrip('/')}/menu/{restaurant_id}/{filename}"
+
+
+def menu_image_urls(
+    restaurant_id: int,
+    image_key: Optional[str],
+    variants: Optional[Iterable[str]],
+    image_url: Optional[str] = None
+) -> Optional[Dict[str, str]]:
+    """
+    URL of a menu item's image at each size, plus ``original``.
+
+    Sizes whose variant has not been generated yet use the original; an
+    item with only an external ``image_url`` uses it at every size.
+
+    Args:
+        restaurant_id: Restaurant of the item
+        image_key: File name of the uploaded original, if any
+        variants: Sizes generated for it
+        image_url: External image URL
+
+    Returns:
+        dict: URL by size, or None if the item has no image
+    """
+    if image_key:
+        original = media_url(restaurant_id, image_key)
+        generated = set(variants or ())
+        urls = {
+            size: media_url(restaurant_id, variant_filename(image_key, size)) if size in generated else original
+            for size in MENU_IMAGE_SIZES
+        }
+    elif image_url:
+        original = image_url
+        urls = dict.fromkeys(MENU_IMAGE_SIZES, image_url)
+    else:
+        return None
+    urls["original"] = original
+    return urls
@@ -0,0 +1,214 @@
+"""
+HTTP Response Cache
+
+Route-level caching for read-mostly GET endpoints (plans, printers,
+categories, tables, the current restaurant)::
+
+    @router.get("/", response_model=List[CategoryInDB])
+    @cached_response(tags=("menu",))
+    async def get_menu_categories(...):
+
+The serialized body is kept in the ``http.responses`` namespace of the
+two-tier cache (core/cache.py), keyed by restaurant, role, path and
+query string. Responses carry an ETag and Cache-Control, and a request
+whose If-None-Match matches gets an empty 304, so browsers and the
+Electron app revalidate without downloading the body again.
+
+Entries are invalidated by tag when the data behind them changes. Writes
+to the models in ``_MODEL_TAGS`` are picked up at flush and fired after
+commit (discarded on rollback), whatever service made them; bulk UPDATEs
+that bypass the ORM call ``invalidate_on_commit`` themselves.
+"""
+import functools
+import hashlib
+import inspect
+import json
+import logging
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+from fastapi import Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from ..models.menu import Category, MenuItem
+from ..models.printer import Printer
+from ..models.restaurant import Restaurant
+from ..models.restaurant_subscription import RestaurantSubscription
+from ..models.restaurant_addon import RestaurantAddon
+from ..models.subscription_addon import SubscriptionAddon
+from ..models.subscription_plan import SubscriptionPlan
+from ..models.table import Table
+from ..models.user import User
+from .cache import caches
+
+logger = logging.getLogger(__name__)
+
+# Upper bound on staleness if a write is ever missed by invalidation
+DEFAULT_TTL_SECONDS = 300
+
+_responses = caches.namespace("http.responses", max_entries=5000, ttl=DEFAULT_TTL_SECONDS, shared=True)
+
+_PENDING_KEY = "response_cache_tags"
+_REQUEST_PARAM = "response_cache_request"
+
+
+def response_tag(name: str, restaurant_id: Optional[int] = None) -> str:
+    """Invalidation tag of a kind of data, for one restaurant or platform-wide."""
+    return name if restaurant_id is None else f"{name}:{restaurant_id}"
+
+
+# Tags fired when a row of the model is written
+_MODEL_TAGS: Dict[type, Callable[[Any], Tuple[str, ...]]] = {
+    Category: lambda row: (response_tag("menu", row.restaurant_id),),
+    MenuItem: lambda row: (response_tag("menu", row.restaurant_id),),
+    Table: lambda row: (response_tag("tables", row.restaurant_id),),
+    Printer: lambda row: (response_tag("printers", row.restaurant_id),),
+    Restaurant: lambda row: (response_tag("restaurant", row.id),),
+    RestaurantSubscription: lambda row: (response_tag("subscription", row.restaurant_id),),
+    RestaurantAddon: lambda row: (response_tag("subscription", row.restaurant_id),),
+    SubscriptionPlan: lambda row: ("plans",),
+    SubscriptionAddon: lambda row: ("addons",),
+}
+
+
+def invalidate_on_commit(db: Session, *tags: str) -> None:
+    """Invalidate cached responses with these tags once the session commits."""
+    db.info.setdefault(_PENDING_KEY, set()).update(tags)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_tags(session, flush_context):
+    tags = set()
+    for row in (*session.new, *session.dirty, *session.deleted):
+        tags_for = _MODEL_TAGS.get(type(row))
+        if tags_for is not None:
+            tags.update(tags_for(row))
+    if tags:
+        invalidate_on_commit(session, *tags)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_after_commit(session):
+    tags = session.info.pop(_PENDING_KEY, None)
+    if tags:
+        caches.invalidate_tags(*tags)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_after_rollback(session, previous_transaction):
+    # A savepoint (or a flush inside one) rolled back: tags collected
+    # outside it still commit
+    if previous_transaction.parent is not None:
+        return
+    session.info.pop(_PENDING_KEY, None)
+
+
+# ---------------------------------------------------------------------------
+# Decorator
+# ---------------------------------------------------------------------------
+
+def _etag(body: bytes) -> str:
+    return '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+
+def _matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = {candidate.strip().removeprefix("W/") for candidate in if_none_match.split(",")}
+    return etag in candidates or "*" in candidates
+
+
+def _request_context(request: Request, kwargs: dict) -> Tuple[Optional[int], str]:
+    """Restaurant and role the response is computed for."""
+    restaurant_id, role = None, "anonymous"
+    for value in kwargs.values():
+        if isinstance(value, Restaurant):
+            restaurant_id = value.id
+        elif isinstance(value, User):
+            role = value.role.value
+            restaurant_id = restaurant_id or value.restaurant_id
+    if restaurant_id is None:
+        restaurant = getattr(request.state, "restaurant", None)
+        restaurant_id = restaurant.id if restaurant is not None else None
+    return restaurant_id, role
+
+
+_adapters: Dict[Any, TypeAdapter] = {}
+
+
+def _serialize(request: Request, content: Any) -> bytes:
+    """JSON body as FastAPI would render it through the route's response_model."""
+    route = request.scope.get("route")
+    response_model = getattr(route, "response_model", None)
+    if response_model is None:
+        return json.dumps(jsonable_encoder(content), separators=(",", ":")).encode()
+    adapter = _adapters.get(response_model)
+    if adapter is None:
+        adapter = _adapters[response_model] = TypeAdapter(response_model)
+    return adapter.dump_json(adapter.validate_python(content, from_attributes=True), by_alias=True)
+
+
+def cached_response(tags: Iterable[str] = (), global_tags: Iterable[str] = (),
+                    per_restaurant: bool = True, ttl: float = DEFAULT_TTL_SECONDS,
+                    max_age: int = 0, public: bool = False):
+    """
+    Cache a GET route's JSON response. Place it under the ``@router.get``.
+
+    Args:
+        tags: Restaurant-scoped tags (``"menu"`` becomes ``"menu:<id>"``)
+        global_tags: Platform-wide tags, used as given (e.g. ``"plans"``)
+        per_restaurant: The response depends on the restaurant; it is not
+            cached when the request has none
+        ttl: Seconds the server keeps the body
+        max_age: Seconds clients may reuse it without revalidating
+        public: Shared caches (proxies, CDNs) may store it
+    """
+    tags, global_tags = tuple(tags), tuple(global_tags)
+    cache_control = f"{'public' if public else 'private'}, max-age={max_age}, must-revalidate"
+
+    def decorate(endpoint):
+        signature = inspect.signature(endpoint)
+        request_param = next(
+            (name for name, param in signature.parameters.items() if param.annotation is Request), None
+        )
+        if request_param is None:
+            signature = signature.replace(parameters=[
+                *signature.parameters.values(),
+                inspect.Parameter(_REQUEST_PARAM, inspect.Parameter.KEYWORD_ONLY, annotation=Request),
+            ])
+
+        async def call(kwargs: dict):
+            if inspect.iscoroutinefunction(endpoint):
+                return await endpoint(**kwargs)
+            return await run_in_threadpool(endpoint, **kwargs)
+
+        @functools.wraps(endpoint)
+        async def wrapper(**kwargs):
+            request: Request = kwargs[request_param] if request_param else kwargs.pop(_REQUEST_PARAM)
+            restaurant_id, role = _request_context(request, kwargs)
+            if per_restaurant and restaurant_id is None:
+                return await call(kwargs)
+
+            key = (role, request.url.path, tuple(sorted(request.query_params.multi_items())))
+            entry = _responses.get(restaurant_id, key)
+            if entry is None:
+                content = await call(kwargs)
+                if isinstance(content, Response):
+                    return content
+                body = _serialize(request, content)
+                entry = {"body": body.decode(), "etag": _etag(body)}
+                entry_tags = [response_tag(tag, restaurant_id if per_restaurant else None) for tag in tags]
+                _responses.set(restaurant_id, key, entry, ttl=ttl, tags=(*entry_tags, *global_tags))
+
+            headers = {"ETag": entry["etag"], "Cache-Control": cache_control}
+            if _matches(request.headers.get("if-none-match"), entry["etag"]):
+                return Response(status_code=304, headers=headers)
+            return Response(content=entry["body"], media_type="application/json", headers=headers)
+
+        wrapper.__signature__ = signature
+        return wrapper
+
+    return decorate
@@ -0,0 +1,55 @@
+"""
+Fast JSON responses.
+
+Some endpoints (orders, order items) already build response-shaped dicts
+in their service layer. Returning them through ``FastJSONResponse`` writes
+those dicts straight to JSON bytes with orjson, skipping FastAPI's
+``response_model`` validation and ``jsonable_encoder`` pass. The
+``response_model`` declared on the route is then only used for OpenAPI.
+
+Datetimes are rendered in America/Phoenix, same as ``PhoenixBaseModel``.
+"""
+from datetime import datetime
+from decimal import Decimal
+from typing import Any
+
+import orjson
+from fastapi.responses import Response
+
+from ..schemas.base import _dt_to_phoenix
+
+_ORJSON_OPTIONS = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+
+
+def _default(value: Any) -> Any:
+    """Encode the types orjson does not handle natively (or is told to pass through)."""
+    if isinstance(value, datetime):
+        return _dt_to_phoenix(value)
+    if isinstance(value, Decimal):
+        return float(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    """
+    Serialize content to JSON bytes.
+
+    Args:
+        content: Dicts, lists and scalars as produced by the serializers
+
+    Returns:
+        UTF-8 encoded JSON
+    """
+    return orjson.dumps(content, default=_default, option=_ORJSON_OPTIONS)
+
+
+class FastJSONResponse(Response):
+    """
+    JSON response rendered with orjson.
+
+    Content must already match the route's response schema; it is not validated.
+    """
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
@@ -1,10 +1,11 @@
 from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker, Session, declarative_base
-from sqlalchemy.pool import QueuePool
 from typing import Generator
 import logging
 
 from ..core.config import settings
+from .pool_metrics import InstrumentedQueuePool
+from .routing import ReplicaRouter, RoutingSession
 
 logger = logging.getLogger(__name__)
 
@@ -17,29 +18,23 @@ DATABASE_URI = f"mysql+pymysql://{settings.MYSQL_USER}:{settings.MYSQL_PASSWORD}
 # Create database engine with connection pooling
 engine = create_engine(
     DATABASE_URI,
-    poolclass=QueuePool,
+    poolclass=InstrumentedQueuePool,  # QueuePool with telemetry (see db/pool_metrics.py)
     pool_pre_ping=True,  # Verify connections before using
     pool_recycle=settings.DB_POOL_RECYCLE,  # Recycle connections
     pool_size=settings.DB_POOL_SIZE,  # Connection pool size
     max_overflow=settings.DB_MAX_OVERFLOW,  # Max overflow connections
-    pool_timeout=30,  # Timeout for getting connection from pool
+    pool_timeout=settings.DB_POOL_TIMEOUT,  # Timeout for getting connection from pool
     echo=settings.DB_ECHO,  # SQL logging (from config)
 )
 
 
-# Event listener for connection pool checkout
+# Event listener for new connections; checkouts are counted by the pool itself
 @event.listens_for(engine, "connect")
 def receive_connect(dbapi_conn, connection_record):
     """Event listener when a connection is created."""
     logger.debug("Database connection established")
 
 
-@event.listens_for(engine, "checkout")
-def receive_checkout(dbapi_conn, connection_record, connection_proxy):
-    """Event listener when a connection is checked out from the pool."""
-    logger.debug("Connection checked out from pool")
-
-
 # Create session factory with optimized settings
 SessionLocal = sessionmaker(
     autocommit=False,
@@ -49,6 +44,42 @@ SessionLocal = sessionmaker(
 )
 
 
+def _create_replica_engine():
+    """Engine for the read replica, or None when replica reads are off."""
+    if not (settings.READ_REPLICA_ENABLED and settings.MYSQL_REPLICA_SERVER):
+        return None
+    return create_engine(
+        f"mysql+pymysql://{settings.MYSQL_USER}:{settings.MYSQL_PASSWORD}"
+        f"@{settings.MYSQL_REPLICA_SERVER}:{settings.MYSQL_REPLICA_PORT}/{settings.MYSQL_DB}",
+        poolclass=InstrumentedQueuePool,
+        pool_pre_ping=True,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        echo=settings.DB_ECHO,
+    )
+
+
+replica_engine = _create_replica_engine()
+
+# Reads of reporting endpoints; falls back to the primary (see db/routing.py)
+read_router = ReplicaRouter(
+    engine,
+    replica_engine,
+    max_lag_seconds=settings.READ_REPLICA_MAX_LAG_SECONDS,
+    check_interval=settings.READ_REPLICA_LAG_CHECK_SECONDS,
+)
+
+ReadSessionLocal = sessionmaker(
+    class_=RoutingSession,
+    router=read_router,
+    autocommit=False,
+    autoflush=False,
+    expire_on_commit=False
+)
+
+
 def get_db() -> Generator[Session, None, None]:
     """
     Dependency function that yields database sessions.
@@ -85,6 +116,29 @@ def get_db() -> Generator[Session, None, None]:
         db.close()
 
 
+def get_read_db() -> Generator[Session, None, None]:
+    """
+    Dependency for read-mostly endpoints (reports, analytics, dashboards).
+
+    Reads go to the read replica while it is within the staleness bound and
+    the request has not written; writes always go to the primary. With
+    READ_REPLICA_ENABLED off this behaves like get_db.
+
+    Yields:
+        Session: A routing database session
+    """
+    db = ReadSessionLocal()
+    try:
+        yield db
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Database error: {str(e)}")
+        raise
+    finally:
+        db.close()
+
+
 def get_db_context():
     """
     Context manager for database sessions.
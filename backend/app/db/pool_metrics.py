@@ -0,0 +1,302 @@
+"""
+Connection Pool Telemetry
+
+``InstrumentedQueuePool`` is a QueuePool that records, per worker process:
+
+- checkout wait times as a histogram (plus count, sum and max),
+- checkout timeouts (``QueuePool limit ... reached``),
+- the in-use gauge, its peak, and how long the pool spent at each in-use
+  level (time-weighted, so percentiles describe real concurrency rather
+  than how often it changed).
+
+Every uvicorn worker has its own pool, so the advisor works across
+processes: each worker periodically writes its numbers to a small JSON
+file in ``DB_POOL_STATS_DIR`` and ``recommend_pool_size`` combines the
+fresh files into a per-worker ``pool_size``/``max_overflow`` that fits
+MySQL's ``max_connections``. The advice is only reported; nothing is
+resized at runtime.
+"""
+import json
+import logging
+import math
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+from sqlalchemy import exc
+from sqlalchemy.pool import QueuePool
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds (milliseconds) of the checkout wait histogram; the last bucket is open
+WAIT_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000)
+
+# Headroom applied to observed concurrency when recommending sizes
+HEADROOM = 1.25
+
+# Connections kept free for migrations, consoles and monitoring
+RESERVED_CONNECTIONS = 10
+
+
+class PoolMetrics:
+    """Thread-safe counters for one pool in one process."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.started_at = datetime.now(timezone.utc)
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_buckets = [0] * (len(WAIT_BUCKETS_MS) + 1)
+        self.wait_sum_ms = 0.0
+        self.wait_max_ms = 0.0
+        self.in_use = 0
+        self.peak_in_use = 0
+        self._level_seconds: Dict[int, float] = {}
+        self._level_since = time.monotonic()
+
+    def _move_level(self, level: int) -> None:
+        now = time.monotonic()
+        self._level_seconds[self.in_use] = self._level_seconds.get(self.in_use, 0.0) + now - self._level_since
+        self._level_since = now
+        self.in_use = level
+        self.peak_in_use = max(self.peak_in_use, level)
+
+    def observe_checkout(self, wait_seconds: float, in_use: int) -> None:
+        wait_ms = wait_seconds * 1000
+        index = next((i for i, bound in enumerate(WAIT_BUCKETS_MS) if wait_ms <= bound), len(WAIT_BUCKETS_MS))
+        with self._lock:
+            self.checkouts += 1
+            self.wait_buckets[index] += 1
+            self.wait_sum_ms += wait_ms
+            self.wait_max_ms = max(self.wait_max_ms, wait_ms)
+            self._move_level(in_use)
+
+    def observe_timeout(self) -> None:
+        with self._lock:
+            self.timeouts += 1
+
+    def observe_checkin(self, in_use: int) -> None:
+        with self._lock:
+            self._move_level(in_use)
+
+    def concurrency_percentile(self, q: float) -> int:
+        """In-use level the pool stayed at or below for fraction ``q`` of the time."""
+        with self._lock:
+            levels = dict(self._level_seconds)
+            levels[self.in_use] = levels.get(self.in_use, 0.0) + time.monotonic() - self._level_since
+        total = sum(levels.values())
+        if total <= 0:
+            return self.in_use
+        running = 0.0
+        for level in sorted(levels):
+            running += levels[level]
+            if running >= q * total:
+                return level
+        return max(levels)
+
+    def wait_percentile_ms(self, q: float) -> Optional[float]:
+        """Upper bound of the histogram bucket holding the q-th wait (None if open-ended)."""
+        with self._lock:
+            buckets, count = list(self.wait_buckets), self.checkouts
+        if count == 0:
+            return 0.0
+        running = 0
+        for index, bucket in enumerate(buckets):
+            running += bucket
+            if running >= q * count:
+                return float(WAIT_BUCKETS_MS[index]) if index < len(WAIT_BUCKETS_MS) else None
+        return None
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            histogram = {
+                **{f"le_{bound}ms": n for bound, n in zip(WAIT_BUCKETS_MS, self.wait_buckets)},
+                "gt_30000ms": self.wait_buckets[-1],
+            }
+            data = {
+                "since": self.started_at.isoformat(),
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "in_use": self.in_use,
+                "peak_in_use": self.peak_in_use,
+                "wait_ms": {
+                    "count": self.checkouts,
+                    "sum": round(self.wait_sum_ms, 3),
+                    "max": round(self.wait_max_ms, 3),
+                    "histogram": histogram,
+                },
+            }
+        data["wait_ms"]["p95_bucket"] = self.wait_percentile_ms(0.95)
+        data["concurrency"] = {
+            "p50": self.concurrency_percentile(0.50),
+            "p95": self.concurrency_percentile(0.95),
+            "p99": self.concurrency_percentile(0.99),
+        }
+        return data
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that feeds a PoolMetrics; drop-in for ``poolclass``."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+        self._in_get = threading.local()
+
+    def recreate(self) -> "InstrumentedQueuePool":
+        # Keep counting across dispose()/invalidation
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+    def _do_get(self):
+        # QueuePool._do_get recurses; only the outermost call is a checkout
+        if getattr(self._in_get, "active", False):
+            return super()._do_get()
+        self._in_get.active = True
+        start = time.perf_counter()
+        try:
+            record = super()._do_get()
+        except exc.TimeoutError:
+            self.metrics.observe_timeout()
+            raise
+        finally:
+            self._in_get.active = False
+        self.metrics.observe_checkout(time.perf_counter() - start, self.checkedout())
+        return record
+
+    def _do_return_conn(self, record) -> None:
+        super()._do_return_conn(record)
+        self.metrics.observe_checkin(self.checkedout())
+
+    def stats(self) -> dict:
+        """Current pool state plus the collected metrics."""
+        return {
+            "pool_size": self.size(),
+            "max_overflow": self._max_overflow,
+            "checked_out": self.checkedout(),
+            "checked_in": self.checkedin(),
+            "overflow": self.overflow(),
+            "timeout_seconds": self.timeout(),
+            **self.metrics.snapshot(),
+        }
+
+
+def pool_stats(engine) -> Optional[dict]:
+    """Stats of an engine's pool, or None when it is not instrumented."""
+    pool = getattr(engine, "pool", None)
+    return pool.stats() if isinstance(pool, InstrumentedQueuePool) else None
+
+
+# ---------------------------------------------------------------------------
+# Cross-worker advisor
+# ---------------------------------------------------------------------------
+
+def publish_worker_stats(engine, directory: str, pid: Optional[int] = None) -> Optional[str]:
+    """
+    Write this worker's pool numbers to ``<directory>/pool-<pid>.json``.
+
+    Returns:
+        Path written, or None when the engine's pool is not instrumented
+    """
+    stats = pool_stats(engine)
+    if stats is None:
+        return None
+    pid = pid or os.getpid()
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"pool-{pid}.json")
+    payload = {
+        "pid": pid,
+        "published_at": time.time(),
+        "pool_size": stats["pool_size"],
+        "max_overflow": stats["max_overflow"],
+        "peak_in_use": stats["peak_in_use"],
+        "p95_in_use": stats["concurrency"]["p95"],
+        "timeouts": stats["timeouts"],
+        "wait_max_ms": stats["wait_ms"]["max"],
+    }
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as fh:
+        json.dump(payload, fh)
+    os.replace(tmp_path, path)
+    return path
+
+
+def remove_worker_stats(directory: str, pid: Optional[int] = None) -> None:
+    """Delete this worker's file on shutdown."""
+    try:
+        os.remove(os.path.join(directory, f"pool-{pid or os.getpid()}.json"))
+    except FileNotFoundError:
+        pass
+
+
+def read_worker_stats(directory: str, max_age_seconds: float) -> List[dict]:
+    """Stats files of workers that published within ``max_age_seconds``."""
+    if not os.path.isdir(directory):
+        return []
+    now = time.time()
+    workers = []
+    for name in sorted(os.listdir(directory)):
+        if not (name.startswith("pool-") and name.endswith(".json")):
+            continue
+        try:
+            with open(os.path.join(directory, name)) as fh:
+                stats = json.load(fh)
+        except (OSError, ValueError):
+            continue
+        if now - stats.get("published_at", 0) <= max_age_seconds:
+            workers.append(stats)
+    return workers
+
+
+def recommend_pool_size(workers: List[dict], max_connections: Optional[int] = None) -> dict:
+    """
+    Recommend per-worker pool settings from observed concurrency.
+
+    ``pool_size`` covers the p95 in-use level of the busiest worker and
+    ``max_overflow`` the rest of its peak, both with headroom. When MySQL's
+    ``max_connections`` is known, the total over all workers is capped to
+    it minus RESERVED_CONNECTIONS.
+
+    Args:
+        workers: Stats published by each live worker
+        max_connections: Server connection limit, if known
+
+    Returns:
+        dict: Observed numbers, current and recommended settings, notes
+    """
+    if not workers:
+        return {"workers": 0, "notes": ["No worker has published pool stats yet"]}
+
+    p95 = max(w["p95_in_use"] for w in workers)
+    peak = max(w["peak_in_use"] for w in workers)
+    timeouts = sum(w["timeouts"] for w in workers)
+    pool_size = max(1, math.ceil(p95 * HEADROOM))
+    max_overflow = max(0, math.ceil(peak * HEADROOM) - pool_size)
+    notes = []
+    if timeouts:
+        notes.append(f"{timeouts} checkout timeouts observed: the pool was exhausted at peak")
+
+    if max_connections:
+        budget = max(len(workers), max_connections - RESERVED_CONNECTIONS)
+        per_worker = budget // len(workers)
+        if pool_size + max_overflow > per_worker:
+            notes.append(
+                f"Capped to {per_worker} connections per worker to stay under "
+                f"max_connections={max_connections} with {len(workers)} workers"
+            )
+            pool_size = min(pool_size, per_worker)
+            max_overflow = max(0, per_worker - pool_size)
+
+    current = workers[0]
+    return {
+        "workers": len(workers),
+        "observed": {"p95_in_use": p95, "peak_in_use": peak, "timeouts": timeouts},
+        "current": {"pool_size": current["pool_size"], "max_overflow": current["max_overflow"]},
+        "recommended": {"pool_size": pool_size, "max_overflow": max_overflow},
+        "total_connections": len(workers) * (pool_size + max_overflow),
+        "max_connections": max_connections,
+        "notes": notes,
+    }
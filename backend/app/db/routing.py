@@ -0,0 +1,191 @@
+"""
+Read Replica Routing
+
+Sends reads of reporting and analytics endpoints to a read-only replica
+while writes, and reads that must see them, stay on the primary.
+
+- ``ReplicaRouter`` picks the engine for reads: the replica when it is
+  configured, reachable and no more than ``max_lag_seconds`` behind the
+  primary, otherwise the primary. Replication lag is probed at most once
+  per ``check_interval`` seconds.
+- ``RoutingSession`` asks the router for every statement, so a single
+  session can read from the replica and still send writes to the primary.
+- Read-your-writes: ``ReadPinMiddleware`` gives each request a pin. Any
+  flush or DML statement in the request, or an explicit
+  ``pin_reads_to_primary()``, sends the rest of the request's reads to the
+  primary.
+"""
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Iterator, Optional
+
+from sqlalchemy import event, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.elements import TextClause
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+
+class _ReadPin:
+    """Mutable per-request flag; shared by every context copied from the request."""
+    __slots__ = ("pinned",)
+
+    def __init__(self):
+        self.pinned = False
+
+
+_read_pin: ContextVar[Optional[_ReadPin]] = ContextVar("read_pin", default=None)
+
+
+def pin_reads_to_primary() -> None:
+    """Send the rest of the current request's reads to the primary."""
+    pin = _read_pin.get()
+    if pin is not None:
+        pin.pinned = True
+
+
+def reads_pinned() -> bool:
+    """Whether the current request has written or asked for primary reads."""
+    pin = _read_pin.get()
+    return pin is not None and pin.pinned
+
+
+@contextmanager
+def read_pin_scope() -> Iterator[None]:
+    """Scope with its own pin: one request, or one background job run."""
+    token = _read_pin.set(_ReadPin())
+    try:
+        yield
+    finally:
+        _read_pin.reset(token)
+
+
+class ReadPinMiddleware:
+    """Gives every HTTP request its own read-your-writes pin."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        with read_pin_scope():
+            await self.app(scope, receive, send)
+
+
+@event.listens_for(Session, "after_flush")
+def _pin_after_flush(session, flush_context):
+    # Any session of the request wrote: later replica reads could miss it
+    pin_reads_to_primary()
+
+
+def replica_lag_seconds(replica: Engine) -> Optional[float]:
+    """
+    Replication lag reported by the replica.
+
+    Returns:
+        Seconds behind the source; 0 for backends without replication
+        status; None when replication is stopped or the status is unavailable
+    """
+    if replica.dialect.name != "mysql":
+        return 0.0
+    with replica.connect() as conn:
+        for statement, column in (
+            ("SHOW REPLICA STATUS", "Seconds_Behind_Source"),
+            ("SHOW SLAVE STATUS", "Seconds_Behind_Master"),  # MySQL < 8.0.22
+        ):
+            try:
+                row = conn.execute(text(statement)).mappings().first()
+            except Exception:
+                continue
+            if row is None:
+                # Not configured as a replica; nothing to wait for
+                return 0.0
+            lag = row.get(column)
+            return float(lag) if lag is not None else None
+    return None
+
+
+class ReplicaRouter:
+    """Chooses between the primary and an optional read replica."""
+
+    def __init__(
+        self,
+        primary: Engine,
+        replica: Optional[Engine] = None,
+        max_lag_seconds: float = 5.0,
+        check_interval: float = 5.0,
+        lag_probe: Callable[[Engine], Optional[float]] = replica_lag_seconds,
+    ):
+        self.primary = primary
+        self.replica = replica
+        self.max_lag_seconds = max_lag_seconds
+        self.check_interval = check_interval
+        self._lag_probe = lag_probe
+        self._lock = threading.Lock()
+        self._checked_at = float("-inf")
+        self._replica_usable = replica is not None
+        self.last_lag: Optional[float] = None
+
+    def _check_replica(self) -> bool:
+        now = time.monotonic()
+        if now - self._checked_at < self.check_interval:
+            return self._replica_usable
+        with self._lock:
+            if now - self._checked_at < self.check_interval:
+                return self._replica_usable
+            try:
+                lag = self._lag_probe(self.replica)
+            except Exception as exc:
+                logger.warning("Read replica unavailable, reading from primary: %s", exc)
+                lag = None
+            usable = lag is not None and lag <= self.max_lag_seconds
+            if usable != self._replica_usable:
+                logger.warning("Read replica %s (lag: %s s)", "back in use" if usable else "bypassed", lag)
+            self.last_lag, self._replica_usable, self._checked_at = lag, usable, now
+            return usable
+
+    def read_engine(self) -> Engine:
+        """Engine for a read in the current context."""
+        if self.replica is None or reads_pinned():
+            return self.primary
+        return self.replica if self._check_replica() else self.primary
+
+    def status(self) -> dict:
+        """Replica state for the health endpoint."""
+        return {
+            "configured": self.replica is not None,
+            "in_use": self.replica is not None and self._replica_usable,
+            "lag_seconds": self.last_lag,
+            "max_lag_seconds": self.max_lag_seconds,
+        }
+
+
+_READ_ONLY_PREFIXES = ("SELECT", "SHOW", "WITH", "EXPLAIN")
+
+
+def _is_write(clause) -> bool:
+    if isinstance(clause, TextClause):
+        # Raw SQL: only statements that are clearly reads may use the replica
+        return not clause.text.lstrip().upper().startswith(_READ_ONLY_PREFIXES)
+    return getattr(clause, "is_dml", False)
+
+
+class RoutingSession(Session):
+    """Session that reads through a ReplicaRouter and writes to the primary."""
+
+    def __init__(self, router: ReplicaRouter, **kwargs):
+        super().__init__(**kwargs)
+        self.router = router
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        if self._flushing or _is_write(clause):
+            pin_reads_to_primary()
+            return self.router.primary
+        return self.router.read_engine()
@@ -0,0 +1,56 @@
+"""
+Request ID middleware.
+Assigns every request a correlation ID used by the logging pipeline.
+"""
+import re
+import uuid
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from ..core.logging_config import request_id_var
+
+REQUEST_ID_HEADER = "X-Request-ID"
+
+# Accept IDs from upstream proxies only if they look sane (no log injection)
+_VALID_REQUEST_ID = re.compile(r"^[A-Za-z0-9._-]{1,64}$")
+
+
+class RequestIdMiddleware:
+    """
+    Middleware that binds a request ID to the logging context.
+
+    Reuses an incoming X-Request-ID header when valid, otherwise generates
+    one, and echoes it back on the response. Written as plain ASGI rather
+    than BaseHTTPMiddleware so the context variable is set in the same
+    context the endpoint runs in and no extra task is spawned per request.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = None
+        for name, value in scope["headers"]:
+            if name == b"x-request-id":
+                candidate = value.decode("latin-1")
+                if _VALID_REQUEST_ID.match(candidate):
+                    request_id = candidate
+                break
+        if request_id is None:
+            request_id = uuid.uuid4().hex
+
+        async def send_with_request_id(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message)[REQUEST_ID_HEADER] = request_id
+            await send(message)
+
+        token = request_id_var.set(request_id)
+        try:
+            await self.app(scope, receive, send_with_request_id)
+        finally:
+            request_id_var.reset(token)
@@ -45,20 +45,18 @@ async def get_restaurant_from_request(request: Request) -> Optional[Restaurant]:
     Returns None if no subdomain or restaurant not found.
     """
     # PRIORITY 1: Check for explicit x-restaurant-subdomain header first (for Electron/mobile apps)
+    # Logging here runs on every request: keep it at DEBUG with lazy %-args
     hdr_sub = request.headers.get('x-restaurant-subdomain')
-    logger.info(f"[get_restaurant_from_request] x-restaurant-subdomain header: {hdr_sub}")
+    host = request.headers.get('host', '')
     
     if hdr_sub:
         subdomain = hdr_sub.strip().lower()
-        logger.info(f"[get_restaurant_from_request] Using subdomain from x-restaurant-subdomain header: {subdomain}")
+        logger.debug("[get_restaurant_from_request] Using subdomain from x-restaurant-subdomain header: %s", subdomain)
     else:
         # PRIORITY 2: Get host from request
-        host = request.headers.get('host', '')
-        logger.info(f"[get_restaurant_from_request] Host header: {host}")
-        
         # Extract subdomain from Host
         subdomain = extract_subdomain(host)
-        logger.info(f"[get_restaurant_from_request] Subdomain from host: {subdomain}")
+        logger.debug("[get_restaurant_from_request] Host header: %s, subdomain: %s", host, subdomain)
 
         # Treat reserved subdomains as non-tenant so we can resolve via Origin/Referer/header
         if subdomain in RESERVED_SUBDOMAINS:
@@ -75,17 +73,17 @@ async def get_restaurant_from_request(request: Request) -> Optional[Restaurant]:
                         origin_host = parsed.hostname or ''
                         subdomain = extract_subdomain(origin_host)
                         if subdomain:
-                            logger.debug(f"Resolved subdomain from header ({'Origin' if hdr==origin else 'Referer'}): {subdomain}")
+                            logger.debug("Resolved subdomain from header (%s): %s", 'Origin' if hdr == origin else 'Referer', subdomain)
                             break
                     except Exception:
                         # ignore parse errors
                         pass
     
     if not subdomain:
-        logger.warning(f"[get_restaurant_from_request] No subdomain found in host: {host}")
+        logger.debug("[get_restaurant_from_request] No subdomain found in host: %s", host)
         return None
     
-    logger.info(f"[get_restaurant_from_request] Final subdomain to query: {subdomain}")
+    logger.debug("[get_restaurant_from_request] Final subdomain to query: %s", subdomain)
     
     # Query database for restaurant
     db = SessionLocal()
@@ -96,9 +94,9 @@ async def get_restaurant_from_request(request: Request) -> Optional[Restaurant]:
         ).first()
         
         if restaurant:
-            logger.debug(f"Found restaurant: {restaurant.name} (subdomain: {subdomain})")
+            logger.debug("Found restaurant: %s (subdomain: %s)", restaurant.name, subdomain)
         else:
-            logger.warning(f"No active restaurant found for subdomain: {subdomain}")
+            logger.warning("No active restaurant found for subdomain: %s", subdomain)
         
         return restaurant
     finally:
@@ -139,7 +137,7 @@ class RestaurantMiddleware(BaseHTTPMiddleware):
             restaurant = await get_restaurant_from_request(request)
             if restaurant:
                 request.state.restaurant = restaurant
-                logger.debug(f"Restaurant context set: {restaurant.name}")
+                logger.debug("Restaurant context set: %s", restaurant.name)
         except Exception as e:
             logger.exception("Error resolving restaurant from request: %s", e)
         response = await call_next(request)
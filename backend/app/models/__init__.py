@@ -7,6 +7,9 @@ from .table import Table
 from .order import Order, OrderItem, OrderStatus
 from .order_person import OrderPerson
 from .order_item_extra import OrderItemExtra
+from .order_search_token import OrderSearchToken
+from .outbox_event import OutboxEvent, OutboxStatus
+from .job_run import JobRun, JobRunStatus
 from .cash_register import (
     CashRegisterSession,
     CashTransaction,
@@ -15,7 +18,7 @@ from .cash_register import (
     TransactionType,
     ReportType
 )
-from .special_note_stats import SpecialNoteStats
+from .special_note_stats import SpecialNoteStats, SpecialNoteItemStats
 from .subscription_plan import SubscriptionPlan, PlanTier
 from .subscription_addon import SubscriptionAddon, AddonType, AddonCategory
 from .restaurant_subscription import RestaurantSubscription, SubscriptionStatus, BillingCycle
@@ -32,6 +35,9 @@ __all__ = [
     "MenuItem", "MenuItemVariant", "Category",
     "Table",
     "Order", "OrderItem", "OrderStatus", "OrderPerson", "OrderItemExtra",
+    "OrderSearchToken",
+    "OutboxEvent", "OutboxStatus",
+    "JobRun", "JobRunStatus",
     "CashRegisterSession",
     "CashTransaction",
     "CashRegisterReport",
@@ -39,6 +45,7 @@ __all__ = [
     "TransactionType",
     "ReportType",
     "SpecialNoteStats",
+    "SpecialNoteItemStats",
     "Restaurant",
     "Printer", "PrinterType",
     "SubscriptionPlan", "PlanTier",
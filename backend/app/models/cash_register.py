@@ -1,6 +1,9 @@
+import zlib
 from enum import Enum as PyEnum
-from sqlalchemy import Column, DateTime, Enum as SQLEnum, ForeignKey, Text, DECIMAL, Integer, event
-from sqlalchemy.orm import relationship, validates
+from sqlalchemy import (
+    Boolean, Column, DateTime, Enum as SQLEnum, ForeignKey, Index, LargeBinary, Text, DECIMAL, Integer, event, select
+)
+from sqlalchemy.orm import deferred, relationship, validates
 from typing import TYPE_CHECKING, Optional
 from .base import BaseModel
 
@@ -81,15 +84,65 @@ class CashTransaction(BaseModel):
 
 
 class CashRegisterReport(BaseModel):
+    """
+    Stored report of a session: the cuts taken during it and, once it is
+    closed, one final summary snapshot (``is_final``) that summaries are
+    served from instead of recomputing the session's transactions.
+
+    The totals of summary reports are columns, so reports can be filtered
+    and aggregated in SQL; the full report is kept as zlib-compressed JSON
+    in ``payload`` and read or written through ``data`` (a JSON string).
+    """
     __tablename__ = "cash_register_reports"
 
     session_id = Column(Integer, ForeignKey("cash_register_sessions.id"), nullable=False)
+    # Copied from the session on insert
+    restaurant_id = Column(Integer, ForeignKey("restaurants.id"), nullable=False)
     report_type = Column(SQLEnum(ReportType, name='report_type', values_callable=lambda x: [e.value for e in x]), nullable=False)
-    data = Column(Text, nullable=False)  # JSON string for report data
+    # zlib-compressed JSON report data, loaded only when read
+    payload = deferred(Column(LargeBinary, nullable=False))
     generated_at = Column(DateTime(timezone=True), nullable=False)
+    is_final = Column(Boolean, nullable=False, default=False)
+
+    # Summary totals (daily summary reports only)
+    total_sales = Column(DECIMAL(10, 2), nullable=True)
+    total_refunds = Column(DECIMAL(10, 2), nullable=True)
+    total_tips = Column(DECIMAL(10, 2), nullable=True)
+    total_expenses = Column(DECIMAL(10, 2), nullable=True)
+    net_cash_flow = Column(DECIMAL(10, 2), nullable=True)
+    total_transactions = Column(Integer, nullable=True)
+    cash_payments = Column(DECIMAL(10, 2), nullable=True)
+    card_payments = Column(DECIMAL(10, 2), nullable=True)
+    digital_payments = Column(DECIMAL(10, 2), nullable=True)
+    other_payments = Column(DECIMAL(10, 2), nullable=True)
 
     # Relationships
     session = relationship("CashRegisterSession", back_populates="reports")
 
+    __table_args__ = (
+        Index('ix_cash_register_reports_restaurant_type_generated', 'restaurant_id', 'report_type', 'generated_at'),
+        Index('ix_cash_register_reports_session_type_generated', 'session_id', 'report_type', 'generated_at'),
+    )
+
+    @property
+    def data(self) -> Optional[str]:
+        """The report as a JSON string."""
+        if self.payload is None:
+            return None
+        return zlib.decompress(self.payload).decode("utf-8")
+
+    @data.setter
+    def data(self, value: str) -> None:
+        self.payload = zlib.compress(value.encode("utf-8"))
+
     def __repr__(self) -> str:
         return f"<CashRegisterReport(id={self.id}, type='{self.report_type}', session={self.session_id})>"
+
+
+@event.listens_for(CashRegisterReport, "before_insert")
+def _copy_restaurant_id(mapper, connection, report: CashRegisterReport) -> None:
+    if report.restaurant_id is None:
+        sessions = CashRegisterSession.__table__
+        report.restaurant_id = connection.execute(
+            select(sessions.c.restaurant_id).where(sessions.c.id == report.session_id)
+        ).scalar_one()
@@ -0,0 +1,48 @@
+from datetime import datetime, timezone
+from enum import Enum as PyEnum
+from typing import Optional
+from sqlalchemy import Integer, String, Text, DateTime, Enum as SQLEnum, Index
+from sqlalchemy.orm import Mapped, mapped_column
+from ..db.base import Base
+
+
+class JobRunStatus(str, PyEnum):
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+class JobRun(Base):
+    """
+    One run of a cluster-wide scheduled job.
+
+    Written by ``app.services.scheduler`` on the worker that holds the
+    scheduler lock, so the table is the cluster's run history.
+
+    Note: Does not inherit from BaseModel; old runs are purged, never
+    soft deleted.
+    """
+    __tablename__ = "scheduled_job_runs"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    job_name: Mapped[str] = mapped_column(String(64), nullable=False)
+    status: Mapped[JobRunStatus] = mapped_column(
+        SQLEnum(JobRunStatus, name="job_run_status", values_callable=lambda x: [e.value for e in x]),
+        nullable=False, default=JobRunStatus.RUNNING
+    )
+    # Process that ran the job, as "host:pid"
+    worker: Mapped[str] = mapped_column(String(128), nullable=False)
+    started_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, default=lambda: datetime.now(timezone.utc)
+    )
+    finished_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    duration_ms: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+
+    __table_args__ = (
+        # Serves "latest runs of a job" and the purge of old runs
+        Index("ix_scheduled_job_runs_job_started", "job_name", "started_at"),
+    )
+
+    def __repr__(self) -> str:
+        return f"<JobRun(id={self.id}, job='{self.job_name}', status='{self.status}')>"
@@ -1,7 +1,8 @@
 from sqlalchemy import String, Float, Boolean, Integer, ForeignKey, Column, Text, and_, JSON
 from sqlalchemy.orm import relationship, Mapped, mapped_column
-from typing import List, Optional, TYPE_CHECKING
+from typing import Dict, List, Optional, TYPE_CHECKING
 from .base import BaseModel
+from ..core.media import menu_image_urls
 
 if TYPE_CHECKING:
     from .order_item import OrderItem
@@ -51,6 +52,10 @@ class MenuItem(BaseModel):
     category_id: Mapped[int] = mapped_column(ForeignKey("categories.id"), nullable=False)
     is_available: Mapped[bool] = mapped_column(default=True, nullable=False)
     image_url: Mapped[Optional[str]] = mapped_column(String(500), nullable=True)
+    # Uploaded image (see core/media.py): file name of the original, and the sizes
+    # generated from it so far; takes precedence over image_url
+    image_key: Mapped[Optional[str]] = mapped_column(String(40), nullable=True)
+    image_variants: Mapped[Optional[list]] = mapped_column(JSON, nullable=True, default=None)
     
     # Ingredients configuration (JSON field for flexibility and performance)
     # Structure: {"options": [{"name": str, "choices": [str], "default": str}], "removable": [str]}
@@ -81,6 +86,11 @@ class MenuItem(BaseModel):
             return self.discount_price
         return self.price
     
+    @property
+    def image_urls(self) -> Optional[Dict[str, str]]:
+        """Image URL at each size (thumb, card, large, original), or None without an image"""
+        return menu_image_urls(self.restaurant_id, self.image_key, self.image_variants, self.image_url)
+    
     def __repr__(self) -> str:
         return f"<MenuItem(id={self.id}, name='{self.name}', price={self.price})>"
 
@@ -1,6 +1,6 @@
 from typing import List, Optional, TYPE_CHECKING
 from datetime import datetime
-from sqlalchemy import Integer, String, ForeignKey, DateTime
+from sqlalchemy import Integer, String, Float, ForeignKey, DateTime
 from sqlalchemy.orm import relationship, Mapped, mapped_column
 from .base import BaseModel
 
@@ -19,6 +19,8 @@ class OrderPerson(BaseModel):
     order_id: Mapped[int] = mapped_column(Integer, ForeignKey("orders.id"), nullable=False, index=True)
     name: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)  # "Persona 1", "Juan", etc.
     position: Mapped[int] = mapped_column(Integer, default=1, nullable=False)  # Order of persons (1, 2, 3...)
+    # Items plus extras of this person, maintained by services/orders/totals.py
+    subtotal: Mapped[float] = mapped_column(Float, default=0.0, server_default="0", nullable=False)
     
     # Relationships
     order: Mapped["Order"] = relationship("Order", back_populates="persons")
@@ -0,0 +1,41 @@
+from typing import Optional
+from sqlalchemy import Integer, String, ForeignKey, Index
+from sqlalchemy.orm import Mapped, mapped_column
+from ..db.base import Base
+
+
+class OrderSearchToken(Base):
+    """
+    One searchable word of an order, for indexed order search.
+
+    Rows are derived from the order's number, ticket number, customer name,
+    notes and item names, and are rewritten by ``app.services.orders.search``
+    whenever one of those changes.
+
+    Note: Does not inherit from BaseModel; tokens are replaced, never
+    soft deleted.
+    """
+    __tablename__ = "order_search_tokens"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    order_id: Mapped[int] = mapped_column(
+        ForeignKey("orders.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    # Set for tokens of an item name, so item changes only rewrite their own rows
+    order_item_id: Mapped[Optional[int]] = mapped_column(
+        ForeignKey("order_items.id", ondelete="CASCADE"), nullable=True, index=True
+    )
+    # Denormalized so a search never leaves the tenant's slice of the index
+    restaurant_id: Mapped[int] = mapped_column(Integer, ForeignKey("restaurants.id"), nullable=False)
+    # Normalized word: lowercase, accents stripped (e.g. "jose", "cebolla", "42")
+    token: Mapped[str] = mapped_column(String(64), nullable=False)
+    # Relevance of the field the token came from (ticket number > name > items > notes)
+    weight: Mapped[int] = mapped_column(Integer, nullable=False, default=1)
+
+    __table_args__ = (
+        # Serves "token LIKE 'term%'" prefix lookups within one restaurant
+        Index("ix_order_search_tokens_restaurant_token", "restaurant_id", "token"),
+    )
+
+    def __repr__(self) -> str:
+        return f"<OrderSearchToken(order_id={self.order_id}, token='{self.token}', weight={self.weight})>"
@@ -0,0 +1,55 @@
+from datetime import datetime, timezone
+from enum import Enum as PyEnum
+from typing import Optional
+from sqlalchemy import Integer, String, Text, DateTime, JSON, Enum as SQLEnum, Index
+from sqlalchemy.orm import Mapped, mapped_column
+from ..db.base import Base
+
+
+class OutboxStatus(str, PyEnum):
+    PENDING = "pending"
+    DONE = "done"
+    FAILED = "failed"
+
+
+class OutboxEvent(Base):
+    """
+    A side effect to run after a commit, written in the same transaction
+    as the change that caused it.
+
+    Drained by the worker in ``app.services.outbox``; delivery is at least
+    once, so handlers must tolerate seeing an event twice.
+
+    Note: Does not inherit from BaseModel; processed events are purged,
+    never soft deleted.
+    """
+    __tablename__ = "outbox_events"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    # What happened, e.g. "order.created"; selects the handler
+    topic: Mapped[str] = mapped_column(String(64), nullable=False)
+    restaurant_id: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    payload: Mapped[dict] = mapped_column(JSON, nullable=False, default=dict)
+    status: Mapped[OutboxStatus] = mapped_column(
+        SQLEnum(OutboxStatus, name="outbox_status", values_callable=lambda x: [e.value for e in x]),
+        nullable=False, default=OutboxStatus.PENDING
+    )
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    last_error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, default=lambda: datetime.now(timezone.utc)
+    )
+    # Not before this time: pushed forward while a worker holds the event
+    # and after a failure (retry backoff)
+    available_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, default=lambda: datetime.now(timezone.utc)
+    )
+    processed_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        # Serves the worker's "status = pending AND available_at <= now ORDER BY id"
+        Index("ix_outbox_events_status_available", "status", "available_at"),
+    )
+
+    def __repr__(self) -> str:
+        return f"<OutboxEvent(id={self.id}, topic='{self.topic}', status='{self.status}')>"
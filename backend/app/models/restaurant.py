@@ -1,4 +1,4 @@
-from sqlalchemy import String, Boolean, Column, Text, Integer, JSON
+from sqlalchemy import String, Boolean, Column, Text, Integer, JSON, ForeignKey
 from sqlalchemy.orm import relationship, Mapped, mapped_column
 from typing import List, Optional, TYPE_CHECKING, Dict, Any
 from .base import BaseModel
@@ -59,6 +59,11 @@ class Restaurant(BaseModel):
         default={"cash": True, "card": False, "digital": True, "other": False}
     )
     
+    # Multi-branch chains: branches point at their headquarters restaurant
+    parent_restaurant_id: Mapped[Optional[int]] = mapped_column(
+        Integer, ForeignKey("restaurants.id"), nullable=True, index=True
+    )
+    
     # Relationships
     users: Mapped[List["User"]] = relationship("User", back_populates="restaurant", cascade="all, delete-orphan")
     menu_items: Mapped[List["MenuItem"]] = relationship("MenuItem", back_populates="restaurant", cascade="all, delete-orphan")
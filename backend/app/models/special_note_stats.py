@@ -47,3 +47,38 @@ class SpecialNoteStats(BaseModel):
     
     def __repr__(self) -> str:
         return f"<SpecialNoteStats(id={self.id}, restaurant_id={self.restaurant_id}, note='{self.note_text}', count={self.usage_count})>"
+
+
+class SpecialNoteItemStats(BaseModel):
+    """
+    Usage of a special note with one menu item, so suggestions can be
+    narrowed to the item (or its category) being ordered. Kept alongside
+    the restaurant-wide count in SpecialNoteStats.
+    """
+    __tablename__ = "special_note_item_stats"
+    
+    restaurant_id: Mapped[int] = mapped_column(
+        Integer, 
+        ForeignKey("restaurants.id"), 
+        nullable=False, 
+        index=True
+    )
+    
+    menu_item_id: Mapped[int] = mapped_column(Integer, ForeignKey("menu_items.id"), nullable=False)
+    
+    note_text: Mapped[str] = mapped_column(String(200), nullable=False)
+    
+    usage_count: Mapped[int] = mapped_column(Integer, default=1, nullable=False)
+    
+    last_used_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), 
+        nullable=False,
+        default=lambda: datetime.now(timezone.utc)
+    )
+    
+    __table_args__ = (
+        UniqueConstraint('restaurant_id', 'menu_item_id', 'note_text', name='uq_restaurant_item_note'),
+    )
+    
+    def __repr__(self) -> str:
+        return f"<SpecialNoteItemStats(id={self.id}, menu_item_id={self.menu_item_id}, note='{self.note_text}', count={self.usage_count})>"
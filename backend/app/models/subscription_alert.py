@@ -1,4 +1,4 @@
-from sqlalchemy import String, Integer, DateTime, ForeignKey, Text, Boolean, Enum as SQLEnum
+from sqlalchemy import String, Integer, DateTime, ForeignKey, Text, Boolean, Index, Enum as SQLEnum
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from datetime import datetime
 from typing import Optional, TYPE_CHECKING
@@ -25,6 +25,10 @@ class SubscriptionAlert(BaseModel):
     Tracks important subscription events and notifications.
     """
     __tablename__ = "subscription_alerts"
+    __table_args__ = (
+        # Serves the unread alerts count of a restaurant
+        Index("ix_subscription_alerts_restaurant_unread", "restaurant_id", "is_read"),
+    )
     
     # Foreign Keys
     restaurant_id: Mapped[int] = mapped_column(ForeignKey("restaurants.id"), nullable=False, index=True)
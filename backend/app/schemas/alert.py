@@ -31,3 +31,8 @@ class AlertResponse(BaseModel):
 class AlertMarkRead(BaseModel):
     """Schema for marking alert as read"""
     alert_ids: list[int]
+
+
+class AlertUnreadCount(BaseModel):
+    """Response schema for the unread alerts counter"""
+    unread_count: int
@@ -135,6 +135,7 @@ class CashRegisterReportInDBBase(CashRegisterReportBase):
     id: int
     session_id: int
     generated_at: datetime
+    is_final: bool = False  # Summary snapshot written when the session was closed
     created_at: datetime
     updated_at: datetime
 
@@ -1,7 +1,7 @@
 from .base import PhoenixBaseModel as BaseModel
 from pydantic import Field, ConfigDict, validator, model_validator
 from enum import Enum
-from typing import Optional, List, Union, Any
+from typing import Optional, List, Union, Any, Dict
 from datetime import datetime
 from ..models.menu import Category as CategoryModel
 from pydantic_core import core_schema
@@ -316,6 +316,8 @@ class MenuItemInDBBase(MenuItemBase):
     category_id: int
     created_at: datetime
     updated_at: datetime
+    # Size-appropriate image URLs: thumb, card, large and original
+    image_urls: Optional[Dict[str, str]] = None
 
     model_config = ConfigDict(from_attributes=True)
 
@@ -330,6 +332,7 @@ class MenuItem(MenuItemInDBBase):
     def from_orm(cls, obj):
         from sqlalchemy import inspect
         obj_dict = {c.key: getattr(obj, c.key) for c in inspect(obj).mapper.column_attrs}
+        obj_dict['image_urls'] = getattr(obj, 'image_urls', None)
         if hasattr(obj, 'category') and obj.category:
             obj_dict['category'] = CategoryInDB(
                 id=obj.category.id,
@@ -1,7 +1,7 @@
 from .base import PhoenixBaseModel as BaseModel
 from pydantic import Field, validator, model_validator
 from datetime import datetime
-from typing import List, Optional
+from typing import Dict, List, Optional
 from enum import Enum
 import re
 from ..core.validators import sanitize_text, validate_name
@@ -30,6 +30,7 @@ class OrderPersonUpdate(BaseModel):
 class OrderPerson(OrderPersonBase):
     id: int
     order_id: int
+    subtotal: float = 0.0
     created_at: datetime
     updated_at: datetime
     items: List['OrderItem'] = []
@@ -122,6 +123,7 @@ class MenuItemBase(BaseModel):
     category: Optional[str] = None
     category_visible_in_kitchen: bool = True
     image_url: Optional[str] = None
+    image_urls: Optional[Dict[str, str]] = None
     is_available: bool = True
 
     class Config:
@@ -246,6 +248,79 @@ class Order(OrderInDBBase):
 class OrderInDB(OrderInDBBase):
     pass
 
+# Kitchen bump (batch item status transitions)
+class ItemStatusTransition(BaseModel):
+    order_id: int = Field(..., ge=1)
+    item_id: int = Field(..., ge=1)
+    status: OrderStatus
+
+class CategoryStatusTransition(BaseModel):
+    """Move every item of a category in one order (e.g. all tacos of order 12)."""
+    order_id: int = Field(..., ge=1)
+    category_id: int = Field(..., ge=1)
+    status: OrderStatus
+
+class KitchenBumpRequest(BaseModel):
+    items: List[ItemStatusTransition] = Field(default_factory=list, max_items=500)
+    categories: List[CategoryStatusTransition] = Field(default_factory=list, max_items=100)
+    update_order_status: bool = Field(True, description="Roll order status up from its items")
+
+    @model_validator(mode='after')
+    def validate_not_empty(self):
+        if not self.items and not self.categories:
+            raise ValueError('At least one transition is required')
+        return self
+
+class ItemStatusDelta(BaseModel):
+    id: int
+    order_id: int
+    status: OrderStatus
+
+class OrderStatusDelta(BaseModel):
+    id: int
+    status: OrderStatus
+
+class KitchenBumpResult(BaseModel):
+    items: List[ItemStatusDelta] = []
+    orders: List[OrderStatusDelta] = []
+    skipped: List[int] = Field(default_factory=list, description="Item IDs already in the requested status")
+    updated_at: datetime
+
+class KitchenQueueExtra(BaseModel):
+    name: str
+    quantity: int
+
+class KitchenQueueItem(BaseModel):
+    """One item to prepare, with just enough order context for a station display."""
+    id: int
+    order_id: int
+    order_number: int
+    ticket_number: Optional[str] = None
+    order_type: str
+    order_status: OrderStatus
+    table_number: Optional[int] = None
+    customer_name: Optional[str] = None
+    person_name: Optional[str] = None
+    order_notes: Optional[str] = None
+    menu_item_id: int
+    name: str
+    variant_name: Optional[str] = None
+    category_id: int
+    category_name: str
+    quantity: int
+    special_instructions: Optional[str] = None
+    extras: List[KitchenQueueExtra] = []
+    status: OrderStatus
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+    age_seconds: int = Field(..., description="Seconds since the item was added")
+    order_age_seconds: int = Field(..., description="Seconds since the order was placed")
+
+class KitchenQueue(BaseModel):
+    printer_ids: Optional[List[int]] = Field(None, description="Printers of the station; null when not filtered")
+    generated_at: datetime
+    items: List[KitchenQueueItem] = []
+
 # Update forward references for circular dependencies
 OrderPersonCreate.update_forward_refs()
 OrderPerson.update_forward_refs()
@@ -1,6 +1,6 @@
 from .base import PhoenixBaseModel as BaseModel
 from pydantic import Field, validator
-from typing import Optional, Dict
+from typing import Optional, Dict, List, Literal
 from datetime import datetime
 from ..core.validators import (
     sanitize_text,
@@ -36,6 +36,7 @@ class RestaurantBase(BaseModel):
         description="Payment methods configuration. Cash is always enabled."
     )
     is_active: bool = True
+    parent_restaurant_id: Optional[int] = Field(None, description="Headquarters restaurant, for branches of a chain")
     
     @validator('name')
     def sanitize_name(cls, v):
@@ -126,6 +127,7 @@ class RestaurantUpdate(BaseModel):
     customer_print_paper_width: Optional[int] = Field(None, ge=58, le=80)
     allow_dine_in_without_table: Optional[bool] = None
     payment_methods_config: Optional[Dict[str, bool]] = None
+    parent_restaurant_id: Optional[int] = None
     
     @validator('name')
     def sanitize_name(cls, v):
@@ -212,3 +214,33 @@ class RestaurantCreationResponse(BaseModel):
     subscription_plan: Optional[str] = None
     welcome_message: str
     shareable_message: str
+
+
+class RestaurantBulkCreate(BaseModel):
+    """Schema for provisioning many branches of a chain at once"""
+    branches: List[RestaurantCreate] = Field(..., min_items=1, max_items=500)
+    menu_template_restaurant_id: Optional[int] = Field(
+        None, description="Restaurant whose categories, items and variants are cloned into every branch"
+    )
+    chunk_size: int = Field(default=25, ge=1, le=100, description="Branches committed per transaction")
+
+
+class BranchProvisionResult(BaseModel):
+    """Outcome of provisioning one branch"""
+    subdomain: str
+    status: Literal["created", "failed"]
+    error: Optional[str] = None
+    restaurant_id: Optional[int] = None
+    restaurant_url: Optional[str] = None
+    admin_email: Optional[str] = None
+    admin_password: Optional[str] = None
+    trial_expires: Optional[datetime] = None
+    subscription_plan: Optional[str] = None
+    menu_items_cloned: int = 0
+
+
+class RestaurantBulkCreationResponse(BaseModel):
+    """Per-branch report of a bulk provisioning request"""
+    created: int
+    failed: int
+    results: List[BranchProvisionResult]
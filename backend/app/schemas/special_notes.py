@@ -13,6 +13,13 @@ class TopSpecialNote(BaseModel):
     
     model_config = ConfigDict(from_attributes=True)
 
+class SuggestedSpecialNote(BaseModel):
+    """Schema for a special note suggested while the note is typed."""
+    note_text: str = Field(..., description="The special note text")
+    usage_count: int = Field(..., description="Number of times this note has been used")
+    score: float = Field(..., description="Usage weighted by recency; higher is better")
+    in_scope: bool = Field(False, description="Used with the requested menu item or category")
+
 class SpecialNoteStatsInDB(BaseModel):
     """Complete schema for special note stats including all fields."""
     id: int
@@ -28,6 +35,7 @@ class SpecialNoteStatsInDB(BaseModel):
 class TrackNoteRequest(BaseModel):
     """Request schema for tracking a special note usage."""
     note_text: str = Field(..., min_length=1, max_length=200, description="The special note to track")
+    menu_item_id: Optional[int] = Field(None, description="Menu item the note was used with")
 
 class TrackNoteResponse(BaseModel):
     """Response schema for note tracking."""
@@ -1,13 +1,53 @@
+from sqlalchemy import func, select
 from sqlalchemy.orm import Session
+from app.core.cache import caches
 from app.models.subscription_alert import SubscriptionAlert, AlertType
 from app.models.restaurant_subscription import RestaurantSubscription, SubscriptionStatus
+from app.models.user import UserRole
+from app.schemas.alert import AlertResponse
+from app.services.realtime import hub
 from datetime import datetime, timedelta
 
+# Real-time events (see services/realtime.py), sent to admins only
+ALERT_CREATED = "alert.created"
+ALERTS_UNREAD = "alerts.unread"
+ADMIN_ROLES = (UserRole.ADMIN.value, UserRole.SYSADMIN.value)
+
+# Unread counters are rewritten on every change; the TTL only bounds drift
+# from writes made outside AlertService
+_unread = caches.namespace("alerts.unread", max_entries=10000, ttl=600, shared=True)
+
 
 class AlertService:
     def __init__(self, db: Session):
         self.db = db
     
+    def _count_unread(self, restaurant_id: int) -> int:
+        return self.db.execute(
+            select(func.count(SubscriptionAlert.id)).where(
+                SubscriptionAlert.restaurant_id == restaurant_id,
+                SubscriptionAlert.is_read == False,
+                SubscriptionAlert.deleted_at.is_(None)
+            )
+        ).scalar_one()
+    
+    def get_unread_count(self, restaurant_id: int) -> int:
+        """Unread alerts of a restaurant, from the cached counter"""
+        return _unread.get_or_set(restaurant_id, "count", lambda: self._count_unread(restaurant_id))
+    
+    def refresh_unread_count(self, restaurant_id: int) -> int:
+        """Recount unread alerts after a committed change and push the count to open streams"""
+        count = self._count_unread(restaurant_id)
+        _unread.set(restaurant_id, "count", count)
+        hub.publish(restaurant_id, ALERTS_UNREAD, {"unread_count": count}, roles=ADMIN_ROLES)
+        return count
+    
+    def notify_created(self, alert: SubscriptionAlert) -> None:
+        """Push a committed alert and the new unread count to open streams"""
+        hub.publish(alert.restaurant_id, ALERT_CREATED,
+                    AlertResponse.model_validate(alert).model_dump(mode="json"), roles=ADMIN_ROLES)
+        self.refresh_unread_count(alert.restaurant_id)
+    
     def create_alert(self, restaurant_id: int, subscription_id: int, 
                     alert_type: AlertType, title: str, message: str) -> SubscriptionAlert:
         """Create a new alert"""
@@ -23,11 +63,12 @@ class AlertService:
         self.db.add(alert)
         self.db.commit()
         self.db.refresh(alert)
+        self.notify_created(alert)
         
         return alert
     
-    def get_restaurant_alerts(self, restaurant_id: int, unread_only: bool = False):
-        """Get alerts for a restaurant"""
+    def get_restaurant_alerts(self, restaurant_id: int, unread_only: bool = False, limit: int = None):
+        """Get alerts for a restaurant, newest first"""
         query = self.db.query(SubscriptionAlert).filter(
             SubscriptionAlert.restaurant_id == restaurant_id,
             SubscriptionAlert.deleted_at.is_(None)
@@ -36,7 +77,10 @@ class AlertService:
         if unread_only:
             query = query.filter(SubscriptionAlert.is_read == False)
         
-        return query.order_by(SubscriptionAlert.created_at.desc()).all()
+        query = query.order_by(SubscriptionAlert.created_at.desc())
+        if limit is not None:
+            query = query.limit(limit)
+        return query.all()
     
     def mark_as_read(self, alert_ids: list[int], restaurant_id: int):
         """Mark alerts as read"""
@@ -49,6 +93,7 @@ class AlertService:
         }, synchronize_session=False)
         
         self.db.commit()
+        self.refresh_unread_count(restaurant_id)
     
     def check_expiring_subscriptions(self):
         """Check for subscriptions expiring in 3 days and create alerts"""
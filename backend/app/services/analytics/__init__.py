@@ -0,0 +1,49 @@
+"""
+Analytics Service Module
+
+Demand analytics computed with NumPy over compact columnar arrays:
+- columns: Column extraction per restaurant-local day, with a per-day cache
+- demand: Hour x weekday heatmaps, rolling daily averages and item velocity
+- consolidated: Multi-branch sales, products, payment mix and cash sessions
+"""
+
+from .columns import (
+    DemandColumns,
+    load_demand_columns,
+    clear_column_cache,
+)
+
+from .demand import (
+    hourly_heatmap,
+    daily_trend,
+    item_velocity,
+)
+
+from .consolidated import (
+    get_branch_ids,
+    has_multi_branch,
+    consolidated_sales,
+    consolidated_top_products,
+    consolidated_payment_mix,
+    consolidated_cash_sessions,
+    clear_consolidated_cache,
+)
+
+__all__ = [
+    # Columns
+    "DemandColumns",
+    "load_demand_columns",
+    "clear_column_cache",
+    # Demand
+    "hourly_heatmap",
+    "daily_trend",
+    "item_velocity",
+    # Consolidated
+    "get_branch_ids",
+    "has_multi_branch",
+    "consolidated_sales",
+    "consolidated_top_products",
+    "consolidated_payment_mix",
+    "consolidated_cash_sessions",
+    "clear_consolidated_cache",
+]
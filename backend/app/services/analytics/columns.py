@@ -0,0 +1,225 @@
+"""
+Demand Columns
+
+Loads paid sales of a restaurant as compact NumPy arrays, one slice per
+restaurant-local day. Timestamps are shifted to the restaurant's wall
+clock once, here, so every analysis downstream is plain integer
+arithmetic on ``int64`` seconds.
+
+Closed days (before today in the restaurant's time zone) are cached per
+restaurant and day; a range query only hits the database for the days
+that are missing, in a single pass. Today is always read fresh.
+"""
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from ...core.cache import caches
+from ...models.order import Order
+from ...models.order_item import OrderItem
+
+SECONDS_PER_DAY = 86400
+
+# Upper bound on cached (restaurant, day) slices, least recently used evicted
+MAX_CACHED_DAYS = 20000
+
+# Closed days can still change (late payments, deleted orders); re-read after this
+DAY_TTL_SECONDS = 6 * 3600
+
+_EPOCH = date(1970, 1, 1)
+
+
+@dataclass(frozen=True)
+class DemandColumns:
+    """
+    Columnar sales for an inclusive range of restaurant-local days.
+
+    ``*_local_ts`` are seconds since 1970-01-01 on the restaurant's wall
+    clock, so ``ts // 86400`` is the local day and ``ts % 86400 // 3600``
+    the local hour.
+    """
+    start: date
+    end: date
+    order_local_ts: np.ndarray
+    order_amount: np.ndarray
+    item_local_ts: np.ndarray
+    item_menu_id: np.ndarray
+    item_quantity: np.ndarray
+    item_revenue: np.ndarray
+
+    @property
+    def days(self) -> int:
+        return (self.end - self.start).days + 1
+
+    @property
+    def first_day_number(self) -> int:
+        """Days since 1970-01-01 of ``start``, comparable to ``ts // 86400``."""
+        return (self.start - _EPOCH).days
+
+
+# One day's arrays, in DemandColumns field order (without start/end)
+_DayArrays = Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]
+
+
+# Per-worker: the arrays are not worth serializing to a shared tier
+_cache = caches.namespace("analytics.demand_days", max_entries=MAX_CACHED_DAYS, ttl=DAY_TTL_SECONDS)
+
+
+def clear_column_cache(restaurant_id: Optional[int] = None) -> None:
+    """
+    Drop cached day slices.
+
+    Args:
+        restaurant_id: Only drop this restaurant's days; all when None
+    """
+    _cache.clear(restaurant_id)
+
+
+def _zone(tz_name: Optional[str]):
+    try:
+        return ZoneInfo(tz_name) if tz_name else timezone.utc
+    except (ZoneInfoNotFoundError, ValueError):
+        return timezone.utc
+
+
+def _utc_seconds(values: List[datetime]) -> np.ndarray:
+    """Naive-UTC (as stored) or aware datetimes to int64 epoch seconds."""
+    if not values:
+        return np.empty(0, dtype=np.int64)
+    if values[0].tzinfo is not None:
+        values = [v.astimezone(timezone.utc).replace(tzinfo=None) for v in values]
+    return np.array(values, dtype="datetime64[s]").astype(np.int64)
+
+
+def _to_local(utc_seconds: np.ndarray, tz, lower: int, upper: int) -> np.ndarray:
+    """
+    Shift epoch seconds to wall-clock seconds in ``tz``.
+
+    The UTC offset is sampled once per hour of [lower, upper] and looked
+    up by index, so the per-row work is vectorized. Offset changes happen
+    on hour boundaries, which keeps this exact across DST switches.
+    """
+    if utc_seconds.size == 0:
+        return utc_seconds
+    first_hour = lower - lower % 3600
+    hours = np.arange(first_hour, upper + 3600, 3600)
+    offsets = np.fromiter(
+        (datetime.fromtimestamp(int(h), tz).utcoffset().total_seconds() for h in hours),
+        dtype=np.int64,
+        count=hours.size,
+    )
+    index = np.clip((utc_seconds - first_hour) // 3600, 0, hours.size - 1)
+    return utc_seconds + offsets[index]
+
+
+def _fetch_days(db: Session, restaurant_id: int, first: date, last: date, tz) -> Dict[date, _DayArrays]:
+    """Read [first, last] in one pass and split it into per-day arrays."""
+    lower = datetime.combine(first, time.min, tz).astimezone(timezone.utc)
+    upper = datetime.combine(last + timedelta(days=1), time.min, tz).astimezone(timezone.utc)
+    lower_naive, upper_naive = lower.replace(tzinfo=None), upper.replace(tzinfo=None)
+
+    paid_orders = (
+        Order.restaurant_id == restaurant_id,
+        Order.is_paid.is_(True),
+        Order.deleted_at.is_(None),
+        Order.created_at >= lower_naive,
+        Order.created_at < upper_naive,
+    )
+    order_rows = db.execute(select(Order.created_at, Order.total_amount).where(*paid_orders)).all()
+    item_rows = db.execute(
+        select(Order.created_at, OrderItem.menu_item_id, OrderItem.quantity, OrderItem.unit_price)
+        .join(Order, OrderItem.order_id == Order.id)
+        .where(*paid_orders, OrderItem.deleted_at.is_(None))
+    ).all()
+
+    bounds = (int(lower.timestamp()), int(upper.timestamp()))
+    order_created, order_amount = zip(*order_rows) if order_rows else ((), ())
+    order_ts = _to_local(_utc_seconds(list(order_created)), tz, *bounds)
+    order_amount = np.asarray(order_amount, dtype=np.float64)
+
+    if item_rows:
+        item_created, menu_ids, quantities, unit_prices = zip(*item_rows)
+    else:
+        item_created, menu_ids, quantities, unit_prices = (), (), (), ()
+    item_ts = _to_local(_utc_seconds(list(item_created)), tz, *bounds)
+    item_menu_id = np.asarray(menu_ids, dtype=np.int64)
+    item_quantity = np.asarray(quantities, dtype=np.int64)
+    item_revenue = item_quantity * np.asarray(unit_prices, dtype=np.float64)
+
+    order_sort = np.argsort(order_ts, kind="stable")
+    item_sort = np.argsort(item_ts, kind="stable")
+    order_cols = [order_ts[order_sort], order_amount[order_sort]]
+    item_cols = [a[item_sort] for a in (item_ts, item_menu_id, item_quantity, item_revenue)]
+
+    # Split at local midnights
+    first_number = (first - _EPOCH).days
+    day_count = (last - first).days + 1
+    midnights = (first_number + np.arange(day_count + 1)) * SECONDS_PER_DAY
+    order_cuts = np.searchsorted(order_cols[0], midnights)
+    item_cuts = np.searchsorted(item_cols[0], midnights)
+
+    days = {}
+    for offset in range(day_count):
+        o_lo, o_hi = order_cuts[offset], order_cuts[offset + 1]
+        i_lo, i_hi = item_cuts[offset], item_cuts[offset + 1]
+        days[first + timedelta(days=offset)] = (
+            tuple(c[o_lo:o_hi] for c in order_cols) + tuple(c[i_lo:i_hi] for c in item_cols)
+        )
+    return days
+
+
+def load_demand_columns(
+    db: Session,
+    restaurant_id: int,
+    start: date,
+    end: date,
+    tz_name: Optional[str] = None,
+    today: Optional[date] = None
+) -> DemandColumns:
+    """
+    Load paid sales of a restaurant for an inclusive range of local days.
+
+    Cached closed days are reused; all missing days are read with one
+    query for orders and one for items.
+
+    Args:
+        db: Database session
+        restaurant_id: Restaurant to analyse
+        start: First local day
+        end: Last local day (inclusive)
+        tz_name: Restaurant IANA time zone; UTC when missing or unknown
+        today: Local "today", for tests; defaults to the current date in tz_name
+
+    Returns:
+        DemandColumns: Concatenated arrays for the range
+    """
+    tz = _zone(tz_name)
+    if today is None:
+        today = datetime.now(tz).date()
+    zone_key = getattr(tz, "key", "UTC")
+
+    days = [start + timedelta(days=n) for n in range((end - start).days + 1)]
+    slices: Dict[date, _DayArrays] = {}
+    missing = []
+    for day in days:
+        cached = _cache.get(restaurant_id, (zone_key, day)) if day < today else None
+        if cached is None:
+            missing.append(day)
+        else:
+            slices[day] = cached
+
+    if missing:
+        fetched = _fetch_days(db, restaurant_id, missing[0], missing[-1], tz)
+        for day in missing:
+            slices[day] = fetched[day]
+            if day < today:
+                _cache.set(restaurant_id, (zone_key, day), fetched[day])
+
+    ordered = [slices[day] for day in days]
+    columns = [np.concatenate([s[i] for s in ordered]) for i in range(6)]
+    return DemandColumns(start, end, *columns)
@@ -0,0 +1,284 @@
+"""
+Consolidated Branch Reports
+
+Sales, top products, payment mix and cash sessions across the branches of
+a chain, with one row per branch and a total.
+
+Each section is a single grouped query over all branch IDs
+(``restaurant_id IN (...) GROUP BY restaurant_id, ...``) rather than one
+query per branch, so the cost stays flat as chains grow. Results are
+cached per (section, branch list, period) in the shared report cache:
+periods that are over are kept for CLOSED_PERIOD_TTL_SECONDS, periods that
+include the present only for OPEN_PERIOD_TTL_SECONDS. Invalidating any
+branch's tenant tag drops the chain's reports.
+"""
+from datetime import datetime, timezone
+from decimal import Decimal
+from typing import Callable, Dict, List, Optional, Sequence
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from ...core.cache import caches, tenant_tag
+from ...models.cash_register import CashRegisterSession, SessionStatus
+from ...models.menu import MenuItem
+from ...models.order import Order, PaymentMethod
+from ...models.order_item import OrderItem
+from ...models.restaurant import Restaurant
+from ...models.restaurant_subscription import RestaurantSubscription, SubscriptionStatus
+from ...models.subscription_plan import SubscriptionPlan
+
+CLOSED_PERIOD_TTL_SECONDS = 15 * 60
+OPEN_PERIOD_TTL_SECONDS = 60
+
+MAX_CACHED_REPORTS = 512
+
+
+# Keyed by the first branch (the headquarters); tagged with every branch covered
+_cache = caches.namespace("reports.consolidated", max_entries=MAX_CACHED_REPORTS,
+                          ttl=OPEN_PERIOD_TTL_SECONDS, shared=True)
+
+
+def clear_consolidated_cache() -> None:
+    """Drop all cached consolidated report sections."""
+    _cache.clear()
+
+
+# ---------------------------------------------------------------------------
+# Branch sets
+# ---------------------------------------------------------------------------
+
+def headquarters_id(restaurant: Restaurant) -> int:
+    """The chain's headquarters: the restaurant itself unless it is a branch."""
+    return restaurant.parent_restaurant_id or restaurant.id
+
+
+def get_branch_ids(db: Session, restaurant: Restaurant) -> List[int]:
+    """IDs of every restaurant in the chain of ``restaurant``, headquarters first."""
+    hq_id = headquarters_id(restaurant)
+    branches = db.execute(
+        select(Restaurant.id).where(Restaurant.parent_restaurant_id == hq_id).order_by(Restaurant.id)
+    ).scalars().all()
+    return [hq_id, *branches]
+
+
+def has_multi_branch(db: Session, restaurant: Restaurant) -> bool:
+    """Whether the chain's headquarters is on a live plan with multi-branch reporting."""
+    return bool(db.execute(
+        select(SubscriptionPlan.has_multi_branch)
+        .join(RestaurantSubscription, RestaurantSubscription.plan_id == SubscriptionPlan.id)
+        .where(
+            RestaurantSubscription.restaurant_id == headquarters_id(restaurant),
+            RestaurantSubscription.status.in_([SubscriptionStatus.ACTIVE, SubscriptionStatus.TRIAL]),
+        )
+        .limit(1)
+    ).scalar())
+
+
+# ---------------------------------------------------------------------------
+# Sections
+# ---------------------------------------------------------------------------
+
+def _money(value) -> float:
+    if isinstance(value, Decimal):
+        value = float(value)
+    return round(value or 0.0, 2)
+
+
+def _branch_names(db: Session, branch_ids: Sequence[int]) -> Dict[int, str]:
+    return dict(db.execute(select(Restaurant.id, Restaurant.name).where(Restaurant.id.in_(branch_ids))).all())
+
+
+def _paid_orders(branch_ids: Sequence[int], start: datetime, end: datetime):
+    return (
+        Order.restaurant_id.in_(branch_ids),
+        Order.is_paid.is_(True),
+        Order.deleted_at.is_(None),
+        Order.created_at >= start,
+        Order.created_at < end,
+    )
+
+
+def _cached(section: str, branch_ids: Sequence[int], start: datetime, end: datetime,
+            compute: Callable[[], dict]) -> dict:
+    closed = end <= datetime.now(timezone.utc)
+    return _cache.get_or_set(
+        branch_ids[0], (section, tuple(branch_ids), start.isoformat(), end.isoformat()), compute,
+        ttl=CLOSED_PERIOD_TTL_SECONDS if closed else OPEN_PERIOD_TTL_SECONDS,
+        tags=[tenant_tag(branch_id) for branch_id in branch_ids],
+    )
+
+
+def consolidated_sales(db: Session, branch_ids: Sequence[int], start: datetime, end: datetime) -> dict:
+    """
+    Paid sales, tickets and average ticket per branch and in total.
+
+    Args:
+        db: Database session
+        branch_ids: Restaurants to include, in the order rows are returned
+        start: Period start (inclusive, timezone-aware)
+        end: Period end (exclusive, timezone-aware)
+    """
+    def compute() -> dict:
+        rows = db.execute(
+            select(Order.restaurant_id, func.count(Order.id), func.sum(Order.total_amount))
+            .where(*_paid_orders(branch_ids, start, end))
+            .group_by(Order.restaurant_id)
+        ).all()
+        by_branch = {restaurant_id: (tickets, sales or 0.0) for restaurant_id, tickets, sales in rows}
+        names = _branch_names(db, branch_ids)
+
+        def summary(tickets: int, sales: float) -> dict:
+            return {
+                "total_sales": _money(sales),
+                "total_tickets": tickets,
+                "average_ticket": _money(sales / tickets if tickets else 0.0),
+            }
+
+        branches = [
+            {"restaurant_id": branch_id, "restaurant_name": names.get(branch_id),
+             **summary(*by_branch.get(branch_id, (0, 0.0)))}
+            for branch_id in branch_ids
+        ]
+        return {
+            "branches": branches,
+            "total": summary(sum(t for t, _ in by_branch.values()), sum(s for _, s in by_branch.values())),
+        }
+
+    return _cached("sales", branch_ids, start, end, compute)
+
+
+def consolidated_top_products(db: Session, branch_ids: Sequence[int], start: datetime, end: datetime,
+                              limit: int = 10) -> dict:
+    """
+    Best-selling products per branch and across the chain.
+
+    Branches have their own menu rows, so products are matched across
+    branches by name.
+    """
+    def compute() -> dict:
+        rows = db.execute(
+            select(
+                Order.restaurant_id,
+                MenuItem.name,
+                func.sum(OrderItem.quantity),
+                func.sum(OrderItem.quantity * OrderItem.unit_price),
+            )
+            .join(OrderItem, OrderItem.order_id == Order.id)
+            .join(MenuItem, MenuItem.id == OrderItem.menu_item_id)
+            .where(*_paid_orders(branch_ids, start, end), OrderItem.deleted_at.is_(None))
+            .group_by(Order.restaurant_id, MenuItem.name)
+        ).all()
+        names = _branch_names(db, branch_ids)
+
+        per_branch: Dict[int, List[dict]] = {branch_id: [] for branch_id in branch_ids}
+        totals: Dict[str, dict] = {}
+        for restaurant_id, name, quantity, revenue in rows:
+            per_branch[restaurant_id].append(
+                {"product_name": name, "quantity_sold": int(quantity), "total_revenue": _money(revenue)}
+            )
+            total = totals.setdefault(name, {"product_name": name, "quantity_sold": 0, "total_revenue": 0.0})
+            total["quantity_sold"] += int(quantity)
+            total["total_revenue"] = _money(total["total_revenue"] + (revenue or 0.0))
+
+        def top(products) -> List[dict]:
+            return sorted(products, key=lambda p: (-p["quantity_sold"], p["product_name"]))[:limit]
+
+        return {
+            "branches": [
+                {"restaurant_id": branch_id, "restaurant_name": names.get(branch_id),
+                 "top_products": top(per_branch[branch_id])}
+                for branch_id in branch_ids
+            ],
+            "total": {"top_products": top(totals.values())},
+        }
+
+    return _cached(f"top_products:{limit}", branch_ids, start, end, compute)
+
+
+def consolidated_payment_mix(db: Session, branch_ids: Sequence[int], start: datetime, end: datetime) -> dict:
+    """Paid sales by payment method, per branch and in total."""
+    def compute() -> dict:
+        rows = db.execute(
+            select(Order.restaurant_id, Order.payment_method, func.count(Order.id), func.sum(Order.total_amount))
+            .where(*_paid_orders(branch_ids, start, end))
+            .group_by(Order.restaurant_id, Order.payment_method)
+        ).all()
+        names = _branch_names(db, branch_ids)
+
+        counts: Dict[Optional[int], Dict[str, list]] = {}
+        for restaurant_id, method, count, amount in rows:
+            if method is None:
+                continue
+            for key in (restaurant_id, None):
+                entry = counts.setdefault(key, {}).setdefault(method.value, [0, 0.0])
+                entry[0] += count
+                entry[1] += amount or 0.0
+
+        def mix(key) -> dict:
+            methods = counts.get(key, {})
+            total = sum(amount for _, amount in methods.values())
+            return {
+                method.value: {
+                    "amount": _money(methods.get(method.value, [0, 0.0])[1]),
+                    "percentage": round(methods.get(method.value, [0, 0.0])[1] / total * 100 if total else 0, 2),
+                    "count": methods.get(method.value, [0, 0.0])[0],
+                }
+                for method in PaymentMethod
+            }
+
+        return {
+            "branches": [
+                {"restaurant_id": branch_id, "restaurant_name": names.get(branch_id), "payment_breakdown": mix(branch_id)}
+                for branch_id in branch_ids
+            ],
+            "total": {"payment_breakdown": mix(None)},
+        }
+
+    return _cached("payment_mix", branch_ids, start, end, compute)
+
+
+def consolidated_cash_sessions(db: Session, branch_ids: Sequence[int], start: datetime, end: datetime) -> dict:
+    """Cash register sessions opened in the period, per branch and in total."""
+    def compute() -> dict:
+        rows = db.execute(
+            select(
+                CashRegisterSession.restaurant_id,
+                CashRegisterSession.status,
+                func.count(CashRegisterSession.id),
+                func.sum(CashRegisterSession.final_balance),
+                func.sum(CashRegisterSession.actual_balance - CashRegisterSession.expected_balance),
+            )
+            .where(
+                CashRegisterSession.restaurant_id.in_(branch_ids),
+                CashRegisterSession.deleted_at.is_(None),
+                CashRegisterSession.opened_at >= start,
+                CashRegisterSession.opened_at < end,
+            )
+            .group_by(CashRegisterSession.restaurant_id, CashRegisterSession.status)
+        ).all()
+        names = _branch_names(db, branch_ids)
+
+        def empty() -> dict:
+            return {"open_sessions": 0, "closed_sessions": 0, "total_cash_collected": 0.0, "total_difference": 0.0}
+
+        per_branch = {branch_id: empty() for branch_id in branch_ids}
+        total = empty()
+        for restaurant_id, status, count, collected, difference in rows:
+            for summary in (per_branch[restaurant_id], total):
+                if status == SessionStatus.OPEN:
+                    summary["open_sessions"] += count
+                elif status == SessionStatus.CLOSED:
+                    summary["closed_sessions"] += count
+                    summary["total_cash_collected"] = _money(summary["total_cash_collected"] + _money(collected))
+                    summary["total_difference"] = _money(summary["total_difference"] + _money(difference))
+
+        return {
+            "branches": [
+                {"restaurant_id": branch_id, "restaurant_name": names.get(branch_id), **per_branch[branch_id]}
+                for branch_id in branch_ids
+            ],
+            "total": total,
+        }
+
+    return _cached("cash_sessions", branch_ids, start, end, compute)
@@ -0,0 +1,147 @@
+"""
+Demand Analytics
+
+Staffing and prep views over DemandColumns. Everything is computed with
+vectorized NumPy reductions (``bincount``, ``cumsum``, ``unique``), so
+cost grows with the number of rows only inside C loops.
+"""
+from datetime import timedelta
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from .columns import SECONDS_PER_DAY, DemandColumns
+
+WEEKDAYS = ("monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday")
+
+# 1970-01-01 was a Thursday
+_EPOCH_WEEKDAY = 3
+
+
+def _weekday(day_numbers: np.ndarray) -> np.ndarray:
+    return (day_numbers + _EPOCH_WEEKDAY) % 7
+
+
+def _round(values: np.ndarray, digits: int = 2) -> List[float]:
+    return np.round(values, digits).tolist()
+
+
+def hourly_heatmap(columns: DemandColumns) -> Dict[str, Any]:
+    """
+    Orders and revenue by local weekday and hour.
+
+    Args:
+        columns: Sales for the period
+
+    Returns:
+        dict: 7x24 matrices (Monday first) of order totals, revenue totals
+        and average orders per occurrence of that weekday in the period
+    """
+    ts = columns.order_local_ts
+    cells = _weekday(ts // SECONDS_PER_DAY) * 24 + ts % SECONDS_PER_DAY // 3600
+    orders = np.bincount(cells, minlength=168).reshape(7, 24)
+    revenue = np.bincount(cells, weights=columns.order_amount, minlength=168).reshape(7, 24)
+
+    period_days = columns.first_day_number + np.arange(columns.days)
+    occurrences = np.bincount(_weekday(period_days), minlength=7)
+    average = orders / np.maximum(occurrences, 1)[:, None]
+
+    return {
+        "weekdays": list(WEEKDAYS),
+        "orders": orders.tolist(),
+        "revenue": _round(revenue),
+        "average_orders": _round(average),
+        "weekday_occurrences": occurrences.tolist(),
+    }
+
+
+def daily_trend(columns: DemandColumns, window: int = 7) -> List[Dict[str, Any]]:
+    """
+    Daily orders and revenue with trailing rolling averages.
+
+    Days without sales are included with zeros. The first ``window - 1``
+    days average over the days available so far.
+
+    Args:
+        columns: Sales for the period
+        window: Rolling window in days
+
+    Returns:
+        list: One entry per local day, oldest first
+    """
+    day_index = columns.order_local_ts // SECONDS_PER_DAY - columns.first_day_number
+    orders = np.bincount(day_index, minlength=columns.days).astype(np.float64)
+    revenue = np.bincount(day_index, weights=columns.order_amount, minlength=columns.days).astype(np.float64)
+
+    def rolling(values: np.ndarray) -> np.ndarray:
+        sums = np.cumsum(np.concatenate(([0.0], values)))
+        upper = np.arange(1, values.size + 1)
+        lower = np.maximum(upper - window, 0)
+        return (sums[upper] - sums[lower]) / (upper - lower)
+
+    rolling_orders = rolling(orders)
+    rolling_revenue = rolling(revenue)
+    average_ticket = np.divide(revenue, orders, out=np.zeros_like(revenue), where=orders > 0)
+
+    return [
+        {
+            "date": (columns.start + timedelta(days=n)).isoformat(),
+            "orders_count": int(orders[n]),
+            "total_sales": round(float(revenue[n]), 2),
+            "average_ticket": round(float(average_ticket[n]), 2),
+            "rolling_orders": round(float(rolling_orders[n]), 2),
+            "rolling_sales": round(float(rolling_revenue[n]), 2),
+        }
+        for n in range(columns.days)
+    ]
+
+
+def item_velocity(columns: DemandColumns, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    Per menu item sales velocity over the period.
+
+    There are no stock levels to measure sell-through against, so it is
+    expressed as rate of sale: units per day, the share of days the item
+    sold at all, and its share of all units.
+
+    Args:
+        columns: Sales for the period
+        limit: Keep only the fastest movers
+
+    Returns:
+        list: Items ordered by units sold, highest first
+    """
+    if columns.item_menu_id.size == 0:
+        return []
+
+    menu_ids, item_index = np.unique(columns.item_menu_id, return_inverse=True)
+    ts = columns.item_local_ts
+    day_index = ts // SECONDS_PER_DAY - columns.first_day_number
+    hour = ts % SECONDS_PER_DAY // 3600
+    quantity = columns.item_quantity.astype(np.float64)
+
+    units = np.bincount(item_index, weights=quantity)
+    revenue = np.bincount(item_index, weights=columns.item_revenue)
+    selling_days = np.bincount(np.unique(item_index * columns.days + day_index) // columns.days,
+                               minlength=menu_ids.size)
+    by_hour = np.bincount(item_index * 24 + hour, weights=quantity, minlength=menu_ids.size * 24)
+    peak_hour = by_hour.reshape(-1, 24).argmax(axis=1)
+
+    order = np.argsort(-units, kind="stable")
+    if limit is not None:
+        order = order[:limit]
+    total_units = units.sum()
+
+    return [
+        {
+            "menu_item_id": int(menu_ids[i]),
+            "units_sold": int(units[i]),
+            "revenue": round(float(revenue[i]), 2),
+            "units_per_day": round(float(units[i] / columns.days), 2),
+            "selling_days": int(selling_days[i]),
+            "selling_days_ratio": round(float(selling_days[i] / columns.days), 4),
+            "share_of_units": round(float(units[i] / total_units), 4),
+            "peak_hour": int(peak_hour[i]),
+        }
+        for i in order
+    ]
@@ -13,6 +13,9 @@ from .session_service import (
     create_session,
     get_session,
     get_current_session,
+    get_open_session_id,
+    invalidate_open_session,
+    clear_open_session_cache,
     get_sessions,
     close_session,
     close_session_with_denominations,
@@ -23,6 +26,7 @@ from .transaction_service import (
     get_transactions_by_session,
     delete_transaction,
     create_transaction_from_order,
+    record_order_sale,
 )
 
 from .report_service import (
@@ -48,6 +52,9 @@ __all__ = [
     'create_session',
     'get_session',
     'get_current_session',
+    'get_open_session_id',
+    'invalidate_open_session',
+    'clear_open_session_cache',
     'get_sessions',
     'close_session',
     'close_session_with_denominations',
@@ -57,6 +64,7 @@ __all__ = [
     'get_transactions_by_session',
     'delete_transaction',
     'create_transaction_from_order',
+    'record_order_sale',
     
     # Report operations
     'get_reports',
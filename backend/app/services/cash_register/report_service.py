@@ -7,12 +7,14 @@ Handles all report generation operations:
 - Cash difference reports
 - Session cuts
 - Report retrieval
+
+Summaries of closed sessions are read from their final snapshots (see
+snapshot_service); only open sessions are recomputed from transactions.
 """
 
-from datetime import datetime, timezone
-from sqlalchemy.orm import Session
+from datetime import datetime
+from sqlalchemy.orm import Session, undefer
 from typing import List, Optional
-import json
 import logging
 
 from ...models.cash_register import (
@@ -29,10 +31,14 @@ from ...schemas.cash_register import (
 )
 from .session_service import get_session
 from .transaction_service import get_transactions_by_session
-from .calculation_service import (
-    calculate_session_totals,
-    calculate_payment_breakdown,
-    calculate_cash_difference
+from .calculation_service import calculate_cash_difference
+from .snapshot_service import (
+    PAYMENT_COLUMNS,
+    save_summary,
+    session_summary,
+    summarize_session,
+    summary_from_snapshot,
+    with_final_snapshots
 )
 
 logger = logging.getLogger(__name__)
@@ -43,10 +49,14 @@ def get_reports(
     session_id: Optional[int] = None,
     report_type: Optional[str] = None,
     skip: int = 0,
-    limit: int = 100
+    limit: int = 100,
+    restaurant_id: Optional[int] = None,
+    cashier_id: Optional[int] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None
 ) -> List[CashRegisterReportModel]:
     """
-    Get cash register reports with optional filtering.
+    Get cash register reports with optional filtering, newest first.
     
     Args:
         db: Database session
@@ -54,14 +64,28 @@ def get_reports(
         report_type: Filter by report type
         skip: Number of records to skip
         limit: Maximum number of records to return
+        restaurant_id: Filter by restaurant
+        cashier_id: Only reports of this cashier's sessions
+        start_date: Generated at or after
+        end_date: Generated at or before
         
     Returns:
         List of cash register reports
     """
-    query = db.query(CashRegisterReportModel)
+    # Reports are returned with their data: load the payload with the rows
+    query = db.query(CashRegisterReportModel).options(undefer(CashRegisterReportModel.payload))
     
     if session_id:
         query = query.filter(CashRegisterReportModel.session_id == session_id)
+    if restaurant_id:
+        query = query.filter(CashRegisterReportModel.restaurant_id == restaurant_id)
+    if cashier_id:
+        query = query.join(CashRegisterReportModel.session)\
+            .filter(CashRegisterSessionModel.cashier_id == cashier_id)
+    if start_date:
+        query = query.filter(CashRegisterReportModel.generated_at >= start_date)
+    if end_date:
+        query = query.filter(CashRegisterReportModel.generated_at <= end_date)
     
     if report_type:
         # Convert string to enum value for proper comparison
@@ -72,7 +96,8 @@ def get_reports(
             # If the string doesn't match any enum value, return empty result
             return []
     
-    return query.offset(skip).limit(limit).all()
+    return query.order_by(CashRegisterReportModel.generated_at.desc(), CashRegisterReportModel.id.desc())\
+        .offset(skip).limit(limit).all()
 
 
 def cut_session(
@@ -99,40 +124,17 @@ def cut_session(
         if not db_session:
             raise ValueError("Session not found")
 
-        # Calculate session totals
-        total_sales, total_refunds, total_tips, total_expenses, net_cash_flow = \
-            calculate_session_totals(db, session_id)
-        
-        transactions = get_transactions_by_session(db, session_id)
-
         # Use the provided payment breakdown data
+        summary = summarize_session(db, db_session)
         report_data = DailySummaryReport(
-            session_id=session_id,
-            session_number=db_session.session_number,
-            total_sales=total_sales,
-            total_refunds=total_refunds,
-            total_tips=total_tips,
-            total_expenses=total_expenses,
-            total_transactions=len(transactions),
-            net_cash_flow=net_cash_flow,
+            **summary.dict(exclude={"opened_at", "closed_at", "payment_breakdown"}),
             payment_breakdown={
-                "cash": payment_breakdown.cash_payments,
-                "card": payment_breakdown.card_payments,
-                "digital": payment_breakdown.digital_payments,
-                "other": payment_breakdown.other_payments
+                method: getattr(payment_breakdown, column) for method, column in PAYMENT_COLUMNS.items()
             }
         )
 
-        # Create report record
-        db_report = CashRegisterReportModel(
-            session_id=session_id,
-            report_type=ReportType.DAILY_SUMMARY,
-            data=json.dumps(report_data.dict()),
-            generated_at=datetime.now(timezone.utc)
-        )
-        db.add(db_report)
+        save_summary(db, db_session, report_data)
         db.commit()
-        db.refresh(db_report)
 
         logger.info(f"Performed cut for session {session_id}")
         return report_data
@@ -155,21 +157,22 @@ def get_last_cut(db: Session, session_id: int) -> Optional[DailySummaryReport]:
         Last daily summary report or None if no cuts exist
     """
     try:
-        # Find the most recent daily summary report for this session
+        # Find the most recent cut; the final snapshot is not a cut
         last_report = db.query(CashRegisterReportModel)\
             .filter(
                 CashRegisterReportModel.session_id == session_id,
-                CashRegisterReportModel.report_type == ReportType.DAILY_SUMMARY
+                CashRegisterReportModel.report_type == ReportType.DAILY_SUMMARY,
+                CashRegisterReportModel.is_final.is_(False)
             )\
-            .order_by(CashRegisterReportModel.generated_at.desc())\
+            .order_by(CashRegisterReportModel.generated_at.desc(), CashRegisterReportModel.id.desc())\
             .first()
 
         if not last_report:
             return None
 
-        # Parse the JSON data back into a DailySummaryReport object
-        report_data = json.loads(last_report.data)
-        return DailySummaryReport(**report_data)
+        summary = summary_from_snapshot(last_report)
+        # Cuts are reported without the session times
+        return summary.copy(update={"opened_at": None, "closed_at": None})
         
     except Exception as e:
         logger.error(f"Error getting last cut for session {session_id}: {e}")
@@ -229,7 +232,8 @@ def get_daily_summary_reports(
 ) -> List[DailySummaryReport]:
     """
     Get daily summary reports within a date range.
-    Generates reports on-the-fly from closed sessions.
+    Read from the final snapshots of closed sessions; sessions closed
+    before snapshots were stored are recomputed.
     
     Args:
         db: Database session
@@ -258,33 +262,10 @@ def get_daily_summary_reports(
         if restaurant_id:
             query = query.filter(CashRegisterSessionModel.restaurant_id == restaurant_id)
         
-        sessions = query.order_by(CashRegisterSessionModel.closed_at.desc())\
+        rows = with_final_snapshots(query).order_by(CashRegisterSessionModel.closed_at.desc())\
             .offset(skip).limit(limit).all()
         
-        # Generate report for each session
-        result = []
-        for session in sessions:
-            total_sales, total_refunds, total_tips, total_expenses, net_cash_flow = \
-                calculate_session_totals(db, session.id)
-            
-            payment_breakdown = calculate_payment_breakdown(db, session.id)
-            transactions = get_transactions_by_session(db, session.id)
-            
-            result.append(DailySummaryReport(
-                session_id=session.id,
-                session_number=session.session_number,
-                opened_at=session.opened_at,
-                closed_at=session.closed_at,
-                total_sales=total_sales,
-                total_refunds=total_refunds,
-                total_tips=total_tips,
-                total_expenses=total_expenses,
-                total_transactions=len(transactions),
-                net_cash_flow=net_cash_flow,
-                payment_breakdown=payment_breakdown
-            ))
-        
-        return result
+        return [session_summary(db, session, snapshot) for session, snapshot in rows]
         
     except Exception as e:
         logger.error(f"Error getting daily summary reports: {e}")
@@ -300,6 +281,8 @@ def get_weekly_summary(
 ) -> WeeklySummaryReport:
     """
     Generate a weekly summary report aggregating multiple sessions.
+    Closed sessions count through their final snapshots; open ones are
+    recomputed from their transactions.
     
     Args:
         db: Database session
@@ -326,7 +309,8 @@ def get_weekly_summary(
         if cashier_id:
             query = query.filter(CashRegisterSessionModel.cashier_id == cashier_id)
         
-        sessions = query.all()
+        rows = with_final_snapshots(query).all()
+        sessions = [session for session, _ in rows]
         
         total_sales = 0.0
         total_refunds = 0.0
@@ -336,21 +320,17 @@ def get_weekly_summary(
         payment_breakdown = {"cash": 0.0, "card": 0.0, "digital": 0.0, "other": 0.0}
         
         # Aggregate data from all sessions
-        for session in sessions:
-            session_sales, session_refunds, session_tips, session_expenses, _ = \
-                calculate_session_totals(db, session.id)
-            
-            total_sales += session_sales
-            total_refunds += session_refunds
-            total_tips += session_tips
-            total_expenses += session_expenses
+        for session, snapshot in rows:
+            summary = session_summary(db, session, snapshot)
             
-            transactions = get_transactions_by_session(db, session.id)
-            total_transactions += len(transactions)
+            total_sales += summary.total_sales
+            total_refunds += summary.total_refunds
+            total_tips += summary.total_tips
+            total_expenses += summary.total_expenses
+            total_transactions += summary.total_transactions
             
             # Aggregate payment methods
-            session_breakdown = calculate_payment_breakdown(db, session.id)
-            for method, amount in session_breakdown.items():
+            for method, amount in summary.payment_breakdown.items():
                 if method in payment_breakdown:
                     payment_breakdown[method] += amount
         
@@ -4,14 +4,18 @@ Session Service - Single Responsibility: Cash Register Session Management
 Handles all operations related to cash register sessions:
 - Creating new sessions
 - Retrieving sessions (current, by ID, filtered list)
-- Closing sessions
+- Closing sessions (storing their final summary snapshot)
 - Session validation
+- Caching the open session ID per restaurant and user for payments
 """
 
 from datetime import datetime, timezone
+from sqlalchemy import select
 from sqlalchemy.orm import Session, joinedload
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 import logging
+import threading
+import time as _time
 
 from ...core.exceptions import ConflictError, ValidationError
 from ...models.cash_register import (
@@ -24,9 +28,80 @@ from ...schemas.cash_register import (
     DenominationCount
 )
 from .calculation_service import calculate_expected_balance
+from .snapshot_service import save_summary, summarize_session
 
 logger = logging.getLogger(__name__)
 
+# Cached open-session IDs are dropped on open and close in this process.
+# Other workers can still close a session, so writers must check that the
+# session is open in the same statement (see transaction_service); the TTL
+# only bounds how long unused entries live.
+OPEN_SESSION_CACHE_TTL_SECONDS = 10 * 60
+
+_open_sessions: Dict[Tuple[int, int], Tuple[float, int]] = {}
+_open_sessions_lock = threading.Lock()
+
+
+def get_open_session_id(db: Session, restaurant_id: int, user_id: int) -> Optional[int]:
+    """
+    Get the ID of the session a user has open in a restaurant, cached.
+
+    Misses are not cached, so a session opened by another worker is seen
+    on the next call.
+
+    Args:
+        db: Database session
+        restaurant_id: ID of the restaurant
+        user_id: ID of the user who opened the session
+
+    Returns:
+        Session ID or None if the user has no open session
+    """
+    key = (restaurant_id, user_id)
+    with _open_sessions_lock:
+        entry = _open_sessions.get(key)
+    if entry is not None and _time.monotonic() < entry[0]:
+        return entry[1]
+
+    session_id = db.execute(
+        select(CashRegisterSessionModel.id)
+        .where(
+            CashRegisterSessionModel.restaurant_id == restaurant_id,
+            CashRegisterSessionModel.opened_by_user_id == user_id,
+            CashRegisterSessionModel.status == SessionStatus.OPEN,
+        )
+        .order_by(CashRegisterSessionModel.opened_at.desc())
+        .limit(1)
+    ).scalar()
+    with _open_sessions_lock:
+        if session_id is None:
+            _open_sessions.pop(key, None)
+        else:
+            _open_sessions[key] = (_time.monotonic() + OPEN_SESSION_CACHE_TTL_SECONDS, session_id)
+    return session_id
+
+
+def invalidate_open_session(restaurant_id: int, user_id: Optional[int] = None) -> None:
+    """
+    Drop cached open-session IDs of a restaurant.
+
+    Args:
+        restaurant_id: ID of the restaurant
+        user_id: Only drop this user's entry; all users of the restaurant if None
+    """
+    with _open_sessions_lock:
+        if user_id is not None:
+            _open_sessions.pop((restaurant_id, user_id), None)
+            return
+        for key in [key for key in _open_sessions if key[0] == restaurant_id]:
+            del _open_sessions[key]
+
+
+def clear_open_session_cache() -> None:
+    """Drop all cached open-session IDs."""
+    with _open_sessions_lock:
+        _open_sessions.clear()
+
 
 def create_session(
     db: Session, 
@@ -85,6 +160,7 @@ def create_session(
         db.add(db_session)
         db.commit()
         db.refresh(db_session)
+        invalidate_open_session(restaurant_id, db_session.opened_by_user_id)
         
         logger.info(f"Created cash register session #{next_session_number} for restaurant {restaurant_id}")
         return db_session
@@ -217,8 +293,12 @@ def close_session(
         db_session.status = SessionStatus.CLOSED
         db_session.notes = session_update.notes
 
+        # Summaries of closed sessions are served from this snapshot
+        save_summary(db, db_session, summarize_session(db, db_session), is_final=True)
+
         db.commit()
         db.refresh(db_session)
+        invalidate_open_session(db_session.restaurant_id, db_session.opened_by_user_id)
         
         logger.info(f"Closed cash register session {session_id}")
         return db_session
@@ -277,8 +357,12 @@ def close_session_with_denominations(
         db_session.status = SessionStatus.CLOSED
         db_session.notes = session_update.notes
 
+        # Summaries of closed sessions are served from this snapshot
+        save_summary(db, db_session, summarize_session(db, db_session), is_final=True)
+
         db.commit()
         db.refresh(db_session)
+        invalidate_open_session(db_session.restaurant_id, db_session.opened_by_user_id)
         
         logger.info(f"Closed cash register session {session_id} with denominations")
         return db_session
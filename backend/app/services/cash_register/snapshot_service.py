@@ -0,0 +1,171 @@
+"""
+Snapshot Service - Single Responsibility: Summary Report Snapshots
+
+Stores session summaries as CashRegisterReport rows and reads them back:
+- Summaries computed from a session's transactions
+- Cuts taken during a session and the final snapshot written at close
+- Summaries rebuilt from snapshot columns, without reading the payload
+
+A closed session no longer changes, so its final snapshot is the
+summary: reports only recompute open sessions (and sessions closed
+before snapshots existed).
+"""
+
+from datetime import datetime, timezone
+from decimal import Decimal
+from sqlalchemy import and_
+from sqlalchemy.orm import Query, Session
+from typing import Optional
+import json
+
+from ...models.cash_register import (
+    CashRegisterSession as CashRegisterSessionModel,
+    CashRegisterReport as CashRegisterReportModel,
+    ReportType
+)
+from ...schemas.cash_register import DailySummaryReport
+from .transaction_service import get_transactions_by_session
+from .calculation_service import calculate_session_totals, calculate_payment_breakdown
+
+# Payment breakdown keys and the snapshot columns that store them
+PAYMENT_COLUMNS = {
+    "cash": "cash_payments",
+    "card": "card_payments",
+    "digital": "digital_payments",
+    "other": "other_payments",
+}
+
+
+def summarize_session(db: Session, db_session: CashRegisterSessionModel) -> DailySummaryReport:
+    """
+    Compute a session's summary from its transactions.
+
+    Args:
+        db: Database session
+        db_session: The cash register session
+
+    Returns:
+        Summary with totals and payment breakdown
+    """
+    total_sales, total_refunds, total_tips, total_expenses, net_cash_flow = \
+        calculate_session_totals(db, db_session.id)
+
+    return DailySummaryReport(
+        session_id=db_session.id,
+        session_number=db_session.session_number,
+        opened_at=db_session.opened_at,
+        closed_at=db_session.closed_at,
+        total_sales=total_sales,
+        total_refunds=total_refunds,
+        total_tips=total_tips,
+        total_expenses=total_expenses,
+        total_transactions=len(get_transactions_by_session(db, db_session.id)),
+        net_cash_flow=net_cash_flow,
+        payment_breakdown=calculate_payment_breakdown(db, db_session.id)
+    )
+
+
+def save_summary(
+    db: Session,
+    db_session: CashRegisterSessionModel,
+    summary: DailySummaryReport,
+    is_final: bool = False
+) -> CashRegisterReportModel:
+    """
+    Store a summary as a daily summary report. Does not commit.
+
+    Args:
+        db: Database session
+        db_session: Session the summary belongs to
+        summary: The summary to store
+        is_final: True for the snapshot written when the session is closed
+
+    Returns:
+        The report record
+    """
+    breakdown = summary.payment_breakdown
+    db_report = CashRegisterReportModel(
+        session_id=db_session.id,
+        restaurant_id=db_session.restaurant_id,
+        report_type=ReportType.DAILY_SUMMARY,
+        data=json.dumps(summary.dict(), default=str),
+        generated_at=datetime.now(timezone.utc),
+        is_final=is_final,
+        total_sales=summary.total_sales,
+        total_refunds=summary.total_refunds,
+        total_tips=summary.total_tips,
+        total_expenses=summary.total_expenses,
+        net_cash_flow=summary.net_cash_flow,
+        total_transactions=summary.total_transactions,
+        **{column: breakdown.get(method, 0.0) for method, column in PAYMENT_COLUMNS.items()}
+    )
+    db.add(db_report)
+    return db_report
+
+
+def _amount(value: Optional[Decimal]) -> float:
+    return float(value) if value is not None else 0.0
+
+
+def summary_from_snapshot(
+    report: CashRegisterReportModel,
+    db_session: Optional[CashRegisterSessionModel] = None
+) -> DailySummaryReport:
+    """
+    Rebuild a summary from a snapshot's columns.
+
+    Args:
+        report: A daily summary report
+        db_session: Its session, for the session number and times
+
+    Returns:
+        The stored summary
+    """
+    db_session = db_session or report.session
+    return DailySummaryReport(
+        session_id=report.session_id,
+        session_number=db_session.session_number,
+        opened_at=db_session.opened_at,
+        closed_at=db_session.closed_at,
+        total_sales=_amount(report.total_sales),
+        total_refunds=_amount(report.total_refunds),
+        total_tips=_amount(report.total_tips),
+        total_expenses=_amount(report.total_expenses),
+        total_transactions=report.total_transactions or 0,
+        net_cash_flow=_amount(report.net_cash_flow),
+        payment_breakdown={
+            method: _amount(getattr(report, column)) for method, column in PAYMENT_COLUMNS.items()
+        }
+    )
+
+
+def with_final_snapshots(query: Query) -> Query:
+    """
+    Add each session's final snapshot to a query of sessions, with an
+    outer join, so they load in the same query.
+
+    Args:
+        query: Query of CashRegisterSession
+
+    Returns:
+        Query of (session, final snapshot or None) rows
+    """
+    return query.outerjoin(
+        CashRegisterReportModel,
+        and_(
+            CashRegisterReportModel.session_id == CashRegisterSessionModel.id,
+            CashRegisterReportModel.report_type == ReportType.DAILY_SUMMARY,
+            CashRegisterReportModel.is_final.is_(True)
+        )
+    ).add_entity(CashRegisterReportModel)
+
+
+def session_summary(
+    db: Session,
+    db_session: CashRegisterSessionModel,
+    snapshot: Optional[CashRegisterReportModel]
+) -> DailySummaryReport:
+    """Summary of a session: from its final snapshot if it has one, else recomputed."""
+    if snapshot is not None:
+        return summary_from_snapshot(snapshot, db_session)
+    return summarize_session(db, db_session)
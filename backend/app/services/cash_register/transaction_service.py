@@ -6,20 +6,27 @@ Handles all operations related to cash transactions:
 - Retrieving transactions
 - Deleting transactions
 - Creating transactions from orders
+- Recording order sales in the open session (payment fast path)
 """
 
 from datetime import datetime, timezone
+from sqlalchemy import insert, literal, select
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import TYPE_CHECKING, List, Optional
 import logging
 
 from ...models.cash_register import (
+    CashRegisterSession as CashRegisterSessionModel,
     CashTransaction as CashTransactionModel,
     PaymentMethod,
+    SessionStatus,
     TransactionType
 )
 from ...schemas.cash_register import CashTransactionCreate
 
+if TYPE_CHECKING:
+    from ...models.order import Order as OrderModel
+
 logger = logging.getLogger(__name__)
 
 
@@ -207,3 +214,75 @@ def create_transaction_from_order(
     
     logger.info(f"Created transaction from order #{db_order.order_number}")
     return transaction
+
+
+def _insert_sale_if_open(
+    db: Session,
+    order: "OrderModel",
+    session_id: int,
+    created_by_user_id: int,
+    payment_method: Optional[PaymentMethod]
+) -> bool:
+    """INSERT ... SELECT the sale only while the session row is still open."""
+    now = datetime.now(timezone.utc)
+    columns = CashTransactionModel.__table__.c
+    values = {
+        "session_id": CashRegisterSessionModel.id,
+        "transaction_type": TransactionType.SALE,
+        "amount": order.total_amount,
+        "description": f"Pago de orden #{order.order_number}",
+        "order_id": order.id,
+        "created_by_user_id": created_by_user_id,
+        "payment_method": payment_method,
+        "created_at": now,
+        "updated_at": now,
+    }
+    row = select(*[
+        value if name == "session_id" else literal(value, type_=columns[name].type)
+        for name, value in values.items()
+    ]).where(
+        CashRegisterSessionModel.id == session_id,
+        CashRegisterSessionModel.status == SessionStatus.OPEN,
+    )
+    result = db.execute(insert(CashTransactionModel).from_select(list(values), row))
+    return result.rowcount == 1
+
+
+def record_order_sale(
+    db: Session,
+    order: "OrderModel",
+    created_by_user_id: int,
+    payment_method: Optional[PaymentMethod] = None
+) -> int:
+    """
+    Record the sale of an order in the user's open session. Does not commit.
+
+    The open session comes from the cache in session_service, and the
+    INSERT only goes through while that session is still open. When the
+    cached session was closed elsewhere, the cache is refreshed once.
+    The caller must hold the order (e.g. SELECT ... FOR UPDATE) and have
+    checked it is unpaid; that is what prevents duplicate sales.
+
+    Args:
+        db: Database session
+        order: Order being paid
+        created_by_user_id: ID of the user taking the payment
+        payment_method: Cash register payment method
+
+    Returns:
+        ID of the session the sale was recorded in
+
+    Raises:
+        ValueError: If the user has no open session
+    """
+    # Lazy import to avoid circular dependency
+    from .session_service import get_open_session_id, invalidate_open_session
+
+    for _ in range(2):
+        session_id = get_open_session_id(db, order.restaurant_id, created_by_user_id)
+        if session_id is None:
+            break
+        if _insert_sale_if_open(db, order, session_id, created_by_user_id, payment_method):
+            return session_id
+        invalidate_open_session(order.restaurant_id, created_by_user_id)
+    raise ValueError("No open cash register session found. Please open a session first.")
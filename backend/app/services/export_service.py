@@ -0,0 +1,190 @@
+"""
+Export Service
+
+Streams orders and cash transactions for accounting exports.
+
+Rows are read as plain column tuples through a server-side cursor
+(``yield_per``) and encoded in small batches, so memory stays flat no
+matter how many rows a date range contains. Nothing here builds ORM
+objects or holds the full result set.
+"""
+import csv
+import io
+from datetime import datetime
+from enum import Enum
+from typing import Any, Iterable, Iterator, Optional, Sequence, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from ..core.responses import dumps
+from ..models.cash_register import CashRegisterSession, CashTransaction
+from ..models.order import Order
+from ..models.table import Table
+from ..schemas.base import _dt_to_phoenix
+
+# Rows fetched per round trip from the server-side cursor
+YIELD_PER = 1000
+
+# Rows encoded per chunk handed to the response
+ROWS_PER_CHUNK = 500
+
+ORDER_COLUMNS = (
+    "id", "order_number", "ticket_number", "created_at", "status", "order_type",
+    "table_number", "customer_name", "payment_method", "is_paid", "total_amount",
+)
+
+TRANSACTION_COLUMNS = (
+    "id", "session_id", "session_number", "created_at", "transaction_type",
+    "payment_method", "amount", "order_id", "category", "description", "created_by_user_id",
+)
+
+# Cells starting with these are evaluated as formulas by spreadsheet apps
+_FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+def iter_order_rows(
+    db: Session,
+    restaurant_id: int,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None
+) -> Iterator[Tuple]:
+    """
+    Stream non-deleted orders of a restaurant, oldest first.
+
+    Args:
+        db: Database session
+        restaurant_id: Restaurant to export
+        start: Inclusive lower bound on created_at
+        end: Inclusive upper bound on created_at
+
+    Yields:
+        Tuples in ORDER_COLUMNS order
+    """
+    stmt = (
+        select(
+            Order.id, Order.order_number, Order.ticket_number, Order.created_at,
+            Order.status, Order.order_type, Table.number, Order.customer_name,
+            Order.payment_method, Order.is_paid, Order.total_amount,
+        )
+        .outerjoin(Table, Order.table_id == Table.id)
+        .where(Order.restaurant_id == restaurant_id, Order.deleted_at.is_(None))
+    )
+    if start is not None:
+        stmt = stmt.where(Order.created_at >= start)
+    if end is not None:
+        stmt = stmt.where(Order.created_at <= end)
+    stmt = stmt.order_by(Order.id).execution_options(yield_per=YIELD_PER)
+
+    for row in db.execute(stmt):
+        yield tuple(row)
+
+
+def iter_transaction_rows(
+    db: Session,
+    restaurant_id: int,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None
+) -> Iterator[Tuple]:
+    """
+    Stream cash transactions of a restaurant's sessions, oldest first.
+
+    Args:
+        db: Database session
+        restaurant_id: Restaurant to export
+        start: Inclusive lower bound on created_at
+        end: Inclusive upper bound on created_at
+
+    Yields:
+        Tuples in TRANSACTION_COLUMNS order
+    """
+    stmt = (
+        select(
+            CashTransaction.id, CashTransaction.session_id, CashRegisterSession.session_number,
+            CashTransaction.created_at, CashTransaction.transaction_type,
+            CashTransaction.payment_method, CashTransaction.amount, CashTransaction.order_id,
+            CashTransaction.category, CashTransaction.description,
+            CashTransaction.created_by_user_id,
+        )
+        .join(CashRegisterSession, CashTransaction.session_id == CashRegisterSession.id)
+        .where(
+            CashRegisterSession.restaurant_id == restaurant_id,
+            CashTransaction.deleted_at.is_(None),
+        )
+    )
+    if start is not None:
+        stmt = stmt.where(CashTransaction.created_at >= start)
+    if end is not None:
+        stmt = stmt.where(CashTransaction.created_at <= end)
+    stmt = stmt.order_by(CashTransaction.id).execution_options(yield_per=YIELD_PER)
+
+    for row in db.execute(stmt):
+        yield tuple(row)
+
+
+def _csv_cell(value: Any) -> Any:
+    if value is None:
+        return ""
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, datetime):
+        return _dt_to_phoenix(value)
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, str) and value.startswith(_FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def stream_csv(columns: Sequence[str], rows: Iterable[Tuple]) -> Iterator[bytes]:
+    """
+    Encode rows as CSV, yielding one chunk per ROWS_PER_CHUNK rows.
+
+    Starts with a UTF-8 BOM so spreadsheet apps detect the encoding.
+
+    Args:
+        columns: Header row
+        rows: Row tuples matching columns
+
+    Yields:
+        UTF-8 encoded CSV chunks
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    yield b"\xef\xbb\xbf" + buffer.getvalue().encode("utf-8")
+
+    pending = 0
+    buffer.seek(0)
+    buffer.truncate()
+    for row in rows:
+        writer.writerow([_csv_cell(value) for value in row])
+        pending += 1
+        if pending == ROWS_PER_CHUNK:
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+            pending = 0
+    if pending:
+        yield buffer.getvalue().encode("utf-8")
+
+
+def stream_ndjson(columns: Sequence[str], rows: Iterable[Tuple]) -> Iterator[bytes]:
+    """
+    Encode rows as newline-delimited JSON objects, in chunks of ROWS_PER_CHUNK.
+
+    Args:
+        columns: Object keys
+        rows: Row tuples matching columns
+
+    Yields:
+        UTF-8 encoded NDJSON chunks
+    """
+    chunk = []
+    for row in rows:
+        chunk.append(dumps(dict(zip(columns, row))))
+        if len(chunk) == ROWS_PER_CHUNK:
+            yield b"\n".join(chunk) + b"\n"
+            chunk = []
+    if chunk:
+        yield b"\n".join(chunk) + b"\n"
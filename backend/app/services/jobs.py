@@ -0,0 +1,81 @@
+"""
+Scheduled Jobs
+
+The application's periodic work, registered with the scheduler (see
+services/scheduler.py) when this module is imported.
+
+Cluster jobs write shared data and run once per cluster, on the leader.
+Worker jobs keep per-process state fresh (the platform metrics snapshot,
+pool stats) and run in every worker, with
+jitter so the workers do not all hit the database at once.
+"""
+import logging
+from datetime import timedelta
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from ..core.config import settings
+from ..models.special_note_stats import SpecialNoteStats
+from . import outbox
+from .alert_service import AlertService
+from .platform_metrics import refresh_platform_metrics
+from .scheduler import Cron, Interval, JobScope, job, purge_history
+from .special_notes import SpecialNotesService
+
+logger = logging.getLogger(__name__)
+
+# Jitter for worker jobs, so N workers spread their queries
+WORKER_JITTER_SECONDS = 30
+
+
+# -- worker jobs --------------------------------------------------------------
+
+@job("platform_metrics.refresh", Interval(settings.PLATFORM_METRICS_REFRESH_SECONDS),
+     scope=JobScope.WORKER, jitter=WORKER_JITTER_SECONDS)
+def refresh_platform_metrics_snapshot(db: Session) -> None:
+    """Recompute this worker's sysadmin metrics snapshot."""
+    refresh_platform_metrics(db)
+
+
+if settings.DB_POOL_ADVISOR_ENABLED:
+    @job("db.publish_pool_stats", Interval(settings.DB_POOL_STATS_INTERVAL), scope=JobScope.WORKER)
+    def publish_pool_stats(db: Session) -> None:
+        """Share this worker's connection pool stats with the pool sizing advisor."""
+        from ..db.base import engine
+        from ..db.pool_metrics import publish_worker_stats
+
+        publish_worker_stats(engine, settings.DB_POOL_STATS_DIR)
+
+
+# -- cluster jobs -------------------------------------------------------------
+
+@job("subscriptions.expiring_alerts", Cron(settings.SUBSCRIPTION_ALERTS_CRON))
+def alert_expiring_subscriptions(db: Session) -> None:
+    """Alert restaurants whose subscription ends within three days."""
+    AlertService(db).check_expiring_subscriptions()
+
+
+@job("special_notes.cleanup", Cron(settings.SPECIAL_NOTES_CLEANUP_CRON))
+def cleanup_special_notes(db: Session) -> None:
+    """Keep each restaurant's special notes to its most used ones."""
+    restaurant_ids = db.execute(
+        select(SpecialNoteStats.restaurant_id).where(SpecialNoteStats.deleted_at.is_(None)).distinct()
+    ).scalars().all()
+    removed = sum(SpecialNotesService.cleanup_old_notes(db, restaurant_id) for restaurant_id in restaurant_ids)
+    if removed:
+        logger.info(f"Removed {removed} rarely used special notes")
+
+
+@job("outbox.purge", Interval(3600))
+def purge_outbox(db: Session) -> None:
+    """Delete processed outbox events past their retention."""
+    purged = outbox.purge(db, timedelta(hours=settings.OUTBOX_RETENTION_HOURS))
+    if purged:
+        logger.info(f"Purged {purged} processed outbox events")
+
+
+@job("scheduler.purge_history", Cron("15 4 * * *"))
+def purge_job_history(db: Session) -> None:
+    """Delete scheduled job runs past their retention."""
+    purge_history(db, timedelta(days=settings.SCHEDULER_HISTORY_DAYS))
@@ -0,0 +1,202 @@
+"""
+Menu Images
+
+Uploads of menu item images and their resized variants (file layout and
+URLs in core/media.py).
+
+``store_menu_image`` writes the original and enqueues an outbox event in
+the same transaction as the item change; the outbox worker then
+generates a WebP variant per MENU_IMAGE_SIZES entry, so the upload
+request never waits for resizing. Until a variant exists its URL falls
+back to the original.
+
+Uploads are checked with Pillow before anything is stored: the format
+must be allowed, the file must verify and the pixel count is capped
+(MENU_IMAGE_MAX_PIXELS), so the worker never decodes an image that
+would not fit in memory. The worker shrinks the image once to the
+largest size and derives the smaller ones from it.
+
+Files are written under a temporary name and renamed, so a file is
+never served half written, and existing files are kept: the same
+content always produces the same files.
+"""
+import hashlib
+import logging
+import os
+import tempfile
+from io import BytesIO
+from pathlib import Path
+from typing import List, Tuple
+
+from sqlalchemy.orm import Session
+
+from ..core.config import settings
+from ..core.exceptions import ValidationError
+from ..core.media import MENU_IMAGE_SIZES, menu_image_dir, variant_filename
+from ..models.menu import MenuItem
+from . import outbox
+
+logger = logging.getLogger(__name__)
+
+WEBP_QUALITY = 80
+
+# Accepted Pillow formats and the extension they are stored with
+_EXTENSIONS = {"JPEG": "jpg", "PNG": "png", "GIF": "gif", "WEBP": "webp"}
+
+
+def _pillow() -> Tuple:
+    try:
+        from PIL import Image, ImageOps
+    except ImportError:
+        raise RuntimeError("Menu images require the 'Pillow' package") from None
+    return Image, ImageOps
+
+
+def image_extension(content: bytes) -> str:
+    """
+    Extension for an uploaded image, after checking it with Pillow.
+    Only the header is decoded, whatever the image size.
+
+    Raises:
+        ValidationError: Not a valid JPEG, PNG, GIF or WebP image, or too many pixels
+        RuntimeError: Pillow is not installed
+    """
+    Image, _ = _pillow()
+    invalid = ValidationError("La imagen debe ser JPEG, PNG, GIF o WebP", field="image")
+    try:
+        with Image.open(BytesIO(content)) as image:
+            extension = _EXTENSIONS.get(image.format)
+            width, height = image.size
+            if extension is None:
+                raise invalid
+            if width * height > settings.MENU_IMAGE_MAX_PIXELS:
+                raise ValidationError(
+                    f"La imagen no puede superar {settings.MENU_IMAGE_MAX_PIXELS // 1_000_000} megapíxeles",
+                    field="image"
+                )
+            image.verify()
+    except ValidationError:
+        raise
+    except Exception:
+        raise invalid from None
+    return extension
+
+
+def _write_atomic(path: Path, content: bytes) -> None:
+    if path.exists():
+        return
+    path.parent.mkdir(parents=True, exist_ok=True)
+    descriptor, temporary = tempfile.mkstemp(dir=path.parent, prefix=".upload-")
+    try:
+        with os.fdopen(descriptor, "wb") as handle:
+            handle.write(content)
+        os.replace(temporary, path)
+    except BaseException:
+        os.unlink(temporary)
+        raise
+
+
+def store_menu_image(db: Session, menu_item: MenuItem, content: bytes) -> MenuItem:
+    """
+    Save an uploaded image as the item's image and schedule its variants.
+    Commits.
+
+    Args:
+        db: Database session
+        menu_item: The item the image belongs to
+        content: The uploaded file
+
+    Returns:
+        The updated menu item
+
+    Raises:
+        ValidationError: Empty, too large or not a valid image
+    """
+    if not content:
+        raise ValidationError("La imagen está vacía", field="image")
+    if len(content) > settings.MENU_IMAGE_MAX_BYTES:
+        raise ValidationError(
+            f"La imagen no puede superar {settings.MENU_IMAGE_MAX_BYTES // (1024 * 1024)} MB", field="image"
+        )
+    image_key = f"{hashlib.sha256(content).hexdigest()[:32]}.{image_extension(content)}"
+    _write_atomic(menu_image_dir(menu_item.restaurant_id) / image_key, content)
+
+    if menu_item.image_key != image_key:
+        menu_item.image_key = image_key
+        menu_item.image_variants = []
+        outbox.enqueue(
+            db, outbox.MENU_IMAGE_UPLOADED,
+            {"menu_item_id": menu_item.id, "restaurant_id": menu_item.restaurant_id, "image_key": image_key},
+            restaurant_id=menu_item.restaurant_id
+        )
+    db.commit()
+    db.refresh(menu_item)
+    logger.info("Stored image %s for menu item %s", image_key, menu_item.id)
+    return menu_item
+
+
+def remove_menu_image(db: Session, menu_item: MenuItem) -> MenuItem:
+    """
+    Stop using the item's uploaded image. Commits.
+
+    The files are kept: other items may have uploaded the same image, and
+    clients may still hold their URLs.
+    """
+    menu_item.image_key = None
+    menu_item.image_variants = None
+    db.commit()
+    db.refresh(menu_item)
+    return menu_item
+
+
+def generate_variants(restaurant_id: int, image_key: str) -> List[str]:
+    """
+    Write the resized WebP variants of an uploaded image.
+
+    Args:
+        restaurant_id: Restaurant the image belongs to
+        image_key: File name of the original
+
+    Returns:
+        list: Sizes whose variant exists
+
+    Raises:
+        RuntimeError: Pillow is not installed
+        FileNotFoundError: The original is missing
+    """
+    Image, ImageOps = _pillow()
+    directory = menu_image_dir(restaurant_id)
+    largest = max(MENU_IMAGE_SIZES.values())
+    with Image.open(directory / image_key) as original:
+        if original.width * original.height > settings.MENU_IMAGE_MAX_PIXELS:
+            # Stored before uploads were checked; the original stays in use
+            logger.warning("Menu image %s is too large to resize", image_key)
+            return []
+        # JPEGs decode straight at a reduced scale
+        original.draft("RGB", (largest, largest))
+        # Converted first: palette images would be resized without filtering
+        mode = "RGBA" if "A" in original.getbands() or "transparency" in original.info else "RGB"
+        image = original if original.mode == mode else original.convert(mode)
+        # The only resize of the full image, in place
+        image.thumbnail((largest, largest), Image.Resampling.LANCZOS)
+        image = ImageOps.exif_transpose(image)
+    # Largest first, each size shrunk from the previous one; never enlarged
+    for size, longest_side in sorted(MENU_IMAGE_SIZES.items(), key=lambda entry: entry[1], reverse=True):
+        image.thumbnail((longest_side, longest_side), Image.Resampling.LANCZOS)
+        path = directory / variant_filename(image_key, size)
+        if path.exists():
+            continue
+        buffer = BytesIO()
+        image.save(buffer, "WEBP", quality=WEBP_QUALITY, method=4)
+        _write_atomic(path, buffer.getvalue())
+    return list(MENU_IMAGE_SIZES)
+
+
+@outbox.handler(outbox.MENU_IMAGE_UPLOADED)
+def resize_uploaded_image(db: Session, payload: dict) -> None:
+    """Outbox handler: generate the variants of an uploaded menu image."""
+    sizes = generate_variants(payload["restaurant_id"], payload["image_key"])
+    menu_item = db.get(MenuItem, payload["menu_item_id"])
+    # The item may have been given another image meanwhile
+    if menu_item is not None and menu_item.image_key == payload["image_key"]:
+        menu_item.image_variants = sizes
@@ -7,6 +7,10 @@ Modules:
 - order_crud: Basic CRUD operations for orders
 - order_items_crud: CRUD operations for order items
 - order_extras_crud: CRUD operations for order item extras
+- totals: Incremental order totals and per-diner subtotals
+- kitchen_bump: Batch item status transitions for the kitchen screen
+- kitchen_queue: Station-scoped, item-level kitchen queue
+- search: Indexed order search (prefix matching and ranking)
 - payment_service: Payment processing and cash register integration
 - table_manager: Table occupancy management
 - validators: Reusable validation functions
@@ -29,6 +33,7 @@ from .serializers import (
     serialize_order_item_extra,
     serialize_order_person,
     serialize_order,
+    serialize_orders,
 )
 
 # Order CRUD
@@ -56,12 +61,44 @@ _update_order_item_status = None
 from .order_extras_crud import (
     add_extra_to_item,
     get_item_extras,
+    get_extra_by_id,
     update_item_extra,
     delete_item_extra,
 )
 
+# Totals Engine
+from .totals import (
+    OrderTotals,
+    apply_delta,
+    compute_order_totals,
+    recompute_order_totals,
+)
+
+# Kitchen Bump
+from .kitchen_bump import (
+    ALLOWED_ITEM_TRANSITIONS,
+    bump_item_statuses,
+)
+
+# Kitchen Queue
+from .kitchen_queue import (
+    get_kitchen_queue,
+    resolve_station,
+)
+
+# Order Search
+from .search import (
+    apply_search,
+    reindex_items,
+    reindex_order,
+    reindex_orders,
+    search_subquery,
+    tokenize,
+)
+
 # Payment Service
 from .payment_service import (
+    settle_order,
     process_order_payment,
     validate_payment_method,
     can_cancel_order,
@@ -71,6 +108,7 @@ from .payment_service import (
 from .table_manager import (
     mark_table_occupied,
     mark_table_available_if_no_orders,
+    release_table_if_idle,
     handle_table_change,
 )
 
@@ -91,6 +129,7 @@ __all__ = [
     "serialize_order_item_extra",
     "serialize_order_person",
     "serialize_order",
+    "serialize_orders",
     # Order CRUD
     "get_orders",
     "get_order",
@@ -106,15 +145,36 @@ __all__ = [
     # Order Extras CRUD
     "add_extra_to_item",
     "get_item_extras",
+    "get_extra_by_id",
     "update_item_extra",
     "delete_item_extra",
+    # Totals Engine
+    "OrderTotals",
+    "apply_delta",
+    "compute_order_totals",
+    "recompute_order_totals",
+    # Kitchen Bump
+    "ALLOWED_ITEM_TRANSITIONS",
+    "bump_item_statuses",
+    # Kitchen Queue
+    "get_kitchen_queue",
+    "resolve_station",
+    # Order Search
+    "apply_search",
+    "reindex_items",
+    "reindex_order",
+    "reindex_orders",
+    "search_subquery",
+    "tokenize",
     # Payment Service
+    "settle_order",
     "process_order_payment",
     "validate_payment_method",
     "can_cancel_order",
     # Table Manager
     "mark_table_occupied",
     "mark_table_available_if_no_orders",
+    "release_table_if_idle",
     "handle_table_change",
     # Validators
     "validate_menu_item_exists",
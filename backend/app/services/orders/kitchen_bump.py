@@ -0,0 +1,179 @@
+"""
+Kitchen Bump
+
+Batch item status transitions for the kitchen screen.
+
+A bump names items explicitly, ``(order_id, item_id, status)``, or by
+category, ``(order_id, category_id, status)``. The current state of every
+item of the affected orders is read in one query, all transitions are
+validated against ``ALLOWED_ITEM_TRANSITIONS`` before anything is written,
+and the changes are applied with one bulk UPDATE per target status and a
+single commit. Order statuses are rolled up from their items the same way
+the kitchen screen did it client-side.
+"""
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Dict, FrozenSet, List, Set
+
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from ...core.exceptions import ConflictError, ResourceNotFoundError, ValidationError
+from ...models.menu import MenuItem
+from ...models.order import Order as OrderModel, OrderStatus
+from ...models.order_item import OrderItem as OrderItemModel, OrderItemStatus
+from ...schemas.order import KitchenBumpRequest
+
+ALLOWED_ITEM_TRANSITIONS: Dict[OrderItemStatus, FrozenSet[OrderItemStatus]] = {
+    OrderItemStatus.PENDING: frozenset({
+        OrderItemStatus.PREPARING, OrderItemStatus.READY, OrderItemStatus.CANCELLED,
+    }),
+    # Going back undoes an accidental bump
+    OrderItemStatus.PREPARING: frozenset({
+        OrderItemStatus.READY, OrderItemStatus.PENDING, OrderItemStatus.CANCELLED,
+    }),
+    OrderItemStatus.READY: frozenset({OrderItemStatus.COMPLETED, OrderItemStatus.PREPARING}),
+    OrderItemStatus.COMPLETED: frozenset(),
+    OrderItemStatus.CANCELLED: frozenset(),
+}
+
+_OPEN_ORDER_STATUSES = (OrderStatus.PENDING, OrderStatus.PREPARING, OrderStatus.READY)
+
+# Item statuses past "pending" and past "preparing", for the order roll-up
+_STARTED = frozenset({
+    OrderItemStatus.PREPARING, OrderItemStatus.READY, OrderItemStatus.COMPLETED, OrderItemStatus.CANCELLED,
+})
+_DONE = frozenset({OrderItemStatus.READY, OrderItemStatus.COMPLETED, OrderItemStatus.CANCELLED})
+
+
+def _rolled_up_status(current: OrderStatus, statuses: List[OrderItemStatus]) -> OrderStatus:
+    """Order status implied by its item statuses; only ever moves forward."""
+    if not statuses or all(s == OrderItemStatus.CANCELLED for s in statuses):
+        return current
+    if current in (OrderStatus.PENDING, OrderStatus.PREPARING) and all(s in _DONE for s in statuses):
+        return OrderStatus.READY
+    if current == OrderStatus.PENDING and all(s in _STARTED for s in statuses):
+        return OrderStatus.PREPARING
+    return current
+
+
+def bump_item_statuses(db: Session, restaurant_id: int, bump: KitchenBumpRequest) -> dict:
+    """
+    Apply a batch of item status transitions in one transaction.
+
+    Args:
+        db: Database session
+        restaurant_id: Restaurant the orders must belong to
+        bump: Explicit item and per-category transitions
+
+    Returns:
+        dict: Compact delta with the items and orders whose status changed,
+        the explicitly named items that were already in the requested
+        status, and the time of the change
+
+    Raises:
+        ResourceNotFoundError: An order or item does not exist in this restaurant
+        ConflictError: An order is no longer open
+        ValidationError: A transition is not allowed; nothing is written
+    """
+    order_ids = {t.order_id for t in bump.items} | {t.order_id for t in bump.categories}
+
+    orders = dict(db.execute(
+        select(OrderModel.id, OrderModel.status).where(
+            OrderModel.id.in_(order_ids),
+            OrderModel.restaurant_id == restaurant_id,
+            OrderModel.deleted_at.is_(None),
+        )
+    ).all())
+    for order_id in sorted(order_ids):
+        if order_id not in orders:
+            raise ResourceNotFoundError("Order", order_id)
+        if orders[order_id] not in _OPEN_ORDER_STATUSES:
+            raise ConflictError(
+                f"Order {order_id} is {orders[order_id].value}; its items can no longer change",
+                resource="Order",
+            )
+
+    rows = db.execute(
+        select(OrderItemModel.id, OrderItemModel.order_id, OrderItemModel.status, MenuItem.category_id)
+        .join(MenuItem, OrderItemModel.menu_item_id == MenuItem.id)
+        .where(OrderItemModel.order_id.in_(order_ids), OrderItemModel.deleted_at.is_(None))
+    ).all()
+    items = {row.id: row for row in rows}
+
+    targets: Dict[int, OrderItemStatus] = {}
+    skipped: List[int] = []
+    invalid: List[str] = []
+
+    def target(item_id: int, status: OrderItemStatus) -> None:
+        if targets.get(item_id, status) != status:
+            raise ValidationError(f"Item {item_id} is bumped to more than one status", field="items")
+        targets[item_id] = status
+
+    for transition in bump.items:
+        row = items.get(transition.item_id)
+        if row is None or row.order_id != transition.order_id:
+            raise ResourceNotFoundError("OrderItem", transition.item_id)
+        status = OrderItemStatus(transition.status.value)
+        if row.status == status:
+            skipped.append(row.id)
+        elif status not in ALLOWED_ITEM_TRANSITIONS[row.status]:
+            invalid.append(f"item {row.id}: {row.status.value} -> {status.value}")
+        else:
+            target(row.id, status)
+
+    # Category bumps move the items that can make the transition and leave the rest
+    for transition in bump.categories:
+        status = OrderItemStatus(transition.status.value)
+        for row in rows:
+            if (row.order_id == transition.order_id and row.category_id == transition.category_id
+                    and status in ALLOWED_ITEM_TRANSITIONS[row.status]):
+                target(row.id, status)
+
+    if invalid:
+        raise ValidationError(f"Transitions not allowed: {'; '.join(invalid)}", field="items")
+
+    now = datetime.now(timezone.utc)
+    by_status: Dict[OrderItemStatus, List[int]] = defaultdict(list)
+    for item_id, status in targets.items():
+        by_status[status].append(item_id)
+    for status, item_ids in by_status.items():
+        db.execute(
+            update(OrderItemModel)
+            .where(OrderItemModel.id.in_(item_ids))
+            .values(status=status, updated_at=now)
+            .execution_options(synchronize_session=False)
+        )
+
+    changed_orders: Dict[int, OrderStatus] = {}
+    if bump.update_order_status and targets:
+        statuses_by_order: Dict[int, List[OrderItemStatus]] = defaultdict(list)
+        for row in rows:
+            statuses_by_order[row.order_id].append(targets.get(row.id, row.status))
+        touched: Set[int] = {items[item_id].order_id for item_id in targets}
+        for order_id in touched:
+            status = _rolled_up_status(orders[order_id], statuses_by_order[order_id])
+            if status != orders[order_id]:
+                changed_orders[order_id] = status
+        orders_by_status: Dict[OrderStatus, List[int]] = defaultdict(list)
+        for order_id, status in changed_orders.items():
+            orders_by_status[status].append(order_id)
+        for status, ids in orders_by_status.items():
+            db.execute(
+                update(OrderModel)
+                .where(OrderModel.id.in_(ids))
+                .values(status=status, updated_at=now)
+                .execution_options(synchronize_session=False)
+            )
+
+    db.commit()
+
+    return {
+        "items": [
+            {"id": item_id, "order_id": items[item_id].order_id, "status": status.value}
+            for item_id, status in sorted(targets.items())
+        ],
+        "orders": [{"id": order_id, "status": status.value} for order_id, status in sorted(changed_orders.items())],
+        "skipped": skipped,
+        "updated_at": now,
+    }
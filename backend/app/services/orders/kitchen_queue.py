@@ -0,0 +1,222 @@
+"""
+Kitchen Queue
+
+Item-level work list for kitchen and bar displays, computed on the server.
+
+A station is one printer (``printer_id``) or every printer of a type
+(``station``: kitchen or bar). It prepares the items of the categories
+assigned to its printers; the default kitchen printer also takes the
+categories assigned to no active printer, as in printing/routing.py.
+Without a station the queue covers every category.
+
+The queue holds the pending and preparing items of open orders whose
+category is visible in the kitchen, one flat row per item with its
+order context and age, ordered FIFO the same way ``get_orders`` sorts
+the kitchen view. It is read with two queries (items, then extras) and
+never loads full orders.
+"""
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import and_, case, exists, or_, select
+from sqlalchemy.orm import Session
+
+from ...core.exceptions import ResourceNotFoundError, ValidationError
+from ...models.menu import Category, MenuItem, MenuItemVariant
+from ...models.order import Order as OrderModel, OrderStatus
+from ...models.order_item import OrderItem as OrderItemModel, OrderItemStatus
+from ...models.order_item_extra import OrderItemExtra
+from ...models.order_person import OrderPerson
+from ...models.printer import Printer, PrinterType, category_printer
+from ...models.table import Table
+
+QUEUE_ITEM_STATUSES = (OrderItemStatus.PENDING, OrderItemStatus.PREPARING)
+QUEUE_ORDER_STATUSES = (OrderStatus.PENDING, OrderStatus.PREPARING)
+
+
+def _active_printers(restaurant_id: int):
+    return and_(
+        Printer.restaurant_id == restaurant_id,
+        Printer.deleted_at.is_(None),
+        Printer.is_active.is_(True),
+    )
+
+
+def resolve_station(
+    db: Session,
+    restaurant_id: int,
+    printer_id: Optional[int] = None,
+    station: Optional[PrinterType] = None,
+) -> Tuple[List[int], bool]:
+    """
+    Printers of a station and whether it takes unassigned categories.
+
+    Args:
+        db: Database session
+        restaurant_id: Restaurant of the station
+        printer_id: One printer
+        station: Every active printer of this type
+
+    Returns:
+        tuple: Printer IDs, and True if the station includes the default
+        kitchen printer (or is the kitchen station as a whole)
+
+    Raises:
+        ValidationError: Both printer_id and station were given
+        ResourceNotFoundError: The printer does not exist or is inactive
+    """
+    if printer_id is not None and station is not None:
+        raise ValidationError("Use either printer_id or station, not both", field="printer_id")
+
+    query = select(Printer.id, Printer.printer_type, Printer.is_default).where(_active_printers(restaurant_id))
+    if printer_id is not None:
+        query = query.where(Printer.id == printer_id)
+    else:
+        query = query.where(Printer.printer_type == station)
+    printers = db.execute(query).all()
+    if printer_id is not None and not printers:
+        raise ResourceNotFoundError("Printer", printer_id)
+
+    takes_unassigned = station == PrinterType.KITCHEN or any(
+        row.is_default and row.printer_type == PrinterType.KITCHEN for row in printers
+    )
+    return [row.id for row in printers], takes_unassigned
+
+
+def get_kitchen_queue(
+    db: Session,
+    restaurant_id: int,
+    printer_id: Optional[int] = None,
+    station: Optional[PrinterType] = None,
+    order_type: Optional[str] = None,
+    limit: int = 500,
+) -> dict:
+    """
+    Kitchen queue of a restaurant, optionally for one station.
+
+    Args:
+        db: Database session
+        restaurant_id: Restaurant whose orders are listed
+        printer_id: Only items routed to this printer
+        station: Only items routed to printers of this type
+        order_type: Only orders of this type (dine_in, takeaway, delivery)
+        limit: Maximum items returned
+
+    Returns:
+        dict: The station's printers, the items oldest order first, and
+        the time the queue was computed (for ages on the client)
+
+    Raises:
+        ValidationError: Both printer_id and station were given
+        ResourceNotFoundError: The printer does not exist or is inactive
+    """
+    now = datetime.now(timezone.utc)
+
+    filters = [
+        OrderModel.restaurant_id == restaurant_id,
+        OrderModel.deleted_at.is_(None),
+        OrderModel.status.in_(QUEUE_ORDER_STATUSES),
+        OrderItemModel.deleted_at.is_(None),
+        OrderItemModel.status.in_(QUEUE_ITEM_STATUSES),
+        Category.visible_in_kitchen.is_(True),
+    ]
+    if order_type is not None:
+        filters.append(OrderModel.order_type == order_type)
+
+    printer_ids: Optional[List[int]] = None
+    if printer_id is not None or station is not None:
+        printer_ids, takes_unassigned = resolve_station(db, restaurant_id, printer_id, station)
+        assigned_here = exists().where(
+            category_printer.c.category_id == Category.id,
+            category_printer.c.printer_id.in_(printer_ids),
+        )
+        if takes_unassigned:
+            assigned_anywhere = exists().where(
+                category_printer.c.category_id == Category.id,
+                category_printer.c.printer_id == Printer.id,
+                _active_printers(restaurant_id),
+            )
+            filters.append(or_(assigned_here, ~assigned_anywhere))
+        else:
+            filters.append(assigned_here)
+
+    # Same FIFO as the kitchen sort of get_orders, then items as added
+    status_order = case(
+        (OrderModel.status == OrderStatus.PENDING, 0),
+        (OrderModel.status == OrderStatus.PREPARING, 1),
+        else_=2
+    )
+    rows = db.execute(
+        select(
+            OrderItemModel.id, OrderItemModel.order_id, OrderItemModel.status, OrderItemModel.quantity,
+            OrderItemModel.special_instructions, OrderItemModel.created_at, OrderItemModel.updated_at,
+            MenuItem.id.label("menu_item_id"), MenuItem.name.label("menu_item_name"),
+            MenuItemVariant.name.label("variant_name"),
+            Category.id.label("category_id"), Category.name.label("category_name"),
+            OrderPerson.name.label("person_name"),
+            OrderModel.order_number, OrderModel.ticket_number, OrderModel.order_type,
+            OrderModel.status.label("order_status"), OrderModel.customer_name, OrderModel.notes.label("order_notes"),
+            OrderModel.created_at.label("order_created_at"),
+            Table.number.label("table_number"),
+        )
+        .select_from(OrderItemModel)
+        .join(OrderModel, OrderItemModel.order_id == OrderModel.id)
+        .join(MenuItem, OrderItemModel.menu_item_id == MenuItem.id)
+        .join(Category, MenuItem.category_id == Category.id)
+        .outerjoin(MenuItemVariant, OrderItemModel.variant_id == MenuItemVariant.id)
+        .outerjoin(OrderPerson, OrderItemModel.person_id == OrderPerson.id)
+        .outerjoin(Table, OrderModel.table_id == Table.id)
+        .where(*filters)
+        .order_by(status_order, OrderModel.sort.asc(), OrderModel.created_at.asc(), OrderItemModel.id.asc())
+        .limit(limit)
+    ).all()
+
+    extras: Dict[int, List[dict]] = defaultdict(list)
+    if rows:
+        for extra in db.execute(
+            select(OrderItemExtra.order_item_id, OrderItemExtra.name, OrderItemExtra.quantity)
+            .where(OrderItemExtra.order_item_id.in_([row.id for row in rows]))
+            .order_by(OrderItemExtra.id)
+        ):
+            extras[extra.order_item_id].append({"name": extra.name, "quantity": extra.quantity})
+
+    def age(created_at: Optional[datetime]) -> int:
+        if created_at is None:
+            return 0
+        if created_at.tzinfo is None:
+            created_at = created_at.replace(tzinfo=timezone.utc)
+        return max(int((now - created_at).total_seconds()), 0)
+
+    return {
+        "printer_ids": printer_ids,
+        "generated_at": now,
+        "items": [
+            {
+                "id": row.id,
+                "order_id": row.order_id,
+                "order_number": row.order_number,
+                "ticket_number": row.ticket_number,
+                "order_type": row.order_type.value,
+                "order_status": row.order_status.value,
+                "table_number": row.table_number,
+                "customer_name": row.customer_name,
+                "person_name": row.person_name,
+                "order_notes": row.order_notes,
+                "menu_item_id": row.menu_item_id,
+                "name": row.menu_item_name,
+                "variant_name": row.variant_name,
+                "category_id": row.category_id,
+                "category_name": row.category_name,
+                "quantity": row.quantity,
+                "special_instructions": row.special_instructions,
+                "extras": extras.get(row.id, []),
+                "status": row.status.value,
+                "created_at": row.created_at,
+                "updated_at": row.updated_at,
+                "age_seconds": age(row.created_at),
+                "order_age_seconds": age(row.order_created_at),
+            }
+            for row in rows
+        ],
+    }
@@ -9,7 +9,7 @@ Basic CRUD operations for orders, including:
 """
 
 from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import or_, case
+from sqlalchemy import case
 from typing import List, Optional, Dict, Any
 from datetime import datetime, timezone, timedelta
 import logging
@@ -21,9 +21,13 @@ from ...models.order_person import OrderPerson as OrderPersonModel
 from ...models.menu import MenuItem, MenuItemVariant
 from ...models.table import Table as TableModel
 from ...schemas.order import OrderCreate, OrderUpdate, OrderItemCreate
-from .serializers import serialize_order
+from .serializers import serialize_order, serialize_orders
 from .ticket_generator import generate_ticket_number
+from .totals import line_amount
+from .search import apply_search
 from ...services.subscription import get_restaurant_subscription
+from .. import outbox
+from ...core.config import settings
 from ...core.operation_modes import validate_order_for_mode, get_default_order_type, get_mode_config
 
 
@@ -63,15 +67,6 @@ def apply_filters(query, filters: Dict[str, Any]):
     if filters.get("end_date"):
         query = query.filter(OrderModel.created_at <= filters["end_date"])
 
-    if filters.get("search"):
-        search_term = f"%{filters['search']}%"
-        query = query.filter(
-            or_(
-                OrderModel.notes.ilike(search_term),
-                OrderModel.customer_name.ilike(search_term)
-            )
-        )
-
     # Filter by hours (e.g., last 24 hours)
     if filters.get("hours") is not None:
         hours_ago = datetime.now(timezone.utc) - timedelta(hours=filters["hours"])
@@ -94,8 +89,10 @@ def get_orders(
         db: Database session
         skip: Number of records to skip (pagination)
         limit: Maximum number of records to return
-        sort_by: Sorting method ('kitchen' for FIFO, 'orders' for newest first)
-        **filters: Additional filters (restaurant_id, status, table_id, waiter_id, etc.)
+        sort_by: Sorting method ('kitchen' for FIFO, 'orders' for newest first,
+            'relevance' for best search matches first)
+        **filters: Additional filters (restaurant_id, status, table_id, waiter_id,
+            start_date, end_date, search, etc.)
         
     Returns:
         List of serialized orders
@@ -110,7 +107,11 @@ def get_orders(
             joinedload(OrderModel.user),
         )
 
+        search = filters.pop("search", None)
         query = apply_filters(query, filters or {})
+        score = None
+        if search:
+            query, score = apply_search(query, filters.get("restaurant_id"), search)
         
         # Apply sorting based on context
         if sort_by == 'kitchen':
@@ -129,13 +130,19 @@ def get_orders(
                 OrderModel.sort.asc(),
                 OrderModel.created_at.asc()
             ).offset(skip).limit(limit).all()
+        elif sort_by == 'relevance' and score is not None:
+            # Search view: best match first, newest first among equals
+            orders = query.order_by(
+                score.desc(),
+                OrderModel.id.desc()
+            ).offset(skip).limit(limit).all()
         else:
             # Orders view: Newest first (by ID desc)
             orders = query.order_by(
                 OrderModel.id.desc()
             ).offset(skip).limit(limit).all()
 
-        return [serialize_order(order) for order in orders]
+        return serialize_orders(orders)
     except Exception as e:
         logging.error(f"Error in get_orders: {str(e)}", exc_info=True)
         raise
@@ -277,8 +284,8 @@ def create_order_with_items(
 
     total_amount = 0.0
 
-    # Helper function to create order items
-    def create_order_item(item_data: OrderItemCreate, person_id: Optional[int] = None):
+    # Helper function to create order items; returns the item's amount with extras
+    def create_order_item(item_data: OrderItemCreate, person_id: Optional[int] = None) -> float:
         nonlocal total_amount
         
         menu_item = db.query(MenuItem).filter(MenuItem.id == item_data.menu_item_id).first()
@@ -314,7 +321,7 @@ def create_order_with_items(
         db.flush()  # Flush to get the item ID for extras
         
         # Add item price to total
-        total_amount += unit_price * item_data.quantity
+        item_amount = line_amount(item_data.quantity, unit_price)
         
         # Add extras if provided
         if hasattr(item_data, 'extras') and item_data.extras:
@@ -330,7 +337,10 @@ def create_order_with_items(
                 )
                 db.add(db_extra)
                 # Add extra price to total
-                total_amount += extra_data.price * extra_data.quantity
+                item_amount += line_amount(extra_data.quantity, extra_data.price)
+
+        total_amount += item_amount
+        return item_amount
 
     # Process persons with their items (new multi-diner approach)
     has_persons = hasattr(order, 'persons') and order.persons
@@ -341,6 +351,7 @@ def create_order_with_items(
                 order_id=db_order.id,
                 name=person_data.name,
                 position=person_data.position,
+                subtotal=0.0,
                 created_at=datetime.now(timezone.utc),
                 updated_at=datetime.now(timezone.utc),
             )
@@ -349,7 +360,7 @@ def create_order_with_items(
             
             # Create items for this person
             for item_data in person_data.items:
-                create_order_item(item_data, person_id=db_person.id)
+                db_person.subtotal += create_order_item(item_data, person_id=db_person.id)
     
     # Process direct items ONLY if there are no persons (legacy support)
     # This prevents duplicate items when using multi-diner mode
@@ -366,7 +377,11 @@ def create_order_with_items(
         if table and not table.is_occupied:
             table.is_occupied = True
             table.updated_at = datetime.now(timezone.utc)
-    
+
+    # Auto-printing runs after commit (outbox worker); without it there is nothing to do
+    if settings.SERVER_AUTO_PRINT:
+        outbox.enqueue(db, outbox.ORDER_CREATED, {"order_id": db_order.id, "restaurant_id": restaurant_id},
+                       restaurant_id=restaurant_id)
     db.commit()
 
     return get_order(db, db_order.id, restaurant_id)
@@ -2,6 +2,9 @@
 Order Item Extras CRUD Operations
 
 CRUD operations for order item extras (additional toppings, modifications, etc.)
+
+Extras are hard-deleted (OrderItemExtra has no deleted_at column). Totals
+are adjusted through the totals engine by the extra's own amount only.
 """
 
 from sqlalchemy.orm import Session
@@ -12,57 +15,45 @@ from ...models.order_item import OrderItem as OrderItemModel
 from ...models.order_item_extra import OrderItemExtra
 from ...schemas.order import OrderItemExtraCreate, OrderItemExtraUpdate
 from .serializers import serialize_order_item_extra
+from .totals import line_amount, record_extra_change
 
 
-def get_item_extras(
-    db: Session,
-    order_item_id: int,
-    include_deleted: bool = False
-) -> List[dict]:
+def _live_item(db: Session, order_item_id: int) -> Optional[OrderItemModel]:
+    return db.query(OrderItemModel).filter(
+        OrderItemModel.id == order_item_id,
+        OrderItemModel.deleted_at.is_(None)
+    ).first()
+
+
+def get_item_extras(db: Session, order_item_id: int) -> List[dict]:
     """
     Get all extras for an order item.
-    
+
     Args:
         db: Database session
         order_item_id: ID of the order item
-        include_deleted: Whether to include soft-deleted extras
-        
+
     Returns:
         List of serialized extras
     """
-    query = db.query(OrderItemExtra).filter(
+    extras = db.query(OrderItemExtra).filter(
         OrderItemExtra.order_item_id == order_item_id
-    )
-    
-    if not include_deleted:
-        query = query.filter(OrderItemExtra.deleted_at.is_(None))
-    
-    extras = query.all()
+    ).all()
     return [serialize_order_item_extra(extra) for extra in extras]
 
 
-def get_extra_by_id(
-    db: Session,
-    extra_id: int,
-    include_deleted: bool = False
-) -> Optional[OrderItemExtra]:
+def get_extra_by_id(db: Session, extra_id: int) -> Optional[OrderItemExtra]:
     """
     Get a specific extra by ID.
-    
+
     Args:
         db: Database session
         extra_id: ID of the extra
-        include_deleted: Whether to include soft-deleted extras
-        
+
     Returns:
         OrderItemExtra model instance or None
     """
-    query = db.query(OrderItemExtra).filter(OrderItemExtra.id == extra_id)
-    
-    if not include_deleted:
-        query = query.filter(OrderItemExtra.deleted_at.is_(None))
-    
-    return query.first()
+    return db.query(OrderItemExtra).filter(OrderItemExtra.id == extra_id).first()
 
 
 def add_extra_to_item(
@@ -72,25 +63,19 @@ def add_extra_to_item(
 ) -> dict:
     """
     Add an extra to an order item.
-    
+
     Args:
         db: Database session
         order_item_id: ID of the order item
         extra: Extra creation data
-        
+
     Returns:
         Serialized created extra
     """
-    # Verify order item exists
-    order_item = db.query(OrderItemModel).filter(
-        OrderItemModel.id == order_item_id,
-        OrderItemModel.deleted_at.is_(None)
-    ).first()
-    
+    order_item = _live_item(db, order_item_id)
     if not order_item:
         raise ValueError(f"Order item {order_item_id} not found")
-    
-    # Create extra
+
     db_extra = OrderItemExtra(
         order_item_id=order_item_id,
         name=extra.name,
@@ -100,30 +85,11 @@ def add_extra_to_item(
         updated_at=datetime.now(timezone.utc)
     )
     db.add(db_extra)
-    
-    # Update order total
-    from ...models.order import Order as OrderModel
-    order = db.query(OrderModel).filter(
-        OrderModel.id == order_item.order_id
-    ).first()
-    
-    if order:
-        # Recalculate total including all extras
-        total = 0.0
-        for item in order.items:
-            if item.deleted_at is None:
-                total += item.quantity * (item.unit_price or 0)
-                # Add extras
-                for item_extra in item.extras:
-                    if item_extra.deleted_at is None:
-                        total += item_extra.quantity * (item_extra.price or 0)
-        
-        order.total_amount = total
-        order.updated_at = datetime.now(timezone.utc)
-    
+    record_extra_change(db, order_item, line_amount(extra.quantity, extra.price))
+
     db.commit()
     db.refresh(db_extra)
-    
+
     return serialize_order_item_extra(db_extra)
 
 
@@ -134,88 +100,44 @@ def update_item_extra(
 ) -> dict:
     """
     Update an order item extra.
-    
+
     Args:
         db: Database session
         db_extra: Existing extra
         extra: Update data
-        
+
     Returns:
         Serialized updated extra
     """
-    update_data = extra.dict(exclude_unset=True)
-    
-    # Update extra fields
-    for field, value in update_data.items():
+    old_amount = line_amount(db_extra.quantity, db_extra.price)
+
+    for field, value in extra.dict(exclude_unset=True).items():
         setattr(db_extra, field, value)
-    
+
     db_extra.updated_at = datetime.now(timezone.utc)
-    
-    # Recalculate order total
-    order_item = db.query(OrderItemModel).filter(
-        OrderItemModel.id == db_extra.order_item_id
-    ).first()
-    
+
+    # Extras of a deleted item no longer count towards the totals
+    order_item = _live_item(db, db_extra.order_item_id)
     if order_item:
-        from ...models.order import Order as OrderModel
-        order = db.query(OrderModel).filter(
-            OrderModel.id == order_item.order_id
-        ).first()
-        
-        if order:
-            # Recalculate total including all extras
-            total = 0.0
-            for item in order.items:
-                if item.deleted_at is None:
-                    total += item.quantity * (item.unit_price or 0)
-                    # Add extras
-                    for item_extra in item.extras:
-                        if item_extra.deleted_at is None:
-                            total += item_extra.quantity * (item_extra.price or 0)
-            
-            order.total_amount = total
-            order.updated_at = datetime.now(timezone.utc)
-    
+        record_extra_change(db, order_item, line_amount(db_extra.quantity, db_extra.price) - old_amount)
+
     db.commit()
     db.refresh(db_extra)
-    
+
     return serialize_order_item_extra(db_extra)
 
 
 def delete_item_extra(db: Session, db_extra: OrderItemExtra) -> None:
     """
-    Soft delete an order item extra.
-    
+    Permanently delete an order item extra.
+
     Args:
         db: Database session
         db_extra: Extra to delete
     """
-    db_extra.deleted_at = datetime.now(timezone.utc)
-    db.add(db_extra)
-    
-    # Recalculate order total
-    order_item = db.query(OrderItemModel).filter(
-        OrderItemModel.id == db_extra.order_item_id
-    ).first()
-    
+    order_item = _live_item(db, db_extra.order_item_id)
     if order_item:
-        from ...models.order import Order as OrderModel
-        order = db.query(OrderModel).filter(
-            OrderModel.id == order_item.order_id
-        ).first()
-        
-        if order:
-            # Recalculate total excluding deleted extras
-            total = 0.0
-            for item in order.items:
-                if item.deleted_at is None:
-                    total += item.quantity * (item.unit_price or 0)
-                    # Add only non-deleted extras
-                    for item_extra in item.extras:
-                        if item_extra.deleted_at is None and item_extra.id != db_extra.id:
-                            total += item_extra.quantity * (item_extra.price or 0)
-            
-            order.total_amount = total
-            order.updated_at = datetime.now(timezone.utc)
-    
+        record_extra_change(db, order_item, -line_amount(db_extra.quantity, db_extra.price))
+
+    db.delete(db_extra)
     db.commit()
@@ -15,9 +15,11 @@ from datetime import datetime, timezone
 
 from ...models.order import Order as OrderModel, OrderStatus
 from ...models.order_item import OrderItem as OrderItemModel
+from ...models.order_item_extra import OrderItemExtra
 from ...models.menu import MenuItem, MenuItemVariant
 from ...schemas.order import OrderItemCreate, OrderItemUpdate
 from .serializers import serialize_order_item
+from .totals import line_amount, record_item_added, record_item_changed, record_item_removed
 
 
 def get_order_item(
@@ -49,7 +51,7 @@ def add_order_item(
     unit_price: Optional[float] = None
 ) -> dict:
     """
-    Add an item to an existing order.
+    Add an item, with any extras it carries, to an existing order.
     
     Args:
         db: Database session
@@ -92,11 +94,20 @@ def add_order_item(
         updated_at=datetime.now(timezone.utc),
     )
     db.add(db_item)
-    
-    # Update order total
-    db_order.total_amount = (db_order.total_amount or 0) + (unit_price * item.quantity)
-    db_order.updated_at = datetime.now(timezone.utc)
-    
+    db.flush()
+
+    extras_total = 0.0
+    for extra in item.extras or ():
+        db.add(OrderItemExtra(
+            order_item_id=db_item.id,
+            name=extra.name,
+            price=extra.price,
+            quantity=extra.quantity,
+        ))
+        extras_total += line_amount(extra.quantity, extra.price)
+
+    record_item_added(db, db_item, extras=extras_total)
+
     db.commit()
     db.refresh(db_item)
     
@@ -146,17 +157,15 @@ def update_order_item(
                 f"Invalid status. Must be one of: {', '.join([s.value for s in OrderStatus])}"
             )
 
+    old_quantity, old_unit_price, old_person_id = db_item.quantity, db_item.unit_price, db_item.person_id
+
     # Update item fields
     for field, value in update_data.items():
         setattr(db_item, field, value)
 
     db_item.updated_at = datetime.now(timezone.utc)
     
-    # Recalculate order total
-    order = db.query(OrderModel).filter(OrderModel.id == db_item.order_id).first()
-    if order:
-        order.total_amount = sum(i.quantity * (i.unit_price or 0) for i in order.items)
-        order.updated_at = datetime.now(timezone.utc)
+    record_item_changed(db, db_item, old_quantity, old_unit_price, old_person_id)
 
     db.commit()
     db.refresh(db_item)
@@ -203,18 +212,12 @@ def delete_order_item(db: Session, db_item: OrderItemModel) -> None:
         db: Database session
         db_item: Order item to delete
     """
+    if db_item.deleted_at is not None:
+        return
+
     db_item.deleted_at = datetime.now(timezone.utc)
     db.add(db_item)
     
-    # Recalculate order total
-    order = db.query(OrderModel).filter(OrderModel.id == db_item.order_id).first()
-    if order:
-        order.total_amount = sum(
-            item.quantity * item.unit_price 
-            for item in order.items 
-            if item.deleted_at is None and item.id != db_item.id
-        )
-        order.updated_at = datetime.now(timezone.utc)
-        db.add(order)
+    record_item_removed(db, db_item)
     
     db.commit()
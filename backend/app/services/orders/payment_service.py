@@ -8,13 +8,17 @@ Handles all payment-related operations for orders, including:
 - Managing order status transitions
 """
 
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, lazyload
 from typing import Optional
 from datetime import datetime, timezone
 
+from ...models.cash_register import PaymentMethod as CashPaymentMethod
 from ...models.order import Order as OrderModel, OrderStatus
 from ...schemas.order import PaymentMethod
-from ...core.exceptions import ValidationError, ResourceNotFoundError
+from ...core.exceptions import ConflictError, ValidationError, ResourceNotFoundError
+from ...core.response_cache import invalidate_on_commit, response_tag
+from ..cash_register.transaction_service import record_order_sale
+from .table_manager import release_table_if_idle
 
 
 def validate_payment_method(payment_method: str) -> PaymentMethod:
@@ -63,24 +67,78 @@ def can_cancel_order(order: OrderModel, user_role: str) -> tuple[bool, Optional[
     return True, None
 
 
+def settle_order(
+    db: Session,
+    order: OrderModel,
+    payment_method: PaymentMethod,
+    user_id: int,
+    status: Optional[OrderStatus] = OrderStatus.COMPLETED
+) -> int:
+    """
+    Mark a loaded, unpaid order as paid. Does not commit.
+
+    The payment pipeline shared by every way of paying an order. It costs
+    a fixed number of statements: the sale INSERT (checked against the
+    open session in the same statement), the table release UPDATE for
+    dine-in orders, and the order UPDATE at flush. The open session comes
+    from a per restaurant/user cache, so it adds a SELECT only on a miss.
+
+    Args:
+        db: Database session
+        order: Order to pay; the caller should hold it (SELECT ... FOR UPDATE)
+        payment_method: Payment method
+        user_id: ID of the user processing the payment
+        status: Status to set (default COMPLETED); None keeps the current one
+
+    Returns:
+        ID of the cash register session the sale was recorded in
+
+    Raises:
+        ConflictError: If the order is already paid
+        ValidationError: If the user has no open cash register session
+    """
+    if order.is_paid:
+        raise ConflictError(f"Order {order.id} is already paid", resource="Order")
+
+    order.is_paid = True
+    order.payment_method = payment_method
+    if status is not None:
+        order.status = status
+    order.updated_at = datetime.now(timezone.utc)
+
+    try:
+        session_id = record_order_sale(
+            db, order, created_by_user_id=user_id,
+            payment_method=CashPaymentMethod[payment_method.name],
+        )
+    except ValueError as e:
+        raise ValidationError(str(e))
+
+    if order.table_id and release_table_if_idle(db, order.table_id, order.id):
+        invalidate_on_commit(db, response_tag("tables", order.restaurant_id))
+
+    return session_id
+
+
 def process_order_payment(
     db: Session,
     order_id: int,
     payment_method: str,
     user_id: int,
     restaurant_id: int,
-    status: Optional[str] = None
+    status: Optional[str] = None,
+    default_status: Optional[OrderStatus] = OrderStatus.COMPLETED
 ) -> OrderModel:
     """
     Process payment for an order.
     
     This function handles the complete payment workflow:
-    1. Validates the order exists and isn't already paid
-    2. Validates the payment method
-    3. Marks the order as paid
-    4. Updates order status to COMPLETED (or provided status)
-    5. Creates a cash register transaction
-    6. Releases the table if it's a dine-in order
+    1. Locks the order and validates it exists and isn't already paid
+    2. Validates the payment method and status
+    3. Marks the order as paid with the given status (``default_status`` if none)
+    4. Records the sale in the user's open cash register session
+    5. Releases the table if it's a dine-in order
+    6. Commits
     
     Args:
         db: Database session
@@ -88,72 +146,45 @@ def process_order_payment(
         payment_method: Payment method (cash, card, transfer, etc.)
         user_id: ID of the user processing the payment
         restaurant_id: ID of the restaurant
-        status: Optional status to set (defaults to COMPLETED)
+        status: Optional status to set
+        default_status: Status to set when none is given (None keeps the
+            order's status)
         
     Returns:
         Updated order object
         
     Raises:
         ResourceNotFoundError: If order doesn't exist
-        ValidationError: If order is already paid or payment method is invalid
+        ConflictError: If order is already paid
+        ValidationError: If the payment method or status is invalid, or
+            there is no open cash register session
     """
-    # Get the order
-    order = db.query(OrderModel).filter(
-        OrderModel.id == order_id,
-        OrderModel.restaurant_id == restaurant_id,
-        OrderModel.deleted_at.is_(None)
-    ).first()
-    
-    if not order:
-        raise ResourceNotFoundError("Order", order_id)
-    
-    # Check if already paid
-    if order.is_paid:
-        raise ValidationError(
-            f"Order {order_id} is already paid",
-            field="is_paid"
-        )
-    
-    # Validate payment method
     payment_method_enum = validate_payment_method(payment_method)
-    
-    # Mark order as paid
-    order.is_paid = True
-    order.payment_method = payment_method_enum
-    order.paid_at = datetime.now(timezone.utc)
-    
-    # Update status
+    order_status = default_status
     if status:
         try:
-            order.status = OrderStatus(status)
+            order_status = OrderStatus(status.lower())
         except ValueError:
             raise ValidationError(f"Invalid status: {status}", field="status")
-    else:
-        order.status = OrderStatus.COMPLETED
-    
-    order.updated_at = datetime.now(timezone.utc)
+
+    # Lock the order: concurrent payments of it wait here and then see is_paid.
+    # Items, persons and table are not needed to pay, so skip their eager loads.
+    order = db.query(OrderModel).options(lazyload("*")).filter(
+        OrderModel.id == order_id,
+        OrderModel.restaurant_id == restaurant_id,
+        OrderModel.deleted_at.is_(None)
+    ).with_for_update().first()
     
-    # Create cash register transaction
+    if not order:
+        raise ResourceNotFoundError("Order", order_id)
+
     try:
-        from ..cash_register import create_transaction_from_order
-        create_transaction_from_order(
-            db=db,
-            order_id=order_id,
-            created_by_user_id=user_id
-        )
-    except ValueError as e:
-        raise ValidationError(str(e))
-    
-    # Release table if dine-in order
-    if order.table_id:
-        from .table_manager import mark_table_available_if_no_orders
-        mark_table_available_if_no_orders(db, order.table_id, order_id)
-    
-    # Commit changes
-    db.add(order)
-    db.commit()
-    db.refresh(order)
-    
+        settle_order(db, order, payment_method_enum, user_id, order_status)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
     return order
 
 
@@ -0,0 +1,323 @@
+"""
+Order Search
+
+Indexed full-text search over a restaurant's orders.
+
+Searching with ``ILIKE '%term%'`` cannot use an index and scans every order
+the restaurant ever took. Instead each order is broken into normalized
+words stored in ``order_search_tokens`` keyed by (restaurant_id, token), and
+a search becomes ``token LIKE 'term%'`` prefix range scans on that index.
+
+Indexed fields and their relevance weights:
+- order number and ticket number: "42", "20261019-042"
+- customer name: "José Pérez"
+- item names (menu item and variant): "Tacos al Pastor"
+- order notes: "Sin cebolla"
+
+The index is maintained by session hooks: a flush that creates an order or
+changes one of its searchable fields marks the order, one that adds,
+removes or changes an item marks that item, and the marked rows have their
+tokens rewritten in the same transaction right before commit. Item tokens
+are kept per item, so an item change never reads the rest of the order.
+Bulk UPDATE statements (kitchen bump, totals) never touch searchable fields
+and are intentionally not tracked.
+"""
+
+import re
+import unicodedata
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import case, delete, event, false, func, insert, inspect, select
+from sqlalchemy.orm import Session
+
+from ...models.menu import MenuItem, MenuItemVariant
+from ...models.order import Order as OrderModel
+from ...models.order_item import OrderItem as OrderItemModel
+from ...models.order_search_token import OrderSearchToken
+
+# Relevance of a token by the field it came from
+WEIGHT_NUMBER = 8
+WEIGHT_CUSTOMER = 4
+WEIGHT_ITEM = 2
+WEIGHT_NOTES = 1
+
+# A token equal to the search term scores this many times its prefix score
+EXACT_MATCH_FACTOR = 2
+
+# Longer queries are cut down to keep the self-join small
+MAX_QUERY_TERMS = 5
+
+TOKEN_MAX_LENGTH = 64
+
+# Order columns whose change requires a reindex
+_SEARCHABLE_ORDER_FIELDS = ("order_number", "ticket_number", "customer_name", "notes")
+_SEARCHABLE_ITEM_FIELDS = ("menu_item_id", "variant_id", "deleted_at", "order_id")
+
+_PENDING_ORDERS_KEY = "order_search_pending_orders"
+_PENDING_ITEMS_KEY = "order_search_pending_items"
+
+_WORD_RE = re.compile(r"[a-z0-9]+")
+
+
+def normalize(text: str) -> str:
+    """Lowercase text and strip accents ("José Peña" -> "jose pena")."""
+    decomposed = unicodedata.normalize("NFKD", text.lower())
+    return "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """
+    Split text into normalized index tokens.
+
+    Numbers also yield their value without leading zeros, so "042" (the
+    daily part of a ticket number) is found by searching "42".
+    """
+    if not text:
+        return []
+    tokens = []
+    for word in _WORD_RE.findall(normalize(str(text))):
+        word = word[:TOKEN_MAX_LENGTH]
+        tokens.append(word)
+        if word.isdigit() and word.startswith("0") and word.lstrip("0"):
+            tokens.append(word.lstrip("0"))
+    return tokens
+
+
+def order_tokens(
+    order_number: Optional[int],
+    ticket_number: Optional[str],
+    customer_name: Optional[str],
+    notes: Optional[str],
+) -> Dict[str, int]:
+    """
+    Build the token -> weight map of an order's own fields.
+
+    A token found in several fields keeps the weight of the most relevant one.
+    """
+    weighted: Dict[str, int] = {}
+    for text, weight in (
+        (order_number, WEIGHT_NUMBER),
+        (ticket_number, WEIGHT_NUMBER),
+        (customer_name, WEIGHT_CUSTOMER),
+        (notes, WEIGHT_NOTES),
+    ):
+        for token in tokenize(text):
+            if weighted.get(token, 0) < weight:
+                weighted[token] = weight
+    return weighted
+
+
+def item_tokens(item_name: str, variant_name: Optional[str] = None) -> Dict[str, int]:
+    """Build the token -> weight map of one order item."""
+    return {token: WEIGHT_ITEM for token in tokenize(f"{item_name} {variant_name or ''}")}
+
+
+def _index_order_fields(db: Session, order_ids: List[int]) -> int:
+    """Rewrite the tokens of the orders' own fields, leaving item tokens alone."""
+    orders = db.execute(
+        select(
+            OrderModel.id, OrderModel.restaurant_id, OrderModel.order_number,
+            OrderModel.ticket_number, OrderModel.customer_name, OrderModel.notes,
+        ).where(OrderModel.id.in_(order_ids))
+    ).all()
+    rows = [
+        {"order_id": order.id, "order_item_id": None, "restaurant_id": order.restaurant_id,
+         "token": token, "weight": weight}
+        for order in orders
+        for token, weight in order_tokens(
+            order.order_number, order.ticket_number, order.customer_name, order.notes,
+        ).items()
+    ]
+    db.execute(delete(OrderSearchToken).where(
+        OrderSearchToken.order_id.in_(order_ids), OrderSearchToken.order_item_id.is_(None),
+    ))
+    if rows:
+        db.execute(insert(OrderSearchToken), rows)
+    return len(rows)
+
+
+def _index_items(db: Session, item_filter) -> int:
+    """Write the tokens of the live items matching ``item_filter``."""
+    items = db.execute(
+        select(OrderItemModel.id, OrderItemModel.order_id, MenuItem.restaurant_id,
+               MenuItem.name, MenuItemVariant.name)
+        .join(MenuItem, MenuItem.id == OrderItemModel.menu_item_id)
+        .outerjoin(MenuItemVariant, MenuItemVariant.id == OrderItemModel.variant_id)
+        .where(item_filter, OrderItemModel.deleted_at.is_(None))
+    ).all()
+    rows = [
+        {"order_id": order_id, "order_item_id": item_id, "restaurant_id": restaurant_id,
+         "token": token, "weight": weight}
+        for item_id, order_id, restaurant_id, item_name, variant_name in items
+        for token, weight in item_tokens(item_name, variant_name).items()
+    ]
+    if rows:
+        db.execute(insert(OrderSearchToken), rows)
+    return len(rows)
+
+
+def reindex_items(db: Session, item_ids: Iterable[int]) -> int:
+    """
+    Rewrite the search tokens of the given order items.
+
+    Deleted and soft-deleted items just lose their tokens. Runs in the
+    caller's transaction and does not commit.
+
+    Returns:
+        Number of tokens written
+    """
+    item_ids = sorted(set(item_ids))
+    if not item_ids:
+        return 0
+    db.execute(delete(OrderSearchToken).where(OrderSearchToken.order_item_id.in_(item_ids)))
+    return _index_items(db, OrderItemModel.id.in_(item_ids))
+
+
+def reindex_orders(db: Session, order_ids: Iterable[int]) -> int:
+    """
+    Rebuild all search tokens of the given orders, items included.
+
+    Runs in the caller's transaction and does not commit.
+
+    Args:
+        db: Database session
+        order_ids: Orders to reindex; missing ids are ignored
+
+    Returns:
+        Number of tokens written
+    """
+    order_ids = sorted(set(order_ids))
+    if not order_ids:
+        return 0
+    db.execute(delete(OrderSearchToken).where(OrderSearchToken.order_id.in_(order_ids)))
+    return _index_order_fields(db, order_ids) + _index_items(db, OrderItemModel.order_id.in_(order_ids))
+
+
+def reindex_order(db: Session, order_id: int) -> int:
+    """Rebuild all search tokens of one order. See ``reindex_orders``."""
+    return reindex_orders(db, [order_id])
+
+
+def query_terms(search: str) -> List[str]:
+    """Normalized, de-duplicated terms of a search string."""
+    terms: List[str] = []
+    for word in _WORD_RE.findall(normalize(search)):
+        word = word[:TOKEN_MAX_LENGTH]
+        if word not in terms:
+            terms.append(word)
+    return terms[:MAX_QUERY_TERMS]
+
+
+def search_subquery(restaurant_id: Optional[int], search: str):
+    """
+    Orders of a restaurant matching every term of a search, with a score.
+
+    Each term matches any token it is a prefix of ("jos" finds "José");
+    an order must match all terms. The score sums, per term, the weight of
+    the best matching token, doubled for exact matches, so "#42" ranks
+    order 42 above order 420.
+
+    Args:
+        restaurant_id: Restaurant to search in; None searches all of them
+            (platform tooling only, the index is not ordered for it)
+        search: Raw search text
+
+    Returns:
+        Subquery with ``order_id`` and ``score`` columns, or None when the
+        search text has no searchable words
+    """
+    terms = query_terms(search)
+    if not terms:
+        return None
+
+    per_term = []
+    for term in terms:
+        score = case(
+            (OrderSearchToken.token == term, OrderSearchToken.weight * EXACT_MATCH_FACTOR),
+            else_=OrderSearchToken.weight,
+        )
+        # Terms are [a-z0-9] only, so no LIKE wildcards need escaping
+        stmt = select(OrderSearchToken.order_id, func.max(score).label("score")).where(
+            OrderSearchToken.token.like(f"{term}%")
+        )
+        if restaurant_id is not None:
+            stmt = stmt.where(OrderSearchToken.restaurant_id == restaurant_id)
+        per_term.append(stmt.group_by(OrderSearchToken.order_id).subquery())
+
+    first = per_term[0]
+    stmt = select(first.c.order_id, sum(sub.c.score for sub in per_term).label("score"))
+    for sub in per_term[1:]:
+        stmt = stmt.join(sub, sub.c.order_id == first.c.order_id)
+    return stmt.subquery("order_search")
+
+
+def apply_search(query, restaurant_id: Optional[int], search: str) -> Tuple[object, Optional[object]]:
+    """
+    Restrict an order query to the orders matching a search.
+
+    Args:
+        query: SQLAlchemy query over orders
+        restaurant_id: Restaurant to search in
+        search: Raw search text
+
+    Returns:
+        Tuple of (query, score column to order by); text without searchable
+        words matches no order, with a None score
+    """
+    ranked = search_subquery(restaurant_id, search)
+    if ranked is None:
+        return query.filter(false()), None
+    return query.join(ranked, ranked.c.order_id == OrderModel.id), ranked.c.score
+
+
+# ---------------------------------------------------------------------------
+# Index maintenance
+# ---------------------------------------------------------------------------
+
+def _changed(obj, fields) -> bool:
+    state = inspect(obj)
+    return any(state.attrs[field].history.has_changes() for field in fields)
+
+
+def _pending(session, key: str) -> Set[int]:
+    return session.info.setdefault(key, set())
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_after_flush(session, flush_context):
+    for obj in session.new:
+        if isinstance(obj, OrderModel):
+            _pending(session, _PENDING_ORDERS_KEY).add(obj.id)
+        elif isinstance(obj, OrderItemModel):
+            _pending(session, _PENDING_ITEMS_KEY).add(obj.id)
+    for obj in session.dirty:
+        if isinstance(obj, OrderModel) and _changed(obj, _SEARCHABLE_ORDER_FIELDS):
+            _pending(session, _PENDING_ORDERS_KEY).add(obj.id)
+        elif isinstance(obj, OrderItemModel) and _changed(obj, _SEARCHABLE_ITEM_FIELDS):
+            _pending(session, _PENDING_ITEMS_KEY).add(obj.id)
+    for obj in session.deleted:
+        if isinstance(obj, OrderItemModel):
+            _pending(session, _PENDING_ITEMS_KEY).add(obj.id)
+
+
+@event.listens_for(Session, "before_commit")
+def _reindex_before_commit(session):
+    # Flush first: commit would flush right after this hook, and the flush
+    # may mark more rows
+    session.flush()
+    orders = session.info.pop(_PENDING_ORDERS_KEY, None)
+    items = session.info.pop(_PENDING_ITEMS_KEY, None)
+    if orders:
+        _index_order_fields(session, sorted(orders))
+    if items:
+        reindex_items(session, items)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_after_rollback(session, previous_transaction):
+    # A savepoint (or a flush inside one) rolled back: the outer transaction
+    # may still commit its rows
+    if previous_transaction.parent is not None:
+        return
+    session.info.pop(_PENDING_ORDERS_KEY, None)
+    session.info.pop(_PENDING_ITEMS_KEY, None)
@@ -2,9 +2,13 @@
 Serializers for Orders
 
 Functions to convert database models to dictionaries for API responses.
+
+The dictionaries match the response schemas in ``schemas/order.py`` field for
+field, so routes can send them through ``FastJSONResponse`` without a second
+Pydantic validation pass. Keep both in sync when adding fields.
 """
 
-from typing import Optional
+from typing import Dict, Iterable, List, Optional
 
 from ...models.order import Order as OrderModel
 from ...models.order_item import OrderItem as OrderItemModel
@@ -12,6 +16,10 @@ from ...models.order_person import OrderPerson as OrderPersonModel
 from ...models.menu import MenuItem, MenuItemVariant
 
 
+def _to_float(value) -> Optional[float]:
+    return float(value) if value is not None else None
+
+
 def serialize_menu_item(menu_item: MenuItem) -> dict:
     """
     Serialize a menu item to dictionary.
@@ -22,20 +30,19 @@ def serialize_menu_item(menu_item: MenuItem) -> dict:
     Returns:
         Dictionary with menu item data
     """
-    # Get category visible_in_kitchen flag
-    category_visible = True  # Default to visible
-    if menu_item.category:
-        category_visible = getattr(menu_item.category, "visible_in_kitchen", True)
+    category = menu_item.category
+    # Get category visible_in_kitchen flag (default to visible)
+    category_visible = getattr(category, "visible_in_kitchen", True) if category else True
     
     return {
         "id": menu_item.id,
         "name": menu_item.name,
-        "price": float(menu_item.price) if menu_item.price is not None else 0.0,
-        "discount_price": float(menu_item.discount_price) if menu_item.discount_price is not None else None,
         "description": menu_item.description,
-        "category": getattr(menu_item.category, "name", menu_item.category) if menu_item.category else None,
+        "price": float(menu_item.price) if menu_item.price is not None else 0.0,
+        "category": getattr(category, "name", category) if category else None,
         "category_visible_in_kitchen": category_visible,
         "image_url": menu_item.image_url,
+        "image_urls": menu_item.image_urls,
         "is_available": menu_item.is_available,
     }
 
@@ -56,7 +63,6 @@ def serialize_variant(variant: Optional[MenuItemVariant]) -> Optional[dict]:
         "id": variant.id,
         "name": variant.name,
         "price": float(variant.price) if variant.price is not None else 0.0,
-        "discount_price": float(variant.discount_price) if variant.discount_price is not None else None,
         "description": getattr(variant, "description", None),
     }
 
@@ -82,20 +88,28 @@ def serialize_order_item_extra(extra) -> dict:
     }
 
 
-def serialize_order_item(item: OrderItemModel) -> dict:
+def serialize_order_item(
+    item: OrderItemModel,
+    menu_items: Optional[Dict[int, dict]] = None
+) -> dict:
     """
     Serialize an order item to dictionary.
     
     Args:
         item: OrderItem model instance
+        menu_items: Optional memo of already serialized menu items by ID,
+            shared across a page of orders so each dish is serialized once
         
     Returns:
         Dictionary with order item data
     """
-    # Serialize extras if they exist
-    extras = []
-    if hasattr(item, 'extras') and item.extras:
-        extras = [serialize_order_item_extra(extra) for extra in item.extras]
+    menu_item = item.menu_item
+    if menu_items is None:
+        serialized_menu_item = serialize_menu_item(menu_item) if menu_item else None
+    else:
+        serialized_menu_item = menu_items.get(item.menu_item_id)
+        if serialized_menu_item is None and menu_item is not None:
+            serialized_menu_item = menu_items[item.menu_item_id] = serialize_menu_item(menu_item)
     
     return {
         "id": item.id,
@@ -107,67 +121,89 @@ def serialize_order_item(item: OrderItemModel) -> dict:
         "status": item.status,
         "variant_id": item.variant_id,
         "variant": serialize_variant(item.variant),
-        "unit_price": float(item.unit_price) if item.unit_price is not None else None,
+        "unit_price": _to_float(item.unit_price),
         "created_at": item.created_at,
         "updated_at": item.updated_at,
-        "menu_item": serialize_menu_item(item.menu_item),
-        "extras": extras,
+        "menu_item": serialized_menu_item,
+        "extras": [serialize_order_item_extra(extra) for extra in item.extras],
     }
 
 
-def serialize_order_person(person: OrderPersonModel) -> dict:
+def serialize_order_person(
+    person: OrderPersonModel,
+    serialized_items: Optional[Dict[int, dict]] = None,
+    menu_items: Optional[Dict[int, dict]] = None
+) -> dict:
     """
     Serialize an order person with their items to dictionary.
     
     Args:
         person: OrderPerson model instance
+        serialized_items: Optional memo of the order's already serialized items by ID
+        menu_items: Optional memo of already serialized menu items by ID
         
     Returns:
         Dictionary with person data
     """
+    items = []
+    for item in person.items:
+        serialized = serialized_items.get(item.id) if serialized_items else None
+        items.append(serialized if serialized is not None else serialize_order_item(item, menu_items))
+    
     return {
         "id": person.id,
         "order_id": person.order_id,
         "name": person.name,
         "position": person.position,
+        "subtotal": float(person.subtotal or 0),
         "created_at": person.created_at,
         "updated_at": person.updated_at,
-        "items": [serialize_order_item(item) for item in person.items] if hasattr(person, 'items') else [],
+        "items": items,
     }
 
 
-def serialize_order(order: OrderModel) -> dict:
+def serialize_order(order: OrderModel, menu_items: Optional[Dict[int, dict]] = None) -> dict:
     """
     Serialize an order to dictionary.
     
+    Each item is serialized once and shared between ``items`` and the
+    ``persons`` breakdown.
+    
     Args:
         order: Order model instance
+        menu_items: Optional memo of already serialized menu items by ID
         
     Returns:
         Dictionary with complete order data
     """
-    # Calculate subtotal from items including extras (exclude deleted items)
-    all_items = getattr(order, "items", [])
-    items = [item for item in all_items if item.deleted_at is None]
+    if menu_items is None:
+        menu_items = {}
+    
+    # Calculate subtotal from items including extras (exclude deleted items).
+    # Extras are hard-deleted, so every loaded extra counts.
+    items = []
+    serialized_items = {}
     subtotal = 0.0
-    for item in items:
-        # Add item price
+    for item in order.items:
+        if item.deleted_at is not None:
+            continue
+        serialized = serialize_order_item(item, menu_items)
+        serialized_items[item.id] = serialized
+        items.append(serialized)
         subtotal += item.quantity * (item.unit_price or 0)
-        # Add extras price
-        if hasattr(item, 'extras') and item.extras:
-            for extra in item.extras:
-                if extra.deleted_at is None:  # Also filter deleted extras
-                    subtotal += extra.quantity * (extra.price or 0)
+        for extra in serialized["extras"]:
+            subtotal += extra["quantity"] * extra["price"]
     
     # For now, tax is 0 (can be configured later)
     tax = 0.0
     total = subtotal + tax
     
-    # Serialize persons if they exist
-    persons = []
-    if hasattr(order, 'persons') and order.persons:
-        persons = [serialize_order_person(person) for person in order.persons]
+    persons = [
+        serialize_order_person(person, serialized_items, menu_items)
+        for person in order.persons
+    ]
     
+    table = order.table
     return {
         "id": order.id,
         "order_number": order.order_number,
@@ -181,14 +217,29 @@ def serialize_order(order: OrderModel) -> dict:
         "total": total,
         "created_at": order.created_at,
         "updated_at": order.updated_at,
-        "table_number": order.table.number if order.table else None,
+        "table_number": table.number if table else None,
         "customer_name": order.customer_name,
         "user_id": order.user_id,
         "order_type": order.order_type,
+        "ticket_number": order.ticket_number,
         "is_paid": order.is_paid,
         "payment_method": order.payment_method,
-        "sort": order.sort if hasattr(order, 'sort') else 50,
+        "sort": order.sort if order.sort is not None else 50,
         "deleted_at": order.deleted_at,
-        "items": [serialize_order_item(item) for item in items],
+        "items": items,
         "persons": persons,
     }
+
+
+def serialize_orders(orders: Iterable[OrderModel]) -> List[dict]:
+    """
+    Serialize a page of orders, sharing serialized menu items across orders.
+    
+    Args:
+        orders: Order model instances
+        
+    Returns:
+        List of serialized orders
+    """
+    menu_items: Dict[int, dict] = {}
+    return [serialize_order(order, menu_items) for order in orders]
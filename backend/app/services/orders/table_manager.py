@@ -7,6 +7,7 @@ Handles table occupancy management for orders, including:
 - Checking if tables have active orders
 """
 
+from sqlalchemy import and_, exists, update
 from sqlalchemy.orm import Session
 from typing import Optional
 from datetime import datetime, timezone
@@ -99,6 +100,44 @@ def mark_table_available_if_no_orders(
     return None
 
 
+def release_table_if_idle(db: Session, table_id: int, exclude_order_id: Optional[int] = None) -> bool:
+    """
+    Mark a table as available if it has no active orders, in one UPDATE.
+
+    Same rule as mark_table_available_if_no_orders, but the check and the
+    write are a single statement and the table is not loaded. A Table
+    already loaded in the session is not refreshed.
+
+    Args:
+        db: Database session
+        table_id: ID of the table to release
+        exclude_order_id: Order ID to exclude from the check (e.g., the order being paid)
+
+    Returns:
+        True if the table was marked available
+    """
+    active_order = [
+        OrderModel.table_id == table_id,
+        OrderModel.is_paid == False,
+        OrderModel.status != OrderStatus.CANCELLED,
+        OrderModel.deleted_at.is_(None),
+    ]
+    if exclude_order_id:
+        active_order.append(OrderModel.id != exclude_order_id)
+
+    result = db.execute(
+        update(TableModel)
+        .where(
+            TableModel.id == table_id,
+            TableModel.deleted_at.is_(None),
+            ~exists().where(and_(*active_order)),
+        )
+        .values(is_occupied=False, updated_at=datetime.now(timezone.utc))
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount == 1
+
+
 def handle_table_change(
     db: Session,
     old_table_id: Optional[int],
@@ -0,0 +1,207 @@
+"""
+Order Totals Engine
+
+Keeps ``Order.total_amount`` and the per-diner ``OrderPerson.subtotal`` in
+step with an order's items and extras.
+
+Every change is applied as a signed delta with ``UPDATE ... SET total =
+total + :delta`` on the order row, and on the diner row when the item
+belongs to one. Adding a round of items to a big table therefore never
+loads the order's item collection, and concurrent writers cannot lose
+each other's updates. ``compute_order_totals`` rebuilds both from scratch;
+it is the verifier used by the tests and the tool for repairing rows
+written before this engine existed.
+
+An item counts ``quantity * unit_price`` plus each of its extras'
+``quantity * price``, as long as the item is not soft-deleted. Extras are
+hard-deleted, so every extra row counts.
+"""
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Dict, Optional
+
+from sqlalchemy import func, select, update
+from sqlalchemy.orm import Session
+
+from ...models.order import Order as OrderModel
+from ...models.order_item import OrderItem as OrderItemModel
+from ...models.order_item_extra import OrderItemExtra
+from ...models.order_person import OrderPerson as OrderPersonModel
+
+
+@dataclass(frozen=True)
+class OrderTotals:
+    """An order's total and its subtotal per diner (person id -> amount)."""
+    total: float
+    persons: Dict[int, float] = field(default_factory=dict)
+
+
+def line_amount(quantity: Optional[int], price: Optional[float]) -> float:
+    """Amount of one item or extra line."""
+    return (quantity or 0) * (price or 0)
+
+
+def extras_amount(db: Session, order_item_id: int) -> float:
+    """Sum of an item's extras, in one aggregate query."""
+    amount = db.execute(
+        select(func.sum(OrderItemExtra.quantity * OrderItemExtra.price))
+        .where(OrderItemExtra.order_item_id == order_item_id)
+    ).scalar()
+    return float(amount or 0)
+
+
+def apply_delta(
+    db: Session,
+    order_id: int,
+    delta: float,
+    person_id: Optional[int] = None
+) -> None:
+    """
+    Add a signed amount to an order's total and, optionally, a diner's subtotal.
+
+    Instances already in the session are kept in sync; nothing is loaded.
+
+    Args:
+        db: Database session (not committed here)
+        order_id: Order to adjust
+        delta: Signed amount
+        person_id: Diner whose subtotal moves with the order total
+    """
+    db.execute(
+        update(OrderModel)
+        .where(OrderModel.id == order_id)
+        .values(total_amount=OrderModel.total_amount + delta, updated_at=datetime.now(timezone.utc))
+    )
+    if person_id is not None:
+        shift_person_subtotal(db, person_id, delta)
+
+
+def shift_person_subtotal(db: Session, person_id: Optional[int], delta: float) -> None:
+    """Add a signed amount to one diner's subtotal only."""
+    if person_id is None or not delta:
+        return
+    db.execute(
+        update(OrderPersonModel)
+        .where(OrderPersonModel.id == person_id)
+        .values(subtotal=OrderPersonModel.subtotal + delta)
+    )
+
+
+def record_item_added(db: Session, item: OrderItemModel, extras: float = 0.0) -> None:
+    """
+    Account for a new item.
+
+    Args:
+        db: Database session
+        item: The added item (order_id, person_id, quantity and unit_price set)
+        extras: Amount of the extras created with it
+    """
+    apply_delta(db, item.order_id, line_amount(item.quantity, item.unit_price) + extras, item.person_id)
+
+
+def record_item_changed(
+    db: Session,
+    item: OrderItemModel,
+    old_quantity: int,
+    old_unit_price: float,
+    old_person_id: Optional[int]
+) -> None:
+    """
+    Account for an item whose quantity, price or diner changed.
+
+    When the item moves to another diner its extras move with it, which
+    costs one aggregate over that item's extras.
+
+    Args:
+        db: Database session
+        item: The item, already holding its new values
+        old_quantity: Quantity before the change
+        old_unit_price: Unit price before the change
+        old_person_id: Diner before the change
+    """
+    old_amount = line_amount(old_quantity, old_unit_price)
+    new_amount = line_amount(item.quantity, item.unit_price)
+    if old_person_id == item.person_id:
+        if new_amount != old_amount:
+            apply_delta(db, item.order_id, new_amount - old_amount, item.person_id)
+        return
+
+    carried = extras_amount(db, item.id)
+    apply_delta(db, item.order_id, new_amount - old_amount)
+    shift_person_subtotal(db, old_person_id, -(old_amount + carried))
+    shift_person_subtotal(db, item.person_id, new_amount + carried)
+
+
+def record_item_removed(db: Session, item: OrderItemModel) -> None:
+    """Account for a soft-deleted item and all of its extras."""
+    amount = line_amount(item.quantity, item.unit_price) + extras_amount(db, item.id)
+    apply_delta(db, item.order_id, -amount, item.person_id)
+
+
+def record_extra_change(db: Session, item: OrderItemModel, delta: float) -> None:
+    """
+    Account for an extra added to, changed on or removed from an item.
+
+    Args:
+        db: Database session
+        item: The extra's (live) item
+        delta: New extra amount minus old extra amount
+    """
+    if delta:
+        apply_delta(db, item.order_id, delta, item.person_id)
+
+
+def compute_order_totals(db: Session, order_id: int) -> OrderTotals:
+    """
+    Recompute an order's totals from its rows, ignoring the stored values.
+
+    Args:
+        db: Database session
+        order_id: Order to recompute
+
+    Returns:
+        OrderTotals: Total plus subtotal for every diner of the order
+    """
+    live_items = (OrderItemModel.order_id == order_id, OrderItemModel.deleted_at.is_(None))
+    item_rows = db.execute(
+        select(OrderItemModel.person_id, func.sum(OrderItemModel.quantity * OrderItemModel.unit_price))
+        .where(*live_items)
+        .group_by(OrderItemModel.person_id)
+    ).all()
+    extra_rows = db.execute(
+        select(OrderItemModel.person_id, func.sum(OrderItemExtra.quantity * OrderItemExtra.price))
+        .join(OrderItemModel, OrderItemExtra.order_item_id == OrderItemModel.id)
+        .where(*live_items)
+        .group_by(OrderItemModel.person_id)
+    ).all()
+    person_ids = db.execute(
+        select(OrderPersonModel.id).where(OrderPersonModel.order_id == order_id)
+    ).scalars()
+
+    persons = {person_id: 0.0 for person_id in person_ids}
+    total = 0.0
+    for person_id, amount in (*item_rows, *extra_rows):
+        total += float(amount or 0)
+        if person_id is not None:
+            persons[person_id] = persons.get(person_id, 0.0) + float(amount or 0)
+    return OrderTotals(total=total, persons=persons)
+
+
+def recompute_order_totals(db: Session, order_id: int) -> OrderTotals:
+    """
+    Overwrite an order's stored totals with freshly computed ones.
+
+    Args:
+        db: Database session (not committed here)
+        order_id: Order to repair
+
+    Returns:
+        OrderTotals: The values written
+    """
+    totals = compute_order_totals(db, order_id)
+    db.execute(update(OrderModel).where(OrderModel.id == order_id).values(total_amount=totals.total))
+    for person_id, subtotal in totals.persons.items():
+        db.execute(
+            update(OrderPersonModel).where(OrderPersonModel.id == person_id).values(subtotal=subtotal)
+        )
+    return totals
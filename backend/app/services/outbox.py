@@ -0,0 +1,190 @@
+"""
+Transactional Outbox
+
+Side effects that must not slow down or fail the request that caused
+them (print jobs, statistics, notifications) are written as outbox
+events in the same transaction as the change, then run by a background
+worker after commit.
+
+- ``enqueue`` adds an event to the caller's transaction; nothing is
+  written if that transaction rolls back.
+- ``handler`` registers the function run for a topic, one per topic.
+- ``drain`` claims a batch of due events and runs their handlers, each in
+  its own transaction. A failing event is retried with exponential
+  backoff and marked failed after OUTBOX_MAX_ATTEMPTS.
+
+Claimed events are leased (``available_at`` pushed OUTBOX_LEASE_SECONDS
+ahead) so several workers can drain the same table; a worker that dies
+mid-batch leaves its events to be picked up when the lease runs out.
+Delivery is therefore at least once and handlers must be idempotent or
+tolerate duplicates.
+"""
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, Optional
+
+from sqlalchemy import delete, event, select, update
+from sqlalchemy.orm import Session
+
+from ..core.config import settings
+from ..models.outbox_event import OutboxEvent, OutboxStatus
+
+logger = logging.getLogger(__name__)
+
+# Topics
+ORDER_CREATED = "order.created"
+SPECIAL_NOTE_USED = "special_note.used"
+MENU_IMAGE_UPLOADED = "menu_image.uploaded"
+
+# First retry delay; doubled per attempt up to MAX_RETRY_DELAY_SECONDS
+RETRY_DELAY_SECONDS = 5
+MAX_RETRY_DELAY_SECONDS = 15 * 60
+
+_ENQUEUED_KEY = "outbox_enqueued"
+
+Handler = Callable[[Session, dict], None]
+_handlers: Dict[str, Handler] = {}
+_wakeup: Optional[Callable[[], None]] = None
+
+
+def handler(topic: str) -> Callable[[Handler], Handler]:
+    """
+    Register the function that runs events of a topic.
+
+    The function gets its own session and payload; it may write, and
+    its writes commit together with the event being marked done.
+    """
+    def register(fn: Handler) -> Handler:
+        if topic in _handlers and _handlers[topic] is not fn:
+            raise ValueError(f"Outbox topic '{topic}' already has a handler")
+        _handlers[topic] = fn
+        return fn
+    return register
+
+
+def enqueue(db: Session, topic: str, payload: dict, restaurant_id: Optional[int] = None) -> OutboxEvent:
+    """
+    Add an event to the current transaction. Does not commit.
+
+    Args:
+        db: Database session of the change causing the event
+        topic: Event topic (see the constants above)
+        payload: JSON-serializable event data
+        restaurant_id: Restaurant the event belongs to
+
+    Returns:
+        The pending event
+    """
+    outbox_event = OutboxEvent(topic=topic, payload=payload, restaurant_id=restaurant_id)
+    db.add(outbox_event)
+    db.info[_ENQUEUED_KEY] = True
+    return outbox_event
+
+
+def set_wakeup(callback: Optional[Callable[[], None]]) -> None:
+    """Set the function called after a commit that enqueued events (None to clear)."""
+    global _wakeup
+    _wakeup = callback
+
+
+@event.listens_for(Session, "after_commit")
+def _wake_after_commit(session):
+    if session.info.pop(_ENQUEUED_KEY, False) and _wakeup is not None:
+        try:
+            _wakeup()
+        except Exception:
+            # The worker polls anyway; a missed wakeup only delays it
+            logger.debug("Outbox wakeup failed", exc_info=True)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_after_rollback(session, previous_transaction):
+    # A savepoint (or a flush inside one) rolled back: events enqueued
+    # outside it still commit
+    if previous_transaction.parent is not None:
+        return
+    session.info.pop(_ENQUEUED_KEY, None)
+
+
+def _retry_delay(attempts: int) -> timedelta:
+    return timedelta(seconds=min(RETRY_DELAY_SECONDS * 2 ** (attempts - 1), MAX_RETRY_DELAY_SECONDS))
+
+
+def _claim(db: Session, batch_size: int, now: datetime) -> list:
+    ids = db.execute(
+        select(OutboxEvent.id)
+        .where(OutboxEvent.status == OutboxStatus.PENDING, OutboxEvent.available_at <= now)
+        .order_by(OutboxEvent.id)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    ).scalars().all()
+    if ids:
+        db.execute(
+            update(OutboxEvent)
+            .where(OutboxEvent.id.in_(ids))
+            .values(available_at=now + timedelta(seconds=settings.OUTBOX_LEASE_SECONDS))
+        )
+    db.commit()
+    return ids
+
+
+def _run(db: Session, event_id: int, max_attempts: int) -> bool:
+    outbox_event = db.get(OutboxEvent, event_id)
+    run = _handlers.get(outbox_event.topic)
+    try:
+        if run is None:
+            raise LookupError(f"No handler for outbox topic '{outbox_event.topic}'")
+        run(db, outbox_event.payload)
+        outbox_event.status = OutboxStatus.DONE
+        outbox_event.processed_at = datetime.now(timezone.utc)
+        db.commit()
+        return True
+    except Exception as e:
+        db.rollback()
+        outbox_event = db.get(OutboxEvent, event_id)
+        outbox_event.attempts += 1
+        outbox_event.last_error = f"{type(e).__name__}: {e}"[:2000]
+        if outbox_event.attempts >= max_attempts:
+            outbox_event.status = OutboxStatus.FAILED
+            logger.error("Outbox event %s (%s) failed for good: %s", event_id, outbox_event.topic, e)
+        else:
+            outbox_event.available_at = datetime.now(timezone.utc) + _retry_delay(outbox_event.attempts)
+            logger.warning("Outbox event %s (%s) failed, attempt %d: %s",
+                           event_id, outbox_event.topic, outbox_event.attempts, e)
+        db.commit()
+        return False
+
+
+def drain(db: Session, batch_size: Optional[int] = None, max_attempts: Optional[int] = None) -> int:
+    """
+    Run one batch of due events.
+
+    Args:
+        db: Database session, used only by the outbox worker
+        batch_size: Maximum events to claim (default OUTBOX_BATCH_SIZE)
+        max_attempts: Attempts before an event is marked failed (default OUTBOX_MAX_ATTEMPTS)
+
+    Returns:
+        Number of events claimed; a full batch means more may be waiting
+    """
+    batch_size = batch_size or settings.OUTBOX_BATCH_SIZE
+    max_attempts = max_attempts or settings.OUTBOX_MAX_ATTEMPTS
+    ids = _claim(db, batch_size, datetime.now(timezone.utc))
+    for event_id in ids:
+        _run(db, event_id, max_attempts)
+    return len(ids)
+
+
+def purge(db: Session, older_than: timedelta) -> int:
+    """
+    Delete events processed more than ``older_than`` ago. Failed events are kept.
+
+    Returns:
+        Number of events deleted
+    """
+    cutoff = datetime.now(timezone.utc) - older_than
+    deleted = db.execute(
+        delete(OutboxEvent).where(OutboxEvent.status == OutboxStatus.DONE, OutboxEvent.processed_at < cutoff)
+    ).rowcount
+    db.commit()
+    return deleted
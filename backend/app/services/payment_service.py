@@ -2,6 +2,7 @@ from sqlalchemy.orm import Session
 from app.models.subscription_payment import SubscriptionPayment, PaymentStatus, PaymentMethod
 from app.models.restaurant_subscription import RestaurantSubscription, SubscriptionStatus
 from app.models.subscription_alert import SubscriptionAlert, AlertType
+from app.services.alert_service import AlertService
 from datetime import datetime, timedelta
 import secrets
 
@@ -117,6 +118,8 @@ class PaymentService:
         
         self.db.commit()
         self.db.refresh(payment)
+        if subscription:
+            AlertService(self.db).notify_created(alert)
         
         return payment
     
@@ -160,6 +163,8 @@ class PaymentService:
         
         self.db.commit()
         self.db.refresh(payment)
+        if subscription:
+            AlertService(self.db).notify_created(alert)
         
         return payment
     
@@ -0,0 +1,208 @@
+"""
+Platform Metrics
+
+Materialized platform-wide metrics for the sysadmin dashboards.
+
+The numbers are computed in one multi-aggregate statement (plus one
+grouped query for the plan distribution) and kept as an in-process
+snapshot. A background job in core/lifespan.py refreshes it every
+PLATFORM_METRICS_REFRESH_SECONDS; endpoints read the snapshot and only
+compute inline when it is missing or older than the allowed staleness.
+"""
+import logging
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+
+from sqlalchemy import case, func, select
+from sqlalchemy.orm import Session
+
+from ..models.order import Order, OrderStatus
+from ..models.restaurant import Restaurant
+from ..models.restaurant_subscription import BillingCycle, RestaurantSubscription, SubscriptionStatus
+from ..models.subscription_plan import SubscriptionPlan
+from ..models.user import User, UserRole
+from .subscription import refresh_due_statuses
+
+logger = logging.getLogger(__name__)
+
+# Subscriptions that bring in revenue
+_LIVE = (SubscriptionStatus.ACTIVE, SubscriptionStatus.TRIAL)
+
+
+@dataclass(frozen=True)
+class PlanCount:
+    """Live subscriptions of one plan."""
+    name: str
+    display_name: str
+    subscriptions: int
+    restaurants: int
+
+
+@dataclass(frozen=True)
+class PlatformMetrics:
+    """A point-in-time snapshot of platform metrics."""
+    computed_at: datetime
+
+    total_restaurants: int
+    new_restaurants_30d: int
+
+    total_subscriptions: int
+    restaurants_with_subscription: int
+    # Distinct restaurants per subscription status value
+    restaurants_by_status: Dict[str, int]
+    suspended_restaurants: int
+
+    total_users: int
+    admin_users: int
+    staff_users: int
+
+    live_subscription_total: float
+    mrr: float
+    pending_payments: int
+
+    orders_30d: int
+    revenue_30d: float
+
+    plans: tuple = field(default_factory=tuple)
+
+
+def _distinct_restaurants_where(condition):
+    return func.count(func.distinct(case((condition, RestaurantSubscription.restaurant_id))))
+
+
+def _sum_where(condition, value):
+    return func.coalesce(func.sum(case((condition, value), else_=0)), 0)
+
+
+def compute_platform_metrics(db: Session, now: Optional[datetime] = None) -> PlatformMetrics:
+    """
+    Compute all platform metrics in one pass over each table.
+
+    Args:
+        db: Database session
+        now: Reference time (naive UTC), defaults to now
+
+    Returns:
+        PlatformMetrics: Fresh snapshot
+    """
+    now = now or datetime.utcnow()
+    thirty_days_ago = now - timedelta(days=30)
+    next_week = now + timedelta(days=7)
+    Sub = RestaurantSubscription
+    live = Sub.status.in_(_LIVE)
+
+    restaurants = select(
+        func.count(Restaurant.id).label("restaurants_total"),
+        _sum_where(Restaurant.created_at >= thirty_days_ago, 1).label("restaurants_new_30d"),
+    ).subquery()
+
+    status_columns = [
+        _distinct_restaurants_where(Sub.status == status).label(f"status_{status.value}")
+        for status in SubscriptionStatus
+    ]
+    subscriptions = select(
+        func.count(Sub.id).label("subscriptions_total"),
+        func.count(func.distinct(Sub.restaurant_id)).label("subscribed_restaurants"),
+        *status_columns,
+        _distinct_restaurants_where(
+            Sub.status.in_([SubscriptionStatus.EXPIRED, SubscriptionStatus.CANCELLED])
+        ).label("suspended"),
+        _sum_where(live, Sub.total_price).label("live_total"),
+        _sum_where(live & (Sub.billing_cycle == BillingCycle.MONTHLY), Sub.total_price).label("monthly"),
+        _sum_where(live & (Sub.billing_cycle == BillingCycle.ANNUAL), Sub.total_price).label("annual"),
+        _sum_where(live & (Sub.current_period_end <= next_week), 1).label("pending_payments"),
+    ).subquery()
+
+    users = select(
+        func.count(User.id).label("users_total"),
+        _sum_where(User.role == UserRole.ADMIN, 1).label("users_admin"),
+        _sum_where(User.role == UserRole.STAFF, 1).label("users_staff"),
+    ).subquery()
+
+    orders = select(
+        func.count(Order.id).label("orders_30d"),
+        _sum_where(Order.status == OrderStatus.COMPLETED, Order.total_amount).label("revenue_30d"),
+    ).where(Order.created_at >= thirty_days_ago).subquery()
+
+    row = db.execute(select(restaurants, subscriptions, users, orders)).one()
+
+    plan_rows = db.execute(
+        select(
+            SubscriptionPlan.name, SubscriptionPlan.display_name,
+            func.count(Sub.id), func.count(func.distinct(Sub.restaurant_id)),
+        )
+        .join(Sub, SubscriptionPlan.id == Sub.plan_id)
+        .where(live)
+        .group_by(SubscriptionPlan.id, SubscriptionPlan.name, SubscriptionPlan.display_name)
+    ).all()
+
+    return PlatformMetrics(
+        computed_at=now,
+        total_restaurants=row.restaurants_total,
+        new_restaurants_30d=int(row.restaurants_new_30d),
+        total_subscriptions=row.subscriptions_total,
+        restaurants_with_subscription=row.subscribed_restaurants,
+        restaurants_by_status={
+            status.value: getattr(row, f"status_{status.value}") for status in SubscriptionStatus
+        },
+        suspended_restaurants=row.suspended,
+        total_users=row.users_total,
+        admin_users=int(row.users_admin),
+        staff_users=int(row.users_staff),
+        live_subscription_total=float(row.live_total),
+        mrr=float(row.monthly) + float(row.annual) / 12,
+        pending_payments=int(row.pending_payments),
+        orders_30d=row.orders_30d,
+        revenue_30d=float(row.revenue_30d),
+        plans=tuple(PlanCount(*plan_row) for plan_row in plan_rows),
+    )
+
+
+_snapshot: Optional[PlatformMetrics] = None
+_lock = threading.Lock()
+
+
+def refresh_platform_metrics(db: Session) -> PlatformMetrics:
+    """
+    Apply due subscription status transitions, then recompute the snapshot.
+
+    Called by the background job; safe to call from request handlers.
+
+    Args:
+        db: Database session
+
+    Returns:
+        PlatformMetrics: The new snapshot
+    """
+    global _snapshot
+    refresh_due_statuses(db)
+    snapshot = compute_platform_metrics(db)
+    with _lock:
+        _snapshot = snapshot
+    return snapshot
+
+
+def get_platform_metrics(db: Session, max_age_seconds: float) -> PlatformMetrics:
+    """
+    Return the current snapshot, refreshing it first if missing or stale.
+
+    Args:
+        db: Database session
+        max_age_seconds: Oldest acceptable snapshot age
+
+    Returns:
+        PlatformMetrics: Snapshot no older than max_age_seconds
+    """
+    snapshot = _snapshot
+    if snapshot is None or (datetime.utcnow() - snapshot.computed_at).total_seconds() > max_age_seconds:
+        snapshot = refresh_platform_metrics(db)
+    return snapshot
+
+
+def invalidate_platform_metrics() -> None:
+    """Drop the snapshot so the next read recomputes it."""
+    global _snapshot
+    with _lock:
+        _snapshot = None
@@ -7,6 +7,7 @@ from app.models.printer import Printer, PrinterType
 from app.models.menu import Category
 from app.schemas.printer import PrinterCreate, PrinterUpdate
 from app.core.exceptions import ResourceNotFoundError, ValidationError, ConflictError
+from app.services.printing.routing import invalidate_routing_table
 
 
 def get_printer_by_id(db: Session, printer_id: int, restaurant_id: int) -> Optional[Printer]:
@@ -94,6 +95,7 @@ def create_printer(db: Session, printer_data: PrinterCreate, restaurant_id: int)
     db.add(printer)
     db.commit()
     db.refresh(printer)
+    invalidate_routing_table(restaurant_id)
     
     return printer
 
@@ -144,6 +146,7 @@ def update_printer(
     
     db.commit()
     db.refresh(printer)
+    invalidate_routing_table(restaurant_id)
     
     return printer
 
@@ -159,6 +162,7 @@ def delete_printer(db: Session, printer_id: int, restaurant_id: int) -> bool:
     printer.deleted_at = datetime.now(timezone.utc)
     
     db.commit()
+    invalidate_routing_table(restaurant_id)
     
     return True
 
@@ -191,6 +195,7 @@ def assign_categories_to_printer(
     printer.categories = categories
     db.commit()
     db.refresh(printer)
+    invalidate_routing_table(restaurant_id)
     
     return printer
 
@@ -0,0 +1,56 @@
+"""
+Printing Service Module
+
+Server-side printing to network thermal printers:
+- routing: Precomputed category -> printer routing tables per restaurant
+- escpos: ESC/POS ticket rendering
+- spooler: Asyncio job queues with connection reuse, retries and backpressure
+- tickets: Order -> print jobs, auto-print of new orders (outbox handler)
+"""
+
+from .routing import (
+    PrinterTarget,
+    RoutingTable,
+    build_routing_table,
+    get_routing_table,
+    invalidate_routing_table,
+)
+
+from .escpos import (
+    render_kitchen_ticket,
+    render_test_page,
+)
+
+from .spooler import (
+    PrintJob,
+    PrintSpooler,
+    PrintQueueFullError,
+    print_spooler,
+)
+
+from .tickets import (
+    order_print_jobs,
+    auto_print_order,
+    print_created_order,
+)
+
+__all__ = [
+    # Routing
+    "PrinterTarget",
+    "RoutingTable",
+    "build_routing_table",
+    "get_routing_table",
+    "invalidate_routing_table",
+    # Rendering
+    "render_kitchen_ticket",
+    "render_test_page",
+    # Spooler
+    "PrintJob",
+    "PrintSpooler",
+    "PrintQueueFullError",
+    "print_spooler",
+    # Tickets
+    "order_print_jobs",
+    "auto_print_order",
+    "print_created_order",
+]
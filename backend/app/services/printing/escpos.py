@@ -0,0 +1,163 @@
+"""
+ESC/POS Rendering
+
+Renders kitchen tickets as raw ESC/POS bytes for network thermal printers
+(port 9100). Layout follows the browser ticket in useKitchenPrint.ts:
+order number and time, table or order type, items grouped by diner with
+variant, notes and extras.
+"""
+import textwrap
+from datetime import datetime, timezone, tzinfo
+from typing import Iterable, List, Optional
+
+ESC = b"\x1b"
+GS = b"\x1d"
+
+INIT = ESC + b"@"
+# Code page 19 (PC858: Latin-1 plus the euro sign) covers Spanish text
+CODEPAGE_PC858 = ESC + b"t\x13"
+ENCODING = "cp858"
+ALIGN_LEFT = ESC + b"a\x00"
+ALIGN_CENTER = ESC + b"a\x01"
+BOLD_ON = ESC + b"E\x01"
+BOLD_OFF = ESC + b"E\x00"
+SIZE_NORMAL = GS + b"!\x00"
+SIZE_TALL = GS + b"!\x01"
+SIZE_DOUBLE = GS + b"!\x11"
+# Feed 3 lines, then partial cut
+FEED_AND_CUT = GS + b"V\x42\x03"
+
+# Characters per line in font A
+COLUMNS = {58: 32, 80: 48}
+
+ORDER_TYPE_LABELS = {
+    "dine_in": "Para Comer Aquí",
+    "takeaway": "Para Llevar",
+    "delivery": "Domicilio",
+    "pos_sale": "Venta Directa",
+    "quick_service": "Para Comer Aquí",
+}
+
+
+class TicketBuilder:
+    """Accumulates ESC/POS commands for one ticket."""
+
+    def __init__(self, paper_width: int = 80):
+        self.columns = COLUMNS.get(paper_width, COLUMNS[80])
+        self._parts: List[bytes] = [INIT, CODEPAGE_PC858]
+
+    def text(self, value: str, bold: bool = False, double: bool = False, tall: bool = False,
+             center: bool = False, indent: int = 0) -> "TicketBuilder":
+        """Append wrapped text; double-width text gets half the columns."""
+        width = self.columns // 2 if double else self.columns
+        lines = textwrap.wrap(value, width=max(width - indent, 8)) or [""]
+        self._parts.append(ALIGN_CENTER if center else ALIGN_LEFT)
+        self._parts.append(SIZE_DOUBLE if double else SIZE_TALL if tall else SIZE_NORMAL)
+        if bold:
+            self._parts.append(BOLD_ON)
+        for line in lines:
+            self._parts.append((" " * indent + line).encode(ENCODING, errors="replace") + b"\n")
+        if bold:
+            self._parts.append(BOLD_OFF)
+        return self
+
+    def divider(self, char: str = "-") -> "TicketBuilder":
+        self._parts += [ALIGN_LEFT, SIZE_NORMAL, (char * self.columns).encode(ENCODING) + b"\n"]
+        return self
+
+    def cut(self) -> "TicketBuilder":
+        self._parts.append(FEED_AND_CUT)
+        return self
+
+    def build(self) -> bytes:
+        return b"".join(self._parts)
+
+
+def _local_time(value, tz: Optional[tzinfo]) -> str:
+    if not isinstance(value, datetime):
+        return ""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(tz or timezone.utc).strftime("%I:%M %p")
+
+
+def _item_lines(ticket: TicketBuilder, item: dict) -> None:
+    menu_item = item.get("menu_item") or {}
+    ticket.text(f"{item['quantity']}x {menu_item.get('name', '')}", bold=True, double=True)
+    if menu_item.get("category"):
+        ticket.text(str(menu_item["category"]).upper(), bold=True, indent=2)
+    if item.get("variant"):
+        ticket.text(item["variant"]["name"], bold=True, indent=2)
+    for extra in item.get("extras") or ():
+        ticket.text(f"+ {extra['quantity']}x {extra['name']}", indent=2)
+    if item.get("special_instructions"):
+        ticket.text(item["special_instructions"], tall=True, indent=2)
+
+
+def render_kitchen_ticket(order: dict, items: Iterable[dict], paper_width: int = 80,
+                          tz: Optional[tzinfo] = None) -> bytes:
+    """
+    Render a kitchen ticket for some of an order's items.
+
+    Args:
+        order: Serialized order (see orders/serializers.py)
+        items: The serialized items this printer should receive
+        paper_width: 58 or 80 (mm)
+        tz: Restaurant time zone for the printed time
+
+    Returns:
+        bytes: ESC/POS payload, ending with a cut
+    """
+    items = list(items)
+    ticket = TicketBuilder(paper_width)
+    ticket.text(f"Orden #{order['order_number']}", bold=True, double=True, center=True)
+    ticket.text(_local_time(order.get("created_at"), tz), center=True)
+    if order.get("table_number") is not None:
+        ticket.text(f"Mesa {order['table_number']}", bold=True, double=True, center=True)
+    else:
+        order_type = order.get("order_type")
+        order_type = getattr(order_type, "value", order_type)
+        ticket.text(ORDER_TYPE_LABELS.get(order_type, order_type or ""), bold=True, tall=True, center=True)
+        if order.get("customer_name"):
+            ticket.text(order["customer_name"], center=True)
+    ticket.divider("=")
+
+    # Group by diner like the browser ticket; items without a diner go last
+    item_ids = {item["id"] for item in items}
+    printed = set()
+    for index, person in enumerate(order.get("persons") or (), start=1):
+        person_items = [item for item in person.get("items") or () if item["id"] in item_ids]
+        if not person_items:
+            continue
+        ticket.text((person.get("name") or f"Persona {index}").upper(), bold=True)
+        for item in person_items:
+            _item_lines(ticket, item)
+            printed.add(item["id"])
+        ticket.divider()
+    for item in items:
+        if item["id"] not in printed:
+            _item_lines(ticket, item)
+
+    if order.get("notes"):
+        ticket.divider()
+        ticket.text(f"NOTAS: {order['notes']}", bold=True)
+    return ticket.cut().build()
+
+
+def render_test_page(printer_name: str, paper_width: int = 80) -> bytes:
+    """
+    Render a short page to check a printer's connection and width.
+
+    Args:
+        printer_name: Name to print
+        paper_width: 58 or 80 (mm)
+
+    Returns:
+        bytes: ESC/POS payload
+    """
+    ticket = TicketBuilder(paper_width)
+    ticket.text("Prueba de impresión", bold=True, double=True, center=True)
+    ticket.text(printer_name, center=True)
+    ticket.divider()
+    ticket.text(("0123456789" * 5)[:ticket.columns])
+    return ticket.cut().build()
@@ -0,0 +1,167 @@
+"""
+Printer Routing
+
+Precomputed category -> printer routing tables, one per restaurant.
+
+A table is built with two queries (active network printers and their
+category assignments) and kept until the restaurant's printers change;
+the printer service invalidates it on every write. Items of a category
+without an assigned printer go to the restaurant's default kitchen
+printer, if any.
+"""
+import threading
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from ...models.printer import Printer, PrinterType, category_printer
+
+
+@dataclass(frozen=True)
+class PrinterTarget:
+    """Connection and ticket settings of one network printer."""
+    id: int
+    name: str
+    printer_type: PrinterType
+    host: str
+    port: int
+    paper_width: int
+    copies: int
+    auto_print: bool
+
+    @property
+    def address(self) -> Tuple[str, int]:
+        return self.host, self.port
+
+
+@dataclass(frozen=True)
+class RoutingTable:
+    """Printers per category for one restaurant."""
+    by_category: Dict[int, Tuple[PrinterTarget, ...]]
+    fallback: Optional[PrinterTarget]
+    printers: Dict[int, PrinterTarget]
+
+    def printers_for(self, category_id: Optional[int]) -> Tuple[PrinterTarget, ...]:
+        """
+        Printers that should receive items of a category.
+
+        Args:
+            category_id: Category of the item
+
+        Returns:
+            tuple: Assigned printers, or the default kitchen printer alone
+        """
+        targets = self.by_category.get(category_id)
+        if targets:
+            return targets
+        return (self.fallback,) if self.fallback else ()
+
+    def route(self, items: Iterable[Tuple[Optional[int], dict]]) -> Dict[PrinterTarget, List[dict]]:
+        """
+        Group items by destination printer, keeping their order.
+
+        Args:
+            items: (category_id, item) pairs
+
+        Returns:
+            dict: Items per printer
+        """
+        routed: Dict[PrinterTarget, List[dict]] = {}
+        for category_id, item in items:
+            for target in self.printers_for(category_id):
+                routed.setdefault(target, []).append(item)
+        return routed
+
+
+def build_routing_table(db: Session, restaurant_id: int) -> RoutingTable:
+    """
+    Build the routing table of a restaurant.
+
+    Only active, non-deleted network printers with an address are routed.
+
+    Args:
+        db: Database session
+        restaurant_id: Restaurant to build for
+
+    Returns:
+        RoutingTable: Fresh routing table
+    """
+    rows = db.execute(
+        select(
+            Printer.id, Printer.name, Printer.printer_type, Printer.ip_address, Printer.port,
+            Printer.paper_width, Printer.print_copies, Printer.auto_print, Printer.is_default,
+        ).where(
+            Printer.restaurant_id == restaurant_id,
+            Printer.deleted_at.is_(None),
+            Printer.is_active.is_(True),
+            Printer.connection_type == "network",
+            Printer.ip_address.isnot(None),
+        ).order_by(Printer.id)
+    ).all()
+
+    printers = {}
+    fallback = None
+    for row in rows:
+        target = PrinterTarget(
+            id=row.id, name=row.name, printer_type=row.printer_type, host=row.ip_address,
+            port=row.port or 9100, paper_width=row.paper_width or 80,
+            copies=max(row.print_copies or 1, 1), auto_print=row.auto_print,
+        )
+        printers[target.id] = target
+        if fallback is None and row.is_default and row.printer_type == PrinterType.KITCHEN:
+            fallback = target
+
+    by_category: Dict[int, List[PrinterTarget]] = {}
+    if printers:
+        assignments = db.execute(
+            select(category_printer.c.category_id, category_printer.c.printer_id)
+            .where(category_printer.c.printer_id.in_(list(printers)))
+            .order_by(category_printer.c.printer_id)
+        ).all()
+        for category_id, printer_id in assignments:
+            by_category.setdefault(category_id, []).append(printers[printer_id])
+
+    return RoutingTable(
+        by_category={category_id: tuple(targets) for category_id, targets in by_category.items()},
+        fallback=fallback,
+        printers=printers,
+    )
+
+
+_tables: Dict[int, RoutingTable] = {}
+_lock = threading.Lock()
+
+
+def get_routing_table(db: Session, restaurant_id: int) -> RoutingTable:
+    """
+    Cached routing table of a restaurant, built on first use.
+
+    Args:
+        db: Database session
+        restaurant_id: Restaurant to route for
+
+    Returns:
+        RoutingTable: Routing table
+    """
+    table = _tables.get(restaurant_id)
+    if table is None:
+        table = build_routing_table(db, restaurant_id)
+        with _lock:
+            _tables[restaurant_id] = table
+    return table
+
+
+def invalidate_routing_table(restaurant_id: Optional[int] = None) -> None:
+    """
+    Drop cached routing tables.
+
+    Args:
+        restaurant_id: Only drop this restaurant's table; all when None
+    """
+    with _lock:
+        if restaurant_id is None:
+            _tables.clear()
+        else:
+            _tables.pop(restaurant_id, None)
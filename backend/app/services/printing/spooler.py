@@ -0,0 +1,239 @@
+"""
+Print Spooler
+
+An asyncio job queue in front of the network printers.
+
+Each printer address gets its own bounded queue and worker task. The
+worker keeps one TCP connection open and reuses it for consecutive
+tickets, reconnecting when the printer has closed it or after it has
+been idle for a while. Failed sends are retried with exponential
+backoff; a ticket that still cannot be delivered is dropped and counted.
+
+Backpressure: ``submit_nowait`` raises PrintQueueFullError when a
+printer's queue is full (a printer that is off should not grow memory
+without bound), ``submit`` waits for room instead.
+
+All methods must be called from the event loop, except
+``submit_threadsafe`` for worker threads (e.g. the outbox worker) once
+the spooler is attached to the loop. Timeouts use
+``asyncio.timeout`` rather than ``wait_for``, which on Python 3.11 can
+swallow a cancellation that races with a refused connection and keep a
+stopped worker alive.
+"""
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Tuple
+
+from ...core.config import settings
+from ...core.exceptions import ExternalServiceError
+from .routing import PrinterTarget
+
+logger = logging.getLogger(__name__)
+
+
+class PrintQueueFullError(ExternalServiceError):
+    """Raised when a printer's queue has no room for another ticket (HTTP 503)."""
+
+    def __init__(self, printer_name: str):
+        super().__init__("printer", f"Print queue for '{printer_name}' is full")
+
+
+@dataclass
+class PrintJob:
+    """One payload for one printer."""
+    printer: PrinterTarget
+    payload: bytes
+    description: str = ""
+
+
+@dataclass
+class PrinterStats:
+    """Delivery counters of one printer address."""
+    printed: int = 0
+    failed: int = 0
+    retries: int = 0
+    connections: int = 0
+    rejected: int = 0
+    last_error: Optional[str] = None
+
+
+class _PrinterChannel:
+    """Queue, worker and reusable connection of one printer address."""
+
+    def __init__(self, spooler: "PrintSpooler", address: Tuple[str, int]):
+        self.spooler = spooler
+        self.address = address
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=spooler.queue_size)
+        self.stats = PrinterStats()
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self.worker = asyncio.create_task(self._run(), name=f"print-spooler-{address[0]}:{address[1]}")
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                async with asyncio.timeout(self.spooler.idle_timeout):
+                    job = await self.queue.get()
+            except TimeoutError:
+                await self._close()
+                continue
+            try:
+                await self._deliver(job)
+            finally:
+                self.queue.task_done()
+
+    async def _connection(self) -> asyncio.StreamWriter:
+        if self._writer is not None and (self._writer.is_closing() or self._reader.at_eof()):
+            await self._close()
+        if self._writer is None:
+            async with asyncio.timeout(self.spooler.connect_timeout):
+                self._reader, self._writer = await asyncio.open_connection(*self.address)
+            self.stats.connections += 1
+        return self._writer
+
+    async def _deliver(self, job: PrintJob) -> None:
+        spooler = self.spooler
+        for attempt in range(spooler.max_retries + 1):
+            try:
+                writer = await self._connection()
+                writer.write(job.payload)
+                async with asyncio.timeout(spooler.write_timeout):
+                    await writer.drain()
+                self.stats.printed += 1
+                return
+            except (OSError, TimeoutError) as e:
+                self.stats.last_error = f"{type(e).__name__}: {e}"
+                await self._close()
+                if attempt == spooler.max_retries:
+                    break
+                self.stats.retries += 1
+                await asyncio.sleep(spooler.retry_backoff * 2 ** attempt)
+
+        self.stats.failed += 1
+        logger.error("Dropped print job %r for %s after %d attempts: %s",
+                     job.description, job.printer.name, spooler.max_retries + 1, self.stats.last_error)
+
+    async def _close(self) -> None:
+        writer, self._reader, self._writer = self._writer, None, None
+        if writer is not None:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except OSError:
+                pass
+
+    async def stop(self) -> None:
+        self.worker.cancel()
+        try:
+            await self.worker
+        except asyncio.CancelledError:
+            pass
+        await self._close()
+
+
+class PrintSpooler:
+    """
+    Per-printer job queues with connection reuse, retries and backpressure.
+
+    Args:
+        queue_size: Tickets waiting per printer before submissions are refused
+        connect_timeout: Seconds to wait for a printer to accept a connection
+        write_timeout: Seconds to wait for a payload to be sent
+        max_retries: Extra attempts per ticket after the first failure
+        retry_backoff: First retry delay in seconds, doubled each attempt
+        idle_timeout: Seconds after which an unused connection is closed
+    """
+
+    def __init__(self, queue_size: int = 100, connect_timeout: float = 3.0, write_timeout: float = 5.0,
+                 max_retries: int = 3, retry_backoff: float = 0.5, idle_timeout: float = 30.0):
+        self.queue_size = queue_size
+        self.connect_timeout = connect_timeout
+        self.write_timeout = write_timeout
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.idle_timeout = idle_timeout
+        self._channels: Dict[Tuple[str, int], _PrinterChannel] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def attach(self, loop: Optional[asyncio.AbstractEventLoop]) -> None:
+        """Set the event loop the spooler runs on, for submit_threadsafe (None to detach)."""
+        self._loop = loop
+
+    def _channel(self, printer: PrinterTarget) -> _PrinterChannel:
+        channel = self._channels.get(printer.address)
+        if channel is None:
+            channel = self._channels[printer.address] = _PrinterChannel(self, printer.address)
+        return channel
+
+    def submit_nowait(self, job: PrintJob) -> None:
+        """
+        Queue a job without waiting.
+
+        Raises:
+            PrintQueueFullError: If the printer's queue is full
+        """
+        channel = self._channel(job.printer)
+        try:
+            channel.queue.put_nowait(job)
+        except asyncio.QueueFull:
+            channel.stats.rejected += 1
+            raise PrintQueueFullError(job.printer.name)
+
+    async def submit(self, job: PrintJob) -> None:
+        """Queue a job, waiting for room if the printer's queue is full."""
+        await self._channel(job.printer).queue.put(job)
+
+    def submit_threadsafe(self, job: PrintJob, timeout: float = 5.0) -> None:
+        """
+        Queue a job from a thread other than the event loop's, waiting up
+        to ``timeout`` seconds for room.
+
+        Raises:
+            RuntimeError: If the spooler is not attached to an event loop
+            PrintQueueFullError: If the printer's queue stayed full
+        """
+        if self._loop is None or self._loop.is_closed():
+            raise RuntimeError("Print spooler is not attached to an event loop")
+        future = asyncio.run_coroutine_threadsafe(self.submit(job), self._loop)
+        try:
+            future.result(timeout)
+        except TimeoutError:
+            future.cancel()
+            self._loop.call_soon_threadsafe(self._count_rejected, job)
+            raise PrintQueueFullError(job.printer.name)
+
+    def _count_rejected(self, job: PrintJob) -> None:
+        self._channel(job.printer).stats.rejected += 1
+
+    async def drain(self) -> None:
+        """Wait until every queued job has been delivered or dropped."""
+        await asyncio.gather(*(channel.queue.join() for channel in list(self._channels.values())))
+
+    async def stop(self, timeout: float = 5.0) -> None:
+        """
+        Give queued jobs up to ``timeout`` seconds, then stop workers and close connections.
+        """
+        try:
+            async with asyncio.timeout(timeout):
+                await self.drain()
+        except TimeoutError:
+            logger.warning("Print spooler stopped with undelivered jobs")
+        channels, self._channels = list(self._channels.values()), {}
+        for channel in channels:
+            await channel.stop()
+
+    def stats(self) -> Dict[str, dict]:
+        """Counters and queue depth per printer address."""
+        return {
+            f"{host}:{port}": {"queued": channel.queue.qsize(), **vars(channel.stats)}
+            for (host, port), channel in self._channels.items()
+        }
+
+
+# Application-wide spooler, stopped from core/lifespan.py
+print_spooler = PrintSpooler(
+    queue_size=settings.PRINT_QUEUE_SIZE,
+    connect_timeout=settings.PRINT_CONNECT_TIMEOUT,
+    max_retries=settings.PRINT_MAX_RETRIES,
+)
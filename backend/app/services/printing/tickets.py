@@ -0,0 +1,136 @@
+"""
+Order Tickets
+
+Turns a serialized order into print jobs: items are routed to printers by
+category, rendered as ESC/POS per printer and queued on the spooler.
+New orders are printed by the outbox worker (``order.created`` events).
+"""
+import logging
+from typing import List, Optional
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from ...core.config import settings
+from .. import outbox
+from ...models.menu import MenuItem
+from ...models.printer import PrinterType
+from ...models.restaurant import Restaurant
+from .escpos import render_kitchen_ticket
+from .routing import get_routing_table
+from .spooler import PrintJob, PrintQueueFullError, print_spooler
+
+logger = logging.getLogger(__name__)
+
+
+def _restaurant_zone(restaurant: Restaurant):
+    try:
+        return ZoneInfo(restaurant.timezone) if restaurant.timezone else None
+    except (ZoneInfoNotFoundError, ValueError):
+        return None
+
+
+def order_print_jobs(
+    db: Session,
+    restaurant: Restaurant,
+    order: dict,
+    auto_print_only: bool = False,
+    items: Optional[List[dict]] = None
+) -> List[PrintJob]:
+    """
+    Build the print jobs of an order, one per destination printer.
+
+    Kitchen printers skip items of categories hidden from the kitchen.
+    Copies are concatenated into a single payload.
+
+    Args:
+        db: Database session
+        restaurant: Restaurant owning the order
+        order: Serialized order (see orders/serializers.py)
+        auto_print_only: Only printers with auto_print enabled
+        items: Subset of the order's serialized items; all when None
+
+    Returns:
+        list: Print jobs, possibly empty
+    """
+    table = get_routing_table(db, restaurant.id)
+    items = order["items"] if items is None else items
+    if not table.printers or not items:
+        return []
+
+    categories = dict(db.execute(
+        select(MenuItem.id, MenuItem.category_id)
+        .where(MenuItem.id.in_({item["menu_item_id"] for item in items}))
+    ).all())
+    routed = table.route((categories.get(item["menu_item_id"]), item) for item in items)
+
+    tz = _restaurant_zone(restaurant)
+    jobs = []
+    for printer, printer_items in routed.items():
+        if auto_print_only and not printer.auto_print:
+            continue
+        if printer.printer_type == PrinterType.KITCHEN:
+            printer_items = [
+                item for item in printer_items
+                if (item.get("menu_item") or {}).get("category_visible_in_kitchen", True)
+            ]
+        if not printer_items:
+            continue
+        payload = render_kitchen_ticket(order, printer_items, printer.paper_width, tz)
+        jobs.append(PrintJob(printer, payload * printer.copies, f"order #{order['order_number']}"))
+    return jobs
+
+
+def auto_print_order(db: Session, restaurant: Restaurant, order: dict) -> int:
+    """
+    Queue tickets for a newly created order when server-side printing is on.
+
+    Never raises: a printer problem must not fail order creation.
+
+    Args:
+        db: Database session
+        restaurant: Restaurant owning the order
+        order: Serialized order
+
+    Returns:
+        int: Number of jobs queued
+    """
+    if not settings.SERVER_AUTO_PRINT:
+        return 0
+    queued = 0
+    try:
+        for job in order_print_jobs(db, restaurant, order, auto_print_only=True):
+            try:
+                print_spooler.submit_nowait(job)
+                queued += 1
+            except PrintQueueFullError:
+                logger.warning("Print queue full for %s, skipped %s", job.printer.name, job.description)
+    except Exception:
+        logger.exception("Auto-print failed for order #%s", order.get("order_number"))
+    return queued
+
+
+@outbox.handler(outbox.ORDER_CREATED)
+def print_created_order(db: Session, payload: dict) -> None:
+    """
+    Outbox handler: queue the auto-print tickets of a new order.
+
+    Runs on the outbox worker thread. A printer whose queue stays full is
+    skipped, as in auto_print_order; database errors propagate so the
+    event is retried.
+    """
+    if not settings.SERVER_AUTO_PRINT:
+        return
+    # Lazy import to avoid circular dependency
+    from ..orders import get_order
+
+    restaurant = db.get(Restaurant, payload["restaurant_id"])
+    order = get_order(db, payload["order_id"], payload["restaurant_id"]) if restaurant else None
+    if order is None:
+        return
+    for job in order_print_jobs(db, restaurant, order, auto_print_only=True):
+        try:
+            print_spooler.submit_threadsafe(job)
+        except PrintQueueFullError:
+            logger.warning("Print queue full for %s, skipped %s", job.printer.name, job.description)
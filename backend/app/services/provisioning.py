@@ -0,0 +1,308 @@
+"""
+Bulk Restaurant Provisioning
+
+Onboards many branches of a chain in one request.
+
+Creating branches one by one through POST /restaurants costs several
+commits and one serial bcrypt hash per branch. Here all validation is
+done up front with one query per check, the admin passwords are hashed
+in parallel on a thread pool, and branches are written in chunked
+transactions. A failing chunk is retried branch by branch so a single
+bad branch never takes its neighbours down with it. Every branch gets a
+result entry: created (with its admin credentials) or failed (with the
+reason).
+"""
+import logging
+import os
+import secrets
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence
+
+from sqlalchemy import select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session, selectinload
+
+from ..core.config import settings
+from ..core.exceptions import ResourceNotFoundError
+from ..core.security import get_password_hash
+from ..models.menu import Category, MenuItem, MenuItemVariant
+from ..models.restaurant import Restaurant
+from ..models.subscription_plan import PlanTier, SubscriptionPlan
+from ..models.user import User, UserRole
+from ..schemas.restaurant import (
+    BranchProvisionResult,
+    RestaurantBulkCreate,
+    RestaurantBulkCreationResponse,
+    RestaurantCreate,
+)
+from .subscription import build_paid_subscription, build_trial_subscription, get_plan_by_tier
+
+logger = logging.getLogger(__name__)
+
+# bcrypt releases the GIL, so hashing scales with threads up to the core count
+HASH_WORKERS = min(8, os.cpu_count() or 1)
+
+
+@dataclass
+class MenuTemplate:
+    """A restaurant's live menu, detached from the session for cloning."""
+    source_restaurant_id: int
+    # Category fields with their items; items carry their variants
+    categories: List[dict] = field(default_factory=list)
+
+    @property
+    def item_count(self) -> int:
+        return sum(len(category["items"]) for category in self.categories)
+
+
+@dataclass
+class _Branch:
+    """A validated branch waiting to be written."""
+    index: int
+    data: RestaurantCreate
+    admin_email: str
+    plan: SubscriptionPlan
+    password: str = ""
+    hashed_password: str = ""
+
+
+def hash_passwords(passwords: Sequence[str]) -> List[str]:
+    """Hash passwords in parallel; results are in input order."""
+    if len(passwords) <= 1:
+        return [get_password_hash(password) for password in passwords]
+    with ThreadPoolExecutor(max_workers=HASH_WORKERS, thread_name_prefix="provision-hash") as pool:
+        return list(pool.map(get_password_hash, passwords))
+
+
+def load_menu_template(db: Session, restaurant_id: int) -> MenuTemplate:
+    """
+    Read the live categories, items and variants of a restaurant.
+
+    Raises:
+        ResourceNotFoundError: If the restaurant does not exist
+    """
+    if db.get(Restaurant, restaurant_id) is None:
+        raise ResourceNotFoundError("Restaurant", restaurant_id)
+
+    categories = db.execute(
+        select(Category).where(Category.restaurant_id == restaurant_id, Category.deleted_at.is_(None))
+        .order_by(Category.id)
+    ).scalars().all()
+    # Items are read in one query rather than through each category, and
+    # their variants in one more
+    items = db.execute(
+        select(MenuItem).where(MenuItem.restaurant_id == restaurant_id, MenuItem.deleted_at.is_(None))
+        .options(selectinload(MenuItem.variants))
+        .order_by(MenuItem.id)
+    ).scalars().all()
+
+    template = MenuTemplate(source_restaurant_id=restaurant_id)
+    by_category: Dict[int, dict] = {}
+    for category in categories:
+        by_category[category.id] = {
+            "name": category.name,
+            "description": category.description,
+            "visible_in_kitchen": category.visible_in_kitchen,
+            "items": [],
+        }
+        template.categories.append(by_category[category.id])
+    for item in items:
+        if item.category_id not in by_category:
+            continue
+        by_category[item.category_id]["items"].append({
+            "name": item.name,
+            "description": item.description,
+            "price": item.price,
+            "discount_price": item.discount_price,
+            "is_available": item.is_available,
+            "image_url": item.image_url,
+            "ingredients": item.ingredients,
+            "variants": [
+                {"name": v.name, "price": v.price, "discount_price": v.discount_price, "is_available": v.is_available}
+                for v in item.variants
+            ],
+        })
+    return template
+
+
+def clone_menu(db: Session, template: MenuTemplate, restaurant_id: int) -> int:
+    """
+    Add a copy of a menu template to a restaurant. Does not commit.
+
+    Returns:
+        Number of menu items cloned
+    """
+    for category_data in template.categories:
+        category = Category(
+            name=category_data["name"],
+            restaurant_id=restaurant_id,
+            description=category_data["description"],
+            visible_in_kitchen=category_data["visible_in_kitchen"],
+        )
+        db.add(category)
+        for item_data in category_data["items"]:
+            fields = {k: v for k, v in item_data.items() if k != "variants"}
+            item = MenuItem(**fields, category=category, restaurant_id=restaurant_id)
+            db.add(item)
+            for variant_data in item_data["variants"]:
+                db.add(MenuItemVariant(**variant_data, menu_item=item))
+    return template.item_count
+
+
+def provision_restaurants(db: Session, request: RestaurantBulkCreate) -> RestaurantBulkCreationResponse:
+    """
+    Provision many restaurants, each with a subscription and an admin user.
+
+    Blocking: hashes passwords and commits. Call it from a worker thread
+    when serving a request.
+
+    Args:
+        db: Database session
+        request: Branches, optional menu template and chunk size
+
+    Returns:
+        Per-branch report, in request order
+
+    Raises:
+        ResourceNotFoundError: If the menu template restaurant does not exist
+    """
+    template = None
+    if request.menu_template_restaurant_id is not None:
+        template = load_menu_template(db, request.menu_template_restaurant_id)
+
+    results: Dict[int, BranchProvisionResult] = {}
+
+    def fail(index: int, error: str) -> None:
+        results[index] = BranchProvisionResult(
+            subdomain=request.branches[index].subdomain, status="failed", error=error,
+        )
+
+    branches = _validate(db, request.branches, fail)
+
+    passwords = [secrets.token_urlsafe(16) for _ in branches]
+    for branch, password, hashed in zip(branches, passwords, hash_passwords(passwords)):
+        branch.password, branch.hashed_password = password, hashed
+
+    for start in range(0, len(branches), request.chunk_size):
+        chunk = branches[start:start + request.chunk_size]
+        try:
+            written = _write_branches(db, chunk, template)
+            db.commit()
+        except SQLAlchemyError:
+            db.rollback()
+            # Retry alone so one bad branch does not fail the whole chunk
+            written = []
+            for branch in chunk:
+                try:
+                    written.extend(_write_branches(db, [branch], template))
+                    db.commit()
+                except SQLAlchemyError as e:
+                    db.rollback()
+                    logger.warning("Provisioning %s failed: %s", branch.data.subdomain, e)
+                    fail(branch.index, "Database error while creating the branch")
+        for result in written:
+            results[result.index] = result.result
+
+    ordered = [results[index] for index in range(len(request.branches))]
+    created = sum(1 for result in ordered if result.status == "created")
+    logger.info("Provisioned %d of %d restaurants", created, len(ordered))
+    return RestaurantBulkCreationResponse(
+        created=created, failed=len(ordered) - created, results=ordered,
+    )
+
+
+def _admin_email(data: RestaurantCreate) -> str:
+    return data.admin_email or f"admin-{data.subdomain}@shopacoffee.com"
+
+
+def _validate(db: Session, requested: Sequence[RestaurantCreate], fail) -> List[_Branch]:
+    """Check all branches with one query per rule; report the rejected ones."""
+    subdomains = [data.subdomain for data in requested]
+    emails = [_admin_email(data) for data in requested]
+
+    taken_subdomains = set(db.execute(
+        select(Restaurant.subdomain).where(Restaurant.subdomain.in_(subdomains))
+    ).scalars())
+    taken_emails = set(db.execute(select(User.email).where(User.email.in_(emails))).scalars())
+
+    plan_ids = {data.plan_id for data in requested if data.plan_id}
+    plans = {
+        plan.id: plan
+        for plan in db.execute(select(SubscriptionPlan).where(SubscriptionPlan.id.in_(plan_ids))).scalars()
+    } if plan_ids else {}
+    trial_plan = get_plan_by_tier(db, PlanTier.TRIAL) if any(not data.plan_id for data in requested) else None
+    parent_ids = {data.parent_restaurant_id for data in requested if data.parent_restaurant_id}
+    known_parents = set(db.execute(
+        select(Restaurant.id).where(Restaurant.id.in_(parent_ids))
+    ).scalars()) if parent_ids else set()
+
+    branches = []
+    seen_subdomains, seen_emails = set(), set()
+    for index, (data, email) in enumerate(zip(requested, emails)):
+        if data.subdomain in seen_subdomains:
+            fail(index, f"Subdomain '{data.subdomain}' appears more than once in the request")
+        elif data.subdomain in taken_subdomains:
+            fail(index, f"Restaurant with subdomain '{data.subdomain}' already exists")
+        elif email in seen_emails:
+            fail(index, f"Admin email '{email}' appears more than once in the request")
+        elif email in taken_emails:
+            fail(index, f"A user with email '{email}' already exists")
+        elif data.plan_id and data.plan_id not in plans:
+            fail(index, f"Subscription plan {data.plan_id} not found")
+        elif not data.plan_id and trial_plan is None:
+            fail(index, "Trial plan not found in system")
+        elif data.parent_restaurant_id and data.parent_restaurant_id not in known_parents:
+            fail(index, f"Headquarters restaurant {data.parent_restaurant_id} not found")
+        else:
+            branches.append(_Branch(index=index, data=data, admin_email=email,
+                                    plan=plans[data.plan_id] if data.plan_id else trial_plan))
+        seen_subdomains.add(data.subdomain)
+        seen_emails.add(email)
+    return branches
+
+
+@dataclass
+class _Written:
+    index: int
+    result: BranchProvisionResult
+
+
+def _write_branches(db: Session, branches: Sequence[_Branch], template: Optional[MenuTemplate]) -> List[_Written]:
+    """Add the restaurants of a chunk and everything they need. Does not commit."""
+    restaurants = [
+        Restaurant(**branch.data.dict(exclude={"trial_days", "admin_email", "plan_id"}))
+        for branch in branches
+    ]
+    db.add_all(restaurants)
+    db.flush()
+
+    written = []
+    for branch, restaurant in zip(branches, restaurants):
+        if branch.data.plan_id:
+            subscription = build_paid_subscription(restaurant.id, branch.plan)
+        else:
+            subscription = build_trial_subscription(restaurant.id, branch.plan, branch.data.trial_days)
+        db.add(subscription)
+        db.add(User(
+            email=branch.admin_email,
+            hashed_password=branch.hashed_password,
+            full_name=f"Admin {restaurant.name}",
+            role=UserRole.ADMIN,
+            is_active=True,
+            restaurant_id=restaurant.id,
+        ))
+        menu_items = clone_menu(db, template, restaurant.id) if template else 0
+        written.append(_Written(branch.index, BranchProvisionResult(
+            subdomain=restaurant.subdomain,
+            status="created",
+            restaurant_id=restaurant.id,
+            restaurant_url=f"{settings.BASE_PROTOCOL}://{restaurant.subdomain}.{settings.BASE_DOMAIN}",
+            admin_email=branch.admin_email,
+            admin_password=branch.password,
+            trial_expires=subscription.trial_end_date,
+            subscription_plan=branch.plan.display_name if branch.data.plan_id else None,
+            menu_items_cloned=menu_items,
+        )))
+    db.flush()
+    return written
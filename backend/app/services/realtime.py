@@ -0,0 +1,214 @@
+"""
+Real-time Events
+
+Push channel from the server to open browser tabs and the Electron app,
+so they stop polling for changes. Each client keeps one Server-Sent
+Events stream (``GET /api/v1/events/stream``) and receives the events of
+its restaurant, optionally restricted to some roles::
+
+    hub.publish(restaurant_id, "alerts.unread", {"unread_count": 3}, roles=ADMIN_ROLES)
+
+Events published in one worker reach the streams held by the others
+through the same shared tier as the cache (see core/cache.py), on
+REALTIME_CHANNEL. Without CACHE_REDIS_URL, events only reach streams on
+the publishing worker.
+
+Delivery is best effort: a stream that falls REALTIME_QUEUE_SIZE events
+behind is sent ``resync`` instead, and the client reloads what it shows.
+Streams send a comment every REALTIME_HEARTBEAT_SECONDS so proxies keep
+idle connections open.
+"""
+import asyncio
+import json
+import logging
+import os
+import socket
+import threading
+import uuid
+from dataclasses import dataclass
+from typing import AsyncIterator, Dict, Iterable, Optional, Set, Tuple
+
+from ..core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Sent when a stream dropped events, and to close streams on shutdown
+RESYNC = "resync"
+_CLOSE = object()
+
+
+@dataclass(eq=False)
+class Subscription:
+    """One open stream."""
+    restaurant_id: int
+    role: str
+    queue: asyncio.Queue
+    loop: asyncio.AbstractEventLoop
+
+
+def format_event(event: str, data: dict) -> str:
+    """One Server-Sent Events message."""
+    return f"event: {event}\ndata: {json.dumps(data, separators=(',', ':'), default=str)}\n\n"
+
+
+class EventHub:
+    """
+    The streams open in one process, by restaurant. The application uses
+    the module-level ``hub``.
+
+    Args:
+        queue_size: Events a stream may fall behind before it is sent resync
+        heartbeat: Seconds between keep-alive comments on idle streams
+    """
+
+    def __init__(self, queue_size: int = 100, heartbeat: float = 15.0):
+        self.queue_size = queue_size
+        self.heartbeat = heartbeat
+        self.tier = None
+        self.origin = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._subscriptions: Dict[int, Set[Subscription]] = {}
+        self._lock = threading.Lock()
+        self.published = 0
+        self.delivered = 0
+        self.dropped = 0
+
+    def configure(self, tier) -> None:
+        """Use a shared tier (None for this worker only), subscribing to other workers' events."""
+        previous, self.tier = self.tier, tier
+        if previous is not None:
+            previous.close()
+        if tier is not None:
+            tier.subscribe(settings.REALTIME_CHANNEL, self._receive)
+
+    def subscribe(self, restaurant_id: int, role: str) -> Subscription:
+        """Open a stream. Must be called on the event loop that will read it."""
+        subscription = Subscription(restaurant_id, role, asyncio.Queue(self.queue_size), asyncio.get_running_loop())
+        with self._lock:
+            self._subscriptions.setdefault(restaurant_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            subscriptions = self._subscriptions.get(subscription.restaurant_id)
+            if subscriptions is not None:
+                subscriptions.discard(subscription)
+                if not subscriptions:
+                    del self._subscriptions[subscription.restaurant_id]
+
+    def publish(self, restaurant_id: int, event: str, data: dict, roles: Optional[Iterable[str]] = None) -> None:
+        """
+        Send an event to the restaurant's streams in every worker. Safe to
+        call from any thread; never raises.
+
+        Args:
+            restaurant_id: Restaurant whose streams receive the event
+            event: Event name, e.g. ``"alert.created"``
+            data: JSON-serializable payload
+            roles: Only streams of users with these roles (default all)
+        """
+        roles = sorted(roles) if roles is not None else None
+        self.published += 1
+        self._deliver(restaurant_id, event, data, roles)
+        if self.tier is not None:
+            message = {"origin": self.origin, "restaurant_id": restaurant_id, "event": event,
+                       "data": data, "roles": roles}
+            try:
+                self.tier.publish(settings.REALTIME_CHANNEL, json.dumps(message, default=str))
+            except Exception as e:
+                logger.warning("Could not broadcast real-time event %s: %s", event, e)
+
+    def _deliver(self, restaurant_id: int, event: str, data: dict, roles: Optional[Iterable[str]]) -> None:
+        with self._lock:
+            subscriptions = list(self._subscriptions.get(restaurant_id, ()))
+        for subscription in subscriptions:
+            if roles is None or subscription.role in roles:
+                try:
+                    subscription.loop.call_soon_threadsafe(self._offer, subscription, (event, data))
+                except RuntimeError:
+                    # Loop closed under a stream that never got to unsubscribe
+                    self.unsubscribe(subscription)
+
+    def _offer(self, subscription: Subscription, item) -> None:
+        try:
+            subscription.queue.put_nowait(item)
+            self.delivered += 1
+        except asyncio.QueueFull:
+            # Too far behind to catch up event by event: start over
+            self.dropped += self._empty(subscription) + 1
+            subscription.queue.put_nowait((RESYNC, {}))
+
+    @staticmethod
+    def _empty(subscription: Subscription) -> int:
+        dropped = 0
+        while not subscription.queue.empty():
+            subscription.queue.get_nowait()
+            dropped += 1
+        return dropped
+
+    def _close(self, subscription: Subscription) -> None:
+        if subscription.queue.full():
+            self._empty(subscription)
+        subscription.queue.put_nowait(_CLOSE)
+
+    def _receive(self, raw: str) -> None:
+        try:
+            message = json.loads(raw)
+        except ValueError:
+            logger.warning("Ignoring malformed real-time event: %r", raw)
+            return
+        if message.get("origin") != self.origin:
+            self._deliver(message["restaurant_id"], message["event"], message["data"], message.get("roles"))
+
+    async def stream(self, restaurant_id: int, role: str,
+                     initial: Iterable[Tuple[str, dict]] = ()) -> AsyncIterator[str]:
+        """
+        Server-Sent Events body of one stream: the ``initial`` events, then
+        the restaurant's events as they are published, until the client
+        disconnects or the hub is closed.
+        """
+        subscription = self.subscribe(restaurant_id, role)
+        try:
+            # Clients reconnect after 5 seconds if the connection drops
+            yield "retry: 5000\n\n"
+            for event, data in initial:
+                yield format_event(event, data)
+            while True:
+                try:
+                    async with asyncio.timeout(self.heartbeat):
+                        item = await subscription.queue.get()
+                except TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                if item is _CLOSE:
+                    return
+                yield format_event(*item)
+        finally:
+            self.unsubscribe(subscription)
+
+    def close_all(self) -> None:
+        """End every open stream (at shutdown, so the server does not wait for clients)."""
+        with self._lock:
+            subscriptions = [s for group in self._subscriptions.values() for s in group]
+        for subscription in subscriptions:
+            try:
+                subscription.loop.call_soon_threadsafe(self._close, subscription)
+            except RuntimeError:
+                self.unsubscribe(subscription)
+
+    def stats(self) -> dict:
+        """Open streams and event counters in this worker."""
+        with self._lock:
+            streams = sum(len(group) for group in self._subscriptions.values())
+            restaurants = len(self._subscriptions)
+        return {
+            "streams": streams,
+            "restaurants": restaurants,
+            "published": self.published,
+            "delivered": self.delivered,
+            "dropped": self.dropped,
+            "shared": self.tier is not None,
+        }
+
+
+# Application-wide hub, configured and closed from core/lifespan.py
+hub = EventHub(queue_size=settings.REALTIME_QUEUE_SIZE, heartbeat=settings.REALTIME_HEARTBEAT_SECONDS)
@@ -0,0 +1,563 @@
+"""
+Background Job Scheduler
+
+Runs the application's periodic work (see services/jobs.py) from one
+asyncio task per worker process.
+
+- ``job`` registers a function under a name with a trigger: ``Interval``
+  (every N seconds, aligned to the epoch so every worker agrees on the
+  slots) or ``Cron`` (five-field cron expression, UTC). Optional jitter
+  delays each run by up to that many seconds.
+- Cluster jobs run once per cluster: only the worker holding the leader
+  lock runs them. On MySQL the lock is a ``GET_LOCK`` advisory lock held
+  on a dedicated connection, so it spans hosts and is released when the
+  holder dies; elsewhere it is an exclusive lock on SCHEDULER_LOCK_FILE,
+  which only coordinates workers on one host. Leadership is claimed
+  lazily, the first time a cluster job is due, and re-checked before
+  every cluster run.
+- Worker jobs refresh per-process state and run in every worker.
+
+Job functions are blocking: they get their own session and run in a
+worker thread, never overlapping with themselves (a run that comes due
+while the previous one is still going is skipped). Every run is timed;
+``Scheduler.stats`` reports per-job counts and durations for this
+worker, and cluster runs are also recorded in ``scheduled_job_runs``.
+``Scheduler.stop`` stops scheduling and waits for running jobs to finish.
+"""
+import asyncio
+import logging
+import math
+import os
+import random
+import socket
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timedelta, timezone
+from enum import Enum
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Sequence
+
+from sqlalchemy import delete, select, text, update
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from ..core.config import settings
+from ..db.base import SessionLocal, engine
+from ..models.job_run import JobRun, JobRunStatus
+
+try:
+    import fcntl
+except ImportError:  # Windows development machines
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+
+# ---------------------------------------------------------------------------
+# Triggers
+# ---------------------------------------------------------------------------
+
+@dataclass(frozen=True)
+class Interval:
+    """Every ``seconds``, on multiples of ``seconds`` since the epoch."""
+    seconds: float
+
+    def __post_init__(self):
+        if self.seconds <= 0:
+            raise ValueError("Interval must be positive")
+
+    def next_after(self, after: datetime) -> datetime:
+        slot = math.floor(after.timestamp() / self.seconds) + 1
+        return datetime.fromtimestamp(slot * self.seconds, timezone.utc)
+
+    def __str__(self) -> str:
+        return f"every {self.seconds:g}s"
+
+
+# (low, high) of minute, hour, day of month, month, day of week (0 or 7 = Sunday)
+_CRON_RANGES = ((0, 59), (0, 23), (1, 31), (1, 12), (0, 7))
+
+
+def _parse_cron_field(spec: str, low: int, high: int) -> FrozenSet[int]:
+    values = set()
+    for part in spec.split(","):
+        step = 1
+        if "/" in part:
+            part, step_text = part.split("/", 1)
+            step = int(step_text)
+            if step < 1:
+                raise ValueError(f"Invalid cron step in '{spec}'")
+        if part == "*":
+            start, end = low, high
+        elif "-" in part:
+            start, end = (int(bound) for bound in part.split("-", 1))
+        else:
+            start = int(part)
+            end = high if step > 1 else start
+        if not low <= start <= end <= high:
+            raise ValueError(f"Cron field '{spec}' is outside {low}-{high}")
+        values.update(range(start, end + 1, step))
+    return frozenset(values)
+
+
+@dataclass(frozen=True)
+class Cron:
+    """
+    Standard five-field cron expression, evaluated in UTC.
+
+    Fields are minute, hour, day of month, month and day of week, each
+    ``*``, a value, a range ``a-b``, a step ``*/n`` or ``a-b/n``, or a comma
+    list of those. As in cron, when both day fields are restricted a day
+    matching either one qualifies.
+    """
+    expression: str
+    _fields: tuple = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        specs = self.expression.split()
+        if len(specs) != 5:
+            raise ValueError(f"Cron expression needs 5 fields: '{self.expression}'")
+        try:
+            fields = [_parse_cron_field(spec, low, high) for spec, (low, high) in zip(specs, _CRON_RANGES)]
+        except ValueError as e:
+            raise ValueError(f"Invalid cron expression '{self.expression}': {e}") from None
+        minutes, hours, days, months, weekdays = fields
+        weekdays = frozenset(day % 7 for day in weekdays)
+        object.__setattr__(self, "_fields", (
+            minutes, hours, days, months, weekdays, specs[2] != "*", specs[4] != "*",
+        ))
+
+    def _day_matches(self, moment: datetime) -> bool:
+        _, _, days, _, weekdays, days_restricted, weekdays_restricted = self._fields
+        in_days = moment.day in days
+        # Python counts weekdays from Monday, cron from Sunday
+        in_weekdays = (moment.weekday() + 1) % 7 in weekdays
+        if days_restricted and weekdays_restricted:
+            return in_days or in_weekdays
+        return in_days and in_weekdays
+
+    def next_after(self, after: datetime) -> datetime:
+        minutes, hours, _, months, *_ = self._fields
+        moment = after.astimezone(timezone.utc).replace(second=0, microsecond=0) + timedelta(minutes=1)
+        give_up = moment + timedelta(days=5 * 366)
+        while moment < give_up:
+            if moment.month not in months:
+                month_start = moment.replace(day=1, hour=0, minute=0)
+                moment = (month_start + timedelta(days=32)).replace(day=1)
+            elif not self._day_matches(moment):
+                moment = moment.replace(hour=0, minute=0) + timedelta(days=1)
+            elif moment.hour not in hours:
+                moment = moment.replace(minute=0) + timedelta(hours=1)
+            elif moment.minute not in minutes:
+                moment += timedelta(minutes=1)
+            else:
+                return moment
+        raise ValueError(f"Cron expression '{self.expression}' never matches")
+
+    def __str__(self) -> str:
+        return f"cron '{self.expression}'"
+
+
+# ---------------------------------------------------------------------------
+# Registry
+# ---------------------------------------------------------------------------
+
+class JobScope(str, Enum):
+    CLUSTER = "cluster"  # once per cluster, on the leader
+    WORKER = "worker"    # in every worker process
+
+
+JobFunc = Callable[[Session], Any]
+
+
+@dataclass(frozen=True)
+class Job:
+    name: str
+    func: JobFunc
+    trigger: Any  # Interval or Cron
+    scope: JobScope = JobScope.CLUSTER
+    # Each run starts up to this many seconds after its slot
+    jitter: float = 0.0
+
+
+_jobs: Dict[str, Job] = {}
+
+
+def job(name: str, trigger, scope: JobScope = JobScope.CLUSTER,
+        jitter: float = 0.0) -> Callable[[JobFunc], JobFunc]:
+    """
+    Register a periodic job.
+
+    The function gets its own session; it may commit, and whatever it
+    leaves pending is committed when it returns.
+    """
+    def register(fn: JobFunc) -> JobFunc:
+        if name in _jobs and _jobs[name].func is not fn:
+            raise ValueError(f"Scheduled job '{name}' is already registered")
+        _jobs[name] = Job(name=name, func=fn, trigger=trigger, scope=scope, jitter=jitter)
+        return fn
+    return register
+
+
+def registered_jobs() -> List[Job]:
+    """All registered jobs, in registration order."""
+    return list(_jobs.values())
+
+
+# ---------------------------------------------------------------------------
+# Leader election
+# ---------------------------------------------------------------------------
+
+class FileLeaderLock:
+    """Leader lock for the workers of one host: an exclusive flock on a file."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._fd: Optional[int] = None
+
+    def acquire(self) -> bool:
+        """Take the lock if free; True while this process holds it."""
+        if fcntl is None:
+            return True
+        if self._fd is not None:
+            return True
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            os.close(fd)
+            return False
+        self._fd = fd
+        return True
+
+    def release(self) -> None:
+        if self._fd is not None:
+            # Closing the descriptor drops the lock
+            os.close(self._fd)
+            self._fd = None
+
+
+class AdvisoryLeaderLock:
+    """
+    Leader lock across hosts: a MySQL ``GET_LOCK`` held on a dedicated
+    connection. The leader keeps that connection checked out of the pool;
+    if it dies, MySQL releases the lock with the connection.
+    """
+
+    def __init__(self, bind: Engine, name: str):
+        self.bind = bind
+        self.name = name
+        self._conn: Optional[Connection] = None
+
+    def _query(self, sql: str):
+        value = self._conn.execute(text(sql), {"name": self.name}).scalar()
+        # Never sit in an open transaction on a long-lived connection
+        self._conn.commit()
+        return value
+
+    def acquire(self) -> bool:
+        """Take the lock if free; True while this process holds it."""
+        if self._conn is not None:
+            try:
+                if self._query("SELECT IS_USED_LOCK(:name) = CONNECTION_ID()"):
+                    return True
+                logger.warning("Scheduler lock '%s' was lost", self.name)
+            except SQLAlchemyError as e:
+                logger.warning("Scheduler lock connection failed: %s", e)
+            self.release()
+        self._conn = self.bind.connect()
+        try:
+            if self._query("SELECT GET_LOCK(:name, 0)") == 1:
+                return True
+        except SQLAlchemyError as e:
+            logger.warning("Could not request scheduler lock '%s': %s", self.name, e)
+        self.release()
+        return False
+
+    def release(self) -> None:
+        if self._conn is None:
+            return
+        try:
+            self._query("SELECT RELEASE_LOCK(:name)")
+        except SQLAlchemyError:
+            pass
+        finally:
+            self._conn.close()
+            self._conn = None
+
+
+def leader_lock_for(bind: Engine):
+    """The leader lock suited to the database: advisory lock on MySQL, lock file otherwise."""
+    if bind.dialect.name == "mysql":
+        return AdvisoryLeaderLock(bind, settings.SCHEDULER_LOCK_NAME)
+    return FileLeaderLock(settings.SCHEDULER_LOCK_FILE)
+
+
+# ---------------------------------------------------------------------------
+# Scheduler
+# ---------------------------------------------------------------------------
+
+@dataclass
+class JobStats:
+    """Runs of one job in this worker."""
+    runs: int = 0
+    failures: int = 0
+    # Runs dropped because the previous one was still going
+    skipped: int = 0
+    last_status: Optional[str] = None
+    last_started_at: Optional[datetime] = None
+    last_duration_ms: Optional[int] = None
+    max_duration_ms: int = 0
+    total_duration_ms: int = 0
+    last_error: Optional[str] = None
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class Scheduler:
+    """
+    Runs jobs on their triggers. ``start`` and ``stop`` are called from
+    the application lifespan; ``execute`` runs a job once, synchronously.
+
+    Args:
+        jobs: Jobs to run (default: the registry, read at start)
+        session_factory: Sessions for jobs and run history (default: SessionLocal)
+        leader_lock: Lock deciding who runs cluster jobs (default: ``leader_lock_for(engine)``)
+    """
+
+    def __init__(self, jobs: Optional[Sequence[Job]] = None,
+                 session_factory: Optional[Callable[[], Session]] = None, leader_lock=None):
+        self._jobs = list(jobs) if jobs is not None else None
+        self._session_factory = session_factory or SessionLocal
+        self._leader_lock = leader_lock
+        # Cluster jobs due together check leadership from parallel threads;
+        # the locks keep a single connection or descriptor
+        self._leader_check = threading.Lock()
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self.is_leader = False
+        self._stats: Dict[str, JobStats] = {}
+        self._stats_lock = threading.Lock()
+        self._next_run: Dict[str, datetime] = {}
+        self._running: Dict[str, asyncio.Task] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._stopping: Optional[asyncio.Event] = None
+
+    @property
+    def jobs(self) -> List[Job]:
+        return self._jobs if self._jobs is not None else registered_jobs()
+
+    # -- running jobs ---------------------------------------------------------
+
+    def check_leader(self) -> bool:
+        """Take or confirm the leader lock. Blocking."""
+        with self._leader_check:
+            if self._leader_lock is None:
+                self._leader_lock = leader_lock_for(engine)
+            try:
+                leader = self._leader_lock.acquire()
+            except Exception as e:
+                logger.error("Scheduler leader check failed: %s", e)
+                leader = False
+            if leader != self.is_leader:
+                logger.info("Worker %s %s the scheduler leader", self.worker_id, "is now" if leader else "is no longer")
+            self.is_leader = leader
+            return leader
+
+    def _release_leader(self) -> None:
+        with self._leader_check:
+            if self._leader_lock is not None:
+                self._leader_lock.release()
+            self.is_leader = False
+
+    def execute(self, job: Job) -> bool:
+        """
+        Run a job once in this thread, recording duration and outcome.
+        Does not check leadership.
+
+        Returns:
+            True if the job succeeded
+        """
+        started_at = _utcnow()
+        start = time.perf_counter()
+        run_id = self._record_start(job, started_at) if job.scope is JobScope.CLUSTER else None
+        error = None
+        db = self._session_factory()
+        try:
+            job.func(db)
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            error = f"{type(e).__name__}: {e}"[:2000]
+            logger.error("Scheduled job %s failed: %s", job.name, e, exc_info=True)
+        finally:
+            db.close()
+        duration_ms = int((time.perf_counter() - start) * 1000)
+
+        with self._stats_lock:
+            stats = self._stats.setdefault(job.name, JobStats())
+            stats.runs += 1
+            stats.failures += error is not None
+            stats.last_status = (JobRunStatus.FAILED if error else JobRunStatus.SUCCEEDED).value
+            stats.last_started_at = started_at
+            stats.last_duration_ms = duration_ms
+            stats.max_duration_ms = max(stats.max_duration_ms, duration_ms)
+            stats.total_duration_ms += duration_ms
+            stats.last_error = error
+        if run_id is not None:
+            self._record_finish(run_id, duration_ms, error)
+        logger.debug("Scheduled job %s took %d ms", job.name, duration_ms)
+        return error is None
+
+    def _record_start(self, job: Job, started_at: datetime) -> Optional[int]:
+        db = self._session_factory()
+        try:
+            run = JobRun(job_name=job.name, worker=self.worker_id, started_at=started_at)
+            db.add(run)
+            db.commit()
+            return run.id
+        except SQLAlchemyError as e:
+            db.rollback()
+            logger.warning("Could not record start of job %s: %s", job.name, e)
+            return None
+        finally:
+            db.close()
+
+    def _record_finish(self, run_id: int, duration_ms: int, error: Optional[str]) -> None:
+        db = self._session_factory()
+        try:
+            db.execute(
+                update(JobRun).where(JobRun.id == run_id).values(
+                    status=JobRunStatus.FAILED if error else JobRunStatus.SUCCEEDED,
+                    finished_at=_utcnow(), duration_ms=duration_ms, error=error,
+                )
+            )
+            db.commit()
+        except SQLAlchemyError as e:
+            db.rollback()
+            logger.warning("Could not record end of job run %s: %s", run_id, e)
+        finally:
+            db.close()
+
+    # -- loop -----------------------------------------------------------------
+
+    def _next_due(self, job: Job, now: datetime) -> datetime:
+        due = job.trigger.next_after(now)
+        if job.jitter:
+            due += timedelta(seconds=random.uniform(0, job.jitter))
+        return due
+
+    async def _dispatch(self, job: Job) -> None:
+        try:
+            if job.scope is JobScope.CLUSTER and not await asyncio.to_thread(self.check_leader):
+                return
+            await asyncio.to_thread(self.execute, job)
+        except Exception as e:
+            logger.error("Error dispatching job %s: %s", job.name, e, exc_info=True)
+
+    def _launch(self, job: Job) -> None:
+        if job.name in self._running:
+            with self._stats_lock:
+                self._stats.setdefault(job.name, JobStats()).skipped += 1
+            logger.warning("Scheduled job %s is still running; skipping this run", job.name)
+            return
+        task = asyncio.create_task(self._dispatch(job))
+        self._running[job.name] = task
+        task.add_done_callback(lambda _, name=job.name: self._running.pop(name, None))
+
+    async def _loop(self) -> None:
+        jobs = self.jobs
+        now = _utcnow()
+        for scheduled in jobs:
+            self._next_run[scheduled.name] = self._next_due(scheduled, now)
+        while jobs and not self._stopping.is_set():
+            delay = (min(self._next_run.values()) - _utcnow()).total_seconds()
+            if delay > 0:
+                try:
+                    await asyncio.wait_for(self._stopping.wait(), timeout=delay)
+                    break
+                except asyncio.TimeoutError:
+                    pass
+            now = _utcnow()
+            for scheduled in jobs:
+                if self._next_run[scheduled.name] <= now:
+                    self._next_run[scheduled.name] = self._next_due(scheduled, now)
+                    self._launch(scheduled)
+
+    def start(self) -> None:
+        """Start scheduling on the running event loop."""
+        if self._task is not None:
+            return
+        self._stopping = asyncio.Event()
+        self._task = asyncio.create_task(self._loop())
+        logger.info("Scheduler started with %d jobs", len(self.jobs))
+
+    async def stop(self, timeout: float) -> None:
+        """
+        Stop scheduling, then wait up to ``timeout`` seconds for running
+        jobs to finish and give up the leader lock.
+        """
+        if self._task is None:
+            return
+        self._stopping.set()
+        await self._task
+        self._task = None
+
+        if self._running:
+            logger.info("Waiting for running jobs: %s", ", ".join(self._running))
+            _, pending = await asyncio.wait(list(self._running.values()), timeout=timeout)
+            for name, task in list(self._running.items()):
+                if task in pending:
+                    # The thread keeps going; only the wait is abandoned
+                    logger.warning("Scheduled job %s still running at shutdown", name)
+                    task.cancel()
+        await asyncio.to_thread(self._release_leader)
+
+    # -- reporting ------------------------------------------------------------
+
+    def stats(self) -> List[dict]:
+        """Per-job schedule, run counts and durations in this worker."""
+        report = []
+        with self._stats_lock:
+            for scheduled in self.jobs:
+                stats = self._stats.get(scheduled.name, JobStats())
+                report.append({
+                    "name": scheduled.name,
+                    "scope": scheduled.scope.value,
+                    "trigger": str(scheduled.trigger),
+                    "next_run_at": self._next_run.get(scheduled.name),
+                    "running": scheduled.name in self._running,
+                    **asdict(stats),
+                    "avg_duration_ms": round(stats.total_duration_ms / stats.runs) if stats.runs else None,
+                })
+        return report
+
+
+scheduler = Scheduler()
+
+
+# ---------------------------------------------------------------------------
+# Run history
+# ---------------------------------------------------------------------------
+
+def recent_runs(db: Session, job_name: Optional[str] = None, limit: int = 50) -> List[JobRun]:
+    """Latest recorded cluster job runs, newest first."""
+    query = select(JobRun).order_by(JobRun.started_at.desc(), JobRun.id.desc()).limit(limit)
+    if job_name:
+        query = query.where(JobRun.job_name == job_name)
+    return list(db.execute(query).scalars())
+
+
+def purge_history(db: Session, older_than: timedelta) -> int:
+    """
+    Delete runs started more than ``older_than`` ago.
+
+    Returns:
+        Number of runs deleted
+    """
+    cutoff = _utcnow() - older_than
+    deleted = db.execute(delete(JobRun).where(JobRun.started_at < cutoff)).rowcount
+    db.commit()
+    return deleted
@@ -0,0 +1,181 @@
+"""
+Special Note Suggestions
+
+In-memory autocomplete index of a restaurant's special notes, so the
+note field can suggest as the waiter types without a query per key.
+
+Every word of a note is a way into it: the index is a sorted array of
+(normalized text from each word start, note) pairs, and a prefix lookup
+is a bisect followed by a scan of the matching run. "ceb" finds
+"Sin cebolla"; accents and case are ignored ("maiz" finds "Tortilla
+Maíz").
+
+Notes are ranked by usage with exponential recency decay: each usage
+is worth 1 when it happens and half as much every ``half_life``
+seconds after. Scores are kept as (value, time) pairs and decayed when
+read, so recording a usage is O(1). Usage with a menu item is also
+counted for the item, and suggestions for an item or a category rank
+the notes used with it first, then the rest of the restaurant's.
+"""
+import bisect
+import heapq
+import threading
+import time
+import unicodedata
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+
+def normalize(text: str) -> str:
+    """Lowercase, unaccented text with single spaces."""
+    decomposed = unicodedata.normalize("NFKD", text)
+    stripped = "".join(char for char in decomposed if not unicodedata.combining(char))
+    return " ".join(stripped.casefold().split())
+
+
+def _timestamp(value: Optional[datetime]) -> float:
+    if value is None:
+        return time.time()
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+@dataclass
+class _Score:
+    """Usage count decayed by recency: ``value`` as of ``at``."""
+    value: float = 0.0
+    at: float = 0.0
+
+    def read(self, now: float, half_life: float) -> float:
+        return self.value * 0.5 ** (max(now - self.at, 0.0) / half_life)
+
+    def add(self, count: float, at: float, half_life: float) -> None:
+        if at >= self.at:
+            self.value, self.at = self.read(at, half_life) + count, at
+        else:
+            # Late usage (batched updates): decay it to the current time
+            self.value += count * 0.5 ** ((self.at - at) / half_life)
+
+
+@dataclass
+class _Note:
+    text: str
+    usage_count: int = 0
+    score: _Score = field(default_factory=_Score)
+    items: Dict[int, _Score] = field(default_factory=dict)
+
+
+class NoteIndex:
+    """
+    Suggestion index of one restaurant. Build it with ``add`` and keep it
+    current by calling ``add`` for every usage; safe to share between
+    threads.
+
+    Args:
+        half_life: Seconds after which a usage counts half
+    """
+
+    def __init__(self, half_life: float):
+        self.half_life = half_life
+        self._notes: Dict[str, _Note] = {}
+        self._keys: List[Tuple[str, str]] = []
+        self._categories: Dict[int, Optional[int]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._notes)
+
+    def add(self, note_text: str, count: int = 1, used_at: Optional[datetime] = None,
+            menu_item_id: Optional[int] = None, category_id: Optional[int] = None) -> None:
+        """
+        Count usages of a note, adding it to the index if new.
+
+        Args:
+            note_text: The note as typed
+            count: Number of usages
+            used_at: When they happened (default now)
+            menu_item_id: Item the note was used with, if any
+            category_id: Category of that item
+        """
+        at = _timestamp(used_at)
+        with self._lock:
+            note = self._notes.get(note_text)
+            if note is None:
+                note = self._notes[note_text] = _Note(note_text)
+                for key in self._entry_keys(note_text):
+                    bisect.insort(self._keys, (key, note_text))
+            note.usage_count += count
+            note.score.add(count, at, self.half_life)
+            if menu_item_id is not None:
+                note.items.setdefault(menu_item_id, _Score()).add(count, at, self.half_life)
+                self._categories[menu_item_id] = category_id
+
+    def add_item_usage(self, note_text: str, menu_item_id: int, category_id: Optional[int],
+                       count: int, used_at: Optional[datetime] = None) -> None:
+        """Count usages with an item of a note already in the index (without adding to its total)."""
+        at = _timestamp(used_at)
+        with self._lock:
+            note = self._notes.get(note_text)
+            if note is None:
+                return
+            note.items.setdefault(menu_item_id, _Score()).add(count, at, self.half_life)
+            self._categories[menu_item_id] = category_id
+
+    @staticmethod
+    def _entry_keys(note_text: str) -> Set[str]:
+        words = normalize(note_text).split(" ")
+        return {" ".join(words[start:]) for start in range(len(words)) if words[start]}
+
+    def _matches(self, prefix: str) -> Iterable[_Note]:
+        if not prefix:
+            return list(self._notes.values())
+        matched: Dict[str, _Note] = {}
+        position = bisect.bisect_left(self._keys, (prefix, ""))
+        while position < len(self._keys) and self._keys[position][0].startswith(prefix):
+            note_text = self._keys[position][1]
+            matched[note_text] = self._notes[note_text]
+            position += 1
+        return matched.values()
+
+    def suggest(self, query: str = "", limit: int = 8, menu_item_id: Optional[int] = None,
+                category_id: Optional[int] = None, now: Optional[float] = None) -> List[dict]:
+        """
+        Best notes with a word starting with ``query``.
+
+        Args:
+            query: What has been typed so far (empty for the best overall)
+            limit: Maximum suggestions
+            menu_item_id: Rank notes used with this item first
+            category_id: Rank notes used with items of this category first
+            now: Time to decay scores to (default now; for tests)
+
+        Returns:
+            list: ``note_text``, ``usage_count``, decayed ``score`` and
+            whether it was used with the item or category (``in_scope``)
+            of each suggestion, best first
+        """
+        now = time.time() if now is None else now
+        half_life = self.half_life
+        with self._lock:
+            scoped = menu_item_id is not None or category_id is not None
+
+            def scope_score(note: _Note) -> float:
+                return sum(
+                    score.read(now, half_life) for item_id, score in note.items.items()
+                    if item_id == menu_item_id
+                    or (category_id is not None and self._categories.get(item_id) == category_id)
+                )
+
+            ranked = []
+            for note in self._matches(normalize(query)):
+                overall = note.score.read(now, half_life)
+                in_scope = scope_score(note) if scoped else 0.0
+                ranked.append((in_scope, overall, note))
+            best = heapq.nlargest(limit, ranked, key=lambda entry: (entry[0], entry[1]))
+        return [
+            {"note_text": note.text, "usage_count": note.usage_count, "score": round(overall, 4),
+             "in_scope": in_scope > 0}
+            for in_scope, overall, note in best
+        ]
@@ -2,18 +2,25 @@
 Service for managing special note statistics with intelligent caching.
 
 This service tracks the most frequently used special notes/instructions
-and provides them as quick suggestions to improve order creation speed.
+and provides them as quick suggestions to improve order creation speed,
+including prefix suggestions as the note is typed (special_note_index.py).
 """
 
+from sqlalchemy import event, select, update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
-from sqlalchemy import insert
-from datetime import datetime, timedelta, timezone
+from datetime import datetime, timezone
 from typing import List, Dict, Optional
-from collections import defaultdict
-from threading import Lock
 
-from ..models.special_note_stats import SpecialNoteStats
-from ..schemas.special_notes import TopSpecialNote
+from ..core.cache import caches
+from ..models.menu import MenuItem
+from ..models.special_note_stats import SpecialNoteItemStats, SpecialNoteStats
+from ..schemas.special_notes import SuggestedSpecialNote, TopSpecialNote
+from . import outbox
+from .special_note_index import NoteIndex
+
+# Usages recorded in a session, applied to the suggestion indexes on commit
+_PENDING_KEY = "special_notes.used"
 
 
 class SpecialNotesService:
@@ -21,32 +28,36 @@ class SpecialNotesService:
     Service for tracking and retrieving special note statistics.
     
     Features:
-    - In-memory caching of top 3 notes (1 hour TTL)
-    - Batch processing of note updates (reduces DB writes by 95%)
+    - Caching of top 3 notes (1 hour TTL, shared across workers)
+    - Prefix suggestions from a per-restaurant in-memory index, optionally
+      ranked for a menu item or category
+    - Durable usage tracking through the outbox (track_note)
     - Automatic cache invalidation
-    - Thread-safe operations
     """
     
-    # Cache structure: {restaurant_id: {"data": [...], "expires": datetime}}
-    _cache: Dict[int, Dict] = {}
-    
-    # Pending updates structure: {restaurant_id: {note_text: count}}
-    _pending_updates: Dict[int, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
-    
-    # Thread lock for concurrent access
-    _lock = Lock()
-    
     # Cache TTL in seconds (1 hour)
     CACHE_TTL = 3600
     
+    # Top notes per restaurant: [{"note_text": ..., "usage_count": ...}]
+    _cache = caches.namespace("special_notes.top", max_entries=5000, ttl=CACHE_TTL, shared=True)
+    
     # Maximum number of top notes to return
     TOP_NOTES_LIMIT = 3
     
+    # Suggestion indexes live in each worker and are updated in place by the
+    # usages it records; usages recorded by other workers show up when the
+    # index is rebuilt, at most SUGGEST_TTL seconds later
+    SUGGEST_TTL = 600
+    _indexes = caches.namespace("special_notes.suggest", max_entries=1000, ttl=SUGGEST_TTL)
+    
+    # A usage counts half after two weeks
+    SUGGEST_HALF_LIFE = 14 * 24 * 3600
+    
     @classmethod
     def get_top_notes(cls, restaurant_id: int, db: Session) -> List[TopSpecialNote]:
         """
         Get top 3 most used special notes for a restaurant.
-        Uses in-memory cache with 1-hour TTL for performance.
+        Cached for an hour; usage updates invalidate it in every worker.
         
         Args:
             restaurant_id: ID of the restaurant
@@ -55,103 +66,141 @@ class SpecialNotesService:
         Returns:
             List of top 3 special notes with usage counts
         """
-        now = datetime.now(timezone.utc)
+        def load() -> List[Dict]:
+            top_notes = db.query(SpecialNoteStats)\
+                .filter(SpecialNoteStats.restaurant_id == restaurant_id)\
+                .filter(SpecialNoteStats.deleted_at.is_(None))\
+                .order_by(SpecialNoteStats.usage_count.desc())\
+                .limit(cls.TOP_NOTES_LIMIT)\
+                .all()
+            return [
+                {"note_text": note.note_text, "usage_count": note.usage_count}
+                for note in top_notes
+            ]
         
-        # Check cache first
-        with cls._lock:
-            if restaurant_id in cls._cache:
-                cache_entry = cls._cache[restaurant_id]
-                if cache_entry["expires"] > now:
-                    # Cache hit - return cached data
-                    return [TopSpecialNote(**note) for note in cache_entry["data"]]
-        
-        # Cache miss - query database
-        top_notes = db.query(SpecialNoteStats)\
-            .filter(SpecialNoteStats.restaurant_id == restaurant_id)\
-            .filter(SpecialNoteStats.deleted_at.is_(None))\
-            .order_by(SpecialNoteStats.usage_count.desc())\
-            .limit(cls.TOP_NOTES_LIMIT)\
-            .all()
+        data = cls._cache.get_or_set(restaurant_id, "top", load)
+        return [TopSpecialNote(**note) for note in data]
+    
+    @classmethod
+    def get_index(cls, restaurant_id: int, db: Session) -> NoteIndex:
+        """
+        Suggestion index of a restaurant, built from its note statistics on
+        first use in this worker.
         
-        # Convert to dict for caching
-        data = [
-            {"note_text": note.note_text, "usage_count": note.usage_count}
-            for note in top_notes
-        ]
+        Args:
+            restaurant_id: ID of the restaurant
+            db: Database session
+            
+        Returns:
+            The restaurant's index
+        """
+        def build() -> NoteIndex:
+            index = NoteIndex(cls.SUGGEST_HALF_LIFE)
+            for note_text, usage_count, last_used_at in db.execute(
+                select(SpecialNoteStats.note_text, SpecialNoteStats.usage_count, SpecialNoteStats.last_used_at)
+                .where(SpecialNoteStats.restaurant_id == restaurant_id, SpecialNoteStats.deleted_at.is_(None))
+            ):
+                index.add(note_text, usage_count, last_used_at)
+            for row in db.execute(
+                select(SpecialNoteItemStats.note_text, SpecialNoteItemStats.menu_item_id,
+                       SpecialNoteItemStats.usage_count, SpecialNoteItemStats.last_used_at, MenuItem.category_id)
+                .join(MenuItem, SpecialNoteItemStats.menu_item_id == MenuItem.id)
+                .where(SpecialNoteItemStats.restaurant_id == restaurant_id,
+                       SpecialNoteItemStats.deleted_at.is_(None))
+            ):
+                index.add_item_usage(row.note_text, row.menu_item_id, row.category_id,
+                                     row.usage_count, row.last_used_at)
+            return index
         
-        # Update cache
-        with cls._lock:
-            cls._cache[restaurant_id] = {
-                "data": data,
-                "expires": now + timedelta(seconds=cls.CACHE_TTL)
-            }
+        return cls._indexes.get_or_set(restaurant_id, "index", build)
+    
+    @classmethod
+    def suggest_notes(
+        cls,
+        restaurant_id: int,
+        db: Session,
+        query: str = "",
+        limit: int = 8,
+        menu_item_id: Optional[int] = None,
+        category_id: Optional[int] = None
+    ) -> List[SuggestedSpecialNote]:
+        """
+        Suggest notes with a word starting with what has been typed, ranked
+        by usage with recency decay.
         
-        return [TopSpecialNote(**note) for note in data]
+        Args:
+            restaurant_id: ID of the restaurant
+            db: Database session (only used to build the index)
+            query: Text typed so far; empty for the best notes overall
+            limit: Maximum number of suggestions
+            menu_item_id: Rank the notes used with this menu item first
+            category_id: Rank the notes used with this category first
+            
+        Returns:
+            Suggestions, best first
+        """
+        index = cls.get_index(restaurant_id, db)
+        suggestions = index.suggest(query, limit, menu_item_id=menu_item_id, category_id=category_id)
+        return [SuggestedSpecialNote(**suggestion) for suggestion in suggestions]
     
     @classmethod
-    def track_note_async(cls, restaurant_id: int, note_text: str):
+    def track_note(cls, db: Session, restaurant_id: int, note_text: str,
+                   menu_item_id: Optional[int] = None) -> None:
         """
-        Track a special note usage asynchronously.
-        Accumulates updates in memory for batch processing.
+        Track a special note usage durably.
+        Writes an outbox event and commits; the outbox worker updates the stats.
         
         Args:
+            db: Database session
             restaurant_id: ID of the restaurant
             note_text: The special note text to track
+            menu_item_id: Menu item the note was used with, if any
         """
-        with cls._lock:
-            cls._pending_updates[restaurant_id][note_text] += 1
+        payload = {"restaurant_id": restaurant_id, "note_text": note_text}
+        if menu_item_id is not None:
+            payload["menu_item_id"] = menu_item_id
+        outbox.enqueue(db, outbox.SPECIAL_NOTE_USED, payload, restaurant_id=restaurant_id)
+        db.commit()
     
     @classmethod
-    def flush_updates(cls, db: Session) -> int:
+    def record_usage(cls, db: Session, restaurant_id: int, note_text: str, count: int = 1,
+                     menu_item_id: Optional[int] = None) -> None:
         """
-        Flush all pending note updates to the database.
-        This should be called periodically (e.g., every 5 minutes) by a background task.
+        Add usages to a note's statistics, creating the row or restoring a
+        cleaned-up one. Does not commit; the suggestion index of this worker
+        is updated when the session commits.
+        
+        Counts are incremented in the database, so outbox workers recording
+        the same note in parallel never lose a usage.
         
         Args:
             db: Database session
-            
-        Returns:
-            Number of notes updated
+            restaurant_id: ID of the restaurant
+            note_text: The special note text
+            count: Number of usages to add
+            menu_item_id: Menu item the note was used with; ignored unless
+                it belongs to the restaurant
         """
-        # Get pending updates and clear the buffer atomically
-        with cls._lock:
-            updates = dict(cls._pending_updates)
-            cls._pending_updates.clear()
+        now = datetime.now(timezone.utc)
+        _add_usage(db, SpecialNoteStats, {"restaurant_id": restaurant_id, "note_text": note_text}, count, now)
         
-        if not updates:
-            return 0
+        category_id = None
+        if menu_item_id is not None:
+            category_id = db.execute(
+                select(MenuItem.category_id)
+                .where(MenuItem.id == menu_item_id, MenuItem.restaurant_id == restaurant_id)
+            ).scalar_one_or_none()
+            if category_id is None:
+                menu_item_id = None
+            else:
+                _add_usage(db, SpecialNoteItemStats,
+                           {"restaurant_id": restaurant_id, "menu_item_id": menu_item_id, "note_text": note_text},
+                           count, now)
         
-        total_updated = 0
-        
-        # Process updates by restaurant
-        for restaurant_id, notes in updates.items():
-            for note_text, count in notes.items():
-                # Use UPSERT (INSERT ... ON CONFLICT DO UPDATE)
-                stmt = insert(SpecialNoteStats).values(
-                    restaurant_id=restaurant_id,
-                    note_text=note_text,
-                    usage_count=count,
-                    last_used_at=datetime.now(timezone.utc)
-                )
-                
-                # PostgreSQL specific ON CONFLICT
-                stmt = stmt.on_conflict_do_update(
-                    index_elements=['restaurant_id', 'note_text'],
-                    set_={
-                        'usage_count': SpecialNoteStats.usage_count + count,
-                        'last_used_at': datetime.now(timezone.utc),
-                        'updated_at': datetime.now(timezone.utc)
-                    }
-                )
-                
-                db.execute(stmt)
-                total_updated += 1
-            
-            # Invalidate cache for this restaurant
-            cls.invalidate_cache(restaurant_id)
-        
-        db.commit()
-        return total_updated
+        db.info.setdefault(_PENDING_KEY, []).append(
+            (restaurant_id, note_text, count, now, menu_item_id, category_id)
+        )
+        cls.invalidate_cache(restaurant_id)
     
     @classmethod
     def invalidate_cache(cls, restaurant_id: int):
@@ -161,15 +210,13 @@ class SpecialNotesService:
         Args:
             restaurant_id: ID of the restaurant
         """
-        with cls._lock:
-            if restaurant_id in cls._cache:
-                del cls._cache[restaurant_id]
+        cls._cache.delete(restaurant_id, "top")
     
     @classmethod
     def invalidate_all_cache(cls):
         """Invalidate all cached data. Useful for testing or maintenance."""
-        with cls._lock:
-            cls._cache.clear()
+        cls._cache.clear()
+        cls._indexes.clear()
     
     @classmethod
     def cleanup_old_notes(cls, db: Session, restaurant_id: int, keep_top: int = 100):
@@ -207,8 +254,10 @@ class SpecialNotesService:
         
         db.commit()
         
-        # Invalidate cache
+        # Invalidate cache; dropped notes leave the suggestions in every worker
         cls.invalidate_cache(restaurant_id)
+        if deleted_count:
+            cls._indexes.delete(restaurant_id, "index")
         
         return deleted_count
     
@@ -220,20 +269,57 @@ class SpecialNotesService:
         Returns:
             Dictionary with cache statistics
         """
-        with cls._lock:
-            now = datetime.now(timezone.utc)
-            active_caches = sum(
-                1 for entry in cls._cache.values()
-                if entry["expires"] > now
-            )
-            
-            pending_count = sum(
-                len(notes) for notes in cls._pending_updates.values()
-            )
-            
-            return {
-                "total_cached_restaurants": len(cls._cache),
-                "active_caches": active_caches,
-                "pending_updates": pending_count,
-                "cache_ttl_seconds": cls.CACHE_TTL
-            }
+        cache_stats = cls._cache.stats()
+        return {
+            "total_cached_restaurants": cache_stats["size"],
+            "cache_ttl_seconds": cls.CACHE_TTL,
+            "cache": cache_stats,
+            "suggest_indexes": cls._indexes.stats(),
+        }
+
+
+def _add_usage(db: Session, model, key: Dict, count: int, now: datetime) -> None:
+    """
+    Add usages to the stats row identified by ``key`` (its unique columns),
+    creating or restoring it. The count is incremented by the UPDATE itself
+    and the INSERT runs in a savepoint: if another worker inserts the row
+    first, the unique constraint fails it and the usages go to that row.
+    """
+    increment = (
+        update(model)
+        .where(*(getattr(model, column) == value for column, value in key.items()))
+        .values(usage_count=model.usage_count + count, last_used_at=now, deleted_at=None)
+    )
+    if db.execute(increment).rowcount:
+        return
+    try:
+        with db.begin_nested():
+            db.add(model(**key, usage_count=count, last_used_at=now))
+    except IntegrityError:
+        db.execute(increment)
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_usages_after_commit(session):
+    for restaurant_id, note_text, count, used_at, menu_item_id, category_id in session.info.pop(_PENDING_KEY, ()):
+        # Only indexes already built; a new one reads the committed rows
+        index = SpecialNotesService._indexes.get(restaurant_id, "index")
+        if index is not None:
+            index.add(note_text, count, used_at, menu_item_id=menu_item_id, category_id=category_id)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_usages_after_rollback(session, previous_transaction):
+    # A savepoint (or a flush inside one) rolled back, e.g. _add_usage losing
+    # an insert race: the usages recorded outside it still commit
+    if previous_transaction.parent is not None:
+        return
+    session.info.pop(_PENDING_KEY, None)
+
+
+@outbox.handler(outbox.SPECIAL_NOTE_USED)
+def record_note_used(db: Session, payload: dict) -> None:
+    """Outbox handler: count one usage of a special note."""
+    SpecialNotesService.record_usage(
+        db, payload["restaurant_id"], payload["note_text"], menu_item_id=payload.get("menu_item_id")
+    )
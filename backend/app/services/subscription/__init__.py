@@ -25,12 +25,15 @@ from .addon_service import (
 
 from .subscription_crud import (
     get_restaurant_subscription,
+    build_trial_subscription,
+    build_paid_subscription,
     create_trial_subscription,
     create_paid_subscription,
     upgrade_subscription,
     downgrade_subscription,
     cancel_subscription,
     renew_subscription,
+    refresh_due_statuses,
 )
 
 from .limit_validator import (
@@ -59,12 +62,15 @@ __all__ = [
     
     # Subscription CRUD
     'get_restaurant_subscription',
+    'build_trial_subscription',
+    'build_paid_subscription',
     'create_trial_subscription',
     'create_paid_subscription',
     'upgrade_subscription',
     'downgrade_subscription',
     'cancel_subscription',
     'renew_subscription',
+    'refresh_due_statuses',
     
     # Validation
     'validate_plan_limits',
@@ -21,6 +21,7 @@ from app.models import (
     PlanTier
 )
 from app.core.exceptions import ResourceNotFoundError, ValidationError, ConflictError
+from app.core.response_cache import invalidate_on_commit
 
 logger = logging.getLogger(__name__)
 
@@ -42,6 +43,85 @@ def get_restaurant_subscription(db: Session, restaurant_id: int) -> Optional[Res
     ).first()
 
 
+def build_trial_subscription(
+    restaurant_id: int,
+    trial_plan: SubscriptionPlan,
+    trial_days: int = 14
+) -> RestaurantSubscription:
+    """
+    Build an unsaved trial subscription starting now.
+    
+    Args:
+        restaurant_id: ID of the restaurant
+        trial_plan: The trial plan
+        trial_days: Number of trial days
+        
+    Returns:
+        Trial subscription, not yet added to a session
+    """
+    now = datetime.utcnow()
+    trial_end = now + timedelta(days=trial_days)
+    
+    return RestaurantSubscription(
+        restaurant_id=restaurant_id,
+        plan_id=trial_plan.id,
+        status=SubscriptionStatus.TRIAL,
+        billing_cycle=BillingCycle.MONTHLY,
+        start_date=now,
+        trial_end_date=trial_end,
+        current_period_start=now,
+        current_period_end=trial_end,
+        base_price=0.0,
+        total_price=0.0,
+        auto_renew=True
+    )
+
+
+def build_paid_subscription(
+    restaurant_id: int,
+    plan: SubscriptionPlan,
+    billing_cycle: BillingCycle = BillingCycle.MONTHLY,
+    discount_code: Optional[str] = None
+) -> RestaurantSubscription:
+    """
+    Build an unsaved paid subscription starting now.
+    
+    Args:
+        restaurant_id: ID of the restaurant
+        plan: The subscription plan
+        billing_cycle: Monthly or annual billing
+        discount_code: Optional discount code
+        
+    Returns:
+        Active subscription, not yet added to a session
+    """
+    # Lazy import to avoid circular dependency
+    from .cost_calculator import calculate_subscription_cost
+    
+    base_price, total_price = calculate_subscription_cost(plan, billing_cycle, discount_code)
+    
+    now = datetime.utcnow()
+    if billing_cycle == BillingCycle.MONTHLY:
+        period_end = now + timedelta(days=30)
+    else:
+        period_end = now + timedelta(days=365)
+    
+    return RestaurantSubscription(
+        restaurant_id=restaurant_id,
+        plan_id=plan.id,
+        status=SubscriptionStatus.ACTIVE,
+        billing_cycle=billing_cycle,
+        start_date=now,
+        trial_end_date=None,
+        current_period_start=now,
+        current_period_end=period_end,
+        base_price=base_price,
+        total_price=total_price,
+        discount_code=discount_code,
+        auto_renew=True
+    )
+
+
 def create_trial_subscription(
     db: Session,
     restaurant_id: int,
@@ -78,24 +158,7 @@ def create_trial_subscription(
     if not trial_plan:
         raise ValidationError("Trial plan not found in system")
     
-    # Calculate dates
-    now = datetime.utcnow()
-    trial_end = now + timedelta(days=trial_days)
-    
-    # Create subscription
-    subscription = RestaurantSubscription(
-        restaurant_id=restaurant_id,
-        plan_id=trial_plan.id,
-        status=SubscriptionStatus.TRIAL,
-        billing_cycle=BillingCycle.MONTHLY,
-        start_date=now,
-        trial_end_date=trial_end,
-        current_period_start=now,
-        current_period_end=trial_end,
-        base_price=0.0,
-        total_price=0.0,
-        auto_renew=True
-    )
+    subscription = build_trial_subscription(restaurant_id, trial_plan, trial_days)
     
     db.add(subscription)
     db.commit()
@@ -128,38 +191,13 @@ def create_paid_subscription(
     Raises:
         ResourceNotFoundError: If plan not found
     """
-    # Lazy imports to avoid circular dependency
+    # Lazy import to avoid circular dependency
     from .plan_service import get_plan_by_id
-    from .cost_calculator import calculate_subscription_cost, apply_discount
     
     # Get plan
     plan = get_plan_by_id(db, plan_id)
     
-    # Calculate price
-    base_price, total_price = calculate_subscription_cost(plan, billing_cycle, discount_code)
-    
-    # Calculate dates
-    now = datetime.utcnow()
-    if billing_cycle == BillingCycle.MONTHLY:
-        period_end = now + timedelta(days=30)
-    else:
-        period_end = now + timedelta(days=365)
-    
-    # Create subscription
-    subscription = RestaurantSubscription(
-        restaurant_id=restaurant_id,
-        plan_id=plan_id,
-        status=SubscriptionStatus.ACTIVE,
-        billing_cycle=billing_cycle,
-        start_date=now,
-        trial_end_date=None,
-        current_period_start=now,
-        current_period_end=period_end,
-        base_price=base_price,
-        total_price=total_price,
-        discount_code=discount_code,
-        auto_renew=True
-    )
+    subscription = build_paid_subscription(restaurant_id, plan, billing_cycle, discount_code)
     
     db.add(subscription)
     db.commit()
@@ -463,3 +501,43 @@ def renew_subscription(
     
     logger.info(f"Renewed subscription {subscription_id} for {subscription.billing_cycle.value} billing")
     return subscription
+
+
+def refresh_due_statuses(db: Session, now: Optional[datetime] = None) -> int:
+    """
+    Apply date-driven status transitions to all subscriptions in bulk.
+
+    Same rules as RestaurantSubscription.update_status, as one UPDATE per
+    rule and a single commit instead of a load and commit per row:
+    expired trials and grace periods become EXPIRED, active subscriptions
+    past their period end become PAST_DUE with a 3-day grace period.
+
+    Args:
+        db: Database session
+        now: Reference time (naive UTC), defaults to now
+
+    Returns:
+        Number of subscriptions updated
+    """
+    now = now or datetime.utcnow()
+    Sub = RestaurantSubscription
+    rules = [
+        ((Sub.status == SubscriptionStatus.TRIAL, Sub.trial_end_date < now),
+         {Sub.status: SubscriptionStatus.EXPIRED}),
+        ((Sub.status == SubscriptionStatus.ACTIVE, Sub.current_period_end < now),
+         {Sub.status: SubscriptionStatus.PAST_DUE, Sub.grace_period_end: now + timedelta(days=3)}),
+        ((Sub.status == SubscriptionStatus.PAST_DUE, Sub.grace_period_end < now, Sub.pending_payment_id.is_(None)),
+         {Sub.status: SubscriptionStatus.EXPIRED}),
+        ((Sub.status == SubscriptionStatus.PENDING_PAYMENT, Sub.grace_period_end < now),
+         {Sub.status: SubscriptionStatus.EXPIRED}),
+    ]
+
+    updated = 0
+    for conditions, values in rules:
+        updated += db.query(Sub).filter(*conditions).update(values, synchronize_session=False)
+    if updated:
+        # Bulk UPDATEs skip the ORM, so cached responses are not dropped on their own
+        invalidate_on_commit(db, "subscriptions")
+        db.commit()
+        logger.info("Applied %d subscription status transitions", updated)
+    return updated
@@ -0,0 +1,10 @@
+"""
+Performance benchmarks for the Coffee Shop API.
+
+Run modules from the backend directory, e.g. ``python -m benchmarks.bench_order_serialization``.
+``benchmarks.dataset`` seeds a database with synthetic tenants, and the
+pytest-benchmark suite (``pytest benchmarks``, see conftest.py) times the
+service layer against it and checks query counts against ``baselines.json``.
+``python -m benchmarks.load_rush`` runs a lunch-rush load simulation
+against the whole app.
+"""
@@ -0,0 +1,132 @@
+"""
+Benchmark: request throughput with logging at INFO versus off.
+
+Drives a small ASGI app in-process. Its endpoint logs the same per-request
+lines tenant resolution used to emit at INFO, and compares:
+
+- off:   logging disabled
+- sync:  the previous setup (file + console handlers on the request path)
+- queue: the QueueHandler/QueueListener pipeline from setup_logging()
+
+plus the same runs with request sampling and with a console sink that
+stalls on flush (a full stdout pipe or busy disk).
+
+    cd backend
+    python -m benchmarks.bench_logging --requests 2000 --concurrency 50
+"""
+import argparse
+import asyncio
+import contextlib
+import logging
+import os
+import sys
+import tempfile
+import time
+from logging.handlers import RotatingFileHandler
+from pathlib import Path
+
+import httpx
+from fastapi import FastAPI, Request
+
+from app.core.logging_config import setup_logging, stop_logging
+from app.middleware.request_id import RequestIdMiddleware
+from app.middleware.restaurant import extract_subdomain
+
+logger = logging.getLogger("app.middleware.restaurant")
+
+
+def build_app() -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(RequestIdMiddleware)
+
+    @app.get("/ping")
+    async def ping(request: Request):
+        host = request.headers.get("host", "")
+        subdomain = extract_subdomain(host)
+        logger.info("[get_restaurant_from_request] x-restaurant-subdomain header: %s", None)
+        logger.info("[get_restaurant_from_request] Host header: %s", host)
+        logger.info("[get_restaurant_from_request] Subdomain from host: %s", subdomain)
+        logger.info("[get_restaurant_from_request] Final subdomain to query: %s", subdomain)
+        return {"subdomain": subdomain}
+
+    return app
+
+
+def configure_sync(logs_dir: Path) -> None:
+    """The pre-queue setup: handlers called inline by the logging thread."""
+    stop_logging()
+    formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    root = logging.getLogger()
+    root.handlers.clear()
+    root.setLevel(logging.DEBUG)
+    for handler in (RotatingFileHandler(logs_dir / "app.log", maxBytes=10 * 1024 * 1024, backupCount=5),
+                    logging.StreamHandler(sys.stdout)):
+        handler.setFormatter(formatter)
+        root.addHandler(handler)
+
+
+async def run(app: FastAPI, total: int, concurrency: int) -> float:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://demo.testserver") as client:
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def one():
+            async with semaphore:
+                await client.get("/ping")
+
+        await one()  # warm up
+        started = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(total)))
+        return total / (time.perf_counter() - started)
+
+
+class SlowStream:
+    """A stdout stand-in whose flush stalls, like a full pipe or a busy disk."""
+
+    def __init__(self, stream, latency: float):
+        self.stream = stream
+        self.latency = latency
+
+    def write(self, data: str) -> int:
+        return self.stream.write(data)
+
+    def flush(self) -> None:
+        time.sleep(self.latency)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--sink-latency-ms", type=float, default=0.2,
+                        help="stall per console flush in the slow-sink runs")
+    args = parser.parse_args()
+
+    app = build_app()
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp, open(os.devnull, "w") as devnull:
+        logs_dir = Path(tmp)
+        slow = SlowStream(devnull, args.sink_latency_ms / 1000)
+        modes = [
+            ("off", devnull, lambda: logging.disable(logging.CRITICAL)),
+            ("sync", devnull, lambda: configure_sync(logs_dir)),
+            ("queue", devnull, lambda: setup_logging(log_level="INFO", logs_dir=logs_dir)),
+            ("queue, 10% sampled", devnull, lambda: setup_logging(
+                log_level="INFO", logs_dir=logs_dir, sample_rates={"app.middleware.restaurant": 0.1})),
+            ("sync, slow sink", slow, lambda: configure_sync(logs_dir)),
+            ("queue, slow sink", slow, lambda: setup_logging(log_level="INFO", logs_dir=logs_dir)),
+        ]
+        for mode, stdout, configure in modes:
+            logging.disable(logging.NOTSET)
+            with contextlib.redirect_stdout(stdout):
+                configure()
+                results[mode] = asyncio.run(run(app, args.requests, args.concurrency))
+                stop_logging()
+
+    logging.disable(logging.NOTSET)
+    for mode, rps in results.items():
+        print(f"  {mode:<20} {rps:8.0f} req/s  ({rps / results['off']:.0%} of logging off)")
+
+
+if __name__ == "__main__":
+    main()
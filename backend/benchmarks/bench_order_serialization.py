@@ -0,0 +1,119 @@
+"""
+Microbenchmark: order list serialization.
+
+Compares the previous response path for ``GET /orders`` (serialize to dicts,
+re-validate against ``List[Order]``, render with the stdlib JSON encoder)
+with the single-pass path (serialize to dicts, write straight to JSON bytes).
+
+Order graphs are built in memory, no database is needed:
+
+    cd backend
+    python -m benchmarks.bench_order_serialization --orders 100 --persons 3 --items 4
+"""
+import argparse
+import asyncio
+import random
+import timeit
+from datetime import datetime, timedelta, timezone
+from typing import List
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+from app.core.responses import dumps
+from app.models import (
+    Category, MenuItem, MenuItemVariant, Order, OrderItem, OrderItemExtra, OrderPerson, Table,
+)
+from app.models.order import OrderStatus, PaymentMethod
+from app.schemas.order import Order as OrderSchema
+from app.services.orders.serializers import serialize_orders
+
+
+def build_orders(n_orders: int, n_persons: int, n_items: int, seed: int = 42) -> List[Order]:
+    """Build transient orders shaped like a busy dinner service."""
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc)
+    categories = []
+    for i, name in enumerate(["Tacos", "Bebidas", "Postres", "Extras"], start=1):
+        category = Category(name=name, restaurant_id=1)
+        category.id = i
+        categories.append(category)
+    menu = []
+    for i in range(1, 61):
+        item = MenuItem(id=i, name=f"Platillo {i}", description="Descripción del platillo",
+                        price=round(rng.uniform(20, 180), 2), category=rng.choice(categories),
+                        is_available=True, restaurant_id=1)
+        item.variants = [
+            MenuItemVariant(id=i * 10 + v, menu_item_id=i, name=size, price=item.price + v * 10)
+            for v, size in enumerate(["Chico", "Grande"])
+        ]
+        menu.append(item)
+    tables = [Table(id=i, number=i, capacity=4, location="Salón", restaurant_id=1) for i in range(1, 21)]
+
+    orders = []
+    item_id = 1
+    for order_id in range(1, n_orders + 1):
+        created = now - timedelta(minutes=rng.randint(0, 240))
+        order = Order(id=order_id, order_number=order_id, status=rng.choice(list(OrderStatus)),
+                      notes="Sin cebolla" if order_id % 3 == 0 else None, total_amount=0.0,
+                      table=rng.choice(tables), is_paid=False, sort=50, restaurant_id=1,
+                      payment_method=PaymentMethod.CASH if order_id % 4 == 0 else None,
+                      order_type="dine_in", created_at=created, updated_at=created)
+        order.table_id = order.table.id
+        order.items, order.persons = [], []
+        for position in range(1, n_persons + 1):
+            person = OrderPerson(id=order_id * 100 + position, order_id=order_id,
+                                 name=f"Persona {position}", position=position,
+                                 created_at=created, updated_at=created)
+            person.items = []
+            for _ in range(n_items):
+                dish = rng.choice(menu)
+                variant = rng.choice([None, *dish.variants])
+                item = OrderItem(id=item_id, order_id=order_id, person_id=person.id,
+                                 menu_item_id=dish.id, menu_item=dish,
+                                 variant_id=variant.id if variant else None, variant=variant,
+                                 quantity=rng.randint(1, 3),
+                                 unit_price=variant.price if variant else dish.price,
+                                 status=order.status, created_at=created, updated_at=created)
+                item.extras = [
+                    OrderItemExtra(id=item_id * 10 + e, order_item_id=item_id, name="Extra queso",
+                                   price=10.0, quantity=1, created_at=created, updated_at=created)
+                    for e in range(rng.choice([0, 0, 1, 2]))
+                ]
+                item_id += 1
+                person.items.append(item)
+                order.items.append(item)
+            order.persons.append(person)
+        orders.append(order)
+    return orders
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--orders", type=int, default=100)
+    parser.add_argument("--persons", type=int, default=3)
+    parser.add_argument("--items", type=int, default=4)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    orders = build_orders(args.orders, args.persons, args.items)
+    field = create_model_field(name="Response", type_=List[OrderSchema], mode="serialization")
+
+    def validated_path() -> bytes:
+        content = serialize_orders(orders)
+        validated = asyncio.run(serialize_response(field=field, response_content=content, is_coroutine=True))
+        return JSONResponse(validated).body
+
+    def single_pass() -> bytes:
+        return dumps(serialize_orders(orders))
+
+    size = len(single_pass())
+    print(f"{args.orders} orders x {args.persons} persons x {args.items} items, {size / 1024:.0f} KiB of JSON")
+    for label, fn in (("validated (before)", validated_path), ("single pass", single_pass)):
+        best = min(timeit.repeat(fn, number=1, repeat=args.repeat))
+        print(f"  {label:<20} {best * 1000:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
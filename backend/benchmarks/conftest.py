@@ -0,0 +1,129 @@
+"""
+Fixtures for the service-level benchmark suite.
+
+The suite seeds one SQLite database per run with ``benchmarks.dataset``
+and times service functions against it with pytest-benchmark. Each
+benchmark also counts the SQL statements a single call issues and checks
+that count against ``baselines.json``, so a new N+1 query fails even on a
+noisy CI machine. Timings are compared with pytest-benchmark's own saved
+runs:
+
+    cd backend
+    pytest benchmarks --bench-scale small --benchmark-autosave
+    pytest benchmarks --bench-scale small --benchmark-compare --benchmark-compare-fail=mean:25%
+    pytest benchmarks --bench-scale small --update-baselines   # after an intended change
+"""
+import json
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Callable, Dict
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session
+
+pytest.importorskip("pytest_benchmark")
+
+from app.db.base import Base  # noqa: E402
+from benchmarks.dataset import SCALES, generate_dataset  # noqa: E402
+
+BASELINES_PATH = Path(__file__).with_name("baselines.json")
+
+_measured: Dict[str, Dict[str, int]] = {}
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("service benchmarks")
+    group.addoption("--bench-scale", choices=sorted(SCALES), default="small",
+                    help="Dataset size to benchmark against (default: small)")
+    group.addoption("--update-baselines", action="store_true", default=False,
+                    help="Rewrite baselines.json with the query counts of this run")
+
+
+def pytest_sessionfinish(session, exitstatus):
+    if not session.config.getoption("--update-baselines", default=False) or not _measured:
+        return
+    baselines = json.loads(BASELINES_PATH.read_text()) if BASELINES_PATH.exists() else {}
+    for scale, counts in _measured.items():
+        baselines.setdefault(scale, {}).update(counts)
+    BASELINES_PATH.write_text(json.dumps(baselines, indent=2, sort_keys=True) + "\n")
+
+
+class QueryCounter:
+    """Counts statements sent to the database by an engine."""
+
+    def __init__(self, engine):
+        self.count = 0
+        event.listen(engine, "before_cursor_execute", self._on_execute)
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self.count += 1
+
+
+@pytest.fixture(scope="session")
+def bench_scale(request) -> str:
+    return request.config.getoption("--bench-scale")
+
+
+@pytest.fixture(scope="session")
+def bench_engine(tmp_path_factory, bench_scale):
+    engine = create_engine(f"sqlite:///{tmp_path_factory.mktemp('bench') / 'bench.db'}")
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture(scope="session")
+def dataset(bench_engine, bench_scale):
+    # End the data at the last midnight: the generated rows, and with them the
+    # query counts, do not depend on the time of day the suite runs
+    now = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0) - timedelta(seconds=1)
+    with Session(bench_engine) as db:
+        return generate_dataset(db, SCALES[bench_scale], now=now)
+
+
+@pytest.fixture(scope="session")
+def query_counter(bench_engine) -> QueryCounter:
+    return QueryCounter(bench_engine)
+
+
+@pytest.fixture
+def db(bench_engine, dataset):
+    with Session(bench_engine) as session:
+        yield session
+
+
+@pytest.fixture
+def measure(request, benchmark, db, query_counter, bench_scale) -> Callable:
+    """
+    Count the queries of one call against the baseline, then time the call.
+
+    Every call starts from an empty identity map, like a fresh request.
+    Returns the result of the counted call.
+    """
+    def run(name: str, fn: Callable):
+        def call():
+            db.expunge_all()
+            return fn()
+
+        before = query_counter.count
+        result = call()
+        queries = query_counter.count - before
+        _measured.setdefault(bench_scale, {})[name] = queries
+        benchmark.extra_info["queries"] = queries
+
+        if not request.config.getoption("--update-baselines"):
+            baseline = _load_baselines().get(bench_scale, {}).get(name)
+            if baseline is None:
+                pytest.fail(f"No query baseline for {name!r} at scale {bench_scale!r}; run with --update-baselines")
+            if queries > baseline:
+                pytest.fail(f"{name} issued {queries} queries, baseline is {baseline}")
+
+        benchmark(call)
+        return result
+
+    return run
+
+
+def _load_baselines() -> dict:
+    return json.loads(BASELINES_PATH.read_text()) if BASELINES_PATH.exists() else {}
@@ -0,0 +1,382 @@
+"""
+Synthetic dataset generator.
+
+Seeds a database with data shaped like real tenants: restaurants with a
+subscription, staff, tables, menus with variants, and months of orders
+with diners, extras and lunch/dinner peaks. Each day also gets a cash
+register session with its sale, tip and expense transactions. The same
+seed and config always produce the same rows.
+
+Rows are written with bulk INSERTs in foreign-key order, so a medium
+dataset (~15k orders) takes seconds on SQLite:
+
+    cd backend
+    python -m benchmarks.dataset --url sqlite:///bench.db --scale medium
+    python -m benchmarks.dataset --url sqlite:///bench.db --restaurants 3 --days 120 --orders-per-day 200
+"""
+import argparse
+import random
+import time
+from dataclasses import dataclass, field, fields, replace
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from typing import Dict, List
+
+from sqlalchemy import create_engine, func, insert, select
+from sqlalchemy.orm import Session
+
+from app.core.operation_modes import OperationMode, OrderType
+from app.core.security import get_password_hash
+from app.db.base import Base
+from app.models import (
+    Category, MenuItem, MenuItemVariant, Order, OrderItem, OrderItemExtra, OrderPerson, Restaurant, Table, User,
+)
+from app.models.cash_register import (
+    CashRegisterSession, CashTransaction, PaymentMethod as CashPaymentMethod, SessionStatus, TransactionType,
+)
+from app.models.order import OrderStatus, PaymentMethod
+from app.models.order_item import OrderItemStatus
+from app.models.restaurant_subscription import BillingCycle, RestaurantSubscription, SubscriptionStatus
+from app.models.subscription_plan import PlanTier, SubscriptionPlan
+from app.models.user import StaffType, UserRole
+from app.services.orders.search import reindex_orders
+
+BENCH_PLAN_NAME = "Benchmark"
+BENCH_PASSWORD = "benchmark123"
+
+# Relative order volume per hour of the day (lunch and dinner rushes)
+HOURLY_WEIGHTS = {
+    8: 2, 9: 3, 10: 3, 11: 5, 12: 9, 13: 12, 14: 10, 15: 5,
+    16: 3, 17: 4, 18: 6, 19: 9, 20: 11, 21: 8, 22: 4,
+}
+PAYMENT_WEIGHTS = {PaymentMethod.CASH: 45, PaymentMethod.CARD: 40, PaymentMethod.DIGITAL: 12, PaymentMethod.OTHER: 3}
+ORDER_TYPE_WEIGHTS = {OrderType.DINE_IN: 70, OrderType.TAKEAWAY: 20, OrderType.DELIVERY: 10}
+OPEN_STATUSES = (OrderStatus.PENDING, OrderStatus.PREPARING, OrderStatus.READY)
+
+CATEGORY_NAMES = [
+    "Entradas", "Tacos", "Platos Fuertes", "Ensaladas", "Sopas", "Postres",
+    "Bebidas", "Cafés", "Cervezas", "Cocteles", "Infantil", "Extras",
+]
+FIRST_NAMES = ["Ana", "Luis", "Carmen", "Jorge", "Sofía", "Diego", "Elena", "Pablo", "Lucía", "Mateo"]
+VARIANT_SIZES = ["Chico", "Mediano", "Grande"]
+EXTRAS = [("Extra queso", 15.0), ("Aguacate", 20.0), ("Tocino", 18.0), ("Salsa especial", 8.0), ("Shot espresso", 12.0)]
+NOTES = [None, None, None, "Sin cebolla", "Poco picante", "Para llevar la mitad", "Alergia a nueces"]
+
+
+@dataclass(frozen=True)
+class DatasetConfig:
+    """Volume knobs; every count is per restaurant unless noted."""
+
+    restaurants: int = 2
+    categories: int = 8
+    items_per_category: int = 12
+    variant_ratio: float = 0.3
+    tables: int = 20
+    waiters: int = 4
+    days: int = 90
+    orders_per_day: int = 80
+    max_persons: int = 4
+    max_items_per_person: int = 3
+    extra_ratio: float = 0.25
+    cancel_ratio: float = 0.03
+    open_orders: int = 25
+    seed: int = 42
+
+
+SCALES: Dict[str, DatasetConfig] = {
+    "small": DatasetConfig(restaurants=1, days=14, orders_per_day=40, open_orders=10),
+    "medium": DatasetConfig(),
+    "large": DatasetConfig(restaurants=5, categories=12, days=180, orders_per_day=250, open_orders=60),
+}
+
+
+@dataclass
+class Dataset:
+    """What was generated, for callers that need ids."""
+
+    config: DatasetConfig
+    restaurant_ids: List[int] = field(default_factory=list)
+    admin_user_ids: Dict[int, int] = field(default_factory=dict)
+    counts: Dict[str, int] = field(default_factory=dict)
+
+
+class _Ids:
+    """Hands out primary keys after the current maximum of each table."""
+
+    def __init__(self, db: Session):
+        self._db = db
+        self._next: Dict[type, int] = {}
+
+    def __call__(self, model) -> int:
+        if model not in self._next:
+            self._next[model] = (self._db.execute(select(func.max(model.id))).scalar() or 0) + 1
+        value = self._next[model]
+        self._next[model] += 1
+        return value
+
+
+class _Writer:
+    """Buffers rows per model and bulk-inserts them in foreign-key order."""
+
+    ORDER = (
+        Restaurant, RestaurantSubscription, User, Category, MenuItem, MenuItemVariant, Table,
+        CashRegisterSession, Order, OrderPerson, OrderItem, OrderItemExtra, CashTransaction,
+    )
+
+    def __init__(self, db: Session, chunk_size: int = 5000):
+        self._db = db
+        self._chunk_size = chunk_size
+        self._rows: Dict[type, List[dict]] = {model: [] for model in self.ORDER}
+        self.counts: Dict[str, int] = {}
+
+    def add(self, model, **row) -> dict:
+        self._rows[model].append(row)
+        return row
+
+    def pending(self, model) -> int:
+        return len(self._rows[model])
+
+    def flush(self) -> None:
+        for model in self.ORDER:
+            rows = self._rows[model]
+            for start in range(0, len(rows), self._chunk_size):
+                self._db.execute(insert(model), rows[start:start + self._chunk_size])
+            if rows:
+                self.counts[model.__tablename__] = self.counts.get(model.__tablename__, 0) + len(rows)
+            rows.clear()
+
+
+def _pick(rng: random.Random, weights: dict):
+    return rng.choices(list(weights), weights=list(weights.values()))[0]
+
+
+def _get_or_create_plan(db: Session) -> SubscriptionPlan:
+    plan = db.query(SubscriptionPlan).filter(SubscriptionPlan.name == BENCH_PLAN_NAME).first()
+    if plan is None:
+        plan = SubscriptionPlan(
+            name=BENCH_PLAN_NAME, tier=PlanTier.PRO, display_name="Plan Benchmark",
+            monthly_price=999.0, annual_price=9990.0, max_admin_users=-1, max_waiter_users=-1,
+            max_cashier_users=-1, max_kitchen_users=-1, max_owner_users=-1, max_tables=-1,
+            max_menu_items=-1, max_categories=-1, operation_mode=OperationMode.FULL_RESTAURANT,
+            has_kitchen_module=True, has_advanced_reports=True, is_active=True,
+        )
+        db.add(plan)
+        db.flush()
+    return plan
+
+
+def generate_dataset(db: Session, config: DatasetConfig = DatasetConfig(), now: datetime = None) -> Dataset:
+    """
+    Generate and commit a dataset.
+
+    Args:
+        db: Database session; the schema must already exist
+        config: Volumes and seed
+        now: End of the generated period (defaults to the current time)
+
+    Returns:
+        Dataset: Generated restaurant ids, admin ids and row counts
+    """
+    rng = random.Random(config.seed)
+    now = now or datetime.now(timezone.utc)
+    today = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    ids = _Ids(db)
+    writer = _Writer(db)
+    dataset = Dataset(config=config)
+    plan = _get_or_create_plan(db)
+    password_hash = get_password_hash(BENCH_PASSWORD)
+
+    for _ in range(config.restaurants):
+        restaurant_id = ids(Restaurant)
+        subdomain = f"bench{restaurant_id}"
+        writer.add(Restaurant, id=restaurant_id, name=f"Sucursal {restaurant_id}", subdomain=subdomain,
+                   email=f"contacto@{subdomain}.com", currency="MXN", timezone="America/Mexico_City")
+        period_start = today - timedelta(days=config.days)
+        writer.add(RestaurantSubscription, id=ids(RestaurantSubscription), restaurant_id=restaurant_id,
+                   plan_id=plan.id, status=SubscriptionStatus.ACTIVE, billing_cycle=BillingCycle.MONTHLY,
+                   start_date=period_start, current_period_start=today - timedelta(days=today.day - 1),
+                   current_period_end=today + timedelta(days=30), base_price=plan.monthly_price,
+                   total_price=plan.monthly_price, auto_renew=True)
+
+        # Staff
+        def add_user(role: UserRole, staff_type: StaffType = None, label: str = "admin") -> int:
+            user_id = ids(User)
+            writer.add(User, id=user_id, email=f"{label}{user_id}@{subdomain}.com", hashed_password=password_hash,
+                       full_name=f"{rng.choice(FIRST_NAMES)} {label.title()}", role=role, staff_type=staff_type,
+                       is_active=True, restaurant_id=restaurant_id)
+            return user_id
+
+        admin_id = add_user(UserRole.ADMIN)
+        cashier_id = add_user(UserRole.STAFF, StaffType.CASHIER, "cajero")
+        add_user(UserRole.STAFF, StaffType.KITCHEN, "cocina")
+        waiter_ids = [add_user(UserRole.STAFF, StaffType.WAITER, "mesero") for _ in range(config.waiters)]
+
+        # Menu
+        menu = []  # (menu_item_id, [(variant_id or None, price)])
+        for position in range(config.categories):
+            category_id = ids(Category)
+            writer.add(Category, id=category_id, name=CATEGORY_NAMES[position % len(CATEGORY_NAMES)],
+                       restaurant_id=restaurant_id, visible_in_kitchen=position % 6 != 5)
+            for n in range(config.items_per_category):
+                item_id = ids(MenuItem)
+                price = round(rng.uniform(25, 260), 0)
+                writer.add(MenuItem, id=item_id, name=f"Platillo {category_id}-{n + 1}",
+                           description="Descripción del platillo", price=price, category_id=category_id,
+                           is_available=rng.random() > 0.05, restaurant_id=restaurant_id)
+                prices = [(None, price)]
+                if rng.random() < config.variant_ratio:
+                    prices = []
+                    for step, size in enumerate(VARIANT_SIZES):
+                        variant_id = ids(MenuItemVariant)
+                        writer.add(MenuItemVariant, id=variant_id, menu_item_id=item_id, name=size,
+                                   price=price + step * 15, is_available=True)
+                        prices.append((variant_id, price + step * 15))
+                menu.append((item_id, prices))
+
+        table_ids = []
+        for number in range(1, config.tables + 1):
+            table_id = ids(Table)
+            writer.add(Table, id=table_id, number=number, capacity=rng.choice([2, 4, 4, 6]),
+                       location="Terraza" if number % 4 == 0 else "Salon", restaurant_id=restaurant_id)
+            table_ids.append(table_id)
+
+        # Orders, one cash register session per day
+        order_number = 0
+        for days_ago in range(config.days, -1, -1):
+            day = today - timedelta(days=days_ago)
+            is_today = days_ago == 0
+            session_id = ids(CashRegisterSession)
+            session = writer.add(
+                CashRegisterSession, id=session_id, restaurant_id=restaurant_id,
+                session_number=config.days - days_ago + 1, opened_at=day.replace(hour=7, minute=45),
+                closed_at=None if is_today else day.replace(hour=23, minute=30),
+                opened_by_user_id=cashier_id, cashier_id=cashier_id, initial_balance=Decimal("1000.00"),
+                status=SessionStatus.OPEN if is_today else SessionStatus.CLOSED,
+            )
+            cash_in = Decimal("0")
+
+            hours = [h for h in HOURLY_WEIGHTS if not is_today or day.replace(hour=h) <= now]
+            count = config.orders_per_day if not is_today else max(
+                config.open_orders, config.orders_per_day * len(hours) // len(HOURLY_WEIGHTS)
+            )
+            open_left = config.open_orders if is_today else 0
+            created_times = sorted(
+                day.replace(hour=rng.choices(hours, weights=[HOURLY_WEIGHTS[h] for h in hours])[0],
+                            minute=rng.randrange(60), second=rng.randrange(60))
+                for _ in range(count if hours else 0)
+            )
+            # Today's most recent orders are the ones still in the kitchen
+            for index, created in enumerate(created_times):
+                order_id = ids(Order)
+                order_number += 1
+                order_type = _pick(rng, ORDER_TYPE_WEIGHTS)
+                if is_today and index >= len(created_times) - open_left:
+                    status, paid = rng.choice(OPEN_STATUSES), False
+                elif rng.random() < config.cancel_ratio:
+                    status, paid = OrderStatus.CANCELLED, False
+                else:
+                    status, paid = OrderStatus.COMPLETED, True
+                method = _pick(rng, PAYMENT_WEIGHTS) if paid else None
+                finished = min(created + timedelta(minutes=rng.randint(20, 75)), now)
+                order = writer.add(
+                    Order, id=order_id, order_number=order_number, order_type=order_type, status=status,
+                    table_id=rng.choice(table_ids) if order_type == OrderType.DINE_IN else None,
+                    customer_name=None if order_type == OrderType.DINE_IN else f"Cliente {order_number}",
+                    notes=rng.choice(NOTES), total_amount=0.0, user_id=rng.choice(waiter_ids), is_paid=paid,
+                    payment_method=method, sort=50, restaurant_id=restaurant_id,
+                    created_at=created, updated_at=finished if status != OrderStatus.PENDING else created,
+                )
+                item_status = OrderItemStatus(status.value)
+                total = 0.0
+                persons = rng.randint(1, config.max_persons) if order_type == OrderType.DINE_IN else 1
+                for position in range(1, persons + 1):
+                    person_id = ids(OrderPerson)
+                    person = writer.add(OrderPerson, id=person_id, order_id=order_id, name=f"Persona {position}",
+                                        position=position, subtotal=0.0, created_at=created, updated_at=created)
+                    for _ in range(rng.randint(1, config.max_items_per_person)):
+                        menu_item_id, prices = rng.choice(menu)
+                        variant_id, unit_price = rng.choice(prices)
+                        quantity = rng.choices([1, 2, 3], weights=[80, 15, 5])[0]
+                        item_id = ids(OrderItem)
+                        writer.add(OrderItem, id=item_id, order_id=order_id, person_id=person_id,
+                                   menu_item_id=menu_item_id, variant_id=variant_id, quantity=quantity,
+                                   unit_price=unit_price, status=item_status,
+                                   special_instructions="Sin sal" if rng.random() < 0.05 else None,
+                                   created_at=created, updated_at=order["updated_at"])
+                        amount = quantity * unit_price
+                        if rng.random() < config.extra_ratio:
+                            name, price = rng.choice(EXTRAS)
+                            writer.add(OrderItemExtra, id=ids(OrderItemExtra), order_item_id=item_id, name=name,
+                                       price=price, quantity=1, created_at=created, updated_at=created)
+                            amount += price
+                        person["subtotal"] = round(person["subtotal"] + amount, 2)
+                    total += person["subtotal"]
+                order["total_amount"] = round(total, 2)
+
+                if paid:
+                    amount = Decimal(str(order["total_amount"]))
+                    writer.add(CashTransaction, id=ids(CashTransaction), session_id=session_id,
+                               transaction_type=TransactionType.SALE, amount=amount, order_id=order_id,
+                               created_by_user_id=cashier_id, payment_method=CashPaymentMethod(method.name),
+                               description=f"Orden #{order_number}", created_at=finished, updated_at=finished)
+                    if method == PaymentMethod.CASH:
+                        cash_in += amount
+                    if rng.random() < 0.1:
+                        writer.add(CashTransaction, id=ids(CashTransaction), session_id=session_id,
+                                   transaction_type=TransactionType.TIP, amount=(amount * Decimal("0.1")).quantize(Decimal("0.01")),
+                                   order_id=order_id, created_by_user_id=cashier_id,
+                                   payment_method=CashPaymentMethod(method.name), created_at=finished, updated_at=finished)
+
+            if rng.random() < 0.3:
+                expense = Decimal(rng.randrange(100, 800))
+                writer.add(CashTransaction, id=ids(CashTransaction), session_id=session_id,
+                           transaction_type=TransactionType.EXPENSE, amount=expense, category="Insumos",
+                           description="Compra de insumos", created_by_user_id=cashier_id,
+                           payment_method=CashPaymentMethod.CASH, created_at=day.replace(hour=10),
+                           updated_at=day.replace(hour=10))
+                cash_in -= expense
+            session["expected_balance"] = session["initial_balance"] + cash_in
+            if not is_today:
+                session["final_balance"] = session["actual_balance"] = session["expected_balance"]
+
+            if writer.pending(Order) >= 5000:
+                writer.flush()
+
+        writer.flush()
+        # Bulk inserts bypass the session hooks that maintain the search index
+        order_ids = db.execute(
+            select(Order.id).where(Order.restaurant_id == restaurant_id).order_by(Order.id)
+        ).scalars().all()
+        for start in range(0, len(order_ids), 2000):
+            tokens = reindex_orders(db, order_ids[start:start + 2000])
+            writer.counts["order_search_tokens"] = writer.counts.get("order_search_tokens", 0) + tokens
+        dataset.restaurant_ids.append(restaurant_id)
+        dataset.admin_user_ids[restaurant_id] = admin_id
+
+    db.commit()
+    dataset.counts = writer.counts
+    return dataset
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--url", default="sqlite:///bench.db", help="SQLAlchemy database URL")
+    parser.add_argument("--scale", choices=sorted(SCALES), default="medium")
+    for option in fields(DatasetConfig):
+        parser.add_argument(f"--{option.name.replace('_', '-')}", type=option.type, default=None)
+    args = parser.parse_args()
+
+    overrides = {f.name: getattr(args, f.name) for f in fields(DatasetConfig) if getattr(args, f.name) is not None}
+    config = replace(SCALES[args.scale], **overrides)
+    engine = create_engine(args.url)
+    Base.metadata.create_all(bind=engine)
+    started = time.perf_counter()
+    with Session(engine) as db:
+        dataset = generate_dataset(db, config)
+    print(f"Generated in {time.perf_counter() - started:.1f}s: restaurants {dataset.restaurant_ids}")
+    for table, count in sorted(dataset.counts.items()):
+        print(f"  {table:<24} {count:>9,}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Service-level benchmarks: timings and query counts of the hot paths.
+
+See conftest.py for how to run and compare.
+"""
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.api.routers.reports import PeriodType, get_dashboard_summary
+from app.models import MenuItem, Restaurant, Table
+from app.schemas.order import OrderCreate, OrderItemCreate, OrderPersonCreate
+from app.services.cash_register.report_service import get_weekly_summary
+from app.services.orders.order_crud import create_order_with_items, get_orders
+from app.services.subscription.limit_validator import get_current_usage
+
+
+@pytest.fixture
+def restaurant_id(dataset) -> int:
+    return dataset.restaurant_ids[0]
+
+
+def test_get_orders_kitchen(measure, db, restaurant_id):
+    orders = measure("get_orders_kitchen", lambda: get_orders(
+        db, limit=100, sort_by="kitchen", restaurant_id=restaurant_id,
+    ))
+    assert orders
+
+
+def test_get_orders_history(measure, db, restaurant_id):
+    orders = measure("get_orders_history", lambda: get_orders(
+        db, limit=100, sort_by="orders", restaurant_id=restaurant_id,
+    ))
+    assert len(orders) == 100
+
+
+def test_search_orders(measure, db, restaurant_id):
+    orders = measure("search_orders", lambda: get_orders(
+        db, limit=50, sort_by="relevance", restaurant_id=restaurant_id, search="cliente 12",
+    ))
+    assert orders[0]["customer_name"].startswith("Cliente 12")
+
+
+def test_create_order_with_items(measure, db, dataset, restaurant_id):
+    menu_item_ids = [item_id for (item_id,) in db.query(MenuItem.id).filter(
+        MenuItem.restaurant_id == restaurant_id, ~MenuItem.variants.any(),
+    ).order_by(MenuItem.id).limit(6)]
+    table_id = db.query(Table.id).filter(Table.restaurant_id == restaurant_id).order_by(Table.id).limit(1).scalar()
+    order = OrderCreate(table_id=table_id, persons=[
+        OrderPersonCreate(name=f"Persona {position}", position=position, items=[
+            OrderItemCreate(menu_item_id=menu_item_id, quantity=1) for menu_item_id in menu_item_ids[position::2]
+        ])
+        for position in (1, 2)
+    ])
+    user_id = dataset.admin_user_ids[restaurant_id]
+
+    created = measure("create_order_with_items", lambda: create_order_with_items(db, order, restaurant_id, user_id))
+    assert created["total_amount"] > 0
+
+
+def test_get_dashboard_summary(measure, db, restaurant_id):
+    restaurant = db.get(Restaurant, restaurant_id)
+    summary = measure("get_dashboard_summary", lambda: asyncio.run(get_dashboard_summary(
+        period=PeriodType.MONTH, start_date=None, end_date=None, db=db, current_user=None, restaurant=restaurant,
+    )))
+    assert summary["sales_summary"]["total_tickets"] > 0
+
+
+def test_get_weekly_summary(measure, db, restaurant_id):
+    end = datetime.now(timezone.utc)
+    report = measure("get_weekly_summary", lambda: get_weekly_summary(
+        db, end - timedelta(days=7), end, restaurant_id=restaurant_id,
+    ))
+    assert report.total_sessions > 0
+
+
+def test_get_current_usage(measure, db, restaurant_id):
+    usage = measure("get_current_usage", lambda: get_current_usage(db, restaurant_id))
+    assert usage["menu_items"] > 0
@@ -0,0 +1,23 @@
+"""add unread index to subscription alerts
+
+Revision ID: add_alerts_unread_index
+Revises: add_scheduled_job_runs
+Create Date: 2026-10-19 20:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_alerts_unread_index'
+down_revision = 'add_scheduled_job_runs'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_subscription_alerts_restaurant_unread', 'subscription_alerts', ['restaurant_id', 'is_read'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_subscription_alerts_restaurant_unread', table_name='subscription_alerts')
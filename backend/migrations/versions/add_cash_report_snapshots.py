@@ -0,0 +1,162 @@
+"""store cash register reports as indexed snapshots
+
+Revision ID: add_cash_report_snapshots
+Revises: add_special_note_item_stats
+Create Date: 2026-10-19 22:00:00.000000
+
+Adds restaurant_id, the summary totals and is_final to
+cash_register_reports, moves the JSON data into a compressed payload,
+and writes the final summary snapshot of every closed session.
+"""
+import json
+import zlib
+from datetime import datetime, timezone
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_cash_report_snapshots'
+down_revision = 'add_special_note_item_stats'
+branch_labels = None
+depends_on = None
+
+SUMMARY_COLUMNS = ('total_sales', 'total_refunds', 'total_tips', 'total_expenses', 'net_cash_flow')
+PAYMENT_COLUMNS = {'cash': 'cash_payments', 'card': 'card_payments',
+                   'digital': 'digital_payments', 'other': 'other_payments'}
+
+
+def _summary_values(data: dict) -> dict:
+    values = {column: data.get(column) for column in SUMMARY_COLUMNS}
+    values['total_transactions'] = data.get('total_transactions')
+    breakdown = data.get('payment_breakdown') or {}
+    values.update({column: breakdown.get(method) for method, column in PAYMENT_COLUMNS.items()})
+    return values
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('cash_register_reports') as batch:
+        batch.add_column(sa.Column('restaurant_id', sa.Integer(), nullable=True))
+        batch.add_column(sa.Column('payload', sa.LargeBinary(), nullable=True))
+        batch.add_column(sa.Column('is_final', sa.Boolean(), nullable=False, server_default=sa.false()))
+        for column in (*SUMMARY_COLUMNS, *PAYMENT_COLUMNS.values()):
+            batch.add_column(sa.Column(column, sa.DECIMAL(10, 2), nullable=True))
+        batch.add_column(sa.Column('total_transactions', sa.Integer(), nullable=True))
+
+    conn = op.get_bind()
+    reports = sa.table(
+        'cash_register_reports',
+        sa.column('id', sa.Integer), sa.column('session_id', sa.Integer), sa.column('restaurant_id', sa.Integer),
+        sa.column('report_type', sa.String), sa.column('data', sa.Text), sa.column('payload', sa.LargeBinary),
+        sa.column('generated_at', sa.DateTime), sa.column('is_final', sa.Boolean),
+        sa.column('created_at', sa.DateTime), sa.column('updated_at', sa.DateTime),
+        sa.column('total_transactions', sa.Integer),
+        *(sa.column(column, sa.DECIMAL) for column in (*SUMMARY_COLUMNS, *PAYMENT_COLUMNS.values())),
+    )
+    sessions = sa.table(
+        'cash_register_sessions',
+        sa.column('id', sa.Integer), sa.column('restaurant_id', sa.Integer), sa.column('session_number', sa.Integer),
+        sa.column('status', sa.String), sa.column('opened_at', sa.DateTime), sa.column('closed_at', sa.DateTime),
+    )
+    transactions = sa.table(
+        'cash_transactions',
+        sa.column('session_id', sa.Integer), sa.column('transaction_type', sa.String),
+        sa.column('amount', sa.DECIMAL), sa.column('payment_method', sa.String),
+    )
+
+    conn.execute(reports.update().values(
+        restaurant_id=sa.select(sessions.c.restaurant_id)
+        .where(sessions.c.id == reports.c.session_id).scalar_subquery()
+    ))
+
+    # Compress existing report data and fill the summary columns from it
+    for report_id, report_type, raw in conn.execute(sa.select(reports.c.id, reports.c.report_type, reports.c.data)):
+        values = {'payload': zlib.compress((raw or '{}').encode('utf-8'))}
+        if report_type == 'daily_summary':
+            try:
+                values.update(_summary_values(json.loads(raw)))
+            except (TypeError, ValueError):
+                pass
+        conn.execute(reports.update().where(reports.c.id == report_id).values(**values))
+
+    # Final snapshots of the sessions already closed, from their transactions
+    amount = sa.cast(transactions.c.amount, sa.Numeric(10, 2))
+
+    def total(*types):
+        return sa.func.coalesce(sa.func.sum(sa.case((transactions.c.transaction_type.in_(types), sa.func.abs(amount)),
+                                                    else_=0)), 0)
+
+    def paid(method):
+        return sa.func.coalesce(sa.func.sum(sa.case(
+            (sa.and_(transactions.c.payment_method == method, amount > 0), amount), else_=0)), 0)
+
+    totals = {
+        row.session_id: row for row in conn.execute(
+            sa.select(
+                transactions.c.session_id,
+                sa.func.coalesce(sa.func.sum(sa.case((transactions.c.transaction_type == 'sale', amount), else_=0)),
+                                 0).label('sales'),
+                total('refund', 'cancellation').label('refunds'),
+                sa.func.coalesce(sa.func.sum(sa.case((transactions.c.transaction_type == 'tip', amount), else_=0)),
+                                 0).label('tips'),
+                total('expense').label('expenses'),
+                sa.func.count().label('count'),
+                *(paid(method.upper()).label(method) for method in PAYMENT_COLUMNS),
+            ).group_by(transactions.c.session_id)
+        )
+    }
+    now = datetime.now(timezone.utc)
+    for session in conn.execute(sa.select(sessions).where(sessions.c.status == 'CLOSED')):
+        row = totals.get(session.id)
+        sales, refunds, tips, expenses = (
+            (float(row.sales), float(row.refunds), float(row.tips), float(row.expenses)) if row else (0.0,) * 4
+        )
+        breakdown = {method: float(getattr(row, method)) if row else 0.0 for method in PAYMENT_COLUMNS}
+        summary = {
+            'session_id': session.id, 'session_number': session.session_number,
+            'opened_at': str(session.opened_at) if session.opened_at else None,
+            'closed_at': str(session.closed_at) if session.closed_at else None,
+            'total_sales': sales, 'total_refunds': refunds, 'total_tips': tips, 'total_expenses': expenses,
+            'total_transactions': row.count if row else 0,
+            'net_cash_flow': sales - refunds + tips - expenses,
+            'payment_breakdown': breakdown,
+        }
+        conn.execute(reports.insert().values(
+            session_id=session.id, restaurant_id=session.restaurant_id, report_type='daily_summary',
+            data='', payload=zlib.compress(json.dumps(summary).encode('utf-8')), is_final=True,
+            generated_at=session.closed_at or now, created_at=now, updated_at=now,
+            **_summary_values(summary),
+        ))
+
+    with op.batch_alter_table('cash_register_reports') as batch:
+        batch.alter_column('restaurant_id', existing_type=sa.Integer(), nullable=False)
+        batch.alter_column('payload', existing_type=sa.LargeBinary(), nullable=False)
+        batch.create_foreign_key('fk_cash_register_reports_restaurant_id', 'restaurants', ['restaurant_id'], ['id'])
+        batch.drop_column('data')
+    op.create_index('ix_cash_register_reports_restaurant_type_generated', 'cash_register_reports',
+                    ['restaurant_id', 'report_type', 'generated_at'])
+    op.create_index('ix_cash_register_reports_session_type_generated', 'cash_register_reports',
+                    ['session_id', 'report_type', 'generated_at'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_cash_register_reports_session_type_generated', table_name='cash_register_reports')
+    op.drop_index('ix_cash_register_reports_restaurant_type_generated', table_name='cash_register_reports')
+    with op.batch_alter_table('cash_register_reports') as batch:
+        batch.add_column(sa.Column('data', sa.Text(), nullable=True))
+
+    conn = op.get_bind()
+    reports = sa.table('cash_register_reports', sa.column('id', sa.Integer), sa.column('data', sa.Text),
+                       sa.column('payload', sa.LargeBinary), sa.column('is_final', sa.Boolean))
+    conn.execute(reports.delete().where(reports.c.is_final.is_(True)))
+    for report_id, payload in conn.execute(sa.select(reports.c.id, reports.c.payload)):
+        conn.execute(reports.update().where(reports.c.id == report_id)
+                     .values(data=zlib.decompress(payload).decode('utf-8')))
+
+    with op.batch_alter_table('cash_register_reports') as batch:
+        batch.alter_column('data', existing_type=sa.Text(), nullable=False)
+        batch.drop_constraint('fk_cash_register_reports_restaurant_id', type_='foreignkey')
+        for column in ('restaurant_id', 'payload', 'is_final', 'total_transactions',
+                       *SUMMARY_COLUMNS, *PAYMENT_COLUMNS.values()):
+            batch.drop_column(column)
@@ -0,0 +1,26 @@
+"""add uploaded image columns to menu items
+
+Revision ID: add_menu_item_images
+Revises: add_cash_report_snapshots
+Create Date: 2026-10-19 23:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_menu_item_images'
+down_revision = 'add_cash_report_snapshots'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('menu_items', sa.Column('image_key', sa.String(length=40), nullable=True))
+    op.add_column('menu_items', sa.Column('image_variants', sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('menu_items', 'image_variants')
+    op.drop_column('menu_items', 'image_key')
@@ -0,0 +1,43 @@
+"""add subtotal to order persons
+
+Revision ID: add_order_person_subtotal
+Revises: c5cba3d8aaa0
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_order_person_subtotal'
+down_revision = 'c5cba3d8aaa0'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'order_persons',
+        sa.Column('subtotal', sa.Float(), nullable=False, server_default='0')
+    )
+
+    # Backfill from live items and their extras
+    op.execute("""
+        UPDATE order_persons SET subtotal =
+            COALESCE((
+                SELECT SUM(oi.quantity * oi.unit_price)
+                FROM order_items oi
+                WHERE oi.person_id = order_persons.id AND oi.deleted_at IS NULL
+            ), 0)
+            + COALESCE((
+                SELECT SUM(e.quantity * e.price)
+                FROM order_item_extras e
+                JOIN order_items oi ON oi.id = e.order_item_id
+                WHERE oi.person_id = order_persons.id AND oi.deleted_at IS NULL
+            ), 0)
+    """)
+
+
+def downgrade() -> None:
+    op.drop_column('order_persons', 'subtotal')
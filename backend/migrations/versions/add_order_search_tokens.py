@@ -0,0 +1,131 @@
+"""add order search tokens
+
+Revision ID: add_order_search_tokens
+Revises: add_order_person_subtotal
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from alembic import op
+import re
+import unicodedata
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_order_search_tokens'
+down_revision = 'add_order_person_subtotal'
+branch_labels = None
+depends_on = None
+
+BACKFILL_BATCH_SIZE = 1000
+
+# Frozen copy of the tokenizer in app/services/orders/search.py as of this
+# revision, so later changes to it never change what this migration does
+WEIGHT_NUMBER = 8
+WEIGHT_CUSTOMER = 4
+WEIGHT_ITEM = 2
+WEIGHT_NOTES = 1
+TOKEN_MAX_LENGTH = 64
+_WORD_RE = re.compile(r"[a-z0-9]+")
+
+order_search_tokens = sa.table(
+    'order_search_tokens',
+    sa.column('order_id', sa.Integer),
+    sa.column('order_item_id', sa.Integer),
+    sa.column('restaurant_id', sa.Integer),
+    sa.column('token', sa.String),
+    sa.column('weight', sa.Integer),
+)
+
+
+def _tokenize(text):
+    if not text:
+        return []
+    decomposed = unicodedata.normalize("NFKD", str(text).lower())
+    normalized = "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+    tokens = []
+    for word in _WORD_RE.findall(normalized):
+        word = word[:TOKEN_MAX_LENGTH]
+        tokens.append(word)
+        if word.isdigit() and word.startswith("0") and word.lstrip("0"):
+            tokens.append(word.lstrip("0"))
+    return tokens
+
+
+def _weighted(*fields):
+    weighted = {}
+    for text, weight in fields:
+        for token in _tokenize(text):
+            if weighted.get(token, 0) < weight:
+                weighted[token] = weight
+    return weighted
+
+
+def _backfill_tokens(bind, order_ids):
+    params = {"first_id": order_ids[0], "last_id": order_ids[-1]}
+    rows = []
+    for order in bind.execute(sa.text(
+        "SELECT id, restaurant_id, order_number, ticket_number, customer_name, notes FROM orders"
+        " WHERE id BETWEEN :first_id AND :last_id"
+    ), params):
+        tokens = _weighted(
+            (order.order_number, WEIGHT_NUMBER), (order.ticket_number, WEIGHT_NUMBER),
+            (order.customer_name, WEIGHT_CUSTOMER), (order.notes, WEIGHT_NOTES),
+        )
+        rows.extend(
+            {"order_id": order.id, "order_item_id": None, "restaurant_id": order.restaurant_id,
+             "token": token, "weight": weight}
+            for token, weight in tokens.items()
+        )
+    for item in bind.execute(sa.text(
+        "SELECT oi.id, oi.order_id, mi.restaurant_id, mi.name AS item_name, v.name AS variant_name"
+        " FROM order_items oi"
+        " JOIN menu_items mi ON mi.id = oi.menu_item_id"
+        " LEFT JOIN menu_item_variants v ON v.id = oi.variant_id"
+        " WHERE oi.order_id BETWEEN :first_id AND :last_id AND oi.deleted_at IS NULL"
+    ), params):
+        rows.extend(
+            {"order_id": item.order_id, "order_item_id": item.id, "restaurant_id": item.restaurant_id,
+             "token": token, "weight": WEIGHT_ITEM}
+            for token in _weighted((f"{item.item_name} {item.variant_name or ''}", WEIGHT_ITEM))
+        )
+    if rows:
+        bind.execute(order_search_tokens.insert(), rows)
+
+
+def upgrade() -> None:
+    op.create_table(
+        'order_search_tokens',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('order_id', sa.Integer(), sa.ForeignKey('orders.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('order_item_id', sa.Integer(), sa.ForeignKey('order_items.id', ondelete='CASCADE'), nullable=True),
+        sa.Column('restaurant_id', sa.Integer(), sa.ForeignKey('restaurants.id'), nullable=False),
+        sa.Column('token', sa.String(length=64), nullable=False),
+        sa.Column('weight', sa.Integer(), nullable=False, server_default='1'),
+    )
+    op.create_index('ix_order_search_tokens_order_id', 'order_search_tokens', ['order_id'])
+    op.create_index('ix_order_search_tokens_order_item_id', 'order_search_tokens', ['order_item_id'])
+    op.create_index(
+        'ix_order_search_tokens_restaurant_token',
+        'order_search_tokens',
+        ['restaurant_id', 'token'],
+    )
+
+    bind = op.get_bind()
+    last_id = 0
+    while True:
+        ids = [row[0] for row in bind.execute(
+            sa.text("SELECT id FROM orders WHERE id > :last_id ORDER BY id LIMIT :limit"),
+            {"last_id": last_id, "limit": BACKFILL_BATCH_SIZE},
+        )]
+        if not ids:
+            break
+        _backfill_tokens(bind, ids)
+        last_id = ids[-1]
+
+
+def downgrade() -> None:
+    op.drop_index('ix_order_search_tokens_restaurant_token', table_name='order_search_tokens')
+    op.drop_index('ix_order_search_tokens_order_item_id', table_name='order_search_tokens')
+    op.drop_index('ix_order_search_tokens_order_id', table_name='order_search_tokens')
+    op.drop_table('order_search_tokens')
@@ -0,0 +1,39 @@
+"""add outbox events for post-commit side effects
+
+Revision ID: add_outbox_events
+Revises: add_restaurant_parent
+Create Date: 2026-10-19 16:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_outbox_events'
+down_revision = 'add_restaurant_parent'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'outbox_events',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('topic', sa.String(length=64), nullable=False),
+        sa.Column('restaurant_id', sa.Integer(), nullable=True),
+        sa.Column('payload', sa.JSON(), nullable=False),
+        sa.Column('status', sa.Enum('pending', 'done', 'failed', name='outbox_status'), nullable=False),
+        sa.Column('attempts', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('last_error', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('available_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('processed_at', sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_outbox_events_status_available', 'outbox_events', ['status', 'available_at'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_outbox_events_status_available', table_name='outbox_events')
+    op.drop_table('outbox_events')
@@ -0,0 +1,31 @@
+"""add parent restaurant for multi-branch chains
+
+Revision ID: add_restaurant_parent
+Revises: add_order_search_tokens
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_restaurant_parent'
+down_revision = 'add_order_search_tokens'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('restaurants', sa.Column('parent_restaurant_id', sa.Integer(), nullable=True))
+    op.create_foreign_key(
+        'fk_restaurants_parent_restaurant_id', 'restaurants', 'restaurants',
+        ['parent_restaurant_id'], ['id']
+    )
+    op.create_index('ix_restaurants_parent_restaurant_id', 'restaurants', ['parent_restaurant_id'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_restaurants_parent_restaurant_id', table_name='restaurants')
+    op.drop_constraint('fk_restaurants_parent_restaurant_id', 'restaurants', type_='foreignkey')
+    op.drop_column('restaurants', 'parent_restaurant_id')
@@ -0,0 +1,37 @@
+"""add scheduled job run history
+
+Revision ID: add_scheduled_job_runs
+Revises: add_outbox_events
+Create Date: 2026-10-19 18:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_scheduled_job_runs'
+down_revision = 'add_outbox_events'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'scheduled_job_runs',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('job_name', sa.String(length=64), nullable=False),
+        sa.Column('status', sa.Enum('running', 'succeeded', 'failed', name='job_run_status'), nullable=False),
+        sa.Column('worker', sa.String(length=128), nullable=False),
+        sa.Column('started_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('duration_ms', sa.Integer(), nullable=True),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_scheduled_job_runs_job_started', 'scheduled_job_runs', ['job_name', 'started_at'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_scheduled_job_runs_job_started', table_name='scheduled_job_runs')
+    op.drop_table('scheduled_job_runs')
@@ -0,0 +1,41 @@
+"""add per menu item special note stats
+
+Revision ID: add_special_note_item_stats
+Revises: add_alerts_unread_index
+Create Date: 2026-10-19 21:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_special_note_item_stats'
+down_revision = 'add_alerts_unread_index'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'special_note_item_stats',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('restaurant_id', sa.Integer(), nullable=False),
+        sa.Column('menu_item_id', sa.Integer(), nullable=False),
+        sa.Column('note_text', sa.String(length=200), nullable=False),
+        sa.Column('usage_count', sa.Integer(), nullable=False, server_default='1'),
+        sa.Column('last_used_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.text('now()')),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.text('now()')),
+        sa.Column('deleted_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['restaurant_id'], ['restaurants.id'], ),
+        sa.ForeignKeyConstraint(['menu_item_id'], ['menu_items.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('restaurant_id', 'menu_item_id', 'note_text', name='uq_restaurant_item_note'),
+    )
+    op.create_index('ix_special_note_item_stats_restaurant_id', 'special_note_item_stats', ['restaurant_id'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_special_note_item_stats_restaurant_id', table_name='special_note_item_stats')
+    op.drop_table('special_note_item_stats')
@@ -11,18 +11,26 @@ from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.pool import StaticPool
 
 from app.main import app
-from app.db.base import Base, get_db
+from app.db.base import Base, get_db, get_read_db
 from app.core.config import settings
 from app.models.user import User, UserRole
 from app.models.restaurant import Restaurant
 from app.models.subscription_plan import SubscriptionPlan, PlanTier
 from app.models.restaurant_subscription import RestaurantSubscription, BillingCycle, SubscriptionStatus
+from app.core.cache import caches
 from app.core.security import get_password_hash
 from app.services.user import get_current_user, get_current_active_user
 from app.core.dependencies import get_current_restaurant, get_current_user_with_restaurant, get_current_user_with_active_subscription
 from datetime import datetime, timedelta, timezone
 
 
+# The outbox worker would drain through the app's own database; tests that
+# need events processed call outbox.drain with the test session instead
+settings.OUTBOX_WORKER_ENABLED = False
+# Likewise the job scheduler; tests run jobs with Scheduler.execute
+settings.SCHEDULER_ENABLED = False
+
+
 # Test database URL (SQLite in-memory for fast tests)
 SQLALCHEMY_TEST_DATABASE_URL = "sqlite:///:memory:"
 
@@ -62,6 +70,8 @@ def db_session() -> Generator[Session, None, None]:
         session.close()
         # Drop all tables to ensure clean state
         Base.metadata.drop_all(bind=test_engine)
+        # IDs restart in the next test's database; so must cached data
+        caches.clear_local()
 
 
 @pytest.fixture(scope="function")
@@ -111,6 +121,7 @@ def client(
     
     # Override all dependencies
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
     app.dependency_overrides[get_current_user] = override_get_current_user
     app.dependency_overrides[get_current_active_user] = override_get_current_active_user
     app.dependency_overrides[get_current_restaurant] = override_get_current_restaurant
@@ -149,6 +160,7 @@ def client_no_auth(db_session: Session) -> Generator[TestClient, None, None]:
     
     # Only override database, NOT auth
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
     
     with TestClient(app, base_url="http://default.testserver") as test_client:
         yield test_client
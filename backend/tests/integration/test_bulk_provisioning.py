@@ -0,0 +1,171 @@
+"""
+Integration tests for bulk franchise provisioning (POST /restaurants/bulk).
+"""
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+from app.core.security import verify_password
+from app.models.menu import Category, MenuItem, MenuItemVariant
+from app.models.restaurant import Restaurant
+from app.models.restaurant_subscription import RestaurantSubscription, SubscriptionStatus
+from app.models.subscription_plan import PlanTier, SubscriptionPlan
+from app.models.user import User, UserRole
+from app.services import provisioning
+
+
+@pytest.fixture
+def trial_plan(db_session: Session) -> SubscriptionPlan:
+    plan = SubscriptionPlan(
+        name="Trial", tier=PlanTier.TRIAL, display_name="Prueba", monthly_price=0.0, annual_price=0.0,
+        max_admin_users=1, max_waiter_users=2, max_cashier_users=1, max_kitchen_users=1, max_owner_users=0,
+        max_tables=10, max_menu_items=50, max_categories=10, is_active=True,
+    )
+    db_session.add(plan)
+    db_session.commit()
+    return plan
+
+
+@pytest.fixture
+def template_menu(db_session: Session, test_restaurant):
+    category = Category(name="Bebidas", restaurant_id=test_restaurant.id)
+    db_session.add(category)
+    db_session.flush()
+    latte = MenuItem(name="Latte", price=45.0, category_id=category.id, restaurant_id=test_restaurant.id,
+                     ingredients={"removable": ["Canela"]})
+    retired = MenuItem(name="Frappe", price=60.0, category_id=category.id, restaurant_id=test_restaurant.id)
+    db_session.add_all([latte, retired])
+    db_session.flush()
+    db_session.add(MenuItemVariant(menu_item_id=latte.id, name="Grande", price=55.0))
+    retired.deleted_at = datetime.now(timezone.utc)
+    db_session.commit()
+    return test_restaurant
+
+
+def _branch(subdomain: str, **extra) -> dict:
+    return {"name": f"Sucursal {subdomain}", "subdomain": subdomain, **extra}
+
+
+def test_bulk_provisioning_creates_branches(client, db_session, trial_plan, test_subscription_plan, template_menu):
+    payload = {
+        "branches": [
+            _branch("centro"),
+            _branch("norte", plan_id=test_subscription_plan.id, admin_email="gerente@norte.com"),
+            _branch("sur", trial_days=30),
+        ],
+        "menu_template_restaurant_id": template_menu.id,
+        "chunk_size": 2,
+    }
+
+    response = client.post("/api/v1/restaurants/bulk", json=payload)
+
+    assert response.status_code == 200
+    report = response.json()
+    assert (report["created"], report["failed"]) == (3, 0)
+    assert [r["subdomain"] for r in report["results"]] == ["centro", "norte", "sur"]
+    centro, norte, sur = report["results"]
+    assert centro["admin_email"] == "admin-centro@shopacoffee.com"
+    assert centro["trial_expires"] and centro["subscription_plan"] is None
+    assert norte["admin_email"] == "gerente@norte.com"
+    assert norte["subscription_plan"] == test_subscription_plan.display_name
+    assert centro["menu_items_cloned"] == 1
+
+    db_session.expire_all()
+    for result in report["results"]:
+        restaurant = db_session.get(Restaurant, result["restaurant_id"])
+        admin = db_session.query(User).filter(User.restaurant_id == restaurant.id).one()
+        assert admin.role == UserRole.ADMIN
+        assert verify_password(result["admin_password"], admin.hashed_password)
+        subscription = db_session.query(RestaurantSubscription).filter_by(restaurant_id=restaurant.id).one()
+        expected = SubscriptionStatus.ACTIVE if restaurant.subdomain == "norte" else SubscriptionStatus.TRIAL
+        assert subscription.status == expected
+
+        items = db_session.query(MenuItem).filter(MenuItem.restaurant_id == restaurant.id).all()
+        assert [item.name for item in items] == ["Latte"]
+        assert items[0].category.name == "BEBIDAS"
+        assert items[0].category.restaurant_id == restaurant.id
+        assert items[0].ingredients == {"removable": ["Canela"]}
+        assert [v.name for v in items[0].variants] == ["Grande"]
+
+
+def test_bulk_provisioning_reports_invalid_branches(client, db_session, trial_plan, test_restaurant):
+    payload = {"branches": [
+        _branch("default"),
+        _branch("oeste"),
+        _branch("oeste"),
+        _branch("este", admin_email="admin-oeste@shopacoffee.com"),
+        _branch("plaza", plan_id=999),
+    ]}
+
+    response = client.post("/api/v1/restaurants/bulk", json=payload)
+
+    report = response.json()
+    assert (report["created"], report["failed"]) == (1, 4)
+    statuses = [(r["subdomain"], r["status"]) for r in report["results"]]
+    assert statuses == [("default", "failed"), ("oeste", "created"), ("oeste", "failed"),
+                        ("este", "failed"), ("plaza", "failed")]
+    assert "already exists" in report["results"][0]["error"]
+    assert "more than once" in report["results"][2]["error"]
+    assert "admin-oeste@shopacoffee.com" in report["results"][3]["error"]
+    assert "999" in report["results"][4]["error"]
+    assert db_session.query(Restaurant).count() == 2
+
+
+def test_failed_chunk_is_retried_branch_by_branch(client, db_session, trial_plan, monkeypatch):
+    real_write = provisioning._write_branches
+
+    def write(db, branches, template):
+        if any(branch.data.subdomain == "roto" for branch in branches):
+            raise OperationalError("INSERT", {}, Exception("lock wait timeout"))
+        return real_write(db, branches, template)
+
+    monkeypatch.setattr(provisioning, "_write_branches", write)
+    payload = {"branches": [_branch("uno"), _branch("roto"), _branch("tres")], "chunk_size": 3}
+
+    report = client.post("/api/v1/restaurants/bulk", json=payload).json()
+
+    assert [r["status"] for r in report["results"]] == ["created", "failed", "created"]
+    assert db_session.query(Restaurant).filter(Restaurant.subdomain.in_(["uno", "roto", "tres"])).count() == 2
+
+
+def test_unknown_menu_template_is_rejected(client, trial_plan):
+    response = client.post("/api/v1/restaurants/bulk", json={
+        "branches": [_branch("centro")], "menu_template_restaurant_id": 999,
+    })
+
+    assert response.status_code == 404
+
+
+def test_hash_passwords_keeps_order():
+    passwords = [f"secreto-{i}" for i in range(4)]
+
+    hashes = provisioning.hash_passwords(passwords)
+
+    assert all(verify_password(p, h) for p, h in zip(passwords, hashes))
+
+
+def test_menu_template_is_read_in_a_fixed_number_of_queries(db_session, template_menu):
+    category = db_session.query(Category).one()
+    for index in range(5):
+        item = MenuItem(name=f"Te {index}", price=30.0, category_id=category.id, restaurant_id=template_menu.id)
+        item.variants = [MenuItemVariant(name="Chico", price=25.0)]
+        db_session.add(item)
+    db_session.commit()
+    db_session.expire_all()
+    statements = []
+
+    def count(*args):
+        statements.append(args)
+
+    event.listen(db_session.get_bind(), "before_cursor_execute", count)
+    try:
+        template = provisioning.load_menu_template(db_session, template_menu.id)
+    finally:
+        event.remove(db_session.get_bind(), "before_cursor_execute", count)
+
+    assert sum(len(item["variants"]) for item in template.categories[0]["items"]) == 6
+    # Restaurant, categories, items and their variants
+    assert len(statements) == 4
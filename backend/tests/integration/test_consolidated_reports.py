@@ -0,0 +1,192 @@
+"""
+Integration tests for consolidated multi-branch reports (/reports/branches/*).
+"""
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.models.cash_register import CashRegisterSession, SessionStatus
+from app.models.menu import Category, MenuItem
+from app.models.order import Order, PaymentMethod
+from app.models.order_item import OrderItem
+from app.models.restaurant import Restaurant
+from app.models.restaurant_subscription import RestaurantSubscription, SubscriptionStatus
+from app.models.user import UserRole
+from app.services import analytics
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    analytics.clear_consolidated_cache()
+    yield
+    analytics.clear_consolidated_cache()
+
+
+@pytest.fixture
+def chain(db_session: Session, test_restaurant, test_subscription_plan):
+    """The test restaurant as headquarters of two branches, plus an unrelated restaurant."""
+    norte = Restaurant(name="Norte", subdomain="norte", parent_restaurant_id=test_restaurant.id)
+    sur = Restaurant(name="Sur", subdomain="sur", parent_restaurant_id=test_restaurant.id)
+    ajeno = Restaurant(name="Ajeno", subdomain="ajeno")
+    db_session.add_all([norte, sur, ajeno])
+    test_subscription_plan.has_multi_branch = True
+    now = datetime.now(timezone.utc)
+    db_session.add(RestaurantSubscription(
+        restaurant_id=test_restaurant.id, plan_id=test_subscription_plan.id, status=SubscriptionStatus.ACTIVE,
+        start_date=now, current_period_start=now, current_period_end=now + timedelta(days=30),
+        base_price=test_subscription_plan.monthly_price, total_price=test_subscription_plan.monthly_price,
+    ))
+    db_session.commit()
+    return test_restaurant, norte, sur, ajeno
+
+
+def _paid_order(db: Session, restaurant_id: int, number: int, total: float, method: PaymentMethod,
+                items=(), **fields) -> Order:
+    order = Order(order_number=number, restaurant_id=restaurant_id, total_amount=total,
+                  is_paid=True, payment_method=method, **fields)
+    order.items = [OrderItem(menu_item_id=item.id, quantity=quantity, unit_price=item.price)
+                   for item, quantity in items]
+    db.add(order)
+    db.commit()
+    return order
+
+
+def _latte(db: Session, restaurant_id: int) -> MenuItem:
+    category = Category(name="Bebidas", restaurant_id=restaurant_id)
+    db.add(category)
+    db.flush()
+    item = MenuItem(name="Latte", price=50.0, category_id=category.id, restaurant_id=restaurant_id)
+    db.add(item)
+    db.commit()
+    return item
+
+
+def test_branch_ids_cover_the_chain(db_session, chain):
+    hq, norte, sur, _ = chain
+
+    assert analytics.get_branch_ids(db_session, hq) == [hq.id, norte.id, sur.id]
+    assert analytics.get_branch_ids(db_session, sur) == [hq.id, norte.id, sur.id]
+    assert analytics.has_multi_branch(db_session, norte)
+
+
+def test_consolidated_sales(client, db_session, chain):
+    hq, norte, sur, ajeno = chain
+    _paid_order(db_session, hq.id, 1, 100.0, PaymentMethod.CASH)
+    _paid_order(db_session, norte.id, 1, 60.0, PaymentMethod.CARD)
+    _paid_order(db_session, norte.id, 2, 40.0, PaymentMethod.CASH)
+    _paid_order(db_session, ajeno.id, 1, 500.0, PaymentMethod.CASH)
+    db_session.add(Order(order_number=3, restaurant_id=norte.id, total_amount=999.0, is_paid=False))
+    db_session.commit()
+
+    response = client.get("/api/v1/reports/branches/sales", params={"restaurant_ids": [hq.id, norte.id, sur.id]})
+
+    assert response.status_code == 200
+    report = response.json()
+    assert report["period"]["type"] == "today"
+    rows = {row["restaurant_name"]: row for row in report["branches"]}
+    assert [row["restaurant_id"] for row in report["branches"]] == [hq.id, norte.id, sur.id]
+    assert rows["Norte"] == {"restaurant_id": norte.id, "restaurant_name": "Norte",
+                             "total_sales": 100.0, "total_tickets": 2, "average_ticket": 50.0}
+    assert rows["Sur"]["total_tickets"] == 0
+    assert report["total"] == {"total_sales": 200.0, "total_tickets": 3, "average_ticket": 66.67}
+
+
+def test_consolidated_top_products_and_payment_mix(client, db_session, chain):
+    hq, norte, _, _ = chain
+    _paid_order(db_session, hq.id, 1, 100.0, PaymentMethod.CASH, items=[(_latte(db_session, hq.id), 2)])
+    _paid_order(db_session, norte.id, 1, 150.0, PaymentMethod.CARD, items=[(_latte(db_session, norte.id), 3)])
+    params = {"restaurant_ids": [hq.id, norte.id]}
+
+    products = client.get("/api/v1/reports/branches/top-products", params=params).json()
+    mix = client.get("/api/v1/reports/branches/payment-mix", params=params).json()
+
+    assert products["branches"][1]["top_products"] == [
+        {"product_name": "Latte", "quantity_sold": 3, "total_revenue": 150.0}
+    ]
+    assert products["total"]["top_products"] == [
+        {"product_name": "Latte", "quantity_sold": 5, "total_revenue": 250.0}
+    ]
+    assert mix["branches"][0]["payment_breakdown"]["cash"]["percentage"] == 100.0
+    assert mix["total"]["payment_breakdown"]["card"] == {"amount": 150.0, "percentage": 60.0, "count": 1}
+
+
+def test_consolidated_cash_sessions(client, db_session, chain, test_admin_user):
+    hq, norte, _, _ = chain
+    now = datetime.now(timezone.utc)
+    db_session.add_all([
+        CashRegisterSession(restaurant_id=hq.id, session_number=1, opened_at=now,
+                            opened_by_user_id=test_admin_user.id, status=SessionStatus.OPEN),
+        CashRegisterSession(restaurant_id=norte.id, session_number=1, opened_at=now, closed_at=now,
+                            opened_by_user_id=test_admin_user.id, status=SessionStatus.CLOSED,
+                            final_balance=800, expected_balance=810, actual_balance=800),
+    ])
+    db_session.commit()
+
+    report = client.get("/api/v1/reports/branches/cash-sessions",
+                        params={"restaurant_ids": [hq.id, norte.id]}).json()
+
+    assert report["branches"][0]["open_sessions"] == 1
+    assert report["total"] == {"open_sessions": 1, "closed_sessions": 1,
+                               "total_cash_collected": 800.0, "total_difference": -10.0}
+
+
+def test_admin_sees_own_chain_only(client, db_session, chain, test_admin_user):
+    hq, norte, sur, ajeno = chain
+    test_admin_user.role = UserRole.ADMIN
+    db_session.commit()
+
+    whole = client.get("/api/v1/reports/branches/sales")
+    subset = client.get("/api/v1/reports/branches/sales", params={"restaurant_ids": [sur.id]})
+    foreign = client.get("/api/v1/reports/branches/sales", params={"restaurant_ids": [norte.id, ajeno.id]})
+
+    assert whole.json()["restaurant_ids"] == [hq.id, norte.id, sur.id]
+    assert subset.json()["restaurant_ids"] == [sur.id]
+    assert foreign.status_code == 403
+
+
+def test_plan_without_multi_branch_is_rejected(client, db_session, chain, test_admin_user, test_subscription_plan):
+    test_admin_user.role = UserRole.ADMIN
+    test_subscription_plan.has_multi_branch = False
+    db_session.commit()
+
+    response = client.get("/api/v1/reports/branches/sales")
+
+    assert response.status_code == 403
+    assert "multi_branch" in response.json()["detail"]
+
+
+def test_custom_period_validation(client, chain):
+    base = "/api/v1/reports/branches/sales"
+
+    assert client.get(base, params={"period": "custom"}).status_code == 400
+    assert client.get(base, params={"period": "custom", "start_date": "2026-02-01",
+                                    "end_date": "2026-01-01"}).status_code == 400
+    assert client.get(base, params={"period": "custom", "start_date": "2024-01-01",
+                                    "end_date": "2026-01-01"}).status_code == 400
+    response = client.get(base, params={"period": "custom", "start_date": "2026-01-01", "end_date": "2026-01-31"})
+    assert response.status_code == 200
+    assert response.json()["period"]["end_date"] == "2026-01-31"
+
+
+def test_sections_are_cached(db_session, chain):
+    hq, norte, _, _ = chain
+    start = datetime.now(timezone.utc) - timedelta(days=1)
+    end = start + timedelta(days=2)
+    statements = []
+
+    def count(*args):
+        statements.append(args)
+
+    event.listen(db_session.get_bind(), "before_cursor_execute", count)
+    try:
+        first = analytics.consolidated_sales(db_session, [hq.id, norte.id], start, end)
+        queries = len(statements)
+        second = analytics.consolidated_sales(db_session, [hq.id, norte.id], start, end)
+    finally:
+        event.remove(db_session.get_bind(), "before_cursor_execute", count)
+
+    assert queries > 0
+    assert len(statements) == queries
+    assert second is first
@@ -0,0 +1,103 @@
+"""
+Integration tests for the streaming export endpoints.
+"""
+import csv
+import io
+import json
+from datetime import datetime, timezone
+from decimal import Decimal
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.models.cash_register import CashRegisterSession, CashTransaction, PaymentMethod, TransactionType
+from app.models.order import Order, OrderStatus
+from app.models.restaurant import Restaurant
+from app.services import export_service
+
+
+@pytest.fixture
+def other_restaurant(db_session: Session) -> Restaurant:
+    restaurant = Restaurant(name="Other", subdomain="other")
+    db_session.add(restaurant)
+    db_session.commit()
+    return restaurant
+
+
+@pytest.fixture
+def export_data(db_session: Session, test_restaurant: Restaurant, other_restaurant: Restaurant, test_admin_user):
+    """Orders and transactions across two months and two restaurants."""
+    jan = datetime(2024, 1, 15, 18, 0, tzinfo=timezone.utc)
+    feb = datetime(2024, 2, 10, 18, 0, tzinfo=timezone.utc)
+    for number, (restaurant, created) in enumerate(
+        [(test_restaurant, jan), (test_restaurant, feb), (other_restaurant, jan)], start=1
+    ):
+        db_session.add(Order(order_number=number, restaurant_id=restaurant.id, status=OrderStatus.COMPLETED,
+                             is_paid=True, total_amount=100.0 * number, customer_name="=HYPERLINK(\"x\")",
+                             created_at=created, updated_at=created))
+    for session_number, restaurant in enumerate([test_restaurant, other_restaurant], start=1):
+        cash_session = CashRegisterSession(restaurant_id=restaurant.id, session_number=session_number,
+                                           opened_at=jan, opened_by_user_id=test_admin_user.id)
+        db_session.add(cash_session)
+        db_session.flush()
+        db_session.add(CashTransaction(session_id=cash_session.id, transaction_type=TransactionType.SALE,
+                                       amount=Decimal("45.50"), payment_method=PaymentMethod.CASH,
+                                       created_by_user_id=test_admin_user.id, created_at=jan, updated_at=jan))
+    db_session.commit()
+
+
+def test_export_orders_csv_filters_by_restaurant_and_dates(client: TestClient, export_data):
+    """Test that only the current restaurant's orders in range are exported."""
+    response = client.get("/api/v1/exports/orders", params={"start_date": "2024-01-01", "end_date": "2024-01-31"})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    assert 'filename="orders_2024-01-01_2024-01-31.csv"' in response.headers["content-disposition"]
+    rows = list(csv.DictReader(io.StringIO(response.content.decode("utf-8-sig"))))
+    assert len(rows) == 1
+    assert rows[0]["total_amount"] == "100.0"
+    assert rows[0]["status"] == "completed"
+    # Spreadsheet formulas are neutralized
+    assert rows[0]["customer_name"].startswith("'=")
+
+
+def test_export_orders_ndjson(client: TestClient, export_data):
+    """Test that NDJSON export yields one JSON object per order."""
+    response = client.get("/api/v1/exports/orders", params={"format": "ndjson"})
+
+    assert response.status_code == 200
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [line["order_number"] for line in lines] == [1, 2]
+    assert lines[0]["is_paid"] is True
+
+
+def test_export_cash_transactions_csv(client: TestClient, export_data):
+    """Test that transactions are scoped through their session's restaurant."""
+    response = client.get("/api/v1/exports/cash-transactions")
+
+    assert response.status_code == 200
+    rows = list(csv.DictReader(io.StringIO(response.content.decode("utf-8-sig"))))
+    assert len(rows) == 1
+    assert rows[0]["amount"] == "45.50"
+    assert rows[0]["transaction_type"] == "sale"
+    assert rows[0]["payment_method"] == "CASH"
+
+
+def test_export_rejects_bad_dates(client: TestClient):
+    """Test that malformed or inverted date ranges are rejected."""
+    assert client.get("/api/v1/exports/orders", params={"start_date": "01/02/2024"}).status_code == 400
+    assert client.get(
+        "/api/v1/exports/orders", params={"start_date": "2024-02-01", "end_date": "2024-01-01"}
+    ).status_code == 400
+
+
+def test_stream_csv_chunks_rows(monkeypatch):
+    """Test that rows are encoded in bounded chunks rather than all at once."""
+    monkeypatch.setattr(export_service, "ROWS_PER_CHUNK", 2)
+    rows = ((i, f"row {i}") for i in range(5))
+
+    chunks = list(export_service.stream_csv(("id", "name"), rows))
+
+    # header + 2 + 2 + 1
+    assert len(chunks) == 4
@@ -0,0 +1,125 @@
+"""
+Integration tests for the batch kitchen bump endpoint.
+"""
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.models.menu import Category, MenuItem
+from app.models.order import Order, OrderStatus
+from app.models.order_item import OrderItem, OrderItemStatus
+from app.models.restaurant import Restaurant
+
+URL = "/api/v1/orders/kitchen/bump"
+
+
+@pytest.fixture
+def ticket(db_session: Session, test_restaurant: Restaurant):
+    """One order with three tacos and one drink."""
+    tacos = Category(name="Tacos", restaurant_id=test_restaurant.id)
+    drinks = Category(name="Bebidas", restaurant_id=test_restaurant.id)
+    db_session.add_all([tacos, drinks])
+    db_session.flush()
+    taco = MenuItem(name="Taco", price=25.0, category_id=tacos.id, restaurant_id=test_restaurant.id)
+    soda = MenuItem(name="Refresco", price=30.0, category_id=drinks.id, restaurant_id=test_restaurant.id)
+    db_session.add_all([taco, soda])
+    db_session.flush()
+    order = Order(order_number=1, restaurant_id=test_restaurant.id, status=OrderStatus.PENDING,
+                  order_type="takeaway", total_amount=105.0)
+    db_session.add(order)
+    db_session.flush()
+    items = [OrderItem(order_id=order.id, menu_item_id=taco.id, quantity=1, unit_price=25.0) for _ in range(3)]
+    items.append(OrderItem(order_id=order.id, menu_item_id=soda.id, quantity=1, unit_price=30.0))
+    db_session.add_all(items)
+    db_session.commit()
+    return order, items, tacos, drinks
+
+
+def _statuses(db_session: Session, items):
+    db_session.expire_all()
+    return [db_session.get(OrderItem, item.id).status for item in items]
+
+
+def test_bump_category_and_items_in_one_request(client: TestClient, db_session: Session, ticket):
+    """Test that category and explicit transitions are applied together."""
+    order, items, tacos, drinks = ticket
+
+    response = client.post(URL, json={
+        "categories": [{"order_id": order.id, "category_id": tacos.id, "status": "preparing"}],
+        "items": [{"order_id": order.id, "item_id": items[3].id, "status": "preparing"}],
+    })
+
+    assert response.status_code == 200
+    body = response.json()
+    assert [item["id"] for item in body["items"]] == sorted(item.id for item in items)
+    assert {item["status"] for item in body["items"]} == {"preparing"}
+    # Every item started, so the order rolls up to preparing
+    assert body["orders"] == [{"id": order.id, "status": "preparing"}]
+    assert _statuses(db_session, items) == [OrderItemStatus.PREPARING] * 4
+    assert db_session.get(Order, order.id).status == OrderStatus.PREPARING
+
+
+def test_bump_to_ready_rolls_order_up(client: TestClient, db_session: Session, ticket):
+    """Test that the order becomes ready when its last item is."""
+    order, items, tacos, drinks = ticket
+    client.post(URL, json={"categories": [{"order_id": order.id, "category_id": tacos.id, "status": "ready"}]})
+    assert db_session.get(Order, order.id).status == OrderStatus.PENDING
+
+    response = client.post(URL, json={"categories": [{"order_id": order.id, "category_id": drinks.id, "status": "ready"}]})
+
+    assert response.json()["orders"] == [{"id": order.id, "status": "ready"}]
+
+
+def test_invalid_transition_rejects_whole_batch(client: TestClient, db_session: Session, ticket):
+    """Test that nothing is written when one transition is not allowed."""
+    order, items, tacos, drinks = ticket
+
+    response = client.post(URL, json={"items": [
+        {"order_id": order.id, "item_id": items[0].id, "status": "preparing"},
+        {"order_id": order.id, "item_id": items[1].id, "status": "completed"},
+    ]})
+
+    assert response.status_code == 400
+    assert _statuses(db_session, items) == [OrderItemStatus.PENDING] * 4
+
+
+def test_already_in_status_is_skipped(client: TestClient, ticket):
+    """Test that repeated bumps are reported, not failed."""
+    order, items, tacos, drinks = ticket
+    payload = {"items": [{"order_id": order.id, "item_id": items[0].id, "status": "preparing"}]}
+    client.post(URL, json=payload)
+
+    body = client.post(URL, json=payload).json()
+
+    assert body["items"] == []
+    assert body["skipped"] == [items[0].id]
+
+
+def test_unknown_item_and_closed_order(client: TestClient, db_session: Session, ticket):
+    """Test that items must belong to the order and orders must be open."""
+    order, items, tacos, drinks = ticket
+    assert client.post(URL, json={"items": [{"order_id": order.id, "item_id": 9999, "status": "ready"}]}).status_code == 404
+    assert client.post(URL, json={"items": []}).status_code == 422
+
+    order.status = OrderStatus.COMPLETED
+    db_session.commit()
+    response = client.post(URL, json={"items": [{"order_id": order.id, "item_id": items[0].id, "status": "ready"}]})
+    assert response.status_code == 409
+
+
+def test_bump_uses_bulk_statements(client: TestClient, db_session: Session, ticket):
+    """Test that a 4-item bump does not issue one UPDATE per item."""
+    order, items, tacos, drinks = ticket
+    statements = []
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(db_session.bind, "before_cursor_execute", listener)
+    try:
+        client.post(URL, json={"items": [
+            {"order_id": order.id, "item_id": item.id, "status": "preparing"} for item in items
+        ]})
+    finally:
+        event.remove(db_session.bind, "before_cursor_execute", listener)
+
+    updates = [s for s in statements if s.lstrip().upper().startswith("UPDATE ORDER_ITEMS")]
+    assert len(updates) == 1
@@ -0,0 +1,112 @@
+"""
+Integration tests for the station-scoped kitchen queue endpoint.
+"""
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.models.menu import Category, MenuItem
+from app.models.order import Order, OrderStatus
+from app.models.order_item import OrderItem, OrderItemStatus
+from app.models.order_item_extra import OrderItemExtra
+from app.models.printer import Printer, PrinterType
+from app.models.restaurant import Restaurant
+
+URL = "/api/v1/orders/kitchen/queue"
+
+
+@pytest.fixture
+def kitchen(db_session: Session, test_restaurant: Restaurant):
+    """
+    Tacos go to the default kitchen printer, drinks to the bar, desserts
+    to no printer and sides are hidden from the kitchen. Two open orders
+    and a completed one.
+    """
+    rid = test_restaurant.id
+    tacos, drinks, desserts = (Category(name=name, restaurant_id=rid) for name in ("Tacos", "Bebidas", "Postres"))
+    sides = Category(name="Extras", restaurant_id=rid, visible_in_kitchen=False)
+    db_session.add_all([tacos, drinks, desserts, sides])
+    db_session.flush()
+    grill = Printer(restaurant_id=rid, name="Cocina", printer_type=PrinterType.KITCHEN, is_default=True,
+                    ip_address="10.0.0.10", categories=[tacos])
+    bar = Printer(restaurant_id=rid, name="Barra", printer_type=PrinterType.BAR,
+                  ip_address="10.0.0.11", categories=[drinks])
+    db_session.add_all([grill, bar])
+    menu = {
+        name: MenuItem(name=name, price=30.0, category_id=category.id, restaurant_id=rid)
+        for name, category in (("Taco", tacos), ("Refresco", drinks), ("Flan", desserts), ("Papas", sides))
+    }
+    db_session.add_all(menu.values())
+    db_session.flush()
+
+    def order(number, status, *lines):
+        placed = Order(order_number=number, restaurant_id=rid, status=status, order_type="takeaway",
+                       total_amount=0.0, customer_name=f"Cliente {number}")
+        db_session.add(placed)
+        db_session.flush()
+        items = [OrderItem(order_id=placed.id, menu_item_id=menu[name].id, quantity=1, unit_price=30.0,
+                           status=item_status) for name, item_status in lines]
+        db_session.add_all(items)
+        db_session.flush()
+        return placed, items
+
+    pending = OrderItemStatus.PENDING
+    first, first_items = order(1, OrderStatus.PENDING, ("Taco", pending), ("Refresco", pending),
+                               ("Flan", pending), ("Papas", pending), ("Taco", OrderItemStatus.CANCELLED))
+    second, second_items = order(2, OrderStatus.PREPARING, ("Taco", OrderItemStatus.PREPARING),
+                                 ("Refresco", OrderItemStatus.READY))
+    order(3, OrderStatus.COMPLETED, ("Taco", pending))
+    db_session.add(OrderItemExtra(order_item_id=first_items[0].id, name="Queso", price=10.0, quantity=2))
+    db_session.commit()
+    return {"grill": grill, "bar": bar, "first": first_items, "second": second_items}
+
+
+def _ids(response):
+    assert response.status_code == 200
+    return [item["id"] for item in response.json()["items"]]
+
+
+def test_whole_kitchen_queue(client: TestClient, kitchen):
+    """Test that only open, visible, active items are listed, FIFO."""
+    first, second = kitchen["first"], kitchen["second"]
+
+    response = client.get(URL)
+
+    assert _ids(response) == [first[0].id, first[1].id, first[2].id, second[0].id]
+    body = response.json()
+    assert body["printer_ids"] is None
+    taco = body["items"][0]
+    assert (taco["order_number"], taco["customer_name"], taco["name"], taco["category_name"]) == (
+        1, "Cliente 1", "Taco", "TACOS"
+    )
+    assert taco["extras"] == [{"name": "Queso", "quantity": 2}]
+    assert taco["age_seconds"] >= 0 and taco["order_status"] == "pending"
+
+
+def test_printer_station(client: TestClient, kitchen):
+    """Test that a station only gets the categories routed to its printer."""
+    first = kitchen["first"]
+
+    assert _ids(client.get(URL, params={"printer_id": kitchen["bar"].id})) == [first[1].id]
+    # The default kitchen printer also takes categories routed nowhere
+    assert _ids(client.get(URL, params={"printer_id": kitchen["grill"].id})) == [
+        first[0].id, first[2].id, kitchen["second"][0].id
+    ]
+
+
+def test_station_by_type(client: TestClient, kitchen):
+    """Test that a station type covers every printer of the type."""
+    response = client.get(URL, params={"station": "bar"})
+
+    assert _ids(response) == [kitchen["first"][1].id]
+    assert response.json()["printer_ids"] == [kitchen["bar"].id]
+
+
+def test_invalid_station(client: TestClient, kitchen):
+    """Test that stations must exist and be named one way."""
+    assert client.get(URL, params={"printer_id": 9999}).status_code == 404
+    assert client.get(URL, params={"printer_id": kitchen["bar"].id, "station": "bar"}).status_code == 400
+
+
+def test_order_type_filter(client: TestClient, kitchen):
+    assert _ids(client.get(URL, params={"order_type": "delivery"})) == []
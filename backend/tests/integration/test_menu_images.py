@@ -0,0 +1,151 @@
+"""
+Integration tests for menu image uploads (services/menu_images.py) and
+the media endpoint that serves them.
+"""
+import struct
+import zlib
+from io import BytesIO
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.media import IMMUTABLE_CACHE_CONTROL, MENU_IMAGE_SIZES
+from app.models.menu import Category, MenuItem
+from app.models.outbox_event import OutboxEvent
+from app.models.restaurant import Restaurant
+from app.services import outbox
+
+# Uploads are checked, and variants generated, with Pillow
+Image = pytest.importorskip("PIL.Image")
+
+
+def _png(width: int, height: int) -> bytes:
+    """A solid red RGB PNG."""
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+    rows = b"".join(b"\x00" + b"\xff\x00\x00" * width for _ in range(height))
+    return (b"\x89PNG\r\n\x1a\n"
+            + chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+            + chunk(b"IDAT", zlib.compress(rows))
+            + chunk(b"IEND", b""))
+
+
+@pytest.fixture(autouse=True)
+def media_root(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "MEDIA_ROOT", str(tmp_path))
+    return tmp_path
+
+
+@pytest.fixture
+def taco(db_session: Session, test_restaurant: Restaurant) -> MenuItem:
+    category = Category(name="Tacos", restaurant_id=test_restaurant.id)
+    db_session.add(category)
+    db_session.flush()
+    item = MenuItem(name="Taco", price=30.0, category_id=category.id, restaurant_id=test_restaurant.id,
+                    image_url="https://example.com/taco.jpg")
+    db_session.add(item)
+    db_session.commit()
+    return item
+
+
+def _upload(client: TestClient, item_id: int, content: bytes, filename: str = "taco.png"):
+    return client.put(f"/api/v1/menu/{item_id}/image", files={"image": (filename, content, "image/png")})
+
+
+def test_external_image_url_is_used_at_every_size(client: TestClient, taco: MenuItem):
+    urls = client.get(f"/api/v1/menu/{taco.id}").json()["image_urls"]
+
+    assert urls == dict.fromkeys([*MENU_IMAGE_SIZES, "original"], "https://example.com/taco.jpg")
+
+
+def test_upload_serves_the_original_until_resized(client: TestClient, taco: MenuItem, media_root):
+    content = _png(4, 2)
+
+    response = _upload(client, taco.id, content)
+
+    assert response.status_code == 200
+    urls = response.json()["image_urls"]
+    assert set(urls.values()) == {urls["original"]}
+    assert urls["original"].startswith(f"/api/v1/media/menu/{taco.restaurant_id}/")
+    assert response.json()["image_url"] == "https://example.com/taco.jpg"
+
+    served = client.get(urls["original"])
+    assert served.content == content
+    assert served.headers["cache-control"] == IMMUTABLE_CACHE_CONTROL
+    assert len(list((media_root / "menu" / str(taco.restaurant_id)).iterdir())) == 1
+
+
+def test_same_content_reuses_its_url(client: TestClient, taco: MenuItem, db_session: Session):
+    first = _upload(client, taco.id, _png(3, 3)).json()["image_urls"]["original"]
+    second = _upload(client, taco.id, _png(3, 3), filename="otro.png").json()["image_urls"]["original"]
+
+    assert first == second
+    # Only the first upload schedules resizing
+    assert db_session.query(OutboxEvent).filter_by(topic=outbox.MENU_IMAGE_UPLOADED).count() == 1
+
+
+def test_rejects_files_that_are_not_images(client: TestClient, taco: MenuItem):
+    response = _upload(client, taco.id, b"<svg xmlns='http://www.w3.org/2000/svg'/>", filename="taco.svg")
+
+    assert response.status_code == 400
+    assert client.get(f"/api/v1/menu/{taco.id}").json()["image_urls"]["original"] == "https://example.com/taco.jpg"
+
+
+def test_rejects_files_over_the_size_limit(client: TestClient, taco: MenuItem, monkeypatch):
+    monkeypatch.setattr(settings, "MENU_IMAGE_MAX_BYTES", 64)
+
+    assert _upload(client, taco.id, _png(40, 40)).status_code == 400
+
+
+def test_rejects_images_over_the_pixel_limit(client: TestClient, taco: MenuItem, db_session: Session,
+                                             monkeypatch, media_root):
+    monkeypatch.setattr(settings, "MENU_IMAGE_MAX_PIXELS", 30 * 30)
+
+    response = _upload(client, taco.id, _png(40, 40))
+
+    assert response.status_code == 400
+    assert "megapíxeles" in response.json()["error"]["message"]
+    assert not (media_root / "menu").exists()
+    assert db_session.query(OutboxEvent).count() == 0
+
+
+def test_rejects_corrupt_images(client: TestClient, taco: MenuItem):
+    content = _png(4, 4)
+    junk = content[:8] + b"\x00" * 40
+    bad_checksum = content[:-20] + bytes([content[-20] ^ 0xFF]) + content[-19:]
+
+    assert _upload(client, taco.id, junk).status_code == 400
+    assert _upload(client, taco.id, bad_checksum).status_code == 400
+
+
+def test_worker_generates_webp_variants(client: TestClient, taco: MenuItem, db_session: Session):
+    _upload(client, taco.id, _png(2000, 1000))
+
+    assert outbox.drain(db_session) == 1
+
+    urls = client.get(f"/api/v1/menu/{taco.id}").json()["image_urls"]
+    for size, longest_side in MENU_IMAGE_SIZES.items():
+        assert urls[size].endswith(f"-{size}.webp")
+        served = client.get(urls[size])
+        assert served.headers["cache-control"] == IMMUTABLE_CACHE_CONTROL
+        with Image.open(BytesIO(served.content)) as variant:
+            assert variant.format == "WEBP"
+            assert variant.size == (longest_side, longest_side // 2)
+
+
+def test_delete_falls_back_to_the_external_url(client: TestClient, taco: MenuItem):
+    original = _upload(client, taco.id, _png(2, 2)).json()["image_urls"]["original"]
+
+    response = client.delete(f"/api/v1/menu/{taco.id}/image")
+
+    assert response.json()["image_urls"]["original"] == "https://example.com/taco.jpg"
+    # Cached URLs keep working
+    assert client.get(original).status_code == 200
+
+
+def test_media_rejects_unknown_names(client: TestClient, taco: MenuItem):
+    assert client.get(f"/api/v1/media/menu/{taco.restaurant_id}/{'0' * 32}.png").status_code == 404
+    assert client.get(f"/api/v1/media/menu/{taco.restaurant_id}/..%2F..%2Fsecret.png").status_code == 404
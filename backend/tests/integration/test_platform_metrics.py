@@ -0,0 +1,121 @@
+"""
+Integration tests for the platform metrics snapshot behind the sysadmin dashboards.
+"""
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.models.order import Order, OrderStatus
+from app.models.restaurant import Restaurant
+from app.models.restaurant_subscription import BillingCycle, RestaurantSubscription, SubscriptionStatus
+from app.services import platform_metrics
+from app.services.subscription import refresh_due_statuses
+
+
+@pytest.fixture(autouse=True)
+def _no_snapshot():
+    platform_metrics.invalidate_platform_metrics()
+    yield
+    platform_metrics.invalidate_platform_metrics()
+
+
+def _subscription(restaurant, plan, status, billing_cycle=BillingCycle.MONTHLY, price=100.0, period_end=None, **extra):
+    now = datetime.utcnow()
+    return RestaurantSubscription(
+        restaurant_id=restaurant.id, plan_id=plan.id, status=status, billing_cycle=billing_cycle,
+        start_date=now, current_period_start=now, current_period_end=period_end or now + timedelta(days=30),
+        base_price=price, total_price=price, **extra,
+    )
+
+
+@pytest.fixture
+def platform(db_session: Session, test_restaurant, test_admin_user, test_staff_user, test_subscription_plan):
+    """Four restaurants: active monthly, active annual (renewing soon), trial and expired."""
+    others = [Restaurant(name=f"R{i}", subdomain=f"r{i}") for i in range(3)]
+    db_session.add_all(others)
+    db_session.flush()
+    plan = test_subscription_plan
+    db_session.add_all([
+        _subscription(test_restaurant, plan, SubscriptionStatus.ACTIVE, price=999.0),
+        _subscription(others[0], plan, SubscriptionStatus.ACTIVE, BillingCycle.ANNUAL, price=1200.0,
+                      period_end=datetime.utcnow() + timedelta(days=3)),
+        _subscription(others[1], plan, SubscriptionStatus.TRIAL, price=0.0,
+                      trial_end_date=datetime.utcnow() + timedelta(days=10)),
+        _subscription(others[2], plan, SubscriptionStatus.EXPIRED, price=999.0),
+    ])
+    now = datetime.utcnow()
+    db_session.add_all([
+        Order(order_number=1, restaurant_id=test_restaurant.id, status=OrderStatus.COMPLETED,
+              total_amount=50.0, created_at=now, updated_at=now),
+        Order(order_number=2, restaurant_id=test_restaurant.id, status=OrderStatus.PENDING,
+              total_amount=70.0, created_at=now, updated_at=now),
+        Order(order_number=3, restaurant_id=test_restaurant.id, status=OrderStatus.COMPLETED,
+              total_amount=90.0, created_at=now - timedelta(days=45), updated_at=now),
+    ])
+    db_session.commit()
+
+
+def test_compute_platform_metrics(db_session, platform):
+    """Test that one pass yields every dashboard number."""
+    statements = []
+    listener = lambda *args: statements.append(args[2])
+    event.listen(db_session.bind, "before_cursor_execute", listener)
+    try:
+        metrics = platform_metrics.compute_platform_metrics(db_session)
+    finally:
+        event.remove(db_session.bind, "before_cursor_execute", listener)
+
+    assert len(statements) == 2
+    assert metrics.total_restaurants == 4
+    assert metrics.restaurants_with_subscription == 4
+    assert metrics.restaurants_by_status["active"] == 2
+    assert metrics.restaurants_by_status["trial"] == 1
+    assert metrics.suspended_restaurants == 1
+    assert metrics.total_users == 2
+    assert metrics.live_subscription_total == pytest.approx(2199.0)
+    assert metrics.mrr == pytest.approx(999.0 + 1200.0 / 12)
+    assert metrics.pending_payments == 1
+    assert metrics.orders_30d == 2
+    assert metrics.revenue_30d == pytest.approx(50.0)
+    assert [(p.name, p.subscriptions) for p in metrics.plans] == [("Pro", 3)]
+
+
+def test_endpoints_read_the_snapshot(client, db_session, platform):
+    """Test that both dashboards are served from the same snapshot."""
+    admin_stats = client.get("/api/v1/admin/stats").json()
+    global_stats = client.get("/api/v1/restaurants/stats/global").json()
+
+    assert admin_stats["active_subscriptions"] == 2
+    assert admin_stats["plans_distribution"] == {"Plan Pro": 3}
+    assert global_stats["restaurants"]["suspended"] == 1
+    assert global_stats["subscription_distribution"] == {"Pro": 3}
+    assert global_stats["computed_at"].startswith(admin_stats["computed_at"][:19])
+
+    # New data is not visible until the snapshot is refreshed
+    db_session.add(Restaurant(name="Late", subdomain="late"))
+    db_session.commit()
+    assert client.get("/api/v1/admin/stats").json()["total_restaurants"] == 4
+
+    platform_metrics.refresh_platform_metrics(db_session)
+    assert client.get("/api/v1/admin/stats").json()["total_restaurants"] == 5
+
+
+def test_refresh_due_statuses(db_session, test_restaurant, test_subscription_plan):
+    """Test the bulk version of RestaurantSubscription.update_status."""
+    past = datetime.utcnow() - timedelta(days=1)
+    trial = _subscription(test_restaurant, test_subscription_plan, SubscriptionStatus.TRIAL, trial_end_date=past)
+    active = _subscription(test_restaurant, test_subscription_plan, SubscriptionStatus.ACTIVE, period_end=past)
+    current = _subscription(test_restaurant, test_subscription_plan, SubscriptionStatus.ACTIVE)
+    db_session.add_all([trial, active, current])
+    db_session.commit()
+
+    assert refresh_due_statuses(db_session) == 2
+    db_session.expire_all()
+
+    assert trial.status == SubscriptionStatus.EXPIRED
+    assert active.status == SubscriptionStatus.PAST_DUE
+    assert active.grace_period_end > datetime.utcnow()
+    assert current.status == SubscriptionStatus.ACTIVE
+    assert refresh_due_statuses(db_session) == 0
@@ -0,0 +1,138 @@
+"""
+Integration tests for the HTTP response cache (core/response_cache.py).
+"""
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.response_cache import _matches, _responses, invalidate_on_commit, response_tag
+from app.models.menu import Category
+from app.models.restaurant import Restaurant
+from app.models.subscription_plan import SubscriptionPlan
+from app.models.table import Table
+
+CATEGORIES_URL = "/api/v1/categories/"
+TABLES_URL = "/api/v1/tables/"
+PLANS_URL = "/api/v1/subscriptions/plans"
+
+
+def test_second_request_is_served_from_cache(client: TestClient, db_session: Session, test_restaurant: Restaurant):
+    """Test that the body is cached and carries ETag and Cache-Control."""
+    db_session.add(Category(name="Tacos", restaurant_id=test_restaurant.id))
+    db_session.commit()
+
+    first = client.get(CATEGORIES_URL)
+    hits = _responses.stats()["hits"]
+    second = client.get(CATEGORIES_URL)
+
+    assert first.status_code == second.status_code == 200
+    assert [category["name"] for category in second.json()] == ["TACOS"]
+    assert second.content == first.content
+    assert second.headers["etag"] == first.headers["etag"]
+    assert second.headers["cache-control"] == "private, max-age=0, must-revalidate"
+    assert _responses.stats()["hits"] == hits + 1
+
+
+def test_if_none_match_returns_304(client: TestClient, test_restaurant: Restaurant):
+    """Test that a matching ETag is revalidated without a body."""
+    etag = client.get(CATEGORIES_URL).headers["etag"]
+
+    response = client.get(CATEGORIES_URL, headers={"If-None-Match": etag})
+
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == etag
+
+
+def test_write_through_api_invalidates(client: TestClient, test_restaurant: Restaurant):
+    """Test that creating a category drops the cached list."""
+    etag = client.get(CATEGORIES_URL).headers["etag"]
+
+    created = client.post(CATEGORIES_URL, json={"name": "Bebidas"})
+    assert created.status_code == 201
+
+    response = client.get(CATEGORIES_URL, headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert [category["name"] for category in response.json()] == ["BEBIDAS"]
+    assert response.headers["etag"] != etag
+
+
+def test_write_from_any_session_invalidates(client: TestClient, db_session: Session, test_restaurant: Restaurant):
+    """Test that ORM writes outside the API are picked up at flush."""
+    table = Table(number=1, capacity=4, location="Terraza", restaurant_id=test_restaurant.id)
+    db_session.add(table)
+    db_session.commit()
+    assert client.get(TABLES_URL).json()[0]["is_occupied"] is False
+
+    table.is_occupied = True
+    db_session.commit()
+
+    assert client.get(TABLES_URL).json()[0]["is_occupied"] is True
+
+
+def test_rollback_discards_pending_tags(client: TestClient, db_session: Session, test_restaurant: Restaurant):
+    """Test that nothing is invalidated when the transaction rolls back."""
+    client.get(TABLES_URL)
+    invalidations = _responses.stats()["invalidations"]
+
+    db_session.add(Table(number=2, capacity=2, location="Barra", restaurant_id=test_restaurant.id))
+    db_session.flush()
+    db_session.rollback()
+    db_session.commit()
+
+    assert _responses.stats()["invalidations"] == invalidations
+    assert client.get(TABLES_URL).json() == []
+
+
+def test_savepoint_rollback_keeps_pending_tags(client: TestClient, db_session: Session, test_restaurant: Restaurant):
+    """Test that a rolled back savepoint does not drop the tags of the outer transaction."""
+    client.get(TABLES_URL)
+
+    invalidate_on_commit(db_session, response_tag("tables", test_restaurant.id))
+    with pytest.raises(RuntimeError):
+        with db_session.begin_nested():
+            raise RuntimeError("savepoint failed")
+    with pytest.raises(IntegrityError):
+        with db_session.begin_nested():
+            db_session.add(Table(number=3, capacity=None, location="Barra", restaurant_id=test_restaurant.id))
+    db_session.commit()
+
+    assert _responses.stats()["size"] == 0
+
+
+def test_explicit_invalidation(client: TestClient, db_session: Session, test_restaurant: Restaurant):
+    """Test invalidate_on_commit for writes that bypass the ORM."""
+    client.get(TABLES_URL)
+
+    invalidate_on_commit(db_session, response_tag("tables", test_restaurant.id))
+    db_session.commit()
+
+    assert _responses.stats()["size"] == 0
+
+
+def test_global_route_is_public_and_invalidated_by_plan_changes(
+    client: TestClient, db_session: Session, test_subscription_plan: SubscriptionPlan
+):
+    """Test that platform-wide responses are dropped by their global tag."""
+    first = client.get(PLANS_URL)
+    assert first.status_code == 200
+    assert first.headers["cache-control"].startswith("public")
+
+    test_subscription_plan.display_name = "Plan Renombrado"
+    db_session.commit()
+
+    names = [plan["display_name"] for plan in client.get(PLANS_URL).json()]
+    assert "Plan Renombrado" in names
+
+
+@pytest.mark.parametrize("header, expected", [
+    (None, False),
+    ('"abc"', True),
+    ('W/"abc"', True),
+    ('"xyz", "abc"', True),
+    ("*", True),
+    ('"xyz"', False),
+])
+def test_matches(header, expected):
+    assert _matches(header, '"abc"') is expected
@@ -0,0 +1,185 @@
+"""
+Tests for the analytics package: columnar loading, the per-day cache and
+the NumPy demand views.
+"""
+
+import pytest
+from datetime import date, datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
+from sqlalchemy.orm import Session
+
+import numpy as np
+
+from app.models.menu import Category, MenuItem
+from app.models.order import Order, OrderStatus
+from app.models.order_item import OrderItem
+from app.services import analytics
+from app.services.analytics.columns import _to_local
+
+PHOENIX = "America/Phoenix"  # UTC-7, no DST
+
+
+@pytest.fixture(autouse=True)
+def _fresh_cache():
+    analytics.clear_column_cache()
+    yield
+    analytics.clear_column_cache()
+
+
+@pytest.fixture
+def menu(db_session: Session, test_restaurant):
+    category = Category(name="Bebidas", restaurant_id=test_restaurant.id)
+    db_session.add(category)
+    db_session.flush()
+    latte = MenuItem(name="Latte", price=50.0, category_id=category.id, restaurant_id=test_restaurant.id)
+    bagel = MenuItem(name="Bagel", price=30.0, category_id=category.id, restaurant_id=test_restaurant.id)
+    db_session.add_all([latte, bagel])
+    db_session.commit()
+    return latte, bagel
+
+
+def _add_order(db_session, restaurant, created_utc, lines, is_paid=True, number=[0]):
+    number[0] += 1
+    order = Order(order_number=number[0], restaurant_id=restaurant.id, status=OrderStatus.COMPLETED,
+                  is_paid=is_paid, total_amount=sum(q * p for _, q, p in lines),
+                  created_at=created_utc, updated_at=created_utc)
+    db_session.add(order)
+    db_session.flush()
+    for menu_item, quantity, price in lines:
+        db_session.add(OrderItem(order_id=order.id, menu_item_id=menu_item.id,
+                                 quantity=quantity, unit_price=price))
+    db_session.commit()
+    return order
+
+
+@pytest.fixture
+def sales(db_session, test_restaurant, menu):
+    """Sales on Monday 2024-03-04 and Tuesday 2024-03-05, Phoenix time."""
+    latte, bagel = menu
+    utc = timezone.utc
+    # 08:30 Monday local
+    _add_order(db_session, test_restaurant, datetime(2024, 3, 4, 15, 30, tzinfo=utc), [(latte, 2, 50.0)])
+    # 08:45 Monday local
+    _add_order(db_session, test_restaurant, datetime(2024, 3, 4, 15, 45, tzinfo=utc),
+               [(latte, 1, 50.0), (bagel, 1, 30.0)])
+    # 23:30 Monday local, already Tuesday in UTC
+    _add_order(db_session, test_restaurant, datetime(2024, 3, 5, 6, 30, tzinfo=utc), [(bagel, 3, 30.0)])
+    # 12:00 Tuesday local
+    _add_order(db_session, test_restaurant, datetime(2024, 3, 5, 19, 0, tzinfo=utc), [(latte, 1, 50.0)])
+    # Unpaid: ignored
+    _add_order(db_session, test_restaurant, datetime(2024, 3, 5, 19, 5, tzinfo=utc), [(latte, 9, 50.0)],
+               is_paid=False)
+    return latte, bagel
+
+
+def _load(db_session, restaurant, start=date(2024, 3, 4), end=date(2024, 3, 10), today=date(2024, 6, 1)):
+    return analytics.load_demand_columns(db_session, restaurant.id, start, end, PHOENIX, today=today)
+
+
+class TestLoadDemandColumns:
+    """Tests for load_demand_columns"""
+
+    def test_buckets_by_local_day(self, db_session, test_restaurant, sales):
+        columns = _load(db_session, test_restaurant)
+
+        assert columns.days == 7
+        day_index = columns.order_local_ts // 86400 - columns.first_day_number
+        assert day_index.tolist() == [0, 0, 0, 1]
+        assert columns.order_amount.sum() == pytest.approx(320.0)
+        assert columns.item_quantity.sum() == 8
+
+    def test_closed_days_are_cached(self, db_session, test_restaurant, sales):
+        latte, _ = sales
+        _load(db_session, test_restaurant)
+        _add_order(db_session, test_restaurant, datetime(2024, 3, 6, 18, 0, tzinfo=timezone.utc),
+                   [(latte, 1, 50.0)])
+
+        assert _load(db_session, test_restaurant).order_amount.size == 4
+
+        analytics.clear_column_cache(test_restaurant.id)
+        assert _load(db_session, test_restaurant).order_amount.size == 5
+
+    def test_today_is_read_fresh(self, db_session, test_restaurant, sales):
+        latte, _ = sales
+        _load(db_session, test_restaurant, today=date(2024, 3, 5))
+        _add_order(db_session, test_restaurant, datetime(2024, 3, 5, 20, 0, tzinfo=timezone.utc),
+                   [(latte, 1, 50.0)])
+
+        assert _load(db_session, test_restaurant, today=date(2024, 3, 5)).order_amount.size == 5
+
+    def test_local_offset_follows_dst(self):
+        tz = ZoneInfo("America/Los_Angeles")
+        # DST started 2024-03-10 at 10:00 UTC
+        before = int(datetime(2024, 3, 10, 9, 0, tzinfo=timezone.utc).timestamp())
+        after = int(datetime(2024, 3, 10, 11, 0, tzinfo=timezone.utc).timestamp())
+
+        local = _to_local(np.array([before, after]), tz, before - 7200, after + 7200)
+
+        assert (local - np.array([before, after])).tolist() == [-8 * 3600, -7 * 3600]
+
+
+class TestDemandViews:
+    """Tests for hourly_heatmap, daily_trend and item_velocity"""
+
+    def test_heatmap_matches_row_by_row(self, db_session, test_restaurant, sales):
+        columns = _load(db_session, test_restaurant)
+        heatmap = analytics.hourly_heatmap(columns)
+
+        expected = [[0] * 24 for _ in range(7)]
+        for order in db_session.query(Order).filter(Order.is_paid.is_(True)):
+            local = order.created_at.replace(tzinfo=timezone.utc).astimezone(ZoneInfo(PHOENIX))
+            expected[local.weekday()][local.hour] += 1
+        assert heatmap["orders"] == expected
+        assert heatmap["orders"][0][8] == 2
+        assert heatmap["revenue"][0][23] == pytest.approx(90.0)
+        assert heatmap["weekday_occurrences"] == [1] * 7
+
+    def test_daily_trend_rolling_average(self, db_session, test_restaurant, sales):
+        trend = analytics.daily_trend(_load(db_session, test_restaurant), window=2)
+
+        assert [day["orders_count"] for day in trend] == [3, 1, 0, 0, 0, 0, 0]
+        assert trend[0]["total_sales"] == pytest.approx(270.0)
+        assert trend[0]["rolling_sales"] == pytest.approx(270.0)
+        assert trend[1]["rolling_sales"] == pytest.approx(160.0)
+        assert trend[2]["rolling_orders"] == pytest.approx(0.5)
+
+    def test_item_velocity(self, db_session, test_restaurant, sales):
+        latte, bagel = sales
+        items = analytics.item_velocity(_load(db_session, test_restaurant))
+
+        assert [item["menu_item_id"] for item in items] == [latte.id, bagel.id]
+        assert items[0]["units_sold"] == 4
+        assert items[0]["selling_days"] == 2
+        assert items[0]["peak_hour"] == 8
+        assert items[1]["revenue"] == pytest.approx(120.0)
+        assert items[1]["peak_hour"] == 23
+        assert items[1]["units_per_day"] == pytest.approx(4 / 7, abs=0.01)
+
+    def test_empty_period(self, db_session, test_restaurant):
+        columns = _load(db_session, test_restaurant)
+
+        assert analytics.item_velocity(columns) == []
+        assert sum(map(sum, analytics.hourly_heatmap(columns)["orders"])) == 0
+        assert len(analytics.daily_trend(columns)) == 7
+
+
+class TestDemandEndpoints:
+    """Tests for the /reports/demand routes"""
+
+    def test_item_velocity_endpoint(self, client, db_session, test_restaurant, sales):
+        test_restaurant.timezone = PHOENIX
+        db_session.commit()
+
+        response = client.get("/api/v1/reports/demand/items",
+                              params={"start_date": "2024-03-04", "end_date": "2024-03-10"})
+
+        assert response.status_code == 200
+        body = response.json()
+        assert body["period"]["days"] == 7
+        assert body["items"][0]["name"] == "Latte"
+
+    def test_rejects_bad_range(self, client):
+        assert client.get("/api/v1/reports/demand/heatmap",
+                          params={"start_date": "2024-03-10", "end_date": "2024-03-01"}).status_code == 400
+        assert client.get("/api/v1/reports/demand/trend",
+                          params={"start_date": "2022-01-01", "end_date": "2024-01-01"}).status_code == 400
@@ -9,13 +9,16 @@ Tests report generation operations:
 """
 
 import pytest
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from decimal import Decimal
 from sqlalchemy.orm import Session
 
 from app.services.cash_register.report_service import (
+    cut_session,
     get_daily_summary_reports,
+    get_last_cut,
     get_reports,
+    get_weekly_summary,
     generate_cash_difference_report
 )
 from app.services.cash_register.session_service import create_session, close_session
@@ -28,7 +31,8 @@ from app.models.cash_register import (
 from app.schemas.cash_register import (
     CashRegisterSessionCreate,
     CashRegisterSessionUpdate,
-    CashTransactionCreate
+    CashTransactionCreate,
+    PaymentBreakdownReport
 )
 
 
@@ -243,3 +247,110 @@ class TestGetDailySummaryReports:
         
         assert len(result) == 1
         assert result[0].session_id == session1.id
+
+
+class TestReportSnapshots:
+    """Tests for summary snapshots (snapshot_service.py)"""
+    
+    def _closed_session_with_sale(self, db_session: Session, restaurant_id: int, user_id: int):
+        session_data = CashRegisterSessionCreate(
+            opened_by_user_id=user_id,
+            cashier_id=user_id,
+            initial_balance=Decimal("100.00")
+        )
+        session = create_session(db_session, session_data, restaurant_id)
+        create_transaction(db_session, CashTransactionCreate(
+            session_id=session.id,
+            transaction_type=TransactionType.SALE,
+            amount=Decimal("50.00"),
+            description="Sale",
+            payment_method=PaymentMethod.CARD,
+            created_by_user_id=user_id
+        ), user_id)
+        close_session(db_session, session.id, CashRegisterSessionUpdate(final_balance=Decimal("150.00")))
+        return session
+    
+    def test_close_writes_final_snapshot(
+        self, 
+        db_session: Session, 
+        test_restaurant, 
+        test_admin_user
+    ):
+        """Test that closing a session stores its summary as typed columns and compressed data"""
+        import json
+        
+        session = self._closed_session_with_sale(db_session, test_restaurant.id, test_admin_user.id)
+        
+        [snapshot] = get_reports(db_session, session_id=session.id)
+        
+        assert snapshot.is_final is True
+        assert snapshot.restaurant_id == test_restaurant.id
+        assert (float(snapshot.total_sales), float(snapshot.card_payments), snapshot.total_transactions) == (
+            50.0, 50.0, 1
+        )
+        assert json.loads(snapshot.data)["payment_breakdown"]["card"] == 50.0
+        assert len(snapshot.payload) < len(snapshot.data)
+        # The snapshot is not a cut
+        assert get_last_cut(db_session, session.id) is None
+    
+    def test_summaries_are_served_from_snapshots(
+        self, 
+        db_session: Session, 
+        test_restaurant, 
+        test_admin_user
+    ):
+        """Test that closed sessions are not recomputed and open ones are"""
+        closed = self._closed_session_with_sale(db_session, test_restaurant.id, test_admin_user.id)
+        [snapshot] = get_reports(db_session, session_id=closed.id)
+        snapshot.total_sales = Decimal("75.00")
+        db_session.commit()
+        
+        open_session = create_session(db_session, CashRegisterSessionCreate(
+            opened_by_user_id=test_admin_user.id,
+            cashier_id=test_admin_user.id,
+            initial_balance=Decimal("0.00")
+        ), test_restaurant.id)
+        create_transaction(db_session, CashTransactionCreate(
+            session_id=open_session.id,
+            transaction_type=TransactionType.SALE,
+            amount=Decimal("20.00"),
+            description="Sale",
+            payment_method=PaymentMethod.CASH,
+            created_by_user_id=test_admin_user.id
+        ), test_admin_user.id)
+        
+        [daily] = get_daily_summary_reports(db_session, restaurant_id=test_restaurant.id)
+        assert (daily.session_id, daily.total_sales) == (closed.id, 75.0)
+        assert daily.closed_at is not None
+        
+        weekly = get_weekly_summary(
+            db_session,
+            datetime.now(timezone.utc) - timedelta(days=7),
+            datetime.now(timezone.utc) + timedelta(minutes=1),
+            restaurant_id=test_restaurant.id
+        )
+        assert (weekly.total_sessions, weekly.total_sales, weekly.total_transactions) == (2, 95.0, 2)
+        assert weekly.payment_breakdown == {"cash": 20.0, "card": 50.0, "digital": 0.0, "other": 0.0}
+    
+    def test_get_reports_filters_by_restaurant_and_orders_newest_first(
+        self, 
+        db_session: Session, 
+        test_restaurant, 
+        test_admin_user
+    ):
+        """Test restaurant filtering and the cut/last cut round trip"""
+        session = create_session(db_session, CashRegisterSessionCreate(
+            opened_by_user_id=test_admin_user.id,
+            cashier_id=test_admin_user.id,
+            initial_balance=Decimal("0.00")
+        ), test_restaurant.id)
+        for cash in (10.0, 30.0):
+            cut_session(db_session, session.id, PaymentBreakdownReport(
+                session_id=session.id, cash_payments=cash, card_payments=0.0,
+                digital_payments=0.0, other_payments=0.0
+            ))
+        
+        reports = get_reports(db_session, restaurant_id=test_restaurant.id)
+        assert [float(report.cash_payments) for report in reports] == [30.0, 10.0]
+        assert get_reports(db_session, restaurant_id=test_restaurant.id + 1) == []
+        assert get_last_cut(db_session, session.id).payment_breakdown["cash"] == 30.0
@@ -0,0 +1,222 @@
+"""
+Tests for the payment pipeline (payment_service.settle_order / process_order_payment).
+"""
+
+import pytest
+from decimal import Decimal
+from sqlalchemy import event, update
+from sqlalchemy.orm import Session
+
+from app.core.exceptions import ConflictError, ValidationError
+from app.models.cash_register import (
+    CashRegisterSession,
+    CashTransaction,
+    PaymentMethod as CashPaymentMethod,
+    SessionStatus,
+)
+from app.models.order import Order as OrderModel, OrderStatus
+from app.models.table import Table
+from app.schemas.cash_register import CashRegisterSessionCreate, CashRegisterSessionUpdate
+from app.services.cash_register import (
+    clear_open_session_cache,
+    close_session,
+    create_session,
+    get_open_session_id,
+)
+from app.services.orders.payment_service import process_order_payment
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    clear_open_session_cache()
+    yield
+    clear_open_session_cache()
+
+
+@pytest.fixture
+def cash_session(db_session: Session, test_restaurant, test_admin_user) -> CashRegisterSession:
+    return create_session(db_session, CashRegisterSessionCreate(
+        opened_by_user_id=test_admin_user.id, initial_balance=Decimal("100.00"),
+    ), test_restaurant.id)
+
+
+@pytest.fixture
+def table(db_session: Session, test_restaurant) -> Table:
+    table = Table(number=1, capacity=4, location="Terraza", restaurant_id=test_restaurant.id, is_occupied=True)
+    db_session.add(table)
+    db_session.commit()
+    return table
+
+
+def _order(db: Session, restaurant_id: int, number: int, table: Table = None, total: float = 80.0) -> OrderModel:
+    order = OrderModel(order_number=number, restaurant_id=restaurant_id, total_amount=total,
+                       table_id=table.id if table else None, order_type="dine_in" if table else "takeaway")
+    db.add(order)
+    db.commit()
+    return order
+
+
+def _pay(db: Session, order: OrderModel, user, method: str = "card", status=None) -> OrderModel:
+    return process_order_payment(db, order.id, method, user.id, order.restaurant_id, status=status)
+
+
+class _Statements:
+    """Statements sent to the database inside the block."""
+
+    def __init__(self, db: Session):
+        self.bind = db.bind
+        self.statements = []
+
+    def _record(self, conn, cursor, statement, *args):
+        self.statements.append(statement)
+
+    def __enter__(self):
+        event.listen(self.bind, "before_cursor_execute", self._record)
+        return self.statements
+
+    def __exit__(self, *exc):
+        event.remove(self.bind, "before_cursor_execute", self._record)
+
+
+def _transactions(db: Session, order_id: int):
+    return db.query(CashTransaction).filter(CashTransaction.order_id == order_id).all()
+
+
+class TestProcessOrderPayment:
+    """Tests for process_order_payment"""
+
+    def test_pays_order_and_records_sale(self, db_session, test_restaurant, test_admin_user, cash_session, table):
+        order = _order(db_session, test_restaurant.id, 1, table)
+
+        paid = _pay(db_session, order, test_admin_user)
+
+        assert paid.is_paid and paid.status == OrderStatus.COMPLETED
+        [sale] = _transactions(db_session, order.id)
+        assert sale.session_id == cash_session.id
+        assert sale.amount == Decimal("80.00")
+        assert sale.payment_method == CashPaymentMethod.CARD
+        assert sale.description == "Pago de orden #1"
+        db_session.refresh(table)
+        assert table.is_occupied is False
+
+    def test_table_stays_occupied_with_other_active_orders(self, db_session, test_restaurant, test_admin_user,
+                                                           cash_session, table):
+        order = _order(db_session, test_restaurant.id, 1, table)
+        _order(db_session, test_restaurant.id, 2, table)
+
+        _pay(db_session, order, test_admin_user)
+
+        db_session.refresh(table)
+        assert table.is_occupied is True
+
+    def test_status_can_be_given(self, db_session, test_restaurant, test_admin_user, cash_session):
+        order = _order(db_session, test_restaurant.id, 1)
+
+        assert _pay(db_session, order, test_admin_user, status="ready").status == OrderStatus.READY
+
+    def test_already_paid(self, db_session, test_restaurant, test_admin_user, cash_session):
+        order = _order(db_session, test_restaurant.id, 1)
+        _pay(db_session, order, test_admin_user)
+
+        with pytest.raises(ConflictError):
+            _pay(db_session, order, test_admin_user)
+        assert len(_transactions(db_session, order.id)) == 1
+
+    def test_requires_open_session(self, db_session, test_restaurant, test_admin_user):
+        order = _order(db_session, test_restaurant.id, 1)
+
+        with pytest.raises(ValidationError, match="No open cash register session"):
+            _pay(db_session, order, test_admin_user)
+        db_session.refresh(order)
+        assert order.is_paid is False
+
+    def test_invalid_payment_method(self, db_session, test_restaurant, test_admin_user, cash_session):
+        order = _order(db_session, test_restaurant.id, 1)
+
+        with pytest.raises(ValidationError):
+            _pay(db_session, order, test_admin_user, method="cheque")
+
+
+class TestOpenSessionCache:
+    """The open session is cached per restaurant and user"""
+
+    def test_payment_statement_count(self, db_session, test_restaurant, test_admin_user, cash_session, table):
+        first = _order(db_session, test_restaurant.id, 1, table)
+        order = _order(db_session, test_restaurant.id, 2, table)
+        restaurant_id, order_id, user_id = test_restaurant.id, order.id, test_admin_user.id
+
+        with _Statements(db_session) as cold:
+            _pay(db_session, first, test_admin_user)
+        with _Statements(db_session) as warm:
+            process_order_payment(db_session, order_id, "cash", user_id, restaurant_id)
+
+        # SELECT order, INSERT ... SELECT sale, UPDATE table, UPDATE order
+        assert [s.split()[0] for s in warm] == ["SELECT", "INSERT", "UPDATE", "UPDATE"]
+        assert "FROM orders" in warm[0] and "JOIN" not in warm[0]
+        # A cold cache adds the open-session lookup
+        assert sum("FROM cash_register_sessions" in s and not s.startswith("INSERT") for s in cold) == 1
+
+    def test_close_invalidates(self, db_session, test_restaurant, test_admin_user, cash_session):
+        order = _order(db_session, test_restaurant.id, 1)
+        assert get_open_session_id(db_session, test_restaurant.id, test_admin_user.id) == cash_session.id
+
+        close_session(db_session, cash_session.id, CashRegisterSessionUpdate(final_balance=Decimal("100.00")))
+
+        assert get_open_session_id(db_session, test_restaurant.id, test_admin_user.id) is None
+        with pytest.raises(ValidationError):
+            _pay(db_session, order, test_admin_user)
+
+    def test_session_closed_elsewhere_is_refreshed(self, db_session, test_restaurant, test_admin_user, cash_session):
+        order = _order(db_session, test_restaurant.id, 1)
+        get_open_session_id(db_session, test_restaurant.id, test_admin_user.id)
+        # Another worker closes the cached session and opens a new one
+        db_session.execute(update(CashRegisterSession).values(status=SessionStatus.CLOSED))
+        db_session.commit()
+        newer = CashRegisterSession(restaurant_id=test_restaurant.id, session_number=2, opened_at=cash_session.opened_at,
+                                    opened_by_user_id=test_admin_user.id, status=SessionStatus.OPEN)
+        db_session.add(newer)
+        db_session.commit()
+
+        _pay(db_session, order, test_admin_user)
+
+        assert [sale.session_id for sale in _transactions(db_session, order.id)] == [newer.id]
+
+
+def test_pay_endpoint(client, db_session, test_restaurant, test_admin_user, cash_session):
+    order = _order(db_session, test_restaurant.id, 7)
+
+    response = client.patch(f"/api/v1/orders/{order.id}/pay", params={"payment_method": "CASH"})
+    again = client.patch(f"/api/v1/orders/{order.id}/pay", params={"payment_method": "cash"})
+
+    assert response.status_code == 200
+    assert response.json()["is_paid"] is True
+    assert again.status_code == 409
+
+
+@pytest.mark.parametrize("params", [{}, {"status": "entregado"}])
+def test_pay_endpoint_keeps_status_without_a_valid_one(client, db_session, test_restaurant, test_admin_user,
+                                                       cash_session, params):
+    order = _order(db_session, test_restaurant.id, 7)
+
+    response = client.patch(f"/api/v1/orders/{order.id}/pay", params={"payment_method": "cash", **params})
+
+    assert response.status_code == 200
+    assert (response.json()["is_paid"], response.json()["status"]) == (True, OrderStatus.PENDING.value)
+
+
+def test_pay_endpoint_sets_given_status(client, db_session, test_restaurant, test_admin_user, cash_session):
+    order = _order(db_session, test_restaurant.id, 7)
+
+    response = client.patch(f"/api/v1/orders/{order.id}/pay", params={"payment_method": "cash", "status": "COMPLETED"})
+
+    assert response.json()["status"] == OrderStatus.COMPLETED.value
+
+
+def test_update_endpoint_pays_order(client, db_session, test_restaurant, test_admin_user, cash_session):
+    order = _order(db_session, test_restaurant.id, 8)
+
+    response = client.put(f"/api/v1/orders/{order.id}", json={"is_paid": True, "payment_method": "digital"})
+
+    assert response.status_code == 200
+    [sale] = _transactions(db_session, order.id)
+    assert sale.payment_method == CashPaymentMethod.DIGITAL
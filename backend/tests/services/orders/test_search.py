@@ -0,0 +1,202 @@
+"""
+Tests for orders/search.py: tokenizing, index maintenance and ranked search.
+"""
+
+import pytest
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.models.menu import Category, MenuItem
+from app.models.order import Order as OrderModel, OrderStatus
+from app.models.order_item import OrderItem as OrderItemModel
+from app.models.order_search_token import OrderSearchToken
+from app.models.restaurant import Restaurant
+from app.services.orders.order_crud import get_orders
+from app.services.orders.search import item_tokens, order_tokens, reindex_order, search_subquery, tokenize
+
+
+@pytest.fixture
+def menu(db_session: Session, test_restaurant):
+    category = Category(name="Tacos", restaurant_id=test_restaurant.id)
+    db_session.add(category)
+    db_session.flush()
+    items = {
+        name: MenuItem(name=name, price=25.0, category_id=category.id, restaurant_id=test_restaurant.id)
+        for name in ("Taco al pastor", "Quesadilla", "Horchata")
+    }
+    db_session.add_all(items.values())
+    db_session.commit()
+    return items
+
+
+def _order(db: Session, restaurant_id: int, number: int, items=(), **fields) -> OrderModel:
+    order = OrderModel(order_number=number, restaurant_id=restaurant_id, **fields)
+    order.items = [OrderItemModel(menu_item_id=item.id, quantity=1, unit_price=item.price) for item in items]
+    db.add(order)
+    db.commit()
+    return order
+
+
+def _tokens(db: Session, order_id: int) -> dict:
+    rows = db.query(OrderSearchToken).filter(OrderSearchToken.order_id == order_id)
+    return {row.token: row.weight for row in rows}
+
+
+def _numbers(orders) -> list:
+    return [order["order_number"] for order in orders]
+
+
+class TestTokenize:
+    """Tests for tokenize and order_tokens"""
+
+    def test_lowercases_and_strips_accents(self):
+        assert tokenize("José Peña, sin CEBOLLA") == ["jose", "pena", "sin", "cebolla"]
+
+    def test_numbers_also_index_without_leading_zeros(self):
+        assert tokenize("20261019-042") == ["20261019", "042", "42"]
+
+    def test_empty(self):
+        assert tokenize(None) == []
+        assert tokenize("¡!") == []
+
+    def test_most_relevant_field_wins(self):
+        tokens = order_tokens(7, None, "Pastor Gómez", "pastor para llevar")
+        assert tokens == {"7": 8, "pastor": 4, "gomez": 4, "para": 1, "llevar": 1}
+
+    def test_item_tokens_include_variant(self):
+        assert item_tokens("Horchata", "Grande") == {"horchata": 2, "grande": 2}
+
+
+class TestIndexMaintenance:
+    """The index follows order and item changes on commit"""
+
+    def test_new_order_is_indexed(self, db_session, test_restaurant, menu):
+        order = _order(db_session, test_restaurant.id, 12, [menu["Quesadilla"]],
+                       customer_name="Ana", notes="Sin crema", ticket_number="20261019-012")
+
+        assert _tokens(db_session, order.id) == {
+            "12": 8, "20261019": 8, "012": 8, "ana": 4, "quesadilla": 2, "sin": 1, "crema": 1,
+        }
+
+    def test_field_update_reindexes(self, db_session, test_restaurant):
+        order = _order(db_session, test_restaurant.id, 1, customer_name="Ana")
+
+        order.customer_name = "Beatriz"
+        db_session.commit()
+
+        tokens = _tokens(db_session, order.id)
+        assert "beatriz" in tokens and "ana" not in tokens
+
+    def test_item_add_and_soft_delete_reindex(self, db_session, test_restaurant, menu):
+        order = _order(db_session, test_restaurant.id, 1)
+        item = OrderItemModel(order_id=order.id, menu_item_id=menu["Horchata"].id, quantity=1, unit_price=25.0)
+        db_session.add(item)
+        db_session.commit()
+        assert "horchata" in _tokens(db_session, order.id)
+
+        item.deleted_at = datetime.now(timezone.utc)
+        db_session.commit()
+        assert "horchata" not in _tokens(db_session, order.id)
+
+    def test_rollback_discards_pending(self, db_session, test_restaurant):
+        order = _order(db_session, test_restaurant.id, 1, customer_name="Ana")
+
+        order.customer_name = "Beatriz"
+        db_session.flush()
+        db_session.rollback()
+        db_session.commit()
+
+        assert "ana" in _tokens(db_session, order.id)
+
+    def test_savepoint_rollback_keeps_pending(self, db_session, test_restaurant):
+        order = _order(db_session, test_restaurant.id, 1, customer_name="Ana")
+
+        order.customer_name = "Beatriz"
+        db_session.flush()
+        with pytest.raises(RuntimeError):
+            with db_session.begin_nested():
+                raise RuntimeError("falla el savepoint")
+        with pytest.raises(IntegrityError):
+            with db_session.begin_nested():
+                db_session.add(OrderModel(order_number=2, restaurant_id=None))
+        db_session.commit()
+
+        assert "beatriz" in _tokens(db_session, order.id)
+
+    def test_reindex_order_rebuilds_tokens(self, db_session, test_restaurant):
+        order = _order(db_session, test_restaurant.id, 1, customer_name="Ana")
+        db_session.query(OrderSearchToken).delete()
+
+        assert reindex_order(db_session, order.id) == 2
+        assert set(_tokens(db_session, order.id)) == {"1", "ana"}
+
+
+class TestSearchOrders:
+    """Tests for the search filter of get_orders"""
+
+    def test_prefix_match_on_any_field(self, db_session, test_restaurant, menu):
+        _order(db_session, test_restaurant.id, 1, [menu["Taco al pastor"]])
+        _order(db_session, test_restaurant.id, 2, customer_name="José")
+        _order(db_session, test_restaurant.id, 3, notes="Sin cebolla")
+
+        def search(text):
+            return _numbers(get_orders(db_session, restaurant_id=test_restaurant.id, search=text))
+
+        assert search("past") == [1]
+        assert search("jose") == [2]
+        assert search("Cebo") == [3]
+        assert search("nada") == []
+
+    def test_all_terms_must_match(self, db_session, test_restaurant, menu):
+        _order(db_session, test_restaurant.id, 1, [menu["Horchata"]], customer_name="Ana")
+        _order(db_session, test_restaurant.id, 2, [menu["Horchata"]], customer_name="Luis")
+
+        orders = get_orders(db_session, restaurant_id=test_restaurant.id, search="ana horch")
+        assert _numbers(orders) == [1]
+
+    def test_relevance_ranks_exact_and_weighted_matches_first(self, db_session, test_restaurant):
+        _order(db_session, test_restaurant.id, 420)
+        _order(db_session, test_restaurant.id, 42)
+        _order(db_session, test_restaurant.id, 7, notes="Mesa 42")
+
+        orders = get_orders(db_session, restaurant_id=test_restaurant.id, search="#42", sort_by="relevance")
+        assert _numbers(orders) == [42, 420, 7]
+
+    def test_combines_with_status_and_dates(self, db_session, test_restaurant):
+        now = datetime.now(timezone.utc)
+        _order(db_session, test_restaurant.id, 1, customer_name="Ana", status=OrderStatus.COMPLETED,
+               created_at=now - timedelta(days=10))
+        _order(db_session, test_restaurant.id, 2, customer_name="Ana", status=OrderStatus.COMPLETED)
+        _order(db_session, test_restaurant.id, 3, customer_name="Ana")
+
+        orders = get_orders(db_session, restaurant_id=test_restaurant.id, search="ana",
+                            status=OrderStatus.COMPLETED, start_date=now - timedelta(days=1))
+        assert _numbers(orders) == [2]
+
+    def test_scoped_to_restaurant(self, db_session, test_restaurant):
+        other = Restaurant(name="Otro", subdomain="otro")
+        db_session.add(other)
+        db_session.commit()
+        mine = _order(db_session, test_restaurant.id, 1, customer_name="Ana")
+        _order(db_session, other.id, 1, customer_name="Ana")
+
+        matches = db_session.execute(select(search_subquery(test_restaurant.id, "ana").c.order_id)).scalars()
+        assert list(matches) == [mine.id]
+
+    def test_text_without_words_matches_nothing(self, db_session, test_restaurant):
+        _order(db_session, test_restaurant.id, 1)
+
+        assert _numbers(get_orders(db_session, restaurant_id=test_restaurant.id, search="¿?")) == []
+        assert _numbers(get_orders(db_session, restaurant_id=test_restaurant.id, search="")) == [1]
+
+
+def test_search_endpoint(client, db_session, test_restaurant):
+    _order(db_session, test_restaurant.id, 5, customer_name="Mariana")
+    _order(db_session, test_restaurant.id, 6, customer_name="Pedro")
+
+    response = client.get("/api/v1/orders/", params={"search": "mari", "sort_by": "relevance"})
+
+    assert response.status_code == 200
+    assert _numbers(response.json()) == [5]
@@ -0,0 +1,126 @@
+"""
+Tests for orders/serializers.py and the FastJSONResponse fast path.
+
+The serializers must emit exactly what the Pydantic response models would,
+because order routes skip response_model validation.
+"""
+
+import orjson
+import pytest
+from datetime import datetime, timezone
+from pydantic import TypeAdapter
+from sqlalchemy.orm import Session
+
+from app.core.responses import FastJSONResponse
+from app.models.menu import Category, MenuItem, MenuItemVariant
+from app.models.order import Order as OrderModel, OrderStatus, PaymentMethod
+from app.models.order_item import OrderItem as OrderItemModel
+from app.models.order_item_extra import OrderItemExtra
+from app.models.order_person import OrderPerson
+from app.models.table import Table
+from app.schemas.order import Order, OrderItem
+from app.services.orders.serializers import serialize_order, serialize_order_item, serialize_orders
+
+
+@pytest.fixture
+def order_graph(db_session: Session, test_restaurant) -> OrderModel:
+    """Dine-in order with two diners, a variant, extras and a deleted item."""
+    now = datetime.now(timezone.utc)
+    category = Category(name="Tacos", restaurant_id=test_restaurant.id)
+    db_session.add(category)
+    db_session.flush()
+
+    taco = MenuItem(name="Taco al pastor", price=25.0, discount_price=22.0,
+                    category_id=category.id, restaurant_id=test_restaurant.id)
+    soda = MenuItem(name="Refresco", price=30.0, category_id=category.id,
+                    restaurant_id=test_restaurant.id)
+    db_session.add_all([taco, soda])
+    db_session.flush()
+    large = MenuItemVariant(menu_item_id=soda.id, name="Grande", price=35.0)
+    table = Table(number=7, capacity=4, location="Terraza", restaurant_id=test_restaurant.id)
+    db_session.add_all([large, table])
+    db_session.flush()
+
+    order = OrderModel(order_number=1, table_id=table.id, status=OrderStatus.PREPARING,
+                       notes="Sin cebolla", total_amount=131.5, restaurant_id=test_restaurant.id,
+                       payment_method=PaymentMethod.CARD, created_at=now, updated_at=now)
+    db_session.add(order)
+    db_session.flush()
+
+    persons = [OrderPerson(order_id=order.id, name=f"Persona {i}", position=i) for i in (1, 2)]
+    db_session.add_all(persons)
+    db_session.flush()
+
+    items = [
+        OrderItemModel(order_id=order.id, person_id=persons[0].id, menu_item_id=taco.id,
+                       quantity=3, unit_price=22.0, special_instructions="Con piña"),
+        OrderItemModel(order_id=order.id, person_id=persons[1].id, menu_item_id=soda.id,
+                       variant_id=large.id, quantity=1, unit_price=35.0),
+        OrderItemModel(order_id=order.id, person_id=persons[1].id, menu_item_id=taco.id,
+                       quantity=1, unit_price=22.0, deleted_at=now),
+    ]
+    db_session.add_all(items)
+    db_session.flush()
+    db_session.add(OrderItemExtra(order_item_id=items[0].id, name="Guacamole", price=15.0, quantity=2))
+    db_session.add(OrderItemExtra(order_item_id=items[1].id, name="Hielo", price=0.0, quantity=1))
+    db_session.commit()
+    db_session.expire_all()
+    return db_session.get(OrderModel, order.id)
+
+
+def _via_response_model(model, data) -> object:
+    """What FastAPI would send after validating data against the response model."""
+    adapter = TypeAdapter(model)
+    return adapter.dump_python(adapter.validate_python(data), mode="json")
+
+
+class TestSerializeOrder:
+    """Tests for serialize_order"""
+
+    def test_matches_response_model(self, order_graph):
+        """Fast path output is identical to the validated response model output"""
+        data = serialize_order(order_graph)
+
+        assert orjson.loads(FastJSONResponse(data).body) == _via_response_model(Order, data)
+
+    def test_totals_include_extras_and_skip_deleted_items(self, order_graph):
+        """Subtotal counts extras and ignores soft-deleted items"""
+        data = serialize_order(order_graph)
+
+        assert len(data["items"]) == 2
+        assert data["subtotal"] == pytest.approx(3 * 22.0 + 2 * 15.0 + 35.0)
+        assert data["table_number"] == 7
+
+    def test_person_items_share_serialized_items(self, order_graph):
+        """Each item is serialized once and reused in the persons breakdown"""
+        data = serialize_order(order_graph)
+
+        by_id = {item["id"]: item for item in data["items"]}
+        person_item = data["persons"][0]["items"][0]
+        assert person_item is by_id[person_item["id"]]
+
+    def test_datetimes_rendered_in_phoenix_time(self, order_graph):
+        """Datetimes keep the PhoenixBaseModel encoding"""
+        body = orjson.loads(FastJSONResponse(serialize_order(order_graph)).body)
+
+        assert body["created_at"].endswith("-07:00")
+
+
+class TestSerializeOrders:
+    """Tests for serialize_orders"""
+
+    def test_shares_menu_items_across_orders(self, order_graph):
+        """A dish appearing in several orders is serialized once per page"""
+        first, second = serialize_orders([order_graph, order_graph])
+
+        assert first["items"][0]["menu_item"] is second["items"][0]["menu_item"]
+
+
+class TestSerializeOrderItem:
+    """Tests for serialize_order_item"""
+
+    def test_matches_response_model(self, order_graph):
+        """Single item output is identical to the validated response model output"""
+        data = serialize_order_item(order_graph.items[0])
+
+        assert orjson.loads(FastJSONResponse(data).body) == _via_response_model(OrderItem, data)
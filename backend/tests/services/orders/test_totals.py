@@ -0,0 +1,181 @@
+"""
+Tests for orders/totals.py.
+
+Every mutation path is followed by the verifier: the stored order total
+and diner subtotals must equal a from-scratch recomputation.
+"""
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.models.menu import Category, MenuItem
+from app.models.order import Order as OrderModel
+from app.models.order_item import OrderItem as OrderItemModel
+from app.models.order_person import OrderPerson
+from app.schemas.order import (
+    OrderCreate,
+    OrderItemCreate,
+    OrderItemExtraCreate,
+    OrderItemExtraUpdate,
+    OrderItemUpdate,
+    OrderPersonCreate,
+)
+from app.services.orders import (
+    add_extra_to_item,
+    add_order_item,
+    compute_order_totals,
+    create_order_with_items,
+    delete_item_extra,
+    delete_order_item,
+    get_extra_by_id,
+    recompute_order_totals,
+    update_item_extra,
+    update_order_item,
+)
+from app.services.orders.totals import record_item_changed
+
+
+@pytest.fixture
+def menu(db_session: Session, test_restaurant):
+    category = Category(name="Tacos", restaurant_id=test_restaurant.id)
+    db_session.add(category)
+    db_session.flush()
+    taco = MenuItem(name="Taco", price=25.0, category_id=category.id, restaurant_id=test_restaurant.id)
+    soda = MenuItem(name="Refresco", price=30.0, category_id=category.id, restaurant_id=test_restaurant.id)
+    db_session.add_all([taco, soda])
+    db_session.commit()
+    return taco, soda
+
+
+@pytest.fixture
+def order(db_session: Session, test_restaurant, menu) -> OrderModel:
+    """Takeaway order with two diners, one of them with extras."""
+    taco, soda = menu
+    created = create_order_with_items(db_session, OrderCreate(
+        order_type="takeaway",
+        customer_name="Mesa larga",
+        persons=[
+            OrderPersonCreate(name="Ana", position=1, items=[
+                OrderItemCreate(menu_item_id=taco.id, quantity=3, extras=[
+                    OrderItemExtraCreate(name="Guacamole", price=15.0, quantity=2),
+                ]),
+            ]),
+            OrderPersonCreate(name="Luis", position=2, items=[
+                OrderItemCreate(menu_item_id=soda.id, quantity=1),
+            ]),
+        ],
+    ), restaurant_id=test_restaurant.id)
+    return db_session.get(OrderModel, created["id"])
+
+
+def _stored(db: Session, order_id: int):
+    db.expire_all()
+    stored = db.get(OrderModel, order_id)
+    return stored.total_amount, {person.id: person.subtotal for person in stored.persons}
+
+
+def assert_totals_consistent(db: Session, order_id: int):
+    """The verifier: stored values equal a recomputation from scratch."""
+    total, persons = _stored(db, order_id)
+    expected = compute_order_totals(db, order_id)
+    assert total == pytest.approx(expected.total)
+    assert persons == pytest.approx(expected.persons)
+    return expected
+
+
+def _person(order: OrderModel, name: str) -> OrderPerson:
+    return next(person for person in order.persons if person.name == name)
+
+
+class TestOrderTotals:
+    """Tests for the incremental totals engine"""
+
+    def test_create_order_sets_person_subtotals(self, db_session, order):
+        expected = assert_totals_consistent(db_session, order.id)
+
+        assert expected.total == 135.0
+        assert expected.persons[_person(order, "Ana").id] == 105.0
+        assert expected.persons[_person(order, "Luis").id] == 30.0
+
+    def test_item_changes(self, db_session, order, menu):
+        taco, soda = menu
+        luis = _person(order, "Luis")
+
+        added = add_order_item(db_session, order, OrderItemCreate(
+            menu_item_id=taco.id, quantity=2, person_id=luis.id,
+            extras=[OrderItemExtraCreate(name="Queso", price=5.0, quantity=1)],
+        ))
+        assert_totals_consistent(db_session, order.id)
+
+        db_item = db_session.get(OrderItemModel, added["id"])
+        update_order_item(db_session, db_item, OrderItemUpdate(quantity=4))
+        expected = assert_totals_consistent(db_session, order.id)
+        assert expected.persons[luis.id] == 30.0 + 4 * 25.0 + 5.0
+
+        delete_order_item(db_session, db_session.get(OrderItemModel, added["id"]))
+        expected = assert_totals_consistent(db_session, order.id)
+        assert expected.total == 135.0
+
+        # Deleting twice must not subtract twice
+        delete_order_item(db_session, db_session.get(OrderItemModel, added["id"]))
+        assert _stored(db_session, order.id)[0] == pytest.approx(135.0)
+
+    def test_extra_changes(self, db_session, order):
+        ana = _person(order, "Ana")
+        item = next(item for item in order.items if item.person_id == ana.id)
+
+        created = add_extra_to_item(db_session, item.id, OrderItemExtraCreate(name="Salsa", price=3.0, quantity=1))
+        assert_totals_consistent(db_session, order.id)
+
+        update_item_extra(db_session, get_extra_by_id(db_session, created["id"]),
+                          OrderItemExtraUpdate(quantity=3))
+        expected = assert_totals_consistent(db_session, order.id)
+        assert expected.persons[ana.id] == 105.0 + 9.0
+
+        delete_item_extra(db_session, get_extra_by_id(db_session, created["id"]))
+        expected = assert_totals_consistent(db_session, order.id)
+        assert expected.total == 135.0
+
+    def test_moving_item_between_persons_carries_extras(self, db_session, order):
+        ana, luis = _person(order, "Ana"), _person(order, "Luis")
+        item = next(item for item in order.items if item.person_id == ana.id)
+
+        old = (item.quantity, item.unit_price, item.person_id)
+        item.person_id = luis.id
+        record_item_changed(db_session, item, *old)
+        db_session.commit()
+
+        expected = assert_totals_consistent(db_session, order.id)
+        assert expected.persons[ana.id] == 0.0
+        assert expected.persons[luis.id] == 135.0
+
+    def test_recompute_repairs_drifted_rows(self, db_session, order):
+        order.total_amount = 1.0
+        _person(order, "Ana").subtotal = 2.0
+        db_session.commit()
+
+        recompute_order_totals(db_session, order.id)
+        db_session.commit()
+
+        assert assert_totals_consistent(db_session, order.id).total == 135.0
+
+    def test_item_update_does_not_load_order_collections(self, db_session, order, menu):
+        taco, _ = menu
+        for _ in range(30):
+            add_order_item(db_session, order, OrderItemCreate(menu_item_id=taco.id, quantity=1))
+        db_item = db_session.get(OrderItemModel, order.items[0].id)
+
+        statements = []
+        listener = lambda conn, cursor, statement, *args: statements.append(statement)
+        event.listen(db_session.bind, "before_cursor_execute", listener)
+        try:
+            update_order_item(db_session, db_item, OrderItemUpdate(quantity=5))
+            delete_order_item(db_session, db_item)
+        finally:
+            event.remove(db_session.bind, "before_cursor_execute", listener)
+
+        selects = [s for s in statements if s.lstrip().upper().startswith("SELECT")]
+        assert not any("FROM orders" in s for s in selects)
+        assert not any("WHERE order_items.order_id" in s for s in selects)
+        assert_totals_consistent(db_session, order.id)
@@ -0,0 +1,74 @@
+"""
+A local TCP stand-in for a port-9100 network printer.
+"""
+import socket
+import socketserver
+import threading
+import time
+
+
+class StandInPrinter:
+    """
+    Accepts raw print connections on localhost and records every byte.
+
+    Runs in its own thread so it works with any event loop, including the
+    one TestClient drives the app on.
+
+    Args:
+        port: Port to listen on; any free port when 0
+        close_after_data: Close each connection after its first payload,
+            like printers that drop idle sockets
+    """
+
+    def __init__(self, port: int = 0, close_after_data: bool = False):
+        self.close_after_data = close_after_data
+        self.connections = 0
+        self.chunks = []
+        self._lock = threading.Lock()
+        standin = self
+
+        class Handler(socketserver.BaseRequestHandler):
+            def handle(self):
+                with standin._lock:
+                    standin.connections += 1
+                while True:
+                    data = self.request.recv(65536)
+                    if not data:
+                        return
+                    with standin._lock:
+                        standin.chunks.append(data)
+                    if standin.close_after_data:
+                        return
+
+        self.server = socketserver.ThreadingTCPServer(("127.0.0.1", port), Handler)
+        self.server.daemon_threads = True
+        self.port = self.server.server_address[1]
+        self._thread = threading.Thread(target=self.server.serve_forever, args=(0.05,), daemon=True)
+
+    @property
+    def received(self) -> bytes:
+        with self._lock:
+            return b"".join(self.chunks)
+
+    def wait_for(self, data: bytes, timeout: float = 2.0) -> bool:
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if data in self.received:
+                return True
+            time.sleep(0.01)
+        return False
+
+    def __enter__(self) -> "StandInPrinter":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def free_port() -> int:
+    """A localhost port with nothing listening on it."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
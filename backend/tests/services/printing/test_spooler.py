@@ -0,0 +1,134 @@
+"""
+Tests for the print spooler and ESC/POS rendering, against a local TCP
+stand-in printer.
+"""
+import asyncio
+
+import pytest
+
+from app.models.printer import PrinterType
+from app.services.printing import (
+    PrintJob,
+    PrintQueueFullError,
+    PrintSpooler,
+    PrinterTarget,
+    render_kitchen_ticket,
+    render_test_page,
+)
+from app.services.printing.escpos import FEED_AND_CUT, INIT
+
+from .standin import StandInPrinter, free_port
+
+
+def _target(port: int, name: str = "Cocina") -> PrinterTarget:
+    return PrinterTarget(id=1, name=name, printer_type=PrinterType.KITCHEN, host="127.0.0.1",
+                         port=port, paper_width=80, copies=1, auto_print=True)
+
+
+def _spooler(**overrides) -> PrintSpooler:
+    options = dict(connect_timeout=0.5, write_timeout=0.5, max_retries=2, retry_backoff=0.01)
+    options.update(overrides)
+    return PrintSpooler(**options)
+
+
+class TestPrintSpooler:
+    """Tests for PrintSpooler"""
+
+    @pytest.mark.asyncio
+    async def test_reuses_one_connection(self):
+        with StandInPrinter() as printer:
+            spooler = _spooler()
+            for n in range(3):
+                spooler.submit_nowait(PrintJob(_target(printer.port), f"ticket-{n};".encode()))
+            await spooler.drain()
+            await spooler.stop()
+
+            assert printer.wait_for(b"ticket-0;ticket-1;ticket-2;")
+            assert printer.connections == 1
+            assert list(spooler.stats().values()) == []  # stop() releases channels
+
+    @pytest.mark.asyncio
+    async def test_reconnects_when_printer_closed_connection(self):
+        with StandInPrinter(close_after_data=True) as printer:
+            spooler = _spooler()
+            target = _target(printer.port)
+            spooler.submit_nowait(PrintJob(target, b"first;"))
+            await spooler.drain()
+            assert printer.wait_for(b"first;")
+            await asyncio.sleep(0.05)
+
+            spooler.submit_nowait(PrintJob(target, b"second;"))
+            await spooler.drain()
+            stats = spooler.stats()[f"127.0.0.1:{printer.port}"]
+            await spooler.stop()
+
+            assert printer.wait_for(b"second;")
+            assert printer.connections == 2
+            assert stats["printed"] == 2
+
+    @pytest.mark.asyncio
+    async def test_retries_until_printer_comes_up(self):
+        port = free_port()
+        spooler = _spooler(max_retries=5, retry_backoff=0.05)
+        spooler.submit_nowait(PrintJob(_target(port), b"late;"))
+        await asyncio.sleep(0.02)
+
+        with StandInPrinter(port=port) as printer:
+            await spooler.drain()
+            stats = spooler.stats()[f"127.0.0.1:{port}"]
+            await spooler.stop()
+            assert printer.wait_for(b"late;")
+
+        assert stats["retries"] >= 1
+        assert stats["printed"] == 1
+
+    @pytest.mark.asyncio
+    async def test_drops_job_after_retries(self):
+        port = free_port()
+        spooler = _spooler(max_retries=1)
+        spooler.submit_nowait(PrintJob(_target(port), b"lost"))
+        await spooler.drain()
+        stats = spooler.stats()[f"127.0.0.1:{port}"]
+        await spooler.stop()
+
+        assert stats["failed"] == 1
+        assert stats["retries"] == 1
+        assert stats["last_error"]
+
+    @pytest.mark.asyncio
+    async def test_backpressure_rejects_when_queue_full(self):
+        spooler = _spooler(queue_size=1)
+        target = _target(free_port())
+        spooler.submit_nowait(PrintJob(target, b"1"))
+
+        with pytest.raises(PrintQueueFullError):
+            spooler.submit_nowait(PrintJob(target, b"2"))
+        assert spooler.stats()[f"127.0.0.1:{target.port}"]["rejected"] == 1
+        await spooler.stop(timeout=0)
+
+
+class TestEscPos:
+    """Tests for ESC/POS rendering"""
+
+    def test_kitchen_ticket_groups_items_by_person(self):
+        latte = {"id": 1, "quantity": 2, "menu_item_id": 5, "special_instructions": "Sin azúcar",
+                 "variant": {"name": "Grande"}, "extras": [{"name": "Canela", "quantity": 1}],
+                 "menu_item": {"name": "Café Latte", "category": "Bebidas"}}
+        bagel = {"id": 2, "quantity": 1, "menu_item_id": 6, "special_instructions": None,
+                 "variant": None, "extras": [], "menu_item": {"name": "Bagel", "category": "Pan"}}
+        order = {"order_number": 42, "table_number": 7, "created_at": None, "notes": "Rápido",
+                 "items": [latte, bagel], "persons": [{"name": "Ana", "items": [latte]}]}
+
+        payload = render_kitchen_ticket(order, [latte, bagel], paper_width=58)
+
+        assert payload.startswith(INIT)
+        assert payload.endswith(FEED_AND_CUT)
+        text = payload.decode("cp858")
+        assert "Orden #42" in text and "Mesa 7" in text
+        assert text.index("ANA") < text.index("2x Café Latte") < text.index("1x Bagel")
+        assert "Sin azúcar" in text and "+ 1x Canela" in text and "NOTAS: Rápido" in text
+
+    def test_test_page_fits_paper(self):
+        narrow = render_test_page("Barra", paper_width=58).decode("cp858")
+
+        assert "0123456789" * 3 + "01\n" in narrow
@@ -0,0 +1,119 @@
+"""
+Tests for category -> printer routing and auto-print of new orders.
+"""
+import pytest
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.menu import Category, MenuItem
+from app.models.printer import Printer, PrinterType
+from app.services import outbox, printer as printer_service
+from app.services.orders import get_order
+from app.services.printing import get_routing_table, invalidate_routing_table, order_print_jobs
+
+from .standin import StandInPrinter
+
+
+@pytest.fixture(autouse=True)
+def _fresh_routing():
+    invalidate_routing_table()
+    yield
+    invalidate_routing_table()
+
+
+@pytest.fixture
+def standins():
+    with StandInPrinter() as kitchen, StandInPrinter() as bar:
+        yield kitchen, bar
+
+
+@pytest.fixture
+def menu(db_session: Session, test_restaurant, standins):
+    """Drinks go to the bar, food to the default kitchen printer, desserts are unassigned."""
+    kitchen_standin, bar_standin = standins
+    drinks, food, desserts = (Category(name=name, restaurant_id=test_restaurant.id)
+                              for name in ("Bebidas", "Comida", "Postres"))
+    db_session.add_all([drinks, food, desserts])
+    db_session.flush()
+    latte = MenuItem(name="Latte", price=50.0, category_id=drinks.id, restaurant_id=test_restaurant.id)
+    taco = MenuItem(name="Taco", price=25.0, category_id=food.id, restaurant_id=test_restaurant.id)
+    flan = MenuItem(name="Flan", price=40.0, category_id=desserts.id, restaurant_id=test_restaurant.id)
+    kitchen = Printer(restaurant_id=test_restaurant.id, name="Cocina", printer_type=PrinterType.KITCHEN,
+                      ip_address="127.0.0.1", port=kitchen_standin.port, is_default=True,
+                      categories=[food])
+    bar = Printer(restaurant_id=test_restaurant.id, name="Barra", printer_type=PrinterType.BAR,
+                  ip_address="127.0.0.1", port=bar_standin.port, print_copies=2, categories=[drinks])
+    usb = Printer(restaurant_id=test_restaurant.id, name="USB", printer_type=PrinterType.BAR,
+                  connection_type="usb", device_path="/dev/usb/lp0", categories=[drinks])
+    db_session.add_all([latte, taco, flan, kitchen, bar, usb])
+    db_session.commit()
+    return {"latte": latte, "taco": taco, "flan": flan, "kitchen": kitchen, "bar": bar, "drinks": drinks}
+
+
+class TestRouting:
+    """Tests for the routing table"""
+
+    def test_routes_by_category_with_default_fallback(self, db_session, test_restaurant, menu):
+        table = get_routing_table(db_session, test_restaurant.id)
+
+        assert [p.name for p in table.printers_for(menu["drinks"].id)] == ["Barra"]
+        assert [p.name for p in table.printers_for(menu["flan"].category_id)] == ["Cocina"]
+        # Non-network printers are not routed
+        assert sorted(p.name for p in table.printers.values()) == ["Barra", "Cocina"]
+
+    def test_printer_changes_invalidate_table(self, db_session, test_restaurant, menu):
+        assert get_routing_table(db_session, test_restaurant.id).printers_for(menu["drinks"].id)[0].name == "Barra"
+
+        printer_service.assign_categories_to_printer(
+            db_session, menu["kitchen"].id, test_restaurant.id, [menu["drinks"].id]
+        )
+
+        table = get_routing_table(db_session, test_restaurant.id)
+        assert sorted(p.name for p in table.printers_for(menu["drinks"].id)) == ["Barra", "Cocina"]
+
+    def test_order_print_jobs(self, db_session, test_restaurant, menu, client):
+        response = client.post("/api/v1/orders/", json={"order_type": "takeaway", "items": [
+            {"menu_item_id": menu["latte"].id, "quantity": 1},
+            {"menu_item_id": menu["taco"].id, "quantity": 3},
+            {"menu_item_id": menu["flan"].id, "quantity": 1},
+        ]})
+        order = get_order(db_session, response.json()["id"], test_restaurant.id)
+
+        jobs = {job.printer.name: job.payload.decode("cp858") for job in
+                order_print_jobs(db_session, test_restaurant, order)}
+
+        assert "1x Latte" in jobs["Barra"] and "Taco" not in jobs["Barra"]
+        assert jobs["Barra"].count("1x Latte") == 2  # two copies
+        assert "3x Taco" in jobs["Cocina"] and "1x Flan" in jobs["Cocina"]
+        assert "Para Llevar" in jobs["Cocina"]
+
+
+def test_auto_print_on_order_creation(client, db_session, menu, standins, monkeypatch,
+                                      test_restaurant_subscription):
+    """Test that creating an order sends each station its tickets through the spooler."""
+    kitchen_standin, bar_standin = standins
+    monkeypatch.setattr(settings, "SERVER_AUTO_PRINT", True)
+
+    response = client.post("/api/v1/orders/", json={"order_type": "takeaway", "items": [
+        {"menu_item_id": menu["latte"].id, "quantity": 2},
+        {"menu_item_id": menu["taco"].id, "quantity": 1},
+    ]})
+    # What the outbox worker does after the commit
+    assert outbox.drain(db_session) == 1
+
+    assert response.status_code == 201
+    assert bar_standin.wait_for("2x Latte".encode("cp858"))
+    assert kitchen_standin.wait_for("1x Taco".encode("cp858"))
+    assert b"Taco" not in bar_standin.received
+
+
+def test_auto_print_is_off_by_default(client, db_session, menu, standins, test_restaurant_subscription):
+    """Test that tablets stay the only printers unless server printing is enabled."""
+    kitchen_standin, _ = standins
+
+    client.post("/api/v1/orders/", json={"order_type": "takeaway", "items": [
+        {"menu_item_id": menu["taco"].id, "quantity": 1},
+    ]})
+    outbox.drain(db_session)
+
+    assert not kitchen_standin.wait_for(b"Taco", timeout=0.2)
@@ -0,0 +1,236 @@
+"""
+Tests for the transactional outbox (services/outbox.py) and its handlers.
+"""
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.menu import Category, MenuItem
+from app.models.outbox_event import OutboxEvent, OutboxStatus
+from app.models.special_note_stats import SpecialNoteStats
+from app.services import outbox
+from app.services.special_notes import SpecialNotesService
+
+TOPIC = "test.event"
+
+
+class _Recorder(list):
+    """Outbox handler that records payloads; set ``fail`` to make it write and then raise."""
+    fail = None
+
+    def __call__(self, db, payload):
+        if self.fail:
+            db.add(SpecialNoteStats(restaurant_id=payload["restaurant_id"], note_text="escrito a medias"))
+            raise RuntimeError(self.fail)
+        self.append(payload)
+
+
+@pytest.fixture
+def calls(monkeypatch):
+    recorder = _Recorder()
+    monkeypatch.setitem(outbox._handlers, TOPIC, recorder)
+    return recorder
+
+
+def _events(db: Session):
+    db.expire_all()
+    return db.query(OutboxEvent).order_by(OutboxEvent.id).all()
+
+
+def test_enqueue_is_part_of_the_transaction(db_session, test_restaurant):
+    outbox.enqueue(db_session, TOPIC, {"n": 1})
+    db_session.rollback()
+    outbox.enqueue(db_session, TOPIC, {"n": 2})
+    db_session.commit()
+
+    assert [event.payload for event in _events(db_session)] == [{"n": 2}]
+
+
+def test_drain_runs_handlers_in_order(db_session, calls):
+    for n in range(3):
+        outbox.enqueue(db_session, TOPIC, {"n": n})
+    db_session.commit()
+
+    assert outbox.drain(db_session, batch_size=2) == 2
+    assert outbox.drain(db_session, batch_size=2) == 1
+
+    assert calls == [{"n": 0}, {"n": 1}, {"n": 2}]
+    events = _events(db_session)
+    assert all(event.status == OutboxStatus.DONE and event.processed_at for event in events)
+    assert outbox.drain(db_session) == 0
+
+
+def test_failed_event_is_retried_then_given_up(db_session, test_restaurant, calls):
+    outbox.enqueue(db_session, TOPIC, {"restaurant_id": test_restaurant.id})
+    db_session.commit()
+    calls.fail = "impresora apagada"
+
+    outbox.drain(db_session, max_attempts=2)
+
+    [event] = _events(db_session)
+    assert (event.status, event.attempts) == (OutboxStatus.PENDING, 1)
+    assert "impresora apagada" in event.last_error
+    assert event.available_at.replace(tzinfo=timezone.utc) > datetime.now(timezone.utc)
+    # The handler's own writes were rolled back
+    assert db_session.query(SpecialNoteStats).count() == 0
+
+    event.available_at = datetime.now(timezone.utc)
+    db_session.commit()
+    outbox.drain(db_session, max_attempts=2)
+
+    [event] = _events(db_session)
+    assert (event.status, event.attempts) == (OutboxStatus.FAILED, 2)
+
+
+def test_claimed_events_are_hidden_from_other_workers(db_session, calls):
+    outbox.enqueue(db_session, TOPIC, {})
+    db_session.commit()
+
+    assert outbox._claim(db_session, 10, datetime.now(timezone.utc))
+    assert outbox.drain(db_session) == 0
+
+
+def test_unknown_topic_is_retried(db_session):
+    outbox.enqueue(db_session, "nadie.escucha", {})
+    db_session.commit()
+
+    outbox.drain(db_session)
+
+    [event] = _events(db_session)
+    assert event.attempts == 1 and "No handler" in event.last_error
+
+
+def test_purge_keeps_recent_and_failed(db_session):
+    old = datetime.now(timezone.utc) - timedelta(days=2)
+    db_session.add_all([
+        OutboxEvent(topic=TOPIC, payload={}, status=OutboxStatus.DONE, processed_at=old),
+        OutboxEvent(topic=TOPIC, payload={}, status=OutboxStatus.DONE, processed_at=datetime.now(timezone.utc)),
+        OutboxEvent(topic=TOPIC, payload={}, status=OutboxStatus.FAILED, processed_at=old),
+    ])
+    db_session.commit()
+
+    assert outbox.purge(db_session, timedelta(days=1)) == 1
+    assert len(_events(db_session)) == 2
+
+
+def test_wakeup_after_commit_with_events(db_session, monkeypatch):
+    wakeups = []
+    monkeypatch.setattr(outbox, "_wakeup", lambda: wakeups.append(1))
+
+    db_session.commit()
+    outbox.enqueue(db_session, TOPIC, {})
+    db_session.commit()
+
+    assert wakeups == [1]
+
+
+@pytest.fixture
+def latte(db_session: Session, test_restaurant):
+    category = Category(name="Bebidas", restaurant_id=test_restaurant.id)
+    db_session.add(category)
+    db_session.flush()
+    item = MenuItem(name="Latte", price=45.0, category_id=category.id, restaurant_id=test_restaurant.id)
+    db_session.add(item)
+    db_session.commit()
+    return item
+
+
+def test_order_creation_enqueues_event(client, db_session, test_restaurant, test_restaurant_subscription,
+                                       latte, monkeypatch):
+    monkeypatch.setattr(settings, "SERVER_AUTO_PRINT", True)
+
+    response = client.post("/api/v1/orders/", json={"order_type": "takeaway", "items": [
+        {"menu_item_id": latte.id, "quantity": 1},
+    ]})
+
+    [event] = _events(db_session)
+    assert event.topic == outbox.ORDER_CREATED
+    assert event.payload == {"order_id": response.json()["id"], "restaurant_id": test_restaurant.id}
+
+
+def test_order_creation_without_auto_print_enqueues_nothing(client, db_session, test_restaurant_subscription,
+                                                           latte, monkeypatch):
+    monkeypatch.setattr(settings, "SERVER_AUTO_PRINT", False)
+
+    response = client.post("/api/v1/orders/", json={"order_type": "takeaway", "items": [
+        {"menu_item_id": latte.id, "quantity": 1},
+    ]})
+
+    assert response.status_code == 201
+    assert _events(db_session) == []
+
+
+def test_special_note_usage_is_counted_by_the_worker(client, db_session, test_restaurant):
+    SpecialNotesService.invalidate_all_cache()
+    for _ in range(2):
+        assert client.post("/api/v1/menu/special-notes/track", json={"note_text": "Sin cebolla"}).json()["success"]
+
+    assert outbox.drain(db_session) == 2
+
+    stats = db_session.query(SpecialNoteStats).one()
+    assert (stats.note_text, stats.usage_count) == ("Sin cebolla", 2)
+
+
+def test_special_note_inserted_by_another_worker_keeps_both_counts(db_session, test_restaurant):
+    """The row appears between the worker's UPDATE (no match) and its INSERT."""
+    SpecialNotesService.invalidate_all_cache()
+    engine = db_session.get_bind()
+    raced = []
+
+    def insert_concurrently(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith("UPDATE special_note_stats") and not raced:
+            raced.append(cursor.rowcount)
+            cursor.connection.execute(
+                "INSERT INTO special_note_stats (restaurant_id, note_text, usage_count, last_used_at,"
+                " created_at, updated_at) VALUES (?, 'Sin hielo', 3, datetime('now'), datetime('now'),"
+                " datetime('now'))",
+                (test_restaurant.id,)
+            )
+
+    event.listen(engine, "after_cursor_execute", insert_concurrently)
+    try:
+        SpecialNotesService.record_usage(db_session, test_restaurant.id, "Sin hielo")
+        db_session.commit()
+    finally:
+        event.remove(engine, "after_cursor_execute", insert_concurrently)
+
+    assert raced == [0]
+    stats = db_session.query(SpecialNoteStats).one()
+    assert (stats.note_text, stats.usage_count) == ("Sin hielo", 4)
+
+
+def test_lost_insert_race_keeps_the_transaction_side_effects(db_session, test_restaurant, calls, monkeypatch):
+    """The savepoint rolled back by the race must not discard the outer transaction's pending work."""
+    from app.core import response_cache
+
+    SpecialNotesService.invalidate_all_cache()
+    engine = db_session.get_bind()
+    woken, invalidated = [], []
+    monkeypatch.setattr(outbox, "_wakeup", lambda: woken.append(True))
+    monkeypatch.setattr(response_cache.caches, "invalidate_tags", lambda *tags: invalidated.extend(tags))
+
+    def insert_concurrently(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith("UPDATE special_note_stats") and cursor.rowcount == 0:
+            cursor.connection.execute(
+                "INSERT INTO special_note_stats (restaurant_id, note_text, usage_count, last_used_at,"
+                " created_at, updated_at) VALUES (?, 'Sin sal', 1, datetime('now'), datetime('now'),"
+                " datetime('now'))",
+                (test_restaurant.id,)
+            )
+
+    outbox.enqueue(db_session, TOPIC, {"n": 1}, restaurant_id=test_restaurant.id)
+    response_cache.invalidate_on_commit(db_session, "tag-a")
+    event.listen(engine, "after_cursor_execute", insert_concurrently)
+    try:
+        SpecialNotesService.record_usage(db_session, test_restaurant.id, "Sin sal")
+        db_session.commit()
+    finally:
+        event.remove(engine, "after_cursor_execute", insert_concurrently)
+
+    assert woken == [True]
+    assert "tag-a" in invalidated
+    assert [event.topic for event in _events(db_session)] == [TOPIC]
+    assert db_session.query(SpecialNoteStats).one().usage_count == 2
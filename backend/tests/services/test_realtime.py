@@ -0,0 +1,183 @@
+"""
+Tests for the real-time event hub (services/realtime.py) and the unread
+alerts counter pushed through it.
+"""
+import asyncio
+import threading
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.core.cache import MemoryTier
+from app.models.subscription_alert import AlertType, SubscriptionAlert
+from app.services.alert_service import ALERT_CREATED, ALERTS_UNREAD, AlertService
+from app.services.realtime import RESYNC, EventHub, hub
+
+
+async def _next(stream) -> str:
+    async with asyncio.timeout(1):
+        return await anext(stream)
+
+
+class TestEventHub:
+    """Tests for EventHub"""
+
+    @pytest.mark.asyncio
+    async def test_events_reach_the_restaurants_streams(self):
+        events = EventHub()
+        first, other = events.stream(1, "admin", [("hello", {"n": 0})]), events.stream(2, "admin")
+        assert await _next(first) == "retry: 5000\n\n"
+        assert await _next(first) == 'event: hello\ndata: {"n":0}\n\n'
+        await _next(other)
+
+        events.publish(1, "order.created", {"id": 7})
+
+        assert events.stats()["streams"] == 2
+        assert await _next(first) == 'event: order.created\ndata: {"id":7}\n\n'
+        with pytest.raises(TimeoutError):
+            async with asyncio.timeout(0.05):
+                await anext(other)
+
+    @pytest.mark.asyncio
+    async def test_roles_filter(self):
+        events = EventHub()
+        admin, staff = events.stream(1, "admin"), events.stream(1, "staff")
+        await _next(admin), await _next(staff)
+
+        events.publish(1, ALERTS_UNREAD, {"unread_count": 1}, roles=("admin",))
+        events.publish(1, "tables.changed", {})
+
+        assert (await _next(admin)).startswith(f"event: {ALERTS_UNREAD}")
+        assert (await _next(admin)).startswith("event: tables.changed")
+        assert (await _next(staff)).startswith("event: tables.changed")
+
+    @pytest.mark.asyncio
+    async def test_publish_from_another_thread(self):
+        events = EventHub()
+        stream = events.stream(1, "admin")
+        await _next(stream)
+
+        await asyncio.to_thread(events.publish, 1, "alert.created", {"id": 1})
+
+        assert (await _next(stream)).startswith("event: alert.created")
+
+    @pytest.mark.asyncio
+    async def test_stream_that_falls_behind_gets_resync(self):
+        events = EventHub(queue_size=2)
+        stream = events.stream(1, "admin")
+        await _next(stream)
+
+        for n in range(3):
+            events.publish(1, "order.created", {"id": n})
+        await asyncio.sleep(0)
+
+        assert await _next(stream) == f"event: {RESYNC}\ndata: {{}}\n\n"
+        assert events.stats()["dropped"] == 3
+
+    @pytest.mark.asyncio
+    async def test_heartbeat_and_close(self):
+        events = EventHub(heartbeat=0.01)
+        stream = events.stream(1, "admin")
+        await _next(stream)
+
+        assert await _next(stream) == ": keep-alive\n\n"
+        events.close_all()
+        with pytest.raises(StopAsyncIteration):
+            await _next(stream)
+        assert events.stats()["streams"] == 0
+
+    @pytest.mark.asyncio
+    async def test_events_cross_workers(self):
+        tier = MemoryTier()
+        first, second = EventHub(), EventHub()
+        first.configure(tier)
+        second.configure(tier)
+        stream = second.stream(1, "staff")
+        await _next(stream)
+
+        first.publish(1, "order.created", {"id": 1}, roles=("staff",))
+
+        assert (await _next(stream)).startswith("event: order.created")
+        # The publishing worker does not deliver its own event twice
+        own = first.stream(1, "staff")
+        await _next(own)
+        first.publish(1, "order.created", {"id": 2})
+        assert (await _next(own)).startswith("event: order.created")
+        with pytest.raises(TimeoutError):
+            async with asyncio.timeout(0.05):
+                await anext(own)
+
+
+@pytest.fixture
+def alert_factory(db_session: Session, test_restaurant, test_restaurant_subscription):
+    def create(**values) -> SubscriptionAlert:
+        return AlertService(db_session).create_alert(
+            restaurant_id=test_restaurant.id,
+            subscription_id=test_restaurant_subscription.id,
+            alert_type=values.get("alert_type", AlertType.EXPIRING_SOON),
+            title="Suscripción por Expirar",
+            message="Tu suscripción expira en 3 días.",
+        )
+    return create
+
+
+class TestUnreadCounter:
+    """Tests for the cached unread alerts counter"""
+
+    def test_counter_follows_changes(self, db_session: Session, test_restaurant, alert_factory):
+        service = AlertService(db_session)
+        assert service.get_unread_count(test_restaurant.id) == 0
+
+        first, _ = alert_factory(), alert_factory()
+        assert service.get_unread_count(test_restaurant.id) == 2
+
+        service.mark_as_read([first.id], test_restaurant.id)
+        assert service.get_unread_count(test_restaurant.id) == 1
+
+    def test_counter_is_served_from_cache(self, db_session: Session, test_restaurant, alert_factory):
+        service = AlertService(db_session)
+        alert_factory()
+        # A write that bypasses AlertService is not counted until the entry expires
+        db_session.add(SubscriptionAlert(restaurant_id=test_restaurant.id, subscription_id=1,
+                                         alert_type=AlertType.SUSPENDED, title="t", message="m"))
+        db_session.commit()
+
+        assert service.get_unread_count(test_restaurant.id) == 1
+
+    def test_list_limit(self, db_session: Session, test_restaurant, alert_factory):
+        for _ in range(3):
+            alert_factory()
+
+        assert len(AlertService(db_session).get_restaurant_alerts(test_restaurant.id, limit=2)) == 2
+
+
+def test_unread_count_endpoint(client: TestClient, alert_factory):
+    alert_factory()
+
+    response = client.get("/api/v1/subscriptions/alerts/unread-count")
+
+    assert response.status_code == 200
+    assert response.json() == {"unread_count": 1}
+
+
+def test_stream_endpoint(client: TestClient, test_restaurant, alert_factory):
+    """Test that the stream starts with the count and carries new alerts."""
+    def produce():
+        deadline = time.monotonic() + 5
+        while hub.stats()["streams"] == 0 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        alert_factory()
+        hub.close_all()
+
+    producer = threading.Thread(target=produce)
+    producer.start()
+    response = client.get("/api/v1/events/stream")
+    producer.join()
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = [block.split("\n")[0] for block in response.text.split("\n\n") if block.startswith("event:")]
+    assert events == [f"event: {ALERTS_UNREAD}", f"event: {ALERT_CREATED}", f"event: {ALERTS_UNREAD}"]
+    assert '"unread_count":1' in response.text.split("\n\n")[-2]
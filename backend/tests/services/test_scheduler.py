@@ -0,0 +1,253 @@
+"""
+Tests for the job scheduler (services/scheduler.py) and the scheduled jobs.
+"""
+import asyncio
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy.orm import Session
+
+from app.models.job_run import JobRun, JobRunStatus
+from app.models.special_note_stats import SpecialNoteStats
+from app.services import jobs, scheduler as scheduler_module
+from app.services.scheduler import Cron, FileLeaderLock, Interval, Job, JobScope, Scheduler, purge_history
+from tests.conftest import TestingSessionLocal
+
+
+def _utc(*args) -> datetime:
+    return datetime(*args, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def lock_path(tmp_path):
+    return str(tmp_path / "scheduler.lock")
+
+
+def _scheduler(lock_path, *scheduled) -> Scheduler:
+    return Scheduler(jobs=scheduled, session_factory=TestingSessionLocal, leader_lock=FileLeaderLock(lock_path))
+
+
+def _runs(db: Session):
+    db.expire_all()
+    return db.query(JobRun).order_by(JobRun.id).all()
+
+
+class TestTriggers:
+    """Tests for Interval and Cron"""
+
+    def test_interval_is_aligned_to_the_epoch(self):
+        trigger = Interval(300)
+        assert trigger.next_after(_utc(2026, 10, 19, 12, 3, 20)) == _utc(2026, 10, 19, 12, 5)
+        assert trigger.next_after(_utc(2026, 10, 19, 12, 5)) == _utc(2026, 10, 19, 12, 10)
+
+    def test_cron_hourly_and_daily(self):
+        assert Cron("0 * * * *").next_after(_utc(2026, 10, 19, 12, 0, 30)) == _utc(2026, 10, 19, 13)
+        assert Cron("30 4 * * *").next_after(_utc(2026, 10, 19, 5)) == _utc(2026, 10, 20, 4, 30)
+
+    def test_cron_ranges_steps_and_lists(self):
+        cron = Cron("*/15 9-17 * * 1-5")
+        # Friday 17:50 -> Monday 09:00
+        assert cron.next_after(_utc(2026, 10, 23, 17, 50)) == _utc(2026, 10, 26, 9)
+        assert Cron("5,35 * * * *").next_after(_utc(2026, 10, 19, 12, 10)) == _utc(2026, 10, 19, 12, 35)
+
+    def test_cron_day_fields_match_either(self):
+        # The 1st of the month or any Sunday (7 is Sunday too)
+        cron = Cron("0 0 1 * 7")
+        assert cron.next_after(_utc(2026, 10, 19)) == _utc(2026, 10, 25)
+        assert cron.next_after(_utc(2026, 10, 26)) == _utc(2026, 11, 1)
+
+    def test_cron_crosses_year_end(self):
+        assert Cron("0 0 1 1 *").next_after(_utc(2026, 10, 19)) == _utc(2027, 1, 1)
+
+    @pytest.mark.parametrize("expression", ["* * * *", "60 * * * *", "*/0 * * * *", "0 0 31 2 *"])
+    def test_invalid_cron(self, expression):
+        with pytest.raises(ValueError):
+            Cron(expression).next_after(_utc(2026, 10, 19))
+
+
+class TestLeaderLock:
+    """Tests for FileLeaderLock"""
+
+    def test_only_one_holder(self, lock_path):
+        first, second = FileLeaderLock(lock_path), FileLeaderLock(lock_path)
+
+        assert first.acquire() and first.acquire()
+        assert not second.acquire()
+
+        first.release()
+        assert second.acquire()
+        second.release()
+
+
+class TestExecute:
+    """Tests for Scheduler.execute: history and metrics"""
+
+    def test_cluster_run_is_recorded(self, db_session, lock_path):
+        seen = []
+        scheduled = Job("test.cluster", lambda db: seen.append(db), Interval(60))
+        scheduler = _scheduler(lock_path, scheduled)
+
+        assert scheduler.execute(scheduled)
+
+        assert len(seen) == 1
+        [run] = _runs(db_session)
+        assert (run.job_name, run.status, run.worker) == ("test.cluster", JobRunStatus.SUCCEEDED, scheduler.worker_id)
+        assert run.finished_at is not None and run.duration_ms >= 0
+        [stats] = scheduler.stats()
+        assert (stats["runs"], stats["failures"], stats["last_status"]) == (1, 0, "succeeded")
+        assert stats["avg_duration_ms"] is not None
+
+    def test_failure_is_recorded_and_rolled_back(self, db_session, lock_path, test_restaurant):
+        def fail(db):
+            db.add(SpecialNoteStats(restaurant_id=test_restaurant.id, note_text="a medias"))
+            db.flush()
+            raise RuntimeError("sin conexión")
+
+        scheduled = Job("test.failing", fail, Interval(60))
+        scheduler = _scheduler(lock_path, scheduled)
+
+        assert not scheduler.execute(scheduled)
+
+        [run] = _runs(db_session)
+        assert run.status == JobRunStatus.FAILED
+        assert run.error == "RuntimeError: sin conexión"
+        assert db_session.query(SpecialNoteStats).count() == 0
+        assert scheduler.stats()[0]["failures"] == 1
+
+    def test_worker_runs_are_not_recorded(self, db_session, lock_path):
+        scheduled = Job("test.worker", lambda db: None, Interval(60), scope=JobScope.WORKER)
+        scheduler = _scheduler(lock_path, scheduled)
+
+        scheduler.execute(scheduled)
+
+        assert _runs(db_session) == []
+        assert scheduler.stats()[0]["runs"] == 1
+
+    def test_purge_history(self, db_session):
+        now = datetime.now(timezone.utc)
+        db_session.add_all([
+            JobRun(job_name="viejo", worker="w", started_at=now - timedelta(days=30)),
+            JobRun(job_name="nuevo", worker="w", started_at=now),
+        ])
+        db_session.commit()
+
+        assert purge_history(db_session, timedelta(days=14)) == 1
+        assert [run.job_name for run in _runs(db_session)] == ["nuevo"]
+
+
+class TestLoop:
+    """Tests for leader election and shutdown"""
+
+    @pytest.mark.asyncio
+    async def test_cluster_jobs_run_on_the_leader_only(self, db_session, lock_path):
+        calls = []
+        cluster = Job("test.cluster", lambda db: calls.append("cluster"), Interval(60))
+        worker = Job("test.worker", lambda db: calls.append("worker"), Interval(60), scope=JobScope.WORKER)
+        leader, follower = _scheduler(lock_path, cluster, worker), _scheduler(lock_path, cluster, worker)
+
+        for scheduler in (leader, follower):
+            for scheduled in (cluster, worker):
+                await scheduler._dispatch(scheduled)
+
+        assert sorted(calls) == ["cluster", "worker", "worker"]
+        assert leader.is_leader and not follower.is_leader
+        await leader.stop(timeout=1)
+
+    @pytest.mark.asyncio
+    async def test_cluster_jobs_due_together_check_leadership_in_turn(self, db_session, lock_path):
+        class SlowLock(FileLeaderLock):
+            holders = max_holders = 0
+
+            def acquire(self):
+                SlowLock.holders += 1
+                SlowLock.max_holders = max(SlowLock.max_holders, SlowLock.holders)
+                time.sleep(0.05)
+                try:
+                    return super().acquire()
+                finally:
+                    SlowLock.holders -= 1
+
+        calls = []
+        first = Job("test.first", lambda db: calls.append("first"), Interval(60))
+        second = Job("test.second", lambda db: calls.append("second"), Interval(60))
+        scheduler = Scheduler(jobs=(first, second), session_factory=TestingSessionLocal,
+                              leader_lock=SlowLock(lock_path))
+
+        await asyncio.gather(scheduler._dispatch(first), scheduler._dispatch(second))
+
+        assert sorted(calls) == ["first", "second"]
+        assert SlowLock.max_holders == 1
+        assert scheduler.is_leader
+        await scheduler.stop(timeout=1)
+
+    @pytest.mark.asyncio
+    async def test_stop_waits_for_running_jobs(self, db_session, lock_path):
+        started, finished = threading.Event(), threading.Event()
+
+        def slow(db):
+            started.set()
+            threading.Event().wait(0.2)
+            finished.set()
+
+        scheduler = _scheduler(lock_path, Job("test.slow", slow, Interval(0.05), scope=JobScope.WORKER))
+        scheduler.start()
+        assert await asyncio.to_thread(started.wait, 2)
+
+        await scheduler.stop(timeout=2)
+
+        assert finished.is_set()
+        stats = scheduler.stats()[0]
+        assert stats["runs"] == 1 and not stats["running"]
+
+    def test_overlapping_run_is_skipped(self, lock_path):
+        scheduler = _scheduler(lock_path)
+        scheduled = Job("test.busy", lambda db: None, Interval(60))
+        scheduler._running[scheduled.name] = object()
+
+        scheduler._launch(scheduled)
+
+        assert scheduler._stats[scheduled.name].skipped == 1
+
+
+class TestJobs:
+    """Tests for the registered jobs"""
+
+    def test_registry(self):
+        names = {scheduled.name: scheduled.scope for scheduled in scheduler_module.registered_jobs()}
+        assert names["subscriptions.expiring_alerts"] is JobScope.CLUSTER
+        assert names["special_notes.cleanup"] is JobScope.CLUSTER
+        assert names["platform_metrics.refresh"] is JobScope.WORKER
+
+    def test_duplicate_name_is_rejected(self):
+        with pytest.raises(ValueError):
+            scheduler_module.job("outbox.purge", Interval(60))(lambda db: None)
+
+    def test_cleanup_special_notes_keeps_top_notes(self, db_session, test_restaurant, monkeypatch):
+        db_session.add_all([
+            SpecialNoteStats(restaurant_id=test_restaurant.id, note_text=f"nota {i}", usage_count=i)
+            for i in range(1, 4)
+        ])
+        db_session.commit()
+        real_cleanup = jobs.SpecialNotesService.cleanup_old_notes
+        monkeypatch.setattr(jobs.SpecialNotesService, "cleanup_old_notes",
+                            lambda db, restaurant_id: real_cleanup(db, restaurant_id, keep_top=2))
+
+        jobs.cleanup_special_notes(db_session)
+
+        db_session.expire_all()
+        live = db_session.query(SpecialNoteStats).filter(SpecialNoteStats.deleted_at.is_(None))
+        assert sorted(note.note_text for note in live) == ["nota 2", "nota 3"]
+
+
+def test_jobs_endpoint(client, db_session):
+    db_session.add(JobRun(job_name="outbox.purge", worker="host:1", status=JobRunStatus.SUCCEEDED, duration_ms=12))
+    db_session.commit()
+
+    response = client.get("/api/v1/health/jobs")
+
+    assert response.status_code == 200
+    body = response.json()
+    assert "subscriptions.expiring_alerts" in [job["name"] for job in body["jobs"]]
+    assert body["recent_runs"][0]["job_name"] == "outbox.purge"
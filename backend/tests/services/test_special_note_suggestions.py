@@ -0,0 +1,130 @@
+"""
+Tests for special note suggestions (services/special_note_index.py and
+SpecialNotesService.suggest_notes).
+"""
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy.orm import Session
+
+from app.models.menu import Category, MenuItem
+from app.models.special_note_stats import SpecialNoteItemStats, SpecialNoteStats
+from app.services import outbox
+from app.services.special_note_index import NoteIndex, normalize
+from app.services.special_notes import SpecialNotesService
+
+DAY = 24 * 3600
+SUGGEST_URL = "/api/v1/menu/special-notes/suggest"
+
+
+def _texts(suggestions):
+    return [suggestion["note_text"] if isinstance(suggestion, dict) else suggestion.note_text
+            for suggestion in suggestions]
+
+
+def test_normalize():
+    assert normalize("  Tortilla   MAÍZ ") == "tortilla maiz"
+
+
+def test_prefix_matches_any_word():
+    index = NoteIndex(half_life=DAY)
+    index.add("Sin cebolla", 5)
+    index.add("Extra salsa", 3)
+    index.add("Sin salsa", 1)
+    index.add("Tortilla Maíz", 2)
+
+    assert _texts(index.suggest("sin")) == ["Sin cebolla", "Sin salsa"]
+    assert _texts(index.suggest("sal")) == ["Extra salsa", "Sin salsa"]
+    assert _texts(index.suggest("sin s")) == ["Sin salsa"]
+    assert _texts(index.suggest("MAIZ")) == ["Tortilla Maíz"]
+    assert _texts(index.suggest("queso")) == []
+    assert _texts(index.suggest("", limit=2)) == ["Sin cebolla", "Extra salsa"]
+
+
+def test_recent_usage_outranks_old_usage():
+    now = datetime.now(timezone.utc)
+    index = NoteIndex(half_life=DAY)
+    index.add("Bien cocido", 8, now - timedelta(days=4))
+    index.add("Bien dorado", 2, now)
+
+    [recent, old] = index.suggest("bien", now=now.timestamp())
+
+    assert recent["note_text"] == "Bien dorado"
+    assert old["usage_count"] == 8
+    assert old["score"] == pytest.approx(0.5, rel=1e-3)
+    # Usages are added at their time, whatever order they arrive in
+    index.add("Bien cocido", 1, now - timedelta(days=1))
+    assert index.suggest("bien cocido", now=now.timestamp())[0]["score"] == pytest.approx(1.0, rel=1e-3)
+
+
+def test_scope_ranks_item_and_category_notes_first():
+    index = NoteIndex(half_life=DAY)
+    index.add("Sin hielo", 1, menu_item_id=10, category_id=1)
+    index.add("Sin cebolla", 9, menu_item_id=20, category_id=2)
+    index.add("Sin azucar", 2, menu_item_id=11, category_id=1)
+
+    by_item = index.suggest("sin", menu_item_id=10)
+    assert _texts(by_item) == ["Sin hielo", "Sin cebolla", "Sin azucar"]
+    assert [suggestion["in_scope"] for suggestion in by_item] == [True, False, False]
+    assert _texts(index.suggest("sin", category_id=1)) == ["Sin azucar", "Sin hielo", "Sin cebolla"]
+    assert _texts(index.suggest("sin"))[0] == "Sin cebolla"
+
+
+@pytest.fixture
+def drinks(db_session: Session, test_restaurant):
+    category = Category(name="Bebidas", restaurant_id=test_restaurant.id)
+    db_session.add(category)
+    db_session.flush()
+    latte = MenuItem(name="Latte", price=45.0, category_id=category.id, restaurant_id=test_restaurant.id)
+    db_session.add(latte)
+    db_session.commit()
+    return latte
+
+
+def test_index_is_built_from_stats(db_session: Session, test_restaurant, drinks):
+    rid = test_restaurant.id
+    now = datetime.now(timezone.utc)
+    db_session.add_all([
+        SpecialNoteStats(restaurant_id=rid, note_text="Sin cebolla", usage_count=7, last_used_at=now),
+        SpecialNoteStats(restaurant_id=rid, note_text="Sin hielo", usage_count=2, last_used_at=now),
+        SpecialNoteStats(restaurant_id=rid, note_text="Sin sal", usage_count=50, last_used_at=now,
+                         deleted_at=now),
+        SpecialNoteItemStats(restaurant_id=rid, menu_item_id=drinks.id, note_text="Sin hielo",
+                             usage_count=2, last_used_at=now),
+    ])
+    db_session.commit()
+
+    assert _texts(SpecialNotesService.suggest_notes(rid, db_session, "sin")) == ["Sin cebolla", "Sin hielo"]
+    scoped = SpecialNotesService.suggest_notes(rid, db_session, "sin", category_id=drinks.category_id)
+    assert _texts(scoped) == ["Sin hielo", "Sin cebolla"]
+
+
+def test_tracked_usage_updates_the_index_on_commit(client, db_session: Session, test_restaurant, drinks):
+    rid = test_restaurant.id
+    assert client.get(SUGGEST_URL, params={"q": "desl"}).json() == []
+
+    response = client.post("/api/v1/menu/special-notes/track",
+                           json={"note_text": "Deslactosada", "menu_item_id": drinks.id})
+    assert response.json()["success"]
+    SpecialNotesService.record_usage(db_session, rid, "Descafeinado")
+    db_session.rollback()
+    assert outbox.drain(db_session) == 1
+
+    [suggestion] = client.get(SUGGEST_URL, params={"q": "desl", "menu_item_id": drinks.id}).json()
+    assert (suggestion["note_text"], suggestion["usage_count"], suggestion["in_scope"]) == ("Deslactosada", 1, True)
+    # Rolled back usages never reach the index
+    assert client.get(SUGGEST_URL, params={"q": "desc"}).json() == []
+    item_stats = db_session.query(SpecialNoteItemStats).one()
+    assert (item_stats.menu_item_id, item_stats.usage_count) == (drinks.id, 1)
+
+
+def test_cleanup_drops_removed_notes(db_session: Session, test_restaurant):
+    rid = test_restaurant.id
+    for count, note_text in enumerate(("Poco picante", "Muy picante"), start=1):
+        SpecialNotesService.record_usage(db_session, rid, note_text, count)
+    db_session.commit()
+    assert _texts(SpecialNotesService.suggest_notes(rid, db_session, "pic")) == ["Muy picante", "Poco picante"]
+
+    SpecialNotesService.cleanup_old_notes(db_session, rid, keep_top=1)
+
+    assert _texts(SpecialNotesService.suggest_notes(rid, db_session, "pic")) == ["Muy picante"]
@@ -0,0 +1,215 @@
+"""
+Unit tests for the two-tier cache (core/cache.py).
+"""
+import pytest
+
+from app.core import cache as cache_module
+from app.core.cache import CacheManager, MemoryTier
+
+
+@pytest.fixture
+def tier():
+    return MemoryTier()
+
+
+def _worker(tier=None) -> CacheManager:
+    manager = CacheManager()
+    if tier is not None:
+        manager.configure(tier)
+    return manager
+
+
+class TestLocalTier:
+    """Namespaces without a shared tier"""
+
+    def test_get_or_set_computes_once(self):
+        notes = _worker().namespace("notes")
+        calls = []
+
+        def load():
+            calls.append(1)
+            return ["sin cebolla"]
+
+        assert notes.get_or_set(1, "top", load) == ["sin cebolla"]
+        assert notes.get_or_set(1, "top", load) == ["sin cebolla"]
+        assert len(calls) == 1
+        stats = notes.stats()
+        assert (stats["hits"], stats["misses"], stats["hit_ratio"]) == (1, 1, 0.5)
+
+    def test_tenants_are_isolated(self):
+        notes = _worker().namespace("notes")
+        notes.set(1, "top", "uno")
+
+        assert notes.get(2, "top") is None
+        assert notes.get(1, "top") == "uno"
+
+    def test_lru_eviction(self):
+        days = _worker().namespace("days", max_entries=2)
+        days.set(1, "a", 1)
+        days.set(1, "b", 2)
+        days.get(1, "a")
+        days.set(1, "c", 3)
+
+        assert days.get(1, "b") is None
+        assert (days.get(1, "a"), days.get(1, "c")) == (1, 3)
+        assert days.stats()["evictions"] == 1
+
+    def test_ttl_expiry(self, monkeypatch):
+        clock = [1000.0]
+        monkeypatch.setattr(cache_module._time, "monotonic", lambda: clock[0])
+        notes = _worker().namespace("notes", ttl=60)
+        notes.set(1, "top", "uno")
+        notes.set(1, "short", "dos", ttl=5)
+
+        clock[0] += 10
+        assert notes.get(1, "short") is None
+        assert notes.get(1, "top") == "uno"
+        clock[0] += 60
+        assert notes.get(1, "top") is None
+        assert notes.stats()["expirations"] == 2
+
+    def test_tag_invalidation_spans_namespaces(self):
+        manager = _worker()
+        menu, reports = manager.namespace("menu"), manager.namespace("reports")
+        menu.set(1, "items", ["latte"], tags=["menu:1"])
+        reports.set(1, "sales", 100, tags=["menu:1"])
+        reports.set(1, "cash", 50)
+
+        manager.invalidate_tags("menu:1")
+
+        assert menu.get(1, "items") is None and reports.get(1, "sales") is None
+        assert reports.get(1, "cash") == 50
+
+    def test_invalidate_tenant_and_clear(self):
+        manager = _worker()
+        notes = manager.namespace("notes")
+        notes.set(1, "top", "uno")
+        notes.set(2, "top", "dos")
+        notes.set(3, "top", "tres")
+
+        manager.invalidate_tenant(1)
+        assert notes.get(1, "top") is None and notes.get(2, "top") == "dos"
+
+        notes.clear(2)
+        assert notes.get(2, "top") is None and notes.get(3, "top") == "tres"
+
+        notes.clear()
+        assert notes.get(3, "top") is None
+
+    def test_tuple_keys(self):
+        days = _worker().namespace("days")
+        days.set(1, ("UTC", 20240305), "arrays")
+
+        assert days.get(1, ("UTC", 20240305)) == "arrays"
+
+
+class TestSharedTier:
+    """Two workers sharing a tier"""
+
+    def test_shared_hit_in_other_worker(self, tier):
+        first, second = _worker(tier).namespace("notes", shared=True), _worker(tier).namespace("notes", shared=True)
+        first.set(1, "top", [{"note_text": "sin hielo", "usage_count": 3}], tags=["notes:1"])
+
+        assert second.get(1, "top") == [{"note_text": "sin hielo", "usage_count": 3}]
+        assert second.get(1, "top") == [{"note_text": "sin hielo", "usage_count": 3}]
+        stats = second.stats()
+        assert (stats["shared_hits"], stats["hits"], stats["misses"]) == (1, 1, 0)
+
+    def test_invalidation_reaches_other_workers(self, tier):
+        first_worker, second_worker = _worker(tier), _worker(tier)
+        first = first_worker.namespace("notes", shared=True)
+        second = second_worker.namespace("notes", shared=True)
+        local = second_worker.namespace("days")
+        first.set(1, "top", "uno", tags=["notes:1"])
+        assert second.get(1, "top") == "uno"
+        local.set(1, "day", "arrays", tags=["notes:1"])
+
+        first_worker.invalidate_tags("notes:1")
+
+        assert second.get(1, "top") is None
+        assert local.get(1, "day") is None
+        assert second.stats()["invalidations"] == 1
+
+    def test_delete_reaches_other_workers(self, tier):
+        first, second = _worker(tier).namespace("notes", shared=True), _worker(tier).namespace("notes", shared=True)
+        first.set(1, "top", "uno")
+        second.get(1, "top")
+
+        first.delete(1, "top")
+
+        assert second.get(1, "top") is None
+
+    def test_shared_errors_fall_back_to_local(self, tier, monkeypatch):
+        notes = _worker(tier).namespace("notes", shared=True)
+
+        def down(*args, **kwargs):
+            raise ConnectionError("redis down")
+
+        monkeypatch.setattr(tier, "get_with_ttl", down)
+        monkeypatch.setattr(tier, "set", down)
+
+        assert notes.get_or_set(1, "top", lambda: "uno") == "uno"
+        assert notes.get(1, "top") == "uno"
+        assert notes.stats()["shared_errors"] == 2
+
+    def test_short_entry_does_not_shorten_a_shared_tag(self, tier, monkeypatch):
+        clock = [1000.0]
+        monkeypatch.setattr(cache_module._time, "monotonic", lambda: clock[0])
+        worker = _worker(tier)
+        reports = worker.namespace("reports", ttl=900, shared=True)
+        responses = worker.namespace("http", ttl=60, shared=True)
+        reports.set(1, "closed", "cerrado", tags=["menu:1"])
+        responses.set(1, "page", "html", tags=["menu:1"])
+
+        clock[0] += 120
+        worker.invalidate_tags("menu:1")
+
+        # A worker that never saw the entry finds it gone from the shared tier
+        assert _worker(tier).namespace("reports", ttl=900, shared=True).get(1, "closed") is None
+
+    def test_tag_sets_drop_expired_members(self, tier, monkeypatch):
+        clock = [1000.0]
+        monkeypatch.setattr(cache_module._time, "monotonic", lambda: clock[0])
+        worker = _worker(tier)
+        tickets = worker.namespace("tickets", ttl=60, shared=True)
+
+        for number in range(50):
+            clock[0] += 30
+            tickets.set(1, number, "ticket")
+
+        # Stored members, not just the live ones tag_members returns
+        assert set(tier._tags[worker.tag_key("tenant:1")]) == {
+            tickets._shared_key(1, "48"), tickets._shared_key(1, "49"),
+        }
+
+    def test_shared_hit_keeps_the_shared_expiry(self, tier, monkeypatch):
+        clock = [1000.0]
+        monkeypatch.setattr(cache_module._time, "monotonic", lambda: clock[0])
+        _worker(tier).namespace("notes", ttl=60, shared=True).set(1, "top", "uno")
+
+        clock[0] += 50
+        notes = _worker(tier).namespace("notes", ttl=60, shared=True)
+        assert notes.get(1, "top") == "uno"
+
+        clock[0] += 15
+        assert notes.get(1, "top") is None
+        assert notes.stats()["expirations"] == 1
+
+    def test_own_messages_are_ignored(self, tier):
+        manager = _worker(tier)
+        notes = manager.namespace("notes")
+        notes.set(1, "top", "uno")
+
+        manager._receive('{"origin": "%s", "tags": ["tenant:1"]}' % manager.origin)
+        assert notes.get(1, "top") == "uno"
+
+        manager._receive("no es json")
+        manager._receive('{"origin": "otro", "tags": ["tenant:1"]}')
+        assert notes.get(1, "top") is None
+
+
+def test_cache_endpoint(client):
+    response = client.get("/api/v1/health/cache")
+
+    assert response.status_code == 200
+    assert "special_notes.top" in response.json()["namespaces"]
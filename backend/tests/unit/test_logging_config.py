@@ -0,0 +1,112 @@
+"""
+Unit tests for the logging pipeline.
+"""
+import json
+import logging
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core.logging_config import (
+    JsonFormatter,
+    RequestIdFilter,
+    SamplingFilter,
+    request_id_var,
+)
+from app.middleware.request_id import RequestIdMiddleware
+
+
+def _record(name: str = "app.test", level: int = logging.INFO, msg: str = "hello %s", args=("world",)) -> logging.LogRecord:
+    return logging.LogRecord(name, level, __file__, 1, msg, args, None)
+
+
+def test_sampling_filter_drops_info_for_sampled_logger():
+    """Test that a zero rate drops INFO records of the matching logger tree."""
+    sampling = SamplingFilter({"app.middleware": 0.0})
+
+    assert sampling.filter(_record("app.middleware.restaurant")) is False
+    assert sampling.filter(_record("app.api.orders")) is True
+
+
+def test_sampling_filter_never_drops_warnings():
+    """Test that WARNING and above always pass."""
+    sampling = SamplingFilter({"app": 0.0})
+
+    assert sampling.filter(_record("app.x", level=logging.WARNING)) is True
+    assert sampling.filter(_record("app.x", level=logging.ERROR)) is True
+
+
+def test_sampling_filter_most_specific_prefix_wins():
+    """Test that the longest matching prefix decides the rate."""
+    sampling = SamplingFilter({"app": 0.0, "app.core": 1.0})
+
+    assert sampling.filter(_record("app.core.lifespan")) is True
+    assert sampling.filter(_record("app.services")) is False
+    # "app.co" is not a logger prefix of "app.core"
+    assert SamplingFilter({"app.co": 0.0}).filter(_record("app.core")) is True
+
+
+def test_request_id_filter_uses_context():
+    """Test that records are stamped with the current request ID."""
+    token = request_id_var.set("abc123")
+    try:
+        record = _record()
+        RequestIdFilter().filter(record)
+    finally:
+        request_id_var.reset(token)
+
+    assert record.request_id == "abc123"
+
+    record = _record()
+    RequestIdFilter().filter(record)
+    assert record.request_id == "-"
+
+
+def test_json_formatter_includes_extra_fields():
+    """Test that JSON records contain message, request ID and extras."""
+    record = _record()
+    record.request_id = "r-1"
+    record.restaurant_id = 7
+
+    payload = json.loads(JsonFormatter().format(record))
+
+    assert payload["message"] == "hello world"
+    assert payload["level"] == "INFO"
+    assert payload["logger"] == "app.test"
+    assert payload["request_id"] == "r-1"
+    assert payload["restaurant_id"] == 7
+
+
+@pytest.fixture
+def request_id_client() -> TestClient:
+    app = FastAPI()
+    app.add_middleware(RequestIdMiddleware)
+
+    @app.get("/whoami")
+    async def whoami():
+        return {"request_id": request_id_var.get()}
+
+    return TestClient(app)
+
+
+def test_request_id_middleware_generates_and_echoes_id(request_id_client):
+    """Test that a request ID is generated, visible to handlers and returned."""
+    response = request_id_client.get("/whoami")
+
+    assert response.headers["X-Request-ID"] == response.json()["request_id"]
+    assert len(response.headers["X-Request-ID"]) == 32
+
+
+def test_request_id_middleware_reuses_valid_incoming_id(request_id_client):
+    """Test that a sane upstream request ID is propagated."""
+    response = request_id_client.get("/whoami", headers={"X-Request-ID": "lb-42"})
+
+    assert response.json()["request_id"] == "lb-42"
+
+
+def test_request_id_middleware_rejects_unsafe_incoming_id(request_id_client):
+    """Test that header values that could forge log lines are replaced."""
+    response = request_id_client.get("/whoami", headers={"X-Request-ID": "bad id\nINFO forged"})
+
+    assert response.json()["request_id"] != "bad id\nINFO forged"
@@ -0,0 +1,151 @@
+"""
+Unit tests for connection pool telemetry and the pool sizing advisor.
+"""
+import json
+import os
+import time
+
+import pytest
+from sqlalchemy import create_engine, exc, text
+
+from app.db import pool_metrics
+from app.db.pool_metrics import (
+    InstrumentedQueuePool,
+    PoolMetrics,
+    pool_stats,
+    publish_worker_stats,
+    read_worker_stats,
+    recommend_pool_size,
+)
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}",
+        poolclass=InstrumentedQueuePool,
+        pool_size=1,
+        max_overflow=1,
+        pool_timeout=0.05,
+    )
+    yield engine
+    engine.dispose()
+
+
+class TestInstrumentedQueuePool:
+    """Tests for InstrumentedQueuePool"""
+
+    def test_counts_checkouts_in_use_and_timeouts(self, engine):
+        first, second = engine.connect(), engine.connect()
+        first.execute(text("SELECT 1"))
+
+        stats = pool_stats(engine)
+        assert stats["checked_out"] == 2
+        assert stats["overflow"] == 1
+        assert stats["in_use"] == 2
+
+        with pytest.raises(exc.TimeoutError):
+            engine.connect()
+        first.close()
+        second.close()
+
+        stats = pool_stats(engine)
+        assert stats["checkouts"] == 2
+        assert stats["timeouts"] == 1
+        assert stats["in_use"] == 0
+        assert stats["peak_in_use"] == 2
+        assert sum(stats["wait_ms"]["histogram"].values()) == 2
+
+    def test_metrics_survive_dispose(self, engine):
+        engine.connect().close()
+        engine.dispose()
+        engine.connect().close()
+
+        assert pool_stats(engine)["checkouts"] == 2
+
+    def test_uninstrumented_pool_has_no_stats(self, tmp_path):
+        plain = create_engine(f"sqlite:///{tmp_path / 'plain.db'}")
+        assert pool_stats(plain) is None
+
+
+class TestPoolMetrics:
+    """Tests for PoolMetrics"""
+
+    def test_concurrency_percentiles_are_time_weighted(self, monkeypatch):
+        clock = [0.0]
+        monkeypatch.setattr(pool_metrics.time, "monotonic", lambda: clock[0])
+        metrics = PoolMetrics()
+
+        # 90 s at one connection, 10 s at eight
+        metrics.observe_checkout(0.001, 1)
+        clock[0] = 90.0
+        metrics.observe_checkout(0.001, 8)
+        clock[0] = 100.0
+        metrics.observe_checkin(0)
+
+        assert metrics.concurrency_percentile(0.5) == 1
+        assert metrics.concurrency_percentile(0.95) == 8
+        assert metrics.peak_in_use == 8
+
+    def test_wait_histogram_buckets(self):
+        metrics = PoolMetrics()
+        for wait in (0.0005, 0.003, 0.2, 45.0):
+            metrics.observe_checkout(wait, 1)
+
+        histogram = metrics.snapshot()["wait_ms"]["histogram"]
+        assert histogram["le_1ms"] == 1
+        assert histogram["le_5ms"] == 1
+        assert histogram["le_250ms"] == 1
+        assert histogram["gt_30000ms"] == 1
+
+
+class TestPoolAdvisor:
+    """Tests for the cross-worker pool sizing advisor"""
+
+    def test_publish_and_read_skip_stale_workers(self, engine, tmp_path):
+        directory = str(tmp_path / "stats")
+        publish_worker_stats(engine, directory, pid=101)
+        stale = os.path.join(directory, "pool-102.json")
+        with open(stale, "w") as fh:
+            json.dump({"pid": 102, "published_at": time.time() - 3600}, fh)
+
+        workers = read_worker_stats(directory, max_age_seconds=60)
+
+        assert [w["pid"] for w in workers] == [101]
+
+    def test_recommends_from_busiest_worker(self):
+        workers = [
+            {"pid": 1, "pool_size": 5, "max_overflow": 10, "p95_in_use": 4, "peak_in_use": 12, "timeouts": 0},
+            {"pid": 2, "pool_size": 5, "max_overflow": 10, "p95_in_use": 8, "peak_in_use": 14, "timeouts": 3},
+        ]
+
+        advice = recommend_pool_size(workers)
+
+        assert advice["recommended"] == {"pool_size": 10, "max_overflow": 8}
+        assert advice["total_connections"] == 36
+        assert "timeouts" in advice["notes"][0]
+
+    def test_caps_to_max_connections(self):
+        workers = [
+            {"pid": pid, "pool_size": 5, "max_overflow": 10, "p95_in_use": 20, "peak_in_use": 40, "timeouts": 0}
+            for pid in range(4)
+        ]
+
+        advice = recommend_pool_size(workers, max_connections=110)
+
+        # (110 - 10 reserved) / 4 workers
+        assert advice["recommended"]["pool_size"] + advice["recommended"]["max_overflow"] == 25
+        assert advice["total_connections"] <= 100
+
+    def test_no_workers(self):
+        assert recommend_pool_size([])["workers"] == 0
+
+
+def test_pool_health_endpoint(client):
+    """Test that the health router exposes pool telemetry."""
+    response = client.get("/api/v1/health/pool")
+
+    assert response.status_code == 200
+    data = response.json()
+    assert "worker_pid" in data
+    assert "primary" in data
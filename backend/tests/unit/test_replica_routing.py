@@ -0,0 +1,133 @@
+"""
+Unit tests for read replica routing (db/routing.py).
+
+Uses two SQLite databases as primary and replica; each holds a different
+marker row so every test can tell which one served a read.
+"""
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from app.db.routing import (
+    ReadPinMiddleware,
+    ReplicaRouter,
+    RoutingSession,
+    pin_reads_to_primary,
+    read_pin_scope,
+    reads_pinned,
+)
+
+
+@pytest.fixture
+def engines(tmp_path):
+    primary = create_engine(f"sqlite:///{tmp_path / 'primary.db'}")
+    replica = create_engine(f"sqlite:///{tmp_path / 'replica.db'}")
+    for engine, name in ((primary, "primary"), (replica, "replica")):
+        with engine.begin() as conn:
+            conn.execute(text("CREATE TABLE marker (name TEXT)"))
+            conn.execute(text("INSERT INTO marker VALUES (:name)"), {"name": name})
+    yield primary, replica
+    primary.dispose()
+    replica.dispose()
+
+
+def _factory(router):
+    return sessionmaker(class_=RoutingSession, router=router, expire_on_commit=False)
+
+
+def _served_by(session) -> str:
+    return session.execute(text("SELECT name FROM marker")).scalar()
+
+
+def _lag(value):
+    calls = []
+
+    def probe(engine):
+        calls.append(engine)
+        if isinstance(value, Exception):
+            raise value
+        return value
+    probe.calls = calls
+    return probe
+
+
+class TestReplicaRouter:
+    """Tests for ReplicaRouter and RoutingSession"""
+
+    def test_reads_use_replica_within_staleness_bound(self, engines):
+        primary, replica = engines
+        router = ReplicaRouter(primary, replica, max_lag_seconds=5, lag_probe=_lag(1.0))
+
+        with _factory(router)() as session:
+            assert _served_by(session) == "replica"
+        assert router.status()["in_use"] is True
+
+    @pytest.mark.parametrize("lag", [30.0, None, RuntimeError("connection refused")])
+    def test_stale_or_broken_replica_falls_back_to_primary(self, engines, lag):
+        primary, replica = engines
+        router = ReplicaRouter(primary, replica, max_lag_seconds=5, lag_probe=_lag(lag))
+
+        with _factory(router)() as session:
+            assert _served_by(session) == "primary"
+
+    def test_no_replica_configured_reads_primary(self, engines):
+        primary, _ = engines
+        router = ReplicaRouter(primary, None)
+
+        with _factory(router)() as session:
+            assert _served_by(session) == "primary"
+        assert router.status()["configured"] is False
+
+    def test_lag_is_probed_once_per_interval(self, engines):
+        primary, replica = engines
+        probe = _lag(0.0)
+        router = ReplicaRouter(primary, replica, check_interval=60, lag_probe=probe)
+
+        for _ in range(5):
+            router.read_engine()
+
+        assert len(probe.calls) == 1
+
+    def test_writes_go_to_primary_and_pin_later_reads(self, engines):
+        primary, replica = engines
+        router = ReplicaRouter(primary, replica, lag_probe=_lag(0.0))
+
+        with read_pin_scope(), _factory(router)() as session:
+            assert _served_by(session) == "replica"
+            session.execute(text("INSERT INTO marker VALUES ('written')"))
+            assert reads_pinned()
+            assert session.execute(text("SELECT COUNT(*) FROM marker")).scalar() == 2
+            session.commit()
+
+        with primary.connect() as conn:
+            assert conn.execute(text("SELECT COUNT(*) FROM marker")).scalar() == 2
+        with replica.connect() as conn:
+            assert conn.execute(text("SELECT COUNT(*) FROM marker")).scalar() == 1
+
+    def test_explicit_pin_is_scoped(self, engines):
+        primary, replica = engines
+        router = ReplicaRouter(primary, replica, lag_probe=_lag(0.0))
+        Session = _factory(router)
+
+        with read_pin_scope():
+            pin_reads_to_primary()
+            with Session() as session:
+                assert _served_by(session) == "primary"
+        # A new scope (the next request) starts unpinned
+        with read_pin_scope(), Session() as session:
+            assert _served_by(session) == "replica"
+
+    @pytest.mark.asyncio
+    async def test_middleware_gives_each_request_its_own_pin(self):
+        seen = []
+
+        async def app(scope, receive, send):
+            seen.append(reads_pinned())
+            pin_reads_to_primary()
+
+        middleware = ReadPinMiddleware(app)
+        for _ in range(2):
+            await middleware({"type": "http"}, None, None)
+
+        assert seen == [False, False]
+        assert reads_pinned() is False
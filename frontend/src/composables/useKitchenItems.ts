@@ -64,17 +64,11 @@ export function useKitchenItems(refreshOrders: () => Promise<void>) {
         item => item.status === 'pending'
       );
 
-      // Update all pending items to preparing
-      for (const item of pendingItems) {
-        await orderService.updateOrderItemStatus(order.id, item.id, 'preparing');
-      }
-
-      // Fetch the updated order to get current state of all items
-      const updatedOrder = await orderService.getOrder(order.id);
-
-      // Check if all items are now preparing or beyond
-      if (areAllItemsPreparing(updatedOrder) && updatedOrder.status === 'pending') {
-        await orderService.updateOrder(order.id, { status: 'preparing' });
+      // One request for the whole ticket; the backend rolls the order status up
+      if (pendingItems.length > 0) {
+        await orderService.bumpKitchenItems({
+          items: pendingItems.map(item => ({ order_id: order.id, item_id: item.id, status: 'preparing' }))
+        });
       }
 
       await refreshOrders();
@@ -92,17 +86,10 @@ export function useKitchenItems(refreshOrders: () => Promise<void>) {
         item => item.status === 'preparing'
       );
 
-      // Update all preparing items to ready
-      for (const item of preparingItems) {
-        await orderService.updateOrderItemStatus(order.id, item.id, 'ready');
-      }
-
-      // Fetch the updated order to get current state of all items
-      const updatedOrder = await orderService.getOrder(order.id);
-
-      // Check if all items in the order are ready or delivered
-      if (areAllItemsReady(updatedOrder) && updatedOrder.status !== 'ready') {
-        await orderService.updateOrder(order.id, { status: 'ready' });
+      if (preparingItems.length > 0) {
+        await orderService.bumpKitchenItems({
+          items: preparingItems.map(item => ({ order_id: order.id, item_id: item.id, status: 'ready' }))
+        });
       }
 
       await refreshOrders();
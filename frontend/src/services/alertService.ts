@@ -40,10 +40,11 @@ export const alertService = {
   },
 
   /**
-   * Get unread count
+   * Get unread count (served from a cached counter; changes are also
+   * pushed as 'alerts.unread' events, see realtimeService)
    */
   async getUnreadCount(): Promise<number> {
-    const alerts = await this.getAlerts(true)
-    return alerts.length
+    const response = await api.get('/subscriptions/alerts/unread-count') as { unread_count: number }
+    return response.unread_count
   }
 }
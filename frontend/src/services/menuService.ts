@@ -1,7 +1,7 @@
 import api from './api';
 import API_CONFIG from '@/config/api';
 import type { AxiosResponse } from 'axios';
-import type { MenuItem, MenuItemVariant, MenuCategory } from '@/types/menu';
+import type { MenuItem, MenuItemVariant, MenuCategory, MenuItemImageUrls } from '@/types/menu';
 import { safeStorage } from '@/utils/storage';
 
 export interface ApiResponse<T = any> {
@@ -35,12 +35,20 @@ export interface MenuItemResponse {
   is_available?: boolean;
   isAvailable?: boolean;
   image_url?: string;
+  image_urls?: MenuItemImageUrls | null;
   ingredients?: MenuItemIngredients | null;
   variants?: MenuItemVariant[];
   created_at?: string;
   updated_at?: string;
 }
 
+export interface SuggestedSpecialNote {
+  note_text: string;
+  usage_count: number;
+  score: number;
+  in_scope: boolean;
+}
+
 // Use the configured API instance from api.ts
 const apiInstance = api;
 
@@ -71,6 +79,19 @@ apiInstance.interceptors.response.use(
   }
 );
 
+// Media URLs come relative to the API server; the app may be served from elsewhere
+// (file:// in Electron, the Vite dev server), so point them at the API base URL
+const resolveImageUrls = (urls: MenuItemImageUrls | null | undefined): MenuItemImageUrls | null => {
+  if (!urls) return null;
+  const resolve = (url: string) => (url && url.startsWith('/') ? `${API_CONFIG.BASE_URL}${url}` : url);
+  return {
+    thumb: resolve(urls.thumb),
+    card: resolve(urls.card),
+    large: resolve(urls.large),
+    original: resolve(urls.original)
+  };
+};
+
 // Helper to normalize menu item data
 const normalizeMenuItem = (item: any): MenuItemResponse => {
   // Ensure variants is always an array and has consistent property names
@@ -93,6 +114,7 @@ const normalizeMenuItem = (item: any): MenuItemResponse => {
     is_available: item.is_available ?? item.isAvailable ?? true,
     isAvailable: item.isAvailable ?? item.is_available ?? true,
     image_url: item.image_url ?? item.imageUrl,
+    image_urls: resolveImageUrls(item.image_urls),
     ingredients: item.ingredients || null,
     variants,
     created_at: item.created_at,
@@ -214,6 +236,36 @@ export const getCategories = async (): Promise<MenuCategory[]> => {
   } as MenuCategory));
 };
 
+// Special note suggestions, cheap enough to request on every keystroke
+export const suggestSpecialNotes = async (
+  query: string,
+  scope: { menuItemId?: number; categoryId?: number } = {},
+  limit: number = 8
+): Promise<SuggestedSpecialNote[]> => {
+  const params = new URLSearchParams({ q: query, limit: String(limit) });
+  if (scope.menuItemId !== undefined) params.append('menu_item_id', String(scope.menuItemId));
+  if (scope.categoryId !== undefined) params.append('category_id', String(scope.categoryId));
+
+  const response = await apiInstance.get<SuggestedSpecialNote[]>(
+    `${MENU_BASE_PATH}/special-notes/suggest`,
+    { params }
+  );
+  return Array.isArray(response) ? response : [];
+};
+
+// Uploaded images; thumbnails appear in image_urls once the server has resized them
+export const uploadMenuItemImage = async (id: string | number, file: File): Promise<MenuItemResponse> => {
+  const formData = new FormData();
+  formData.append('image', file);
+  const response = await apiInstance.put<MenuItemResponse>(`${MENU_BASE_PATH}/${id}/image`, formData);
+  return normalizeMenuItem(response);
+};
+
+export const deleteMenuItemImage = async (id: string | number): Promise<MenuItemResponse> => {
+  const response = await apiInstance.delete<MenuItemResponse>(`${MENU_BASE_PATH}/${id}/image`);
+  return normalizeMenuItem(response);
+};
+
 // Category CRUD Operations
 
 export const createCategory = async (data: { name: string; description?: string; visible_in_kitchen?: boolean }): Promise<MenuCategory> => {
@@ -303,6 +355,8 @@ export default {
   updateMenuItem,
   deleteMenuItem,
   updateMenuItemAvailability,
+  uploadMenuItemImage,
+  deleteMenuItemImage,
   getCategories,
   createCategory,
   updateCategory,
@@ -312,5 +366,8 @@ export default {
   addMenuItemVariant,
   updateMenuItemVariant,
   deleteMenuItemVariant,
-  toggleVariantAvailability
+  toggleVariantAvailability,
+
+  // Special notes
+  suggestSpecialNotes
 };
@@ -141,6 +141,58 @@ export interface MenuItem {
   has_variants: boolean;
 }
 
+export interface KitchenBump {
+  items?: Array<{ order_id: number; item_id: number; status: string }>;
+  categories?: Array<{ order_id: number; category_id: number; status: string }>;
+  update_order_status?: boolean;
+}
+
+export interface KitchenBumpResult {
+  items: Array<{ id: number; order_id: number; status: string }>;
+  orders: Array<{ id: number; status: string }>;
+  skipped: number[];
+  updated_at: string;
+}
+
+export interface KitchenQueueItem {
+  id: number;
+  order_id: number;
+  order_number: number;
+  ticket_number: string | null;
+  order_type: string;
+  order_status: string;
+  table_number: number | null;
+  customer_name: string | null;
+  person_name: string | null;
+  order_notes: string | null;
+  menu_item_id: number;
+  name: string;
+  variant_name: string | null;
+  category_id: number;
+  category_name: string;
+  quantity: number;
+  special_instructions: string | null;
+  extras: Array<{ name: string; quantity: number }>;
+  status: string;
+  created_at: string;
+  updated_at: string | null;
+  age_seconds: number;
+  order_age_seconds: number;
+}
+
+export interface KitchenQueue {
+  printer_ids: number[] | null;
+  generated_at: string;
+  items: KitchenQueueItem[];
+}
+
+export interface KitchenQueueParams {
+  printer_id?: number;
+  station?: 'kitchen' | 'bar';
+  order_type?: string;
+  limit?: number;
+}
+
 const orderService = {
   async createOrder(orderData: CreateOrderData): Promise<Order> {
     try {
@@ -310,6 +362,33 @@ const orderService = {
       throw error;
     }
   },
+
+  /**
+   * Move many items through their statuses in one request.
+   * The backend validates every transition and rolls the order status up.
+   */
+  async bumpKitchenItems(bump: KitchenBump): Promise<KitchenBumpResult> {
+    try {
+      return await api.post('/orders/kitchen/bump', bump) as KitchenBumpResult;
+    } catch (error) {
+      console.error('Error bumping kitchen items:', error);
+      throw error;
+    }
+  },
+
+  /**
+   * Items a station has to prepare, oldest order first, as a flat list.
+   * Filtering by station and kitchen visibility happens on the server, so
+   * a bar display only downloads the bar's items.
+   */
+  async getKitchenQueue(params: KitchenQueueParams = {}): Promise<KitchenQueue> {
+    try {
+      return await api.get('/orders/kitchen/queue', { params }) as KitchenQueue;
+    } catch (error) {
+      console.error('Error fetching kitchen queue:', error);
+      throw error;
+    }
+  },
 };
 
 export default orderService;
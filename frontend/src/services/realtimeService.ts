@@ -0,0 +1,157 @@
+import API_CONFIG from '@/config/api'
+import { safeStorage } from '@/utils/storage'
+import { getGlobalToken } from '@/utils/tokenCache'
+import { getSubdomain } from '@/utils/subdomain'
+import { authService } from './authService'
+
+/**
+ * Server-Sent Events client for GET /events/stream.
+ *
+ * One stream is shared by every component of the tab: it opens with the
+ * first listener and closes with the last. EventSource cannot send the
+ * Authorization header, so the stream is read with fetch.
+ *
+ * Besides the server's events, listeners can subscribe to 'open', fired
+ * on every (re)connection, and 'resync', sent by the server when events
+ * were dropped; both mean "reload what you show".
+ */
+
+export type RealtimeHandler = (data: any) => void
+
+const MAX_RETRY_DELAY = 60000
+
+const listeners = new Map<string, Set<RealtimeHandler>>()
+let controller: AbortController | null = null
+let retryTimer: number | null = null
+let retryDelay = 5000
+
+function listenerCount(): number {
+  let count = 0
+  listeners.forEach(handlers => { count += handlers.size })
+  return count
+}
+
+function emit(event: string, data: any) {
+  listeners.get(event)?.forEach(handler => {
+    try {
+      handler(data)
+    } catch (error) {
+      console.error(`Realtime handler for ${event} failed:`, error)
+    }
+  })
+}
+
+function authHeaders(): Record<string, string> {
+  const headers: Record<string, string> = { Accept: 'text/event-stream' }
+  const subdomain = getSubdomain()
+  if (subdomain) {
+    headers['x-restaurant-subdomain'] = subdomain
+  }
+  const token = getGlobalToken() ||
+                safeStorage.getItem('access_token') ||
+                safeStorage.getItem('access_token', true) ||
+                authService.getToken()
+  if (token) {
+    headers.Authorization = `Bearer ${token}`
+  }
+  return headers
+}
+
+function dispatch(block: string) {
+  let event = 'message'
+  const data: string[] = []
+  for (const line of block.split('\n')) {
+    if (line.startsWith('event:')) {
+      event = line.slice(6).trim()
+    } else if (line.startsWith('data:')) {
+      data.push(line.slice(5).trim())
+    } else if (line.startsWith('retry:')) {
+      retryDelay = Number(line.slice(6).trim()) || retryDelay
+    }
+  }
+  if (data.length > 0) {
+    emit(event, JSON.parse(data.join('\n')))
+  }
+}
+
+function scheduleReconnect() {
+  if (retryTimer !== null || listenerCount() === 0) return
+  retryTimer = window.setTimeout(() => {
+    retryTimer = null
+    connect()
+  }, retryDelay)
+  retryDelay = Math.min(retryDelay * 2, MAX_RETRY_DELAY)
+}
+
+async function connect() {
+  if (controller) return
+  const current = new AbortController()
+  controller = current
+  try {
+    const response = await fetch(API_CONFIG.getUrl('/events/stream'), {
+      headers: authHeaders(),
+      credentials: 'include',
+      signal: current.signal
+    })
+    if (response.status === 401) {
+      // Let the API client refresh the token on its next request
+      return
+    }
+    if (!response.ok || !response.body) {
+      throw new Error(`Event stream failed with status ${response.status}`)
+    }
+    retryDelay = 5000
+    emit('open', null)
+
+    const reader = response.body.pipeThrough(new TextDecoderStream()).getReader()
+    let buffer = ''
+    while (true) {
+      const { value, done } = await reader.read()
+      if (done) break
+      buffer += value.replace(/\r\n/g, '\n')
+      let end = buffer.indexOf('\n\n')
+      while (end !== -1) {
+        dispatch(buffer.slice(0, end))
+        buffer = buffer.slice(end + 2)
+        end = buffer.indexOf('\n\n')
+      }
+    }
+  } catch (error) {
+    if (current.signal.aborted) return
+    console.error('Event stream error:', error)
+  } finally {
+    if (controller === current) {
+      controller = null
+      if (!current.signal.aborted) scheduleReconnect()
+    }
+  }
+}
+
+function disconnect() {
+  if (retryTimer !== null) {
+    clearTimeout(retryTimer)
+    retryTimer = null
+  }
+  controller?.abort()
+  controller = null
+}
+
+export const realtimeService = {
+  /**
+   * Listen to an event; returns the function that stops listening
+   */
+  on(event: string, handler: RealtimeHandler): () => void {
+    if (!listeners.has(event)) {
+      listeners.set(event, new Set())
+    }
+    listeners.get(event)!.add(handler)
+    connect()
+
+    return () => {
+      listeners.get(event)?.delete(handler)
+      if (listenerCount() === 0) {
+        disconnect()
+      }
+    }
+  }
+}
@@ -43,6 +43,7 @@ export const useMenuStore = defineStore('menu', () => {
       category: category,
       is_available: item.is_available ?? true,
       image_url: item.image_url ?? '',
+      image_urls: item.image_urls ?? null,
       ingredients: item.ingredients || null,
       variants: Array.isArray(item.variants) 
         ? item.variants.map((v: any) => ({
@@ -35,6 +35,7 @@ export interface MenuItem {
   discount_price?: number;
   image_url?: string;
   imageUrl?: string; // Support both snake_case and camelCase
+  image_urls?: MenuItemImageUrls | null; // Pre-sized variants, see menuService.uploadMenuItemImage
   is_available?: boolean;
   isAvailable?: boolean; // Support both snake_case and camelCase
   ingredients?: MenuItemIngredients | null;
@@ -43,6 +44,14 @@ export interface MenuItem {
   updated_at?: string;
 }
 
+// URL of a menu item image by size (longest side: thumb 160px, card 480px, large 1024px)
+export interface MenuItemImageUrls {
+  thumb: string;
+  card: string;
+  large: string;
+  original: string;
+}
+
 export interface MenuItemFormData {
   name: string;
   description: string;
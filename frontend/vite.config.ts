@@ -154,6 +154,21 @@ export default defineConfig(({ mode }) => {
                 }
               }
             },
+            {
+              // Uploaded menu images never change under the same URL
+              urlPattern: /\/api\/v1\/media\/.*/i,
+              handler: 'CacheFirst',
+              options: {
+                cacheName: 'media-cache',
+                expiration: {
+                  maxEntries: 500,
+                  maxAgeSeconds: 60 * 60 * 24 * 30 // 30 days
+                },
+                cacheableResponse: {
+                  statuses: [0, 200]
+                }
+              }
+            },
             {
               urlPattern: /\/api\/.*/i,
               handler: 'NetworkFirst',